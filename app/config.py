@@ -0,0 +1,22 @@
+"""
+역할: 실행 설정 로드 (.env → 환경변수)
+포함 내용:
+- load_config(): .env 파일을 프로세스에서 처음 호출할 때 한 번만 읽음
+  (모듈마다 load_dotenv()로 .env를 다시 찾고 읽지 않도록, 이미 있는 환경변수는 덮어쓰지 않음)
+"""
+
+import threading
+
+from dotenv import load_dotenv
+
+_lock = threading.Lock()
+_loaded = False
+
+
+def load_config():
+    """.env 파일을 환경변수로 로드 (이미 로드했으면 아무것도 안 함)"""
+    global _loaded
+    with _lock:
+        if not _loaded:
+            load_dotenv()
+            _loaded = True
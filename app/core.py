@@ -2,21 +2,31 @@
 Shorts Factory - 애플리케이션 핵심 로직
 
 실행은 프로젝트 루트의 main.py를 사용하세요:
-    python3 main.py
+    python3 main.py              # 전체 (크롤링 → 대본 작성 → 영상 생성)
+    python3 main.py crawl        # 크롤링만
+    python3 main.py write        # 대본 작성만
+    python3 main.py render       # 영상 생성만
+
+단계마다 무거운 의존성(크롤러: Selenium / bs4 / lxml / requests, 대본: google.generativeai 등)은
+그 단계를 실행할 때만 import한다. (대본만 작성할 때 크롤러를 불러오지 않음)
+설정(.env)은 시작할 때 한 번만 로드 (app.config.load_config)
 """
 
 import os
 import sys
 import logging
+import argparse
 
 from pathlib import Path
+from typing import List, Optional
 
 # 프로젝트 루트를 파이썬 경로에 추가
-project_root = Path(__file__).parent
+project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from modules.crawling.crawler_main import crawl_gallery
-from modules.llm.llm_writer import generate_scripts_batch
+# 하위 모듈이 모두 app.modules.* 로 import하므로 같은 경로로 가져옴
+# (modules.* 로 가져오면 같은 모듈이 두 번 로드되어 MongoDB 클라이언트 등 전역 객체가 따로 생김)
+from app.config import load_config
 
 # 로깅 설정
 logging.basicConfig(
@@ -25,55 +35,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
-    """메인 실행 함수"""
-    logger.info("=" * 60)
-    logger.info("🎬 Shorts Factory - 경제 쇼츠 자동 생성 시스템")
-    logger.info("=" * 60)
-    logger.info("")  # 빈 줄
-    
-    # Phase 1: 데이터 수집
+COMMANDS = ('crawl', 'write', 'render', 'all')
+
+# MongoDB를 쓰는 단계 (인덱스 확인 / 커넥션 풀 정리 대상)
+DB_COMMANDS = ('crawl', 'write', 'all')
+
+# 크롤러와 대본 저장이 함께 쓰는 MongoDB 클라이언트 모듈
+CONNECTION_MODULE = 'app.modules.crawling.manager.connection_db'
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """서브커맨드 파서 (서브커맨드 없이 실행하면 all)"""
+    parser = argparse.ArgumentParser(prog='main.py', description='Shorts Factory - 경제 쇼츠 자동 생성 시스템')
+    subparsers = parser.add_subparsers(dest='command', metavar='{' + ','.join(COMMANDS) + '}')
+
+    crawl = subparsers.add_parser('crawl', help='게시글 크롤링 + MongoDB 저장')
+    write = subparsers.add_parser('write', help='대본이 없는 게시글로 LLM 대본 작성')
+    subparsers.add_parser('render', help='대본으로 영상 생성')
+    run_all = subparsers.add_parser('all', help='크롤링 → 대본 작성 → 영상 생성 (기본값)')
+
+    for subparser in (crawl, run_all):
+        subparser.add_argument('--pages', type=int, default=None, help='크롤링할 페이지 수 (기본값: CRAWL_PAGES)')
+        subparser.add_argument('--max-posts', type=int, default=None, help='최대 수집 게시글 수 (기본값: MAX_POSTS)')
+    for subparser in (write, run_all):
+        subparser.add_argument('--limit', type=int, default=None, help='생성할 대본 수 (기본값: SCRIPT_LIMIT)')
+    return parser
+
+
+def run_crawl(pages: int = None, max_posts: int = None) -> int:
+    """
+    Phase 1: 데이터 크롤링
+
+    Returns:
+        수집한 게시글 수
+    """
+    from app.modules.crawling.crawler_main import save_gallery
+
     logger.info("📡 [Phase 1] 데이터 크롤링 시작...")
-    try:
-        # 환경변수에서 설정 읽기
+    # 환경변수에서 설정 읽기 (인자로 주면 인자 우선)
+    if max_posts is None:
         max_posts = os.getenv('MAX_POSTS')  # None이면 제한 없음
         max_posts = int(max_posts) if max_posts else None
-        cleanup_days = int(os.getenv('IMAGE_CLEANUP_DAYS', 7))
-        
-        posts = crawl_gallery(
-            pages=int(os.getenv('CRAWL_PAGES', 1)),
-            delay=float(os.getenv('CRAWL_DELAY', 2.0)),
-            save_to_db=True,
-            max_posts=max_posts,
-            cleanup_days=cleanup_days
-        )
-        logger.info(f"✅ 크롤링 완료: {len(posts)}개 게시글 수집")
-    except Exception as e:
-        logger.error(f"❌ 크롤링 실패: {e}")
-        return
-    
-    # Phase 2: 대본 작성
-    logger.info("")  # 빈 줄
+    cleanup_days = int(os.getenv('IMAGE_CLEANUP_DAYS', 7))
+
+    # 수집하는 동안 마이크로 배치로 저장 (결과를 메모리에 모으지 않음)
+    post_count = save_gallery(
+        pages=pages if pages is not None else int(os.getenv('CRAWL_PAGES', 1)),
+        delay=float(os.getenv('CRAWL_DELAY', 2.0)),
+        max_posts=max_posts,
+        cleanup_days=cleanup_days,
+        concurrency=int(os.getenv('CRAWL_CONCURRENCY', 1)),
+        incremental=os.getenv('CRAWL_INCREMENTAL', 'true').lower() == 'true'
+    )
+    logger.info(f"✅ 크롤링 완료: {post_count}개 게시글 수집")
+    return post_count
+
+
+def run_write(limit: int = None) -> int:
+    """
+    Phase 2: LLM 대본 작성
+
+    Returns:
+        생성한 대본 수
+    """
+    from app.modules.llm.llm_writer import generate_scripts_batch
+
     logger.info("✍️  [Phase 2] LLM 대본 작성 시작...")
+    # 환경변수에서 생성할 대본 수 읽기 (기본값: 5)
+    script_limit = limit if limit is not None else int(os.getenv('SCRIPT_LIMIT', 5))
+
+    script_count = generate_scripts_batch(limit=script_limit)
+    logger.info(f"✅ 대본 생성 완료: {script_count}개 대본 생성")
+    return script_count
+
+
+def run_render():
+    """Phase 3: 영상 생성 (추후 구현, 영상 라이브러리도 이 함수 안에서 import)"""
+    logger.info("🎥 [Phase 3] 영상 생성... (미구현)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    메인 실행 함수
+
+    Args:
+        argv: 명령행 인자 (없으면 sys.argv[1:])
+
+    Returns:
+        종료 코드 (실행한 단계가 실패하면 1)
+    """
+    args = build_parser().parse_args(argv)
+    command = args.command or 'all'
+    load_config()
+
     try:
-        # 환경변수에서 생성할 대본 수 읽기 (기본값: 5)
-        script_limit = int(os.getenv('SCRIPT_LIMIT', 5))
-        
-        script_count = generate_scripts_batch(limit=script_limit)
-        logger.info(f"✅ 대본 생성 완료: {script_count}개 대본 생성")
-    except Exception as e:
-        logger.error(f"❌ 대본 생성 실패: {e}")
-        # 대본 생성 실패해도 계속 진행
-    
-    # Phase 3: 영상 생성 (추후 구현)
+        return _run_phases(command, args)
+    finally:
+        # 크롤러와 대본 저장이 함께 쓰던 MongoDB 커넥션 풀 정리 (MongoDB를 쓴 단계가 있을 때만)
+        connection_db = sys.modules.get(CONNECTION_MODULE)
+        if connection_db is not None:
+            connection_db.close_mongo_client()
+
+
+def _run_phases(command: str, args: argparse.Namespace) -> int:
+    """선택한 단계 실행 (all: 크롤링 → 대본 작성 → 영상 생성)"""
+    logger.info("=" * 60)
+    logger.info(f"🎬 Shorts Factory - 경제 쇼츠 자동 생성 시스템 ({command})")
+    logger.info("=" * 60)
     logger.info("")  # 빈 줄
-    logger.info("🎥 [Phase 3] 영상 생성... (미구현)")
-    
+
+    if command in DB_COMMANDS:
+        # 크롤링/대본 조회 쿼리가 쓰는 인덱스 준비 (실패해도 느려질 뿐이므로 계속 진행)
+        try:
+            from app.modules.crawling.manager.indexes import ensure_indexes
+            ensure_indexes()
+        except Exception as e:
+            logger.warning(f"⚠️ 인덱스 확인 실패: {e}")
+
+    exit_code = 0
+
+    # Phase 1: 데이터 수집
+    if command in ('crawl', 'all'):
+        try:
+            run_crawl(pages=args.pages, max_posts=args.max_posts)
+        except Exception as e:
+            logger.error(f"❌ 크롤링 실패: {e}")
+            return 1
+
+    # Phase 2: 대본 작성
+    if command in ('write', 'all'):
+        logger.info("")  # 빈 줄
+        try:
+            run_write(limit=args.limit)
+        except Exception as e:
+            logger.error(f"❌ 대본 생성 실패: {e}")
+            exit_code = 1
+            # 대본 생성 실패해도 계속 진행
+
+    # Phase 3: 영상 생성 (추후 구현)
+    if command in ('render', 'all'):
+        logger.info("")  # 빈 줄
+        run_render()
+
     logger.info("")  # 빈 줄
     logger.info("=" * 60)
     logger.info("🎉 프로세스 완료!")
     logger.info("=" * 60)
+    return exit_code
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
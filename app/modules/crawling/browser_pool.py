@@ -0,0 +1,204 @@
+"""
+Headless 브라우저(WebDriver) 풀
+
+게시글마다 Chromium을 새로 띄우지 않고, 미리 띄운 N개의 WebDriver를 빌려 쓰고 돌려준다.
+- 반납 시 쿠키 삭제 + about:blank 이동으로 상태 초기화
+- 대여 시 헬스 체크, 실패한 드라이버는 폐기 후 새로 생성
+- M페이지 사용한 드라이버는 메모리 누수 방지를 위해 재생성
+"""
+
+import os
+import queue
+import logging
+import threading
+
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from app.modules.crawling.dcinside.constants import HEADERS
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def create_driver() -> webdriver.Chrome:
+    """Headless Chrome/Chromium WebDriver 생성"""
+    # Chrome/Chromium 옵션 설정 (headless 모드)
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')  # 백그라운드 실행
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument(f'user-agent={HEADERS["User-Agent"]}')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+
+    # 로그 최소화
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+
+    # Chromium 바이너리 경로 설정 (Docker 환경)
+    # macOS에서는 자동으로 Chrome 찾음, Docker에서는 chromium 사용
+    if os.path.exists('/usr/bin/chromium'):
+        chrome_options.binary_location = '/usr/bin/chromium'
+
+    return webdriver.Chrome(options=chrome_options)
+
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.debug(f"WebDriver 종료 실패 (무시): {e}")
+
+
+class BrowserPool:
+    """
+    WebDriver 대여/반납 풀 (스레드 안전)
+
+    Usage:
+        with pool.lease() as driver:
+            driver.get(url)
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50):
+        """
+        Args:
+            size: 동시에 띄울 수 있는 최대 브라우저 수
+            max_pages: 드라이버 1개당 최대 사용 페이지 수 (초과 시 재생성)
+        """
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+
+        self._idle = queue.LifoQueue()  # (driver, 사용한 페이지 수)
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # 통계
+        self.created = 0
+        self.recycled = 0
+        self.leases = 0
+
+    def _create(self):
+        driver = create_driver()
+        with self._lock:
+            self.created += 1
+        return driver, 0
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            return driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        """다음 게시글에 영향이 없도록 상태 초기화"""
+        driver.delete_all_cookies()
+        driver.get('about:blank')
+
+    @contextmanager
+    def lease(self):
+        """WebDriver 1개 대여 (블록을 벗어나면 자동 반납)"""
+        if self._closed:
+            raise RuntimeError("브라우저 풀이 이미 종료되었습니다.")
+
+        self._slots.acquire()
+        driver = None
+        try:
+            # 놀고 있는 드라이버 재사용, 없으면 새로 생성
+            try:
+                driver, pages = self._idle.get_nowait()
+                if not self._is_healthy(driver):
+                    logger.warning("  ⚠️ 응답 없는 브라우저 폐기 후 재생성")
+                    _quit_driver(driver)
+                    driver, pages = self._create()
+            except queue.Empty:
+                driver, pages = self._create()
+
+            with self._lock:
+                self.leases += 1
+
+            try:
+                yield driver
+            finally:
+                pages += 1
+                self._release(driver, pages)
+                driver = None
+        finally:
+            if driver is not None:
+                # 대여 전 단계에서 실패한 경우
+                _quit_driver(driver)
+            self._slots.release()
+
+    def _release(self, driver, pages: int):
+        if self._closed:
+            _quit_driver(driver)
+            return
+
+        if pages >= self.max_pages:
+            _quit_driver(driver)
+            with self._lock:
+                self.recycled += 1
+            return
+
+        # 초기화에 실패하면 브라우저가 죽은 것으로 보고 폐기
+        try:
+            self._reset(driver)
+        except Exception as e:
+            logger.warning(f"  ⚠️ 브라우저 초기화 실패, 폐기: {e}")
+            _quit_driver(driver)
+            return
+
+        # shutdown과 동시에 반납되는 경우 드라이버가 남지 않도록 잠금 안에서 확인
+        with self._lock:
+            if not self._closed:
+                self._idle.put((driver, pages))
+                return
+        _quit_driver(driver)
+
+    def shutdown(self):
+        """모든 브라우저 종료 (대여 중인 드라이버는 반납 시 종료)"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                driver, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            _quit_driver(driver)
+
+        logger.info(f"🧹 브라우저 풀 종료 (생성 {self.created}개, 대여 {self.leases}회, 재생성 {self.recycled}회)")
+
+
+# 프로세스 전역 풀 (처음 사용할 때 생성)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """전역 브라우저 풀 반환 (없으면 BROWSER_POOL_SIZE / BROWSER_MAX_PAGES로 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                size=int(os.getenv('BROWSER_POOL_SIZE', 2)),
+                max_pages=int(os.getenv('BROWSER_MAX_PAGES', 50))
+            )
+        return _pool
+
+
+def shutdown_browser_pool():
+    """전역 브라우저 풀 종료 (생성된 적 없으면 아무것도 안 함)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -4,18 +4,31 @@
 DC인사이드 크롤링 + MongoDB 저장을 조율하는 메인 함수
 """
 
-import time
+import os
 import logging
-from typing import List, Dict
-from dotenv import load_dotenv
+from typing import Callable, Iterator, List, Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from app.config import load_config
 
 # 분리된 모듈들 import (절대 경로)
 from app.modules.crawling.dcinside.list_scraper import get_post_list
-from app.modules.crawling.dcinside.detail_scraper import get_post_detail, cleanup_old_images
-from app.modules.crawling.manager.save_db import save_posts
+from app.modules.crawling.dcinside.detail_scraper import get_post_detail, download_image
+from app.modules.crawling.manager.save_db import PostBatchSaver
+from app.modules.crawling.rate_limiter import TokenBucketLimiter
+from app.modules.crawling.http_client import log_http_stats, close_sessions, set_host_limiter
+from app.modules.crawling.browser_pool import shutdown_browser_pool
+from app.modules.crawling import image_store
+from app.modules.crawling.image_pipeline import ImageDownloadStage
+from app.modules.crawling.manager.crawl_state import fetch_post_snapshots, load_high_water_mark, save_high_water_mark
+from app.modules.crawling.manager.retention import start_retention
+from app.modules.crawling.dcinside.constants import (
+    GALLERY_ID, GALLERY_HOST, DEFAULT_CONCURRENCY, REFRESH_THRESHOLDS, IMAGE_CONCURRENCY, IMAGE_PER_POST, IMAGE_MAX_MB, IMAGE_RUN_MAX_MB,
+    SAVE_BATCH_SIZE, SAVE_FLUSH_SECONDS
+)
 
 # 환경변수 로드
-load_dotenv()
+load_config()
 
 # 로깅 설정
 logging.basicConfig(
@@ -25,59 +38,279 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def crawl_gallery(pages: int = 1, delay: float = 2.0, save_to_db: bool = True, max_posts: int = None, cleanup_days: int = 7) -> List[Dict]:
+def get_refresh_thresholds() -> Dict[str, int]:
+    """증분 크롤링 재수집 기준 (CRAWL_REFRESH_VIEWS / _RECOMMEND / _COMMENTS 환경변수로 변경 가능)"""
+    return {
+        'views': int(os.getenv('CRAWL_REFRESH_VIEWS', REFRESH_THRESHOLDS['views'])),
+        'recommend': int(os.getenv('CRAWL_REFRESH_RECOMMEND', REFRESH_THRESHOLDS['recommend'])),
+        'comment_count': int(os.getenv('CRAWL_REFRESH_COMMENTS', REFRESH_THRESHOLDS['comment_count'])),
+    }
+
+
+def needs_refresh(post: Dict, stored: Optional[Dict], thresholds: Dict[str, int]) -> bool:
+    """
+    목록 정보와 저장된 값을 비교해 본문을 다시 수집할지 판단
+
+    Args:
+        post: get_post_list 결과 1건
+        stored: 저장된 게시글의 목록 지표 (없으면 새 글)
+        thresholds: 필드별 재수집 기준 변화량
+
+    Returns:
+        True면 다시 수집
     """
-    갤러리 크롤링 메인 함수
+    if not stored:
+        return True
+
+    for field, threshold in thresholds.items():
+        # 예전에 저장된 게시글엔 comment_count가 없을 수 있음 → 한 번 다시 수집해서 채움
+        if field not in stored:
+            return True
+        if abs(post.get(field, 0) - (stored.get(field) or 0)) >= threshold:
+            return True
+
+    return False
+
+
+def iter_gallery(pages: int = 1, delay: float = 2.0, max_posts: int = None, cleanup_days: int = 7,
+                 concurrency: int = DEFAULT_CONCURRENCY, incremental: bool = False,
+                 state: Dict = None) -> Iterator[Dict]:
+    """
+    갤러리 크롤링 (스트리밍)
+
+    본문과 이미지 다운로드가 끝난 게시글을 목록 순서대로 하나씩 돌려준다.
+    전체 결과를 메모리에 모으지 않으므로 소비하는 쪽(PostBatchSaver 등)에서 바로 저장할 수 있다.
+
+    목록/본문/댓글 페이지 요청(재시도, Selenium 폴백 포함)은 모두 하나의 Token Bucket 리미터를 거친다.
+    요청 시작 간격은 항상 delay초 이상으로 유지되고, 동시에 진행 중인 요청은 concurrency개까지만 허용된다.
+    (concurrency=1이면 기존처럼 한 건씩 순차 수집)
+
+    incremental=True면 MongoDB에 이미 있는 게시글 중 조회수/추천수/댓글수 변화가 작은 글은 건너뛰고,
+    이전 실행의 하이 워터 마크(가장 큰 게시글 번호)가 나온 페이지까지만 넘긴다.
+    하이 워터 마크는 실제로 내보낸 게시글로만 올리고, 본문 수집에 실패했거나 max_posts로 중간에 끊긴
+    실행은 complete=False (다음 실행이 못 가져온 게시글을 건너뛰지 않도록 저장하지 않음).
     
     Args:
         pages: 크롤링할 페이지 수
-        delay: 페이지 간 대기 시간 (초)
-        save_to_db: MongoDB 저장 여부
+        delay: 요청 간 최소 간격 (초)
         max_posts: 최대 크롤링 게시글 수 (None이면 제한 없음)
-        cleanup_days: 이미지 보관 기간 (일). 0이면 정리 안 함
+        cleanup_days: 참조가 끊긴 이미지를 지우기 전 유예 기간 (일). 0이면 정리 안 함
+        concurrency: 동시에 진행할 상세 페이지 요청 수
+        incremental: 증분 크롤링 여부 (MongoDB 필요)
+        state: 넘기면 실행 결과를 채워줌
+            {'state_id', 'high_water_mark', 'new', 'refreshed', 'skipped', 'failed', 'total', 'complete'}
     
-    Returns:
-        크롤링한 전체 게시글 리스트
+    Yields:
+        목록 정보 + 본문 정보가 병합된 게시글
     """
-    logger.info(f"🚀 크롤링 시작: {pages}페이지, 지연 {delay}초" + (f", 최대 {max_posts}개" if max_posts else ""))
+    concurrency = max(1, concurrency)
+    state = state if state is not None else {}
+    logger.info(f"🚀 크롤링 시작: {pages}페이지, 지연 {delay}초, 동시 {concurrency}개" + (f", 최대 {max_posts}개" if max_posts else "")
+                + (", 증분 모드" if incremental else ""))
     
-    # 오래된 이미지 자동 정리
-    if cleanup_days > 0:
-        cleanup_old_images(keep_days=cleanup_days)
+    # 더 이상 참조되지 않는 이미지 정리 (백그라운드, 크롤링과 동시에 진행)
+    retention = start_retention(grace_days=cleanup_days) if cleanup_days > 0 else None
     
-    all_posts = []
+    # gall.dcinside.com 전체 요청이 공유하는 리미터 (서버 부하 방지)
+    # HTTP 클라이언트에 등록 → 목록/본문/댓글 페이지(재시도 포함)/Selenium 폴백 요청마다 토큰 1개
+    limiter = TokenBucketLimiter(
+        rate=1 / delay if delay > 0 else 0,
+        burst=1,
+        max_concurrent=concurrency,
+        name=GALLERY_HOST
+    )
+
+    # 이미지는 본문 수집과 분리된 단계에서 병렬로 다운로드 (이미지 서버는 별도 호스트)
+    image_stage = ImageDownloadStage(
+        download_image,
+        max_workers=int(os.getenv('IMAGE_CONCURRENCY', IMAGE_CONCURRENCY)),
+        per_post=int(os.getenv('IMAGE_PER_POST', IMAGE_PER_POST)),
+        max_image_bytes=int(float(os.getenv('IMAGE_MAX_MB', IMAGE_MAX_MB)) * 1024 * 1024),
+        max_run_bytes=int(float(os.getenv('IMAGE_RUN_MAX_MB', IMAGE_RUN_MAX_MB)) * 1024 * 1024)
+    )
+    # 본문은 끝났지만 이미지 다운로드를 기다리는 게시글 (목록 순서 유지)
+    pending = deque()
+
+    def fetch_detail(post: Dict):
+        # 본문 + 댓글 페이지 요청은 각각 호스트 리미터를 거침
+        return get_post_detail(post['post_id'], download_images=False)
+
+    def drain(wait: bool) -> Iterator[Dict]:
+        """이미지까지 끝난 게시글을 앞에서부터 내보냄 (wait=True면 전부 끝날 때까지 대기)"""
+        while pending and (wait or pending[0][1].done()):
+            post, job = pending.popleft()
+            post['image_paths'] = job.result()
+            state['total'] += 1
+            if incremental:
+                state['high_water_mark'] = max(state['high_water_mark'], int(post['post_id']))
+            yield post
+
+    # 증분 크롤링 준비
+    state_id = f"{GALLERY_ID}:recommend"
+    thresholds = get_refresh_thresholds()
+    high_water_mark = load_high_water_mark(state_id) if incremental else None
+    # 이전 마크보다 내려가지 않도록 이전 마크에서 시작 (예전 글만 갱신된 실행이어도 유지)
+    state.update({'state_id': state_id, 'high_water_mark': high_water_mark or 0, 'new': 0, 'refreshed': 0,
+                  'skipped': 0, 'failed': 0, 'total': 0, 'complete': False})
+    collected = 0  # 본문 수집에 성공한 게시글 수 (max_posts 기준)
+    truncated = False  # max_posts 때문에 남은 게시글/페이지를 수집하지 않음
+    stored_ids = set()  # 다시 수집하는 게시글 중 이미 저장된 글 (갱신 집계용)
     
-    # 1단계: 게시글 목록 수집
-    for page in range(1, pages + 1):
-        posts = get_post_list(page=page, recommend_only=True)
-        
-        # 2단계: 각 게시글 본문 수집
-        for post in posts:
-            # 최대 게시글 수 체크
-            if max_posts and len(all_posts) >= max_posts:
-                logger.info(f"⏹️ 최대 게시글 수({max_posts}개) 도달, 크롤링 중단")
-                break
+    set_host_limiter(GALLERY_HOST, limiter)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # 1단계: 게시글 목록 수집
+            for page in range(1, pages + 1):
+                posts = get_post_list(page=page, recommend_only=True)
+
+                reached_mark = False
+                if incremental and posts:
+                    post_numbers = [int(post['post_id']) for post in posts]
+                    reached_mark = high_water_mark is not None and min(post_numbers) <= high_water_mark
+
+                    # 저장된 값과 비교해서 변화가 큰 글만 남김
+                    snapshots = fetch_post_snapshots([post['post_id'] for post in posts])
+                    changed = []
+                    for post in posts:
+                        stored = snapshots.get(post['post_id'])
+                        if needs_refresh(post, stored, thresholds):
+                            changed.append(post)
+                            if stored:
+                                stored_ids.add(post['post_id'])
+                        else:
+                            state['skipped'] += 1
+                    posts = changed
             
-            time.sleep(delay)  # 서버 부하 방지
+                # 2단계: 각 게시글 본문 수집 (남은 개수만큼씩 병렬 요청)
+                while posts:
+                    # 최대 게시글 수 체크
+                    if max_posts and collected >= max_posts:
+                        logger.info(f"⏹️ 최대 게시글 수({max_posts}개) 도달, 크롤링 중단")
+                        break
+
+                    remaining = max_posts - collected if max_posts else len(posts)
+                    chunk, posts = posts[:remaining], posts[remaining:]
+
+                    # executor.map은 입력 순서대로 결과를 돌려줌 (목록 순서 유지)
+                    for post, detail in zip(chunk, executor.map(fetch_detail, chunk)):
+                        if detail:
+                            # 목록 정보와 본문 정보 병합, 3단계(이미지)는 백그라운드에서 진행
+                            merged = {**post, **detail}
+                            pending.append((merged, image_stage.submit(merged['post_id'], merged['images'])))
+                            collected += 1
+                            if incremental:
+                                state['refreshed' if post['post_id'] in stored_ids else 'new'] += 1
+                        else:
+                            state['failed'] += 1
+                        yield from drain(wait=False)
             
-            detail = get_post_detail(post['post_id'])
-            if detail:
-                # 목록 정보와 본문 정보 병합
-                merged = {**post, **detail}
-                all_posts.append(merged)
-        
-        # 최대 게시글 수 도달 시 페이지 루프도 중단
-        if max_posts and len(all_posts) >= max_posts:
-            break
-        
-        time.sleep(delay)  # 페이지 간 대기
-    
-    logger.info(f"✅ 크롤링 완료: 총 {len(all_posts)}개 게시글")
+                # 최대 게시글 수 도달 시 페이지 루프도 중단
+                if max_posts and collected >= max_posts:
+                    truncated = bool(posts) or (page < pages and not reached_mark)
+                    break
+
+                # 이전 실행에서 이미 본 구간에 도달하면 더 오래된 페이지는 넘기지 않음
+                if reached_mark:
+                    logger.info(f"⏹️ 하이 워터 마크({high_water_mark}) 도달, {page}페이지에서 페이지 이동 중단")
+                    break
+
+        # 남은 이미지 다운로드가 끝날 때까지 대기
+        yield from drain(wait=True)
+        image_stage.shutdown()
+        state['complete'] = not truncated and not state['failed']
+    finally:
+        # 브라우저/HTTP 커넥션은 크롤링이 끝나면 (실패하거나 중간에 멈춰도) 반드시 정리
+        image_stage.shutdown(wait=False)
+        set_host_limiter(GALLERY_HOST, None)
+        shutdown_browser_pool()
+        log_http_stats()
+        close_sessions()
+        if retention is not None:
+            retention.join(timeout=60)
+        image_store.flush()
+
+    logger.info(f"✅ 크롤링 완료: 총 {state['total']}개 게시글")
+    if incremental:
+        logger.info(f"🔁 증분 크롤링: 새 글 {state['new']}개, 갱신 {state['refreshed']}개, 스킵 {state['skipped']}개")
+        if not state['complete']:
+            reasons = ([f"본문 수집 실패 {state['failed']}개"] if state['failed'] else []) \
+                + ([f"최대 게시글 수({max_posts}개)로 중단"] if truncated else [])
+            logger.warning(f"⚠️ {', '.join(reasons)} → 하이 워터 마크 유지 (다음 실행에서 다시 확인)")
+    limiter.log_stats()
+
+
+def _consume(stream: Iterator[Dict], save_to_db: bool, incremental: bool, state: Dict,
+             on_post: Callable[[Dict], None] = None) -> int:
+    """
+    iter_gallery 결과를 마이크로 배치로 저장
+
+    크롤링이 중간에 실패해도 그 전까지 받은 게시글은 저장하고,
+    하이 워터 마크는 크롤링이 빠짐없이 끝나고(state['complete']) 저장도 모두 성공했을 때만 저장한다.
+    """
+    saver = PostBatchSaver(
+        batch_size=int(os.getenv('SAVE_BATCH_SIZE', SAVE_BATCH_SIZE)),
+        flush_interval=float(os.getenv('SAVE_FLUSH_SECONDS', SAVE_FLUSH_SECONDS))
+    ) if save_to_db else None
+
+    count = 0
+    try:
+        for post in stream:
+            count += 1
+            if on_post:
+                on_post(post)
+            if saver:
+                saver.add(post)
+    finally:
+        if saver:
+            saver.close()
+
+    if saver and saver.failed:
+        logger.warning(f"⚠️ 게시글 {saver.failed}개 저장 실패 → 하이 워터 마크 유지")
+    elif saver and incremental and state.get('complete') and state.get('high_water_mark'):
+        save_high_water_mark(state['state_id'], state['high_water_mark'])
+
+    return count
+
+
+def save_gallery(pages: int = 1, delay: float = 2.0, max_posts: int = None, cleanup_days: int = 7,
+                 concurrency: int = DEFAULT_CONCURRENCY, incremental: bool = False) -> int:
+    """
+    갤러리 크롤링 + MongoDB 저장 (결과를 메모리에 모으지 않음)
+
+    Args:
+        iter_gallery와 같음
+
+    Returns:
+        수집한 게시글 수
+    """
+    state = {}
+    stream = iter_gallery(pages, delay, max_posts, cleanup_days, concurrency, incremental, state=state)
+    return _consume(stream, save_to_db=True, incremental=incremental, state=state)
+
+
+def crawl_gallery(pages: int = 1, delay: float = 2.0, save_to_db: bool = True, max_posts: int = None, cleanup_days: int = 7,
+                  concurrency: int = DEFAULT_CONCURRENCY, incremental: bool = False) -> List[Dict]:
+    """
+    갤러리 크롤링 메인 함수 (iter_gallery 결과를 리스트로 모아서 반환)
+
+    save_to_db=True면 수집하는 동안 마이크로 배치로 저장한다.
     
-    # MongoDB 저장
-    if save_to_db:
-        save_posts(all_posts)
+    Args:
+        pages: 크롤링할 페이지 수
+        delay: 요청 간 최소 간격 (초)
+        save_to_db: MongoDB 저장 여부
+        max_posts: 최대 크롤링 게시글 수 (None이면 제한 없음)
+        cleanup_days: 참조가 끊긴 이미지를 지우기 전 유예 기간 (일). 0이면 정리 안 함
+        concurrency: 동시에 진행할 상세 페이지 요청 수
+        incremental: 증분 크롤링 여부 (MongoDB 필요)
     
+    Returns:
+        크롤링한 전체 게시글 리스트
+    """
+    all_posts = []
+    state = {}
+    stream = iter_gallery(pages, delay, max_posts, cleanup_days, concurrency, incremental, state=state)
+    _consume(stream, save_to_db=save_to_db, incremental=incremental, state=state, on_post=all_posts.append)
     return all_posts
 
 
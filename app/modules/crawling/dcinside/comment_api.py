@@ -0,0 +1,144 @@
+"""
+DC 인사이드 크롤링 로직만 담당
+
+해당 파일에서는 DC인사이드 댓글 API(AJAX 엔드포인트)를 직접 호출하여 댓글을 수집
+Selenium으로 본문 페이지 전체를 렌더링하지 않아도 되므로 훨씬 가볍고 빠르다.
+"""
+
+import logging
+
+from typing import List, Dict, Tuple
+from bs4 import BeautifulSoup
+
+from app.modules.crawling.dcinside.constants import (
+    GALLERY_ID, GALLERY_TYPE, VIEW_URL, COMMENT_URL, HEADERS, TIMEOUT, COMMENT_MAX_PAGES
+)
+from app.modules.crawling.http_client import http_post
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class CommentAPIError(Exception):
+    """댓글 API 응답을 사용할 수 없을 때 (Selenium 폴백 대상)"""
+
+
+def _is_ad_row(row: Dict) -> bool:
+    """댓글돌이(dory) / 광고 행 여부"""
+    if row.get('nicktype') == 'COMMENT_BOY':
+        return True
+    no = str(row.get('no', ''))
+    return not no.isdigit() or int(no) == 0
+
+
+def _is_deleted(row: Dict) -> bool:
+    return row.get('del_yn') == 'Y' or str(row.get('is_delete', '0')) != '0'
+
+
+def parse_comment_response(data: Dict) -> Tuple[List[str], int, int]:
+    """
+    댓글 API 응답(JSON) 1페이지를 댓글 리스트로 변환
+
+    get_comments_with_selenium과 같은 형식으로 맞춘다.
+    - 대댓글은 "└ " 접두어
+    - 댓글돌이/광고, 삭제된 댓글, 디시콘만 있는 댓글 제외
+
+    Args:
+        data: 댓글 API 응답 JSON
+
+    Returns:
+        (댓글 리스트, 전체 댓글 수, 이 페이지의 원본 행 수)
+    """
+    rows = data.get('comments') or []
+    total = int(data.get('total_cnt') or 0)
+    comments = []
+
+    for row in rows:
+        if _is_ad_row(row) or _is_deleted(row):
+            continue
+
+        # memo는 HTML (디시콘 <img>, <br> 등 포함) → 텍스트만 추출
+        memo = row.get('memo') or ''
+        comment_text = BeautifulSoup(memo, 'lxml').get_text(strip=True) if '<' in memo or '&' in memo else memo.strip()
+
+        # 디시콘만 있는 댓글 / "디시콘 보기" 같은 버튼 텍스트 제외
+        if not comment_text or comment_text == "디시콘 보기":
+            continue
+
+        # depth > 0 이면 대댓글
+        if int(row.get('depth') or 0) > 0:
+            comments.append(f"└ {comment_text}")
+        else:
+            comments.append(comment_text)
+
+    ad_rows = sum(1 for row in rows if _is_ad_row(row))
+    return comments, total, len(rows) - ad_rows
+
+
+def get_comments_with_http(post_id: str, e_s_n_o: str) -> List[str]:
+    """
+    댓글 API를 페이지 단위로 호출하여 전체 댓글 수집
+
+    Args:
+        post_id: 게시글 번호
+        e_s_n_o: 본문 페이지의 <input id="e_s_n_o"> 값 (댓글 API 요청 토큰)
+
+    Returns:
+        댓글 리스트
+
+    Raises:
+        CommentAPIError: 토큰이 없거나 응답이 JSON이 아닐 때
+        requests.RequestException: 요청 실패 시
+    """
+    if not e_s_n_o:
+        raise CommentAPIError("e_s_n_o 토큰 없음")
+
+    headers = HEADERS.copy()
+    headers.update({
+        'Accept': 'application/json, text/javascript, */*; q=0.01',
+        'X-Requested-With': 'XMLHttpRequest',
+        'Referer': f"{VIEW_URL}/?id={GALLERY_ID}&no={post_id}",
+    })
+
+    comments = []
+    seen_rows = 0
+
+    for page in range(1, COMMENT_MAX_PAGES + 1):
+        data = {
+            'id': GALLERY_ID,
+            'no': post_id,
+            'cmt_id': GALLERY_ID,
+            'cmt_no': post_id,
+            'e_s_n_o': e_s_n_o,
+            'comment_page': page,
+            'sort': '',
+            '_GALLTYPE_': GALLERY_TYPE,
+        }
+        response = http_post(COMMENT_URL, data=data, headers=headers, timeout=TIMEOUT)
+        response.raise_for_status()
+
+        try:
+            payload = response.json()
+        except ValueError:
+            raise CommentAPIError(f"JSON이 아닌 응답: {response.text[:100]}")
+
+        if not isinstance(payload, dict):
+            raise CommentAPIError(f"예상하지 못한 응답 형식: {type(payload).__name__}")
+
+        page_comments, total, row_count = parse_comment_response(payload)
+        comments.extend(page_comments)
+        seen_rows += row_count
+
+        # 빈 페이지거나 전체 댓글 수만큼 다 봤으면 종료
+        if row_count == 0 or seen_rows >= total:
+            break
+
+    # 중복 제거
+    comments = list(dict.fromkeys(comments))
+
+    logger.info(f"  ✅ HTTP 댓글 수집 완료: {len(comments)}개")
+    return comments
@@ -5,6 +5,10 @@
 # 상수 설정
 GALLERY_ID = "stockus"  # DC인사이드 미국주식 갤러리 ID
 BASE_URL = "https://gall.dcinside.com/mgallery/board/lists"
+VIEW_URL = "https://gall.dcinside.com/mgallery/board/view"
+COMMENT_URL = "https://gall.dcinside.com/board/comment/"  # 댓글 AJAX 엔드포인트
+GALLERY_HOST = "gall.dcinside.com"  # 목록/본문/댓글 요청이 모두 가는 호스트 (요청 속도 제한 대상)
+GALLERY_TYPE = "M"  # 마이너 갤러리
 
 # 헤더 설정
 HEADERS = {
@@ -15,5 +19,32 @@ HEADERS = {
 
 # 크롤링 설정
 DEFAULT_DELAY = 2.0
+DEFAULT_CONCURRENCY = 1  # 동시에 진행할 상세 페이지 요청 수
+COMMENT_MAX_PAGES = 20  # 댓글 API 최대 조회 페이지 수 (무한 루프 방지)
+IMAGE_CHUNK_SIZE = 64 * 1024  # 이미지 스트리밍 다운로드 청크 크기 (bytes)
+
+# 이미지 다운로드 단계 (본문 수집과 별도로 병렬 진행)
+IMAGE_CONCURRENCY = 4  # 전체 동시 다운로드 수
+IMAGE_PER_POST = 2  # 게시글 1개당 동시 다운로드 수
+IMAGE_MAX_MB = 10  # 이미지 1개 최대 크기 (초과 시 중단)
+IMAGE_RUN_MAX_MB = 500  # 1회 실행 전체 다운로드 한도 (초과 시 남은 이미지 건너뜀)
+IMAGE_TIMEOUT = (5, 15)  # (연결, 읽기) 타임아웃 (초)
+IMAGE_DEADLINE = 60  # 이미지 1개 전체 다운로드 제한 시간 (초)
+
+# 스트리밍 저장: 이만큼 모이거나 이 시간이 지나면 MongoDB에 저장
+SAVE_BATCH_SIZE = 20
+SAVE_FLUSH_SECONDS = 30
+
+# 증분 크롤링: 저장된 값보다 이만큼 이상 변한 게시글만 다시 수집
+REFRESH_THRESHOLDS = {
+    'views': 100,
+    'recommend': 5,
+    'comment_count': 5,
+}
 MAX_RETRY = 3
-TIMEOUT = 10
\ No newline at end of file
+TIMEOUT = 10
+
+# 재시도 설정 (지수 백오프: RETRY_BACKOFF * 2^n초, 최대 RETRY_BACKOFF_MAX초)
+RETRY_BACKOFF = 1.0
+RETRY_BACKOFF_MAX = 30.0
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
\ No newline at end of file
@@ -7,25 +7,28 @@ DC 인사이드 크롤링 로직만 담당
 
 import os
 import logging
+import itertools
 import requests
-import hashlib
-import shutil
-import time as time_module
-from datetime import datetime, timedelta
 
 from pathlib import Path
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 
 # Selenium 관련
-from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 
-from app.modules.crawling.dcinside.constants import GALLERY_ID, BASE_URL, HEADERS
+from app.modules.crawling.dcinside.constants import (
+    GALLERY_ID, BASE_URL, VIEW_URL, HEADERS, TIMEOUT, IMAGE_CHUNK_SIZE, IMAGE_MAX_MB, IMAGE_TIMEOUT, IMAGE_DEADLINE
+)
+from app.modules.crawling import image_store
+from app.modules.crawling.image_pipeline import ByteBudget, ImageRejectedError, limited_chunks, sniff_extension
+from app.modules.crawling.http_client import host_slot, http_get
+from app.modules.crawling.browser_pool import get_browser_pool
+from app.modules.crawling.dcinside.comment_api import get_comments_with_http
+from app.modules.crawling.dcinside.fast_parser import parse_post_detail_fast
 
 # 로깅 설정
 logging.basicConfig(
@@ -35,51 +38,58 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def cleanup_old_images(keep_days: int = 7):
+def parse_comment_html(html: str) -> List[str]:
     """
-    오래된 이미지 폴더 자동 삭제
-    
+    렌더링된 본문 페이지 HTML에서 댓글 추출
+
     Args:
-        keep_days: 보관 기간 (일). 이보다 오래된 폴더는 삭제
+        html: Selenium page_source
+
+    Returns:
+        댓글 리스트 (대댓글은 "└ " 접두어)
     """
-    try:
-        images_base_dir = Path("app/output/images")
-        if not images_base_dir.exists():
-            return
-        
-        cutoff_date = datetime.now() - timedelta(days=keep_days)
-        deleted_count = 0
+    comments = []
+    soup = BeautifulSoup(html, 'lxml')
+    
+    # 댓글 <li> 요소 찾기
+    comment_list = soup.select('ul.cmt_list li')
+    
+    if not comment_list:
+        comment_list = soup.select('.comment_wrap li')
+    
+    logger.info(f"  🔍 댓글 <li> 요소 {len(comment_list)}개 발견")
+    
+    for li in comment_list:
+        # 광고성 댓글 제외
+        li_classes = li.get('class', [])
+        if 'dory' in li_classes or 'ad' in li_classes:
+            continue
         
-        # 날짜 형식 폴더만 확인 (YYYY-MM-DD)
-        for folder in images_base_dir.iterdir():
-            if not folder.is_dir():
-                continue
-            
-            try:
-                # 폴더명이 날짜 형식인지 확인
-                folder_date = datetime.strptime(folder.name, '%Y-%m-%d')
-                
-                # 오래된 폴더 삭제
-                if folder_date < cutoff_date:
-                    shutil.rmtree(folder)
-                    deleted_count += 1
-                    logger.info(f"🗑️ 오래된 이미지 폴더 삭제: {folder.name}")
-            except ValueError:
-                # 날짜 형식이 아닌 폴더는 무시
-                continue
+        # 텍스트 댓글 찾기 (.usertxt 우선)
+        comment_text_elem = li.select_one('.usertxt')
         
-        if deleted_count > 0:
-            logger.info(f"✅ 총 {deleted_count}개 폴더 정리 완료")
-        else:
-            logger.info(f"✅ 정리할 오래된 이미지 없음 (보관 기간: {keep_days}일)")
+        # 대댓글 묶음을 감싸는 <li>는 건너뜀 (대댓글 <li>에서 따로 수집)
+        if comment_text_elem and comment_text_elem.find_parent('li') is li:
+            comment_text = comment_text_elem.get_text(strip=True)
             
-    except Exception as e:
-        logger.warning(f"⚠️ 이미지 정리 실패: {e}")
+            # "디시콘 보기" 같은 버튼 텍스트 제외
+            if comment_text and len(comment_text) > 0 and comment_text != "디시콘 보기":
+                # 대댓글 여부 확인
+                is_reply = 'reply' in li_classes or li.find_parent('ul', class_='reply_list')
+                if is_reply:
+                    comments.append(f"└ {comment_text}")
+                else:
+                    comments.append(comment_text)
+    
+    # 중복 제거
+    return list(dict.fromkeys(comments))
 
 
 def get_comments_with_selenium(post_id: str) -> List[str]:
     """
     Selenium을 사용하여 댓글 크롤링 (JavaScript 동적 로딩 대응)
+
+    브라우저는 전역 풀(browser_pool)에서 빌려 쓰고 반납한다.
     
     Args:
         post_id: 게시글 번호
@@ -90,95 +100,43 @@ def get_comments_with_selenium(post_id: str) -> List[str]:
     comments = []
     
     try:
-        # Chrome/Chromium 옵션 설정 (headless 모드)
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # 백그라운드 실행
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument(f'user-agent={HEADERS["User-Agent"]}')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        
-        # 로그 최소화
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
-        # Chromium 바이너리 경로 설정 (Docker 환경)
-        # macOS에서는 자동으로 Chrome 찾음, Docker에서는 chromium 사용
-        try:
-            chrome_options.binary_location = '/usr/bin/chromium'
-        except:
-            pass  # macOS는 기본 경로 사용
-        
-        # WebDriver 생성
-        driver = webdriver.Chrome(options=chrome_options)
-        
-        # 페이지 접속
-        url = f"https://gall.dcinside.com/mgallery/board/view?id={GALLERY_ID}&no={post_id}"
-        driver.get(url)
-        
-        # 댓글 영역 로딩 대기 (최대 10초)
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "comment_wrap"))
-            )
-            
-            # 추가 대기 (댓글 로딩 완료)
-            time_module.sleep(2)
-            
-            # 댓글 수 확인
-            comment_total_elem = driver.find_element(By.ID, f"comment_total_{post_id}")
-            comment_count = int(comment_total_elem.text)
-            
-            if comment_count == 0:
-                logger.info(f"  💬 댓글 없음")
-                driver.quit()
-                return []
-            
-            logger.info(f"  💬 댓글 {comment_count}개 발견")
+        with get_browser_pool().lease() as driver:
+            # 페이지 접속
+            url = f"{VIEW_URL}?id={GALLERY_ID}&no={post_id}"
+            # HTTP 요청과 같은 호스트 리미터 사용 (페이지 로딩이 끝날 때까지 슬롯 사용)
+            with host_slot(url):
+                driver.get(url)
             
-            # BeautifulSoup으로 파싱
-            soup = BeautifulSoup(driver.page_source, 'lxml')
-            
-            # 댓글 <li> 요소 찾기
-            comment_list = soup.select('ul.cmt_list li')
-            
-            if not comment_list:
-                comment_list = soup.select('.comment_wrap li')
-            
-            logger.info(f"  🔍 댓글 <li> 요소 {len(comment_list)}개 발견")
-            
-            for li in comment_list:
-                # 광고성 댓글 제외
-                li_classes = li.get('class', [])
-                if 'dory' in li_classes or 'ad' in li_classes:
-                    continue
+            # 댓글 영역 로딩 대기 (최대 10초)
+            try:
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "comment_wrap"))
+                )
                 
-                # 텍스트 댓글 찾기 (.usertxt 우선)
-                comment_text_elem = li.select_one('.usertxt')
+                # 댓글 수 확인
+                comment_total_elem = driver.find_element(By.ID, f"comment_total_{post_id}")
+                comment_count = int(comment_total_elem.text or 0)
                 
-                if comment_text_elem:
-                    comment_text = comment_text_elem.get_text(strip=True)
-                    
-                    # "디시콘 보기" 같은 버튼 텍스트 제외
-                    if comment_text and len(comment_text) > 0 and comment_text != "디시콘 보기":
-                        # 대댓글 여부 확인
-                        is_reply = 'reply' in li_classes or li.find_parent('ul', class_='reply_list')
-                        if is_reply:
-                            comments.append(f"└ {comment_text}")
-                        else:
-                            comments.append(comment_text)
-            
-            # 중복 제거
-            comments = list(dict.fromkeys(comments))
-            
-            logger.info(f"  ✅ Selenium 댓글 수집 완료: {len(comments)}개")
-            
-        except Exception as e:
-            logger.warning(f"  ⚠️ 댓글 로딩 대기 실패: {e}")
-        
-        finally:
-            driver.quit()
+                if comment_count == 0:
+                    logger.info(f"  💬 댓글 없음")
+                    return []
+                
+                logger.info(f"  💬 댓글 {comment_count}개 발견")
+                
+                # 고정 2초 대기 대신 댓글 <li>가 그려질 때까지만 대기 (최대 5초)
+                try:
+                    WebDriverWait(driver, 5).until(
+                        lambda d: d.find_elements(By.CSS_SELECTOR, 'ul.cmt_list li')
+                    )
+                except TimeoutException:
+                    logger.warning(f"  ⚠️ 댓글 목록 렌더링 대기 시간 초과, 현재 상태로 수집")
+                
+                comments = parse_comment_html(driver.page_source)
+                
+                logger.info(f"  ✅ Selenium 댓글 수집 완료: {len(comments)}개")
+                
+            except Exception as e:
+                logger.warning(f"  ⚠️ 댓글 로딩 대기 실패: {e}")
     
     except Exception as e:
         logger.error(f"  ❌ Selenium 댓글 크롤링 실패: {e}")
@@ -186,46 +144,79 @@ def get_comments_with_selenium(post_id: str) -> List[str]:
     return comments
 
 
-def download_image(image_url: str, post_id: str, img_index: int) -> Optional[str]:
+def get_comments(post_id: str, e_s_n_o: str = None) -> List[str]:
+    """
+    설정된 방식으로 댓글 수집 (COMMENT_BACKEND 환경변수)
+
+    - http (기본): 댓글 API 직접 호출, 실패 시 Selenium으로 폴백
+    - selenium: 브라우저로 본문 페이지를 렌더링해서 수집
+
+    Args:
+        post_id: 게시글 번호
+        e_s_n_o: 본문 페이지의 댓글 API 토큰 (http 방식에서 필요)
+
+    Returns:
+        댓글 리스트
+    """
+    if os.getenv('COMMENT_BACKEND', 'http').lower() == 'http':
+        try:
+            return get_comments_with_http(post_id, e_s_n_o)
+        except Exception as e:
+            logger.warning(f"  ⚠️ HTTP 댓글 수집 실패, Selenium으로 재시도: {e}")
+
+    return get_comments_with_selenium(post_id)
+
+
+def download_image(image_url: str, post_id: str, img_index: int, max_bytes: int = IMAGE_MAX_MB * 1024 * 1024,
+                   budget: ByteBudget = None) -> Optional[str]:
     """
     이미지 다운로드 (403 에러 방지를 위해 Referer 헤더 포함)
+
+    내용 주소 기반 저장소(image_store)에 저장한다.
+    이미 받은 URL은 다시 요청하지 않고, 같은 내용의 이미지는 파일 1개를 공유한다.
     
     Args:
         image_url: 이미지 URL
         post_id: 게시글 ID
         img_index: 이미지 순서
+        max_bytes: 이미지 1개 최대 크기 (초과 시 저장 안 함)
+        budget: 실행 전체 다운로드 한도 (image_pipeline.ByteBudget)
     
     Returns:
         저장된 이미지의 로컬 경로 (실패 시 None)
     """
     try:
-        # 날짜별 이미지 저장 디렉토리 생성 (YYYY-MM-DD 형식)
-        today = datetime.now().strftime('%Y-%m-%d')
-        images_dir = Path(f"app/output/images/{today}")
-        images_dir.mkdir(parents=True, exist_ok=True)
+        # 이미 받은 URL이면 참조만 추가
+        cached = image_store.lookup_url(image_url)
+        if cached:
+            sha256, filepath = cached
+            image_store.add_ref(sha256, post_id)
+            logger.info(f"  📸 이미지 재사용: {post_id}_{img_index:02d} → {filepath.name}")
+            return str(filepath)
         
         # Referer 헤더 추가 (DCInside에서 오는 것처럼 위장)
         headers = HEADERS.copy()
         headers['Referer'] = f'https://gall.dcinside.com/mgallery/board/view/?id={GALLERY_ID}&no={post_id}'
         
-        # 이미지 다운로드
-        response = requests.get(image_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # 파일 확장자 추출
-        ext = image_url.split('.')[-1].split('?')[0]  # URL 파라미터 제거
-        if ext.lower() not in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
-            ext = 'jpg'  # 기본 확장자
-        
-        # 파일명 생성 (게시글ID_순서.확장자)
-        filename = f"{post_id}_{img_index:02d}.{ext}"
-        filepath = images_dir / filename
-        
-        # 이미지 저장
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
+        # 이미지 다운로드 (메모리에 전부 올리지 않고 청크 단위로 저장)
+        response = http_get(image_url, headers=headers, timeout=IMAGE_TIMEOUT, stream=True)
+        try:
+            response.raise_for_status()
+            chunks = limited_chunks(response, IMAGE_CHUNK_SIZE, max_bytes=max_bytes, budget=budget,
+                                    deadline=IMAGE_DEADLINE)
+            
+            # 확장자는 URL이 아니라 파일 앞부분으로 판별 (dcimg URL에는 확장자가 없음)
+            head = next(chunks, b'')
+            ext = sniff_extension(head, response.headers.get('Content-Type'))
+            if ext is None:
+                raise ImageRejectedError(f"이미지가 아닌 응답 ({response.headers.get('Content-Type')})")
+            
+            sha256, filepath = image_store.save_stream(image_url, itertools.chain([head], chunks), ext)
+        finally:
+            response.close()
         
-        logger.info(f"  📸 이미지 저장: {filename}")
+        image_store.add_ref(sha256, post_id)
+        logger.info(f"  📸 이미지 저장: {post_id}_{img_index:02d} → {filepath.name}")
         return str(filepath)
         
     except Exception as e:
@@ -233,6 +224,62 @@ def download_image(image_url: str, post_id: str, img_index: int) -> Optional[str
         return None
 
 
+def parse_post_detail(html: str) -> Dict:
+    """
+    본문 페이지 HTML → 본문 정보 (BeautifulSoup 파서)
+
+    기본은 fast_parser.parse_post_detail_fast를 사용하고, 이 함수는 HTML_PARSER=soup일 때와
+    빠른 파서 결과 비교(테스트/벤치마크)에 사용한다.
+
+    Args:
+        html: 본문 페이지 HTML
+
+    Returns:
+        {'title', 'author', 'content', 'images', 'e_s_n_o'}
+    """
+    soup = BeautifulSoup(html, 'lxml')
+
+    # 제목
+    title_elem = soup.select_one('span.title_subject')
+    title = title_elem.text.strip() if title_elem else ''
+
+    # 작성자
+    author_elem = soup.select_one('div.gall_writer')
+    author = author_elem.get('data-nick', '익명') if author_elem else '익명'
+
+    # 본문 영역 찾기
+    content_elem = soup.select_one('div.write_div')
+    
+    # 이미지 URL 먼저 수집 (decompose 전에!)
+    images = []
+    
+    if content_elem:
+        for img in content_elem.find_all('img'):
+            src = img.get('src', '')
+            if src and src.startswith('http'):
+                images.append(src)
+    
+    # 본문 텍스트 추출 (이미지 태그 제거)
+    if content_elem:
+        # 이미지 태그 제거하고 텍스트만 추출
+        for img in content_elem.find_all('img'):
+            img.decompose()
+        content = content_elem.get_text(separator='\n', strip=True)
+    else:
+        content = ''
+
+    # 댓글 API 토큰 (hidden input)
+    esno_elem = soup.select_one('input#e_s_n_o')
+
+    return {
+        'title': title,
+        'author': author,
+        'content': content,
+        'images': images,
+        'e_s_n_o': esno_elem.get('value') if esno_elem else None,
+    }
+
+
 # 갤러리 게시글 디테일 크롤링
 def get_post_detail(post_id: str, download_images: bool = True, debug: bool = False) -> Optional[Dict]:
     """
@@ -240,26 +287,26 @@ def get_post_detail(post_id: str, download_images: bool = True, debug: bool = Fa
 
     Args:
         post_id: 게시글 번호
-        download_images: 이미지 다운로드 여부 (기본: True)
+        download_images: 이미지 다운로드 여부 (기본: True).
+            False면 URL만 수집하고 바로 반환 (crawl_gallery는 이미지 다운로드 단계에서 따로 받음)
         debug: 디버그 모드 (HTML 저장 및 상세 로그)
 
     Returns:
         {'post_id', 'title', 'author', 'content', 'images', 'image_paths', 'comments'}
     """
-    url = f"https://gall.dcinside.com/mgallery/board/view"
+    url = VIEW_URL
     params = {
         'id': GALLERY_ID,
         'no': post_id,
     }
 
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=10)
+        response = http_get(url, params=params, headers=HEADERS, timeout=TIMEOUT, use_cache=True)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'lxml')
-
         # 디버그 모드: HTML 저장 및 댓글 영역 분석
         if debug:
+            soup = BeautifulSoup(response.text, 'lxml')
             debug_dir = Path("app/output/debug")
             debug_dir.mkdir(parents=True, exist_ok=True)
             
@@ -277,48 +324,28 @@ def get_post_detail(post_id: str, download_images: bool = True, debug: bool = Fa
             else:
                 logger.warning(f"  🐛 DEBUG: 댓글 영역을 찾을 수 없음!")
 
-        # 제목
-        title_elem = soup.select_one('span.title_subject')
-        title = title_elem.text.strip() if title_elem else ''
-
-        # 작성자
-        author_elem = soup.select_one('div.gall_writer')
-        author = author_elem.get('data-nick', '익명') if author_elem else '익명'
+        if os.getenv('HTML_PARSER', 'fast').lower() == 'soup':
+            parsed = parse_post_detail(response.text)
+        else:
+            parsed = parse_post_detail_fast(response.text)
 
-        # 본문 영역 찾기
-        content_elem = soup.select_one('div.write_div')
-        
-        # 이미지 URL 먼저 수집 (decompose 전에!)
-        images = []  # 원본 URL
+        title = parsed['title']
+        author = parsed['author']
+        content = parsed['content']
+        images = parsed['images']  # 원본 URL
         image_paths = []  # 다운로드된 로컬 경로
         
-        if content_elem:
-            img_index = 0
-            for img in content_elem.find_all('img'):
-                src = img.get('src', '')
-                if src and src.startswith('http'):
-                    images.append(src)
-                    
-                    # 이미지 다운로드
-                    if download_images:
-                        local_path = download_image(src, post_id, img_index)
-                        if local_path:
-                            image_paths.append(local_path)
-                    img_index += 1
-        
-        # 본문 텍스트 추출 (이미지 태그 제거)
-        if content_elem:
-            # 이미지 태그 제거하고 텍스트만 추출
-            for img in content_elem.find_all('img'):
-                img.decompose()
-            content = content_elem.get_text(separator='\n', strip=True)
-        else:
-            content = ''
+        # 이미지 다운로드
+        if download_images:
+            for img_index, src in enumerate(images):
+                local_path = download_image(src, post_id, img_index)
+                if local_path:
+                    image_paths.append(local_path)
 
-        # 댓글 수집 (Selenium 사용 - JavaScript 동적 로딩 대응)
-        comments = get_comments_with_selenium(post_id)
+        # 댓글 수집 (댓글 API 토큰은 본문 페이지의 hidden input에 있음)
+        comments = get_comments(post_id, parsed['e_s_n_o'])
 
-        logger.info(f"📝 게시글 {post_id} 본문 수집 완료 (본문 {len(content)}자, 이미지 {len(image_paths)}개, 댓글 {len(comments)}개)")
+        logger.info(f"📝 게시글 {post_id} 본문 수집 완료 (본문 {len(content)}자, 이미지 {len(images)}개, 댓글 {len(comments)}개)")
 
         return {
             'post_id': post_id,
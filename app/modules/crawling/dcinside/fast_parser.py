@@ -0,0 +1,138 @@
+"""
+DC 인사이드 목록/본문 페이지 빠른 파서
+
+BeautifulSoup 트리를 만들고 행마다 CSS 선택자를 여러 번 돌리는 대신
+lxml 트리에 미리 컴파일한 XPath만 실행한다.
+결과는 BeautifulSoup 파서(list_scraper.parse_post_list, detail_scraper.parse_post_detail)와 같다.
+"""
+
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+
+def _has_class(name: str) -> str:
+    """CSS의 .name과 같은 XPath 조건 (class 속성에 토큰으로 포함)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 목록 페이지
+_ROWS = etree.XPath(f"//tr[{_has_class('ub-content')}]")
+_NUM = etree.XPath(f".//td[{_has_class('gall_num')}]")
+_SUBJECT = etree.XPath(f".//td[{_has_class('gall_subject')}]")
+_TITLE = etree.XPath(f".//td[{_has_class('gall_tit')}]//a")
+_WRITER = etree.XPath(f".//td[{_has_class('gall_writer')}]")
+_DATE = etree.XPath(f".//td[{_has_class('gall_date')}]")
+_COUNT = etree.XPath(f".//td[{_has_class('gall_count')}]")
+_RECOMMEND = etree.XPath(f".//td[{_has_class('gall_recommend')}]")
+_REPLY = etree.XPath(f".//td[{_has_class('gall_tit')}]//span[{_has_class('reply_num')}]")
+
+# 본문 페이지
+_VIEW_TITLE = etree.XPath(f"//span[{_has_class('title_subject')}]")
+_VIEW_WRITER = etree.XPath(f"//div[{_has_class('gall_writer')}]")
+_VIEW_CONTENT = etree.XPath(f"//div[{_has_class('write_div')}]")
+_VIEW_ESNO = etree.XPath("//input[@id='e_s_n_o']")
+_IMAGES = etree.XPath(".//img")
+
+# 주석(<!-- -->)과 <script>/<style>/<template> 내용은 제외하고 텍스트 노드만 (BeautifulSoup get_text와 동일)
+_TEXTS = etree.XPath(".//text()[not(parent::script or parent::style or parent::template)]", smart_strings=False)
+
+
+def _first(xpath: etree.XPath, node) -> Optional[etree._Element]:
+    found = xpath(node)
+    return found[0] if found else None
+
+
+def _text(node) -> str:
+    return ''.join(_TEXTS(node))
+
+
+def _int(node) -> int:
+    text = _text(node).strip() if node is not None else ''
+    return int(text) if text.isdigit() else 0
+
+
+def _parse(html: str):
+    # etree.HTML은 스레드별 기본 파서를 사용 (동시 크롤링에서 공유해도 안전)
+    return etree.HTML(html) if html else None
+
+
+def parse_post_list_fast(html: str) -> List[Dict]:
+    """
+    목록 페이지 HTML → 게시글 정보 리스트 (list_scraper.parse_post_list와 같은 결과)
+
+    Returns:
+        [{'post_id', 'title', 'author', 'date', 'views', 'recommend', 'comment_count'}]
+    """
+    root = _parse(html)
+    if root is None:
+        return []
+
+    posts = []
+    for row in _ROWS(root):
+        # 게시글 번호 (공지/광고 등 숫자가 아닌 행 제외)
+        num_cell = _first(_NUM, row)
+        post_id = _text(num_cell).strip() if num_cell is not None else ''
+        if not post_id.isdigit():
+            continue
+
+        # 말머리 확인 (공지, 설문, AD 제외)
+        subject_cell = _first(_SUBJECT, row)
+        if subject_cell is not None:
+            if ''.join(text.strip() for text in _TEXTS(subject_cell)) in ['공지', '설문', 'AD']:
+                continue
+
+        title_elem = _first(_TITLE, row)
+        if title_elem is None:
+            continue
+
+        author_elem = _first(_WRITER, row)
+        date_elem = _first(_DATE, row)
+
+        # 댓글수 ("[45]" 형식, 댓글 없으면 표시 안 됨)
+        reply_elem = _first(_REPLY, row)
+        reply_text = _text(reply_elem).strip().strip('[]') if reply_elem is not None else ''
+
+        posts.append({
+            'post_id': post_id,
+            'title': _text(title_elem).strip(),
+            'author': author_elem.get('data-nick', '익명') if author_elem is not None else '익명',
+            'date': date_elem.get('title', '') if date_elem is not None else '',
+            'views': _int(_first(_COUNT, row)),
+            'recommend': _int(_first(_RECOMMEND, row)),
+            'comment_count': int(reply_text) if reply_text.isdigit() else 0,
+        })
+
+    return posts
+
+
+def parse_post_detail_fast(html: str) -> Dict:
+    """
+    본문 페이지 HTML → 본문 정보 (detail_scraper.parse_post_detail과 같은 결과)
+
+    Returns:
+        {'title', 'author', 'content', 'images', 'e_s_n_o'}
+    """
+    root = _parse(html)
+    if root is None:
+        return {'title': '', 'author': '익명', 'content': '', 'images': [], 'e_s_n_o': None}
+
+    title_elem = _first(_VIEW_TITLE, root)
+    author_elem = _first(_VIEW_WRITER, root)
+    content_elem = _first(_VIEW_CONTENT, root)
+    esno_elem = _first(_VIEW_ESNO, root)
+
+    images = []
+    content = ''
+    if content_elem is not None:
+        images = [img.get('src', '') for img in _IMAGES(content_elem) if img.get('src', '').startswith('http')]
+        # <img>에는 텍스트가 없으므로 제거하지 않고 텍스트 노드만 모음
+        content = '\n'.join(text.strip() for text in _TEXTS(content_elem) if text.strip())
+
+    return {
+        'title': _text(title_elem).strip() if title_elem is not None else '',
+        'author': author_elem.get('data-nick', '익명') if author_elem is not None else '익명',
+        'content': content,
+        'images': images,
+        'e_s_n_o': esno_elem.get('value') if esno_elem is not None else None,
+    }
@@ -5,13 +5,16 @@ DC 인사이드 크롤링 로직만 담당
 해당 파일에서는 DC인사이드 목록에 대한 크롤링 담당
 """
 
+import os
 import requests
 import logging
 
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 
-from app.modules.crawling.dcinside.constants import GALLERY_ID, BASE_URL, HEADERS
+from app.modules.crawling.dcinside.constants import GALLERY_ID, BASE_URL, HEADERS, TIMEOUT
+from app.modules.crawling.http_client import http_get
+from app.modules.crawling.dcinside.fast_parser import parse_post_list_fast
 
 # 로깅 설정
 logging.basicConfig(
@@ -21,6 +24,86 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def parse_post_list(html: str) -> List[Dict]:
+    """
+    목록 페이지 HTML → 게시글 정보 리스트 (BeautifulSoup 파서)
+
+    기본은 fast_parser.parse_post_list_fast를 사용하고, 이 함수는 HTML_PARSER=soup일 때와
+    빠른 파서 결과 비교(테스트/벤치마크)에 사용한다.
+
+    Args:
+        html: 목록 페이지 HTML
+
+    Returns:
+        게시글 정보 리스트 [{'post_id', 'title', 'author', 'date', 'views', 'recommend', 'comment_count'}]
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    posts = []
+
+    # 게시글 테이블에서 tr.ub-content 추출
+    rows = soup.select('tr.ub-content')
+
+    for row in rows:
+        try:
+            # 게시글 번호 추출
+            num_cell = row.select_one('td.gall_num')
+            if not num_cell or not num_cell.text.strip().isdigit():
+                continue
+
+            post_id = num_cell.text.strip()
+
+            # 말머리 확인 (공지, 설문, AD 제외)
+            subject_cell = row.select_one('td.gall_subject')
+            if subject_cell:
+                subject_text = subject_cell.get_text(strip=True)
+                if subject_text in ['공지', '설문', 'AD']:
+                    logger.debug(f"⏭️ '{subject_text}' 글 스킵: {post_id}")
+                    continue
+
+            # 제목 추출
+            title_elem = row.select_one('td.gall_tit a')
+            if not title_elem:
+                continue
+            title = title_elem.text.strip()
+
+            # 작성자
+            author_elem = row.select_one('td.gall_writer')
+            author = author_elem.get('data-nick', '익명') if author_elem else '익명'
+
+            # 날짜
+            date_elem = row.select_one('td.gall_date')
+            date_str = date_elem.get('title', '') if date_elem else ''
+
+            # 조회수
+            views_elem = row.select_one('td.gall_count')
+            views = int(views_elem.text.strip()) if views_elem and views_elem.text.strip().isdigit() else 0
+
+            # 추천수
+            recommend_elem = row.select_one('td.gall_recommend')
+            recommend = int(recommend_elem.text.strip()) if recommend_elem and recommend_elem.text.strip().isdigit() else 0
+
+            # 댓글수 ("[45]" 형식, 댓글 없으면 표시 안 됨)
+            reply_elem = row.select_one('td.gall_tit span.reply_num')
+            reply_text = reply_elem.text.strip().strip('[]') if reply_elem else ''
+            comment_count = int(reply_text) if reply_text.isdigit() else 0
+
+            posts.append({
+                'post_id': post_id,
+                'title': title,
+                'author': author,
+                'date': date_str,
+                'views': views,
+                'recommend': recommend,
+                'comment_count': comment_count,
+            })
+
+        except Exception as e:
+            logger.warning(f"게시글 파싱 실패: {e}")
+            continue
+
+    return posts
+
+
 # 갤러리 게시글 목록 크롤링
 def get_post_list(page: int=1, recommend_only: bool = True) -> List[Dict]:
     """
@@ -30,7 +113,7 @@ def get_post_list(page: int=1, recommend_only: bool = True) -> List[Dict]:
         recommend_only: True면 개념글만, False면 전체글
 
     Returns:
-        게시글 정보 리스트 [{'post_id', 'title', 'author', 'date', 'views', 'recommend'}]
+        게시글 정보 리스트 [{'post_id', 'title', 'author', 'date', 'views', 'recommend', 'comment_count'}]
     """
 
     params = {
@@ -43,66 +126,13 @@ def get_post_list(page: int=1, recommend_only: bool = True) -> List[Dict]:
         params['exception_mode'] = 'recommend'
 
     try:
-        response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=10)
+        response = http_get(BASE_URL, params=params, headers=HEADERS, timeout=TIMEOUT, use_cache=True)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'lxml')
-        posts = []
-
-        # 게시글 테이블에서 tr.ub-content 추출
-        rows = soup.select('tr.ub-content')
-
-        for row in rows:
-            try:
-                # 게시글 번호 추출
-                num_cell = row.select_one('td.gall_num')
-                if not num_cell or not num_cell.text.strip().isdigit():
-                    continue
-
-                post_id = num_cell.text.strip()
-
-                # 말머리 확인 (공지, 설문, AD 제외)
-                subject_cell = row.select_one('td.gall_subject')
-                if subject_cell:
-                    subject_text = subject_cell.get_text(strip=True)
-                    if subject_text in ['공지', '설문', 'AD']:
-                        logger.debug(f"⏭️ '{subject_text}' 글 스킵: {post_id}")
-                        continue
-
-                # 제목 추출
-                title_elem = row.select_one('td.gall_tit a')
-                if not title_elem:
-                    continue
-                title = title_elem.text.strip()
-
-                # 작성자
-                author_elem = row.select_one('td.gall_writer')
-                author = author_elem.get('data-nick', '익명') if author_elem else '익명'
-
-                # 날짜
-                date_elem = row.select_one('td.gall_date')
-                date_str = date_elem.get('title', '') if date_elem else ''
-
-                # 조회수
-                views_elem = row.select_one('td.gall_count')
-                views = int(views_elem.text.strip()) if views_elem and views_elem.text.strip().isdigit() else 0
-
-                # 추천수
-                recommend_elem = row.select_one('td.gall_recommend')
-                recommend = int(recommend_elem.text.strip()) if recommend_elem and recommend_elem.text.strip().isdigit() else 0
-
-                posts.append({
-                    'post_id': post_id,
-                    'title': title,
-                    'author': author,
-                    'date': date_str,
-                    'views': views,
-                    'recommend': recommend,
-                })
-
-            except Exception as e:
-                logger.warning(f"게시글 파싱 실패: {e}")
-                continue
+        if os.getenv('HTML_PARSER', 'fast').lower() == 'soup':
+            posts = parse_post_list(response.text)
+        else:
+            posts = parse_post_list_fast(response.text)
 
         logger.info(f"📄 페이지 {page}: {len(posts)}개 게시글 수집")
         return posts
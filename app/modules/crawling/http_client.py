@@ -0,0 +1,313 @@
+"""
+크롤링 공용 HTTP 클라이언트
+
+- 호스트별 requests.Session을 재사용하여 keep-alive 커넥션 풀 유지 (TCP/TLS 핸드셰이크 절약)
+- 5xx/429 응답 및 연결 오류 시 지수 백오프 + 지터로 재시도 (MAX_RETRY)
+- 호스트별 요청 수, 지연 시간, 바이트 수, 커넥션 재사용률 집계
+- use_cache=True인 GET은 디스크 응답 캐시(response_cache)를 거침
+- 호스트별 리미터(set_host_limiter)를 등록하면 그 호스트로 나가는 모든 요청(재시도 포함)이 토큰/슬롯을 잡음
+  (캐시 적중은 네트워크 요청이 아니므로 제외, Selenium 등 다른 경로는 host_slot()으로 같은 리미터 사용)
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+import requests
+
+from typing import ContextManager, Dict, Optional
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from app.modules.crawling import response_cache
+from app.modules.crawling.rate_limiter import TokenBucketLimiter
+from app.modules.crawling.dcinside.constants import (
+    HEADERS, MAX_RETRY, TIMEOUT, RETRY_BACKOFF, RETRY_BACKOFF_MAX, RETRY_STATUS_CODES
+)
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 호스트별 세션 / 통계 (프로세스 전역)
+_sessions: Dict[str, requests.Session] = {}
+_stats: Dict[str, Dict] = {}
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_lock = threading.Lock()
+
+
+def set_host_limiter(host: str, limiter: Optional[TokenBucketLimiter]):
+    """
+    호스트로 나가는 모든 요청이 거칠 리미터 등록 (None이면 해제)
+
+    Args:
+        host: 대상 호스트 (예: gall.dcinside.com)
+        limiter: 요청 1회(재시도 포함)마다 slot()을 잡을 리미터
+    """
+    with _lock:
+        if limiter is None:
+            _limiters.pop(host, None)
+        else:
+            _limiters[host] = limiter
+
+
+def host_slot(url: str) -> ContextManager:
+    """url 호스트에 등록된 리미터 슬롯 (없으면 제한 없음) - requests를 거치지 않는 요청(Selenium)도 같은 제한 사용"""
+    with _lock:
+        limiter = _limiters.get(urlsplit(url).hostname or '')
+    return limiter.slot() if limiter is not None else nullcontext()
+
+
+def _new_stats() -> Dict:
+    return {'requests': 0, 'errors': 0, 'retries': 0, 'bytes': 0, 'latency_total': 0.0, 'latency_max': 0.0,
+            'connections': 0}
+
+
+def _counting_pool(pool_cls):
+    """실제 TCP 연결(connect) 횟수를 호스트별로 세는 커넥션 풀 클래스 생성"""
+    base_conn_cls = pool_cls.ConnectionCls
+
+    class CountingConnection(base_conn_cls):
+        def connect(self):
+            with _lock:
+                _stats.setdefault(self.host, _new_stats())['connections'] += 1
+            return super().connect()
+
+    return type(f"Counting{pool_cls.__name__}", (pool_cls,), {'ConnectionCls': CountingConnection})
+
+
+_POOL_CLASSES = {
+    'http': _counting_pool(HTTPConnectionPool),
+    'https': _counting_pool(HTTPSConnectionPool),
+}
+
+
+def get_session(host: str) -> requests.Session:
+    """
+    호스트 전용 세션 반환 (없으면 생성)
+
+    Args:
+        host: 요청 대상 호스트 (예: gall.dcinside.com)
+
+    Returns:
+        커넥션 풀이 설정된 requests.Session
+    """
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            # 풀 크기는 동시 크롤링 수 이상으로 설정해야 커넥션이 버려지지 않음
+            adapter = HTTPAdapter(
+                pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', 4)),
+                pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', 10)),
+                max_retries=0,  # 재시도는 http_get에서 직접 처리
+            )
+            adapter.poolmanager.pool_classes_by_scheme = _POOL_CLASSES
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[host] = session
+            _stats[host] = _new_stats()
+        return session
+
+
+def _backoff_delay(attempt: int, response: Optional[requests.Response] = None) -> float:
+    """재시도 대기 시간 계산 (429의 Retry-After 우선, 없으면 지수 백오프 + 지터)"""
+    if response is not None and response.status_code == 429:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_BACKOFF_MAX)
+
+    delay = min(RETRY_BACKOFF * (2 ** attempt), RETRY_BACKOFF_MAX)
+    return random.uniform(delay / 2, delay)
+
+
+def _record(host: str, elapsed: float, size: int = 0, error: bool = False, retry: bool = False):
+    with _lock:
+        stats = _stats.setdefault(host, _new_stats())
+        if retry:
+            stats['retries'] += 1
+            return
+        stats['requests'] += 1
+        stats['latency_total'] += elapsed
+        stats['latency_max'] = max(stats['latency_max'], elapsed)
+        stats['bytes'] += size
+        if error:
+            stats['errors'] += 1
+
+
+def _request(method: str, url: str, timeout: float, stream: bool, max_retry: int, **kwargs) -> requests.Response:
+    """풀링된 세션으로 요청 전송 (연결 오류 / 5xx / 429 재시도)"""
+    host = urlsplit(url).hostname or ''
+    session = get_session(host)
+
+    for attempt in range(max_retry + 1):
+        started = time.perf_counter()
+        try:
+            # 재시도도 서버에는 요청 1회 → 매번 리미터를 거침 (백오프 대기 중에는 슬롯을 잡지 않음)
+            with host_slot(url):
+                response = session.request(method, url, timeout=timeout, stream=stream, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= max_retry:
+                _record(host, time.perf_counter() - started, error=True)
+                raise
+            delay = _backoff_delay(attempt)
+            _record(host, 0, retry=True)
+            logger.warning(f"  🔁 요청 재시도 {attempt + 1}/{max_retry} ({delay:.1f}초 후): {e}")
+            time.sleep(delay)
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retry:
+            delay = _backoff_delay(attempt, response)
+            _record(host, 0, retry=True)
+            logger.warning(f"  🔁 HTTP {response.status_code} 재시도 {attempt + 1}/{max_retry} ({delay:.1f}초 후): {url}")
+            response.close()
+            time.sleep(delay)
+            continue
+
+        # stream 요청은 본문 크기를 Content-Length로 집계
+        if stream:
+            size = int(response.headers.get('Content-Length', 0) or 0)
+        else:
+            size = len(response.content)
+
+        _record(host, time.perf_counter() - started, size=size, error=response.status_code >= 400)
+        return response
+
+
+def http_get(url: str, params: Dict = None, headers: Dict = None, timeout: float = TIMEOUT,
+             stream: bool = False, max_retry: int = MAX_RETRY, use_cache: bool = False) -> requests.Response:
+    """
+    풀링된 세션으로 GET 요청 (재시도 포함)
+
+    Args:
+        url: 요청 URL
+        params: 쿼리 파라미터
+        headers: 추가 헤더 (세션 기본 헤더 위에 덮어씀)
+        timeout: 요청 타임아웃 (초)
+        stream: True면 본문을 바로 읽지 않음 (iter_content로 나눠 읽기)
+        max_retry: 최대 재시도 횟수
+        use_cache: 디스크 응답 캐시 사용 여부 (HTTP_CACHE_MODE가 off면 무시)
+
+    Returns:
+        requests.Response (상태 코드 검사는 호출한 쪽에서 raise_for_status로 처리)
+
+    Raises:
+        requests.RequestException: 재시도 후에도 연결/타임아웃 오류가 계속될 때
+        CacheMissError: 오프라인 모드에서 캐시에 없는 URL일 때
+    """
+    mode = response_cache.get_cache_mode()
+    if not use_cache or stream or mode == 'off':
+        return _request('GET', url, timeout, stream, max_retry, params=params, headers=headers)
+
+    key = response_cache.make_cache_key(url, params)
+    entry = response_cache.load_entry(key)
+
+    # TTL 이내 (또는 오프라인 모드) → 네트워크 요청 없이 캐시 사용
+    if entry and (mode == 'offline' or response_cache.is_fresh(entry)):
+        response_cache.record('hits')
+        return response_cache.build_response(entry, 'HIT')
+
+    if mode == 'offline':
+        response_cache.record('misses')
+        raise response_cache.CacheMissError(f"오프라인 모드: 캐시에 없는 요청 ({url}, {params})")
+
+    # 만료된 캐시가 있으면 조건부 요청으로 재검증
+    request_headers = dict(headers or {})
+    if entry:
+        request_headers.update(response_cache.conditional_headers(entry))
+
+    response = _request('GET', url, timeout, stream, max_retry, params=params, headers=request_headers)
+
+    if response.status_code == 304 and entry:
+        response_cache.record('revalidated')
+        response_cache.touch_entry(key, entry)
+        return response_cache.build_response(entry, 'REVALIDATED')
+
+    response_cache.record('misses')
+    if response.status_code == 200:
+        response_cache.store_response(key, response)
+    return response
+
+
+def http_post(url: str, data: Dict = None, headers: Dict = None, timeout: float = TIMEOUT,
+              max_retry: int = MAX_RETRY) -> requests.Response:
+    """
+    풀링된 세션으로 POST 요청 (조회용 AJAX 엔드포인트 전용, 재시도 포함)
+
+    Args:
+        url: 요청 URL
+        data: form 데이터
+        headers: 추가 헤더
+        timeout: 요청 타임아웃 (초)
+        max_retry: 최대 재시도 횟수
+
+    Returns:
+        requests.Response
+
+    Raises:
+        requests.RequestException: 재시도 후에도 연결/타임아웃 오류가 계속될 때
+    """
+    return _request('POST', url, timeout, False, max_retry, data=data, headers=headers)
+
+
+def get_http_stats() -> Dict[str, Dict]:
+    """
+    호스트별 요청 통계 반환
+
+    Returns:
+        {host: {'requests', 'errors', 'retries', 'bytes', 'avg_latency', 'max_latency',
+                'connections', 'reuse_ratio'}}
+    """
+    result = {}
+    with _lock:
+        for host, stats in _stats.items():
+            # 재시도 요청도 커넥션을 쓰므로 재사용률 계산에 포함
+            count = stats['requests']
+            connections = stats['connections']
+            sent = count + stats['retries']
+            result[host] = {
+                'requests': count,
+                'errors': stats['errors'],
+                'retries': stats['retries'],
+                'bytes': stats['bytes'],
+                'avg_latency': stats['latency_total'] / count if count else 0.0,
+                'max_latency': stats['latency_max'],
+                'connections': connections,
+                'reuse_ratio': max(0.0, 1 - connections / sent) if sent else 0.0,
+            }
+    return result
+
+
+def log_http_stats():
+    """호스트별 요청 통계 출력"""
+    stats = get_http_stats()
+    cache = response_cache.get_cache_stats()
+    if not stats and not any(cache.values()):
+        return
+
+    logger.info("=" * 60)
+    logger.info("🌐 HTTP Client Stats")
+    for host, s in stats.items():
+        logger.info(f"   {host}: 요청 {s['requests']}회 (재시도 {s['retries']}, 실패 {s['errors']}), "
+                    f"{s['bytes'] / 1024:.1f}KB, 평균 {s['avg_latency'] * 1000:.0f}ms / 최대 {s['max_latency'] * 1000:.0f}ms, "
+                    f"커넥션 {s['connections']}개 (재사용률 {s['reuse_ratio']:.0%})")
+    logger.info(f"   캐시: 적중 {cache['hits']}, 재검증 {cache['revalidated']}, 미스 {cache['misses']}, "
+                f"저장 {cache['stores']}, 삭제 {cache['evictions']}")
+    logger.info("=" * 60)
+
+
+def close_sessions():
+    """모든 세션(커넥션 풀) 종료 및 통계 초기화"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _stats.clear()
+    response_cache.reset_cache_stats()
@@ -0,0 +1,296 @@
+"""
+이미지 다운로드 단계 (본문 수집과 분리된 병렬 처리)
+
+본문 파싱은 이미지 URL만 모아서 바로 돌려주고, 이미지는 이 단계에서 따로 받는다.
+- 전체 동시 다운로드 수 / 게시글당 동시 다운로드 수 제한
+- 이미지 1개 최대 크기, 1회 실행 전체 다운로드 한도
+- 확장자는 URL이 아니라 파일 앞부분(매직 바이트)과 Content-Type으로 판별
+- 연결/읽기 타임아웃 + 이미지 1개 전체 제한 시간
+- 끝난 게시글 작업은 바로 놓아줌 (크롤링 규모가 커져도 진행 중인 작업만 메모리에 유지)
+"""
+
+import time
+import logging
+import threading
+
+from typing import Callable, Iterator, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Content-Type → 확장자 (매직 바이트로 판별이 안 될 때만 사용)
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/jpg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+}
+
+
+class ImageRejectedError(Exception):
+    """크기 초과 / 이미지가 아닌 응답 / 제한 시간 초과로 저장하지 않는 이미지"""
+
+
+def sniff_extension(head: bytes, content_type: str = None) -> Optional[str]:
+    """
+    파일 앞부분(매직 바이트)으로 이미지 형식 판별
+
+    Args:
+        head: 응답 본문 첫 청크
+        content_type: 응답 Content-Type 헤더 (매직 바이트로 판별 못 할 때 사용)
+
+    Returns:
+        확장자 (jpg/png/gif/webp), 이미지가 아니면 None
+    """
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'jpg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+
+    # HTML 오류 페이지 등은 Content-Type이 image/*여도 저장하지 않음
+    if head.lstrip()[:1] == b'<':
+        return None
+    mime = (content_type or '').split(';')[0].strip().lower()
+    return CONTENT_TYPE_EXTENSIONS.get(mime)
+
+
+class ByteBudget:
+    """1회 실행 동안 다운로드할 수 있는 전체 바이트 한도 (스레드 안전)"""
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit: 최대 바이트 수 (0 이하면 제한 없음)
+        """
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        return 0 < self.limit <= self.used
+
+    def consume(self, size: int):
+        """size 바이트 사용 (한도 초과 시 ImageRejectedError)"""
+        with self._lock:
+            self.used += size
+            if 0 < self.limit < self.used:
+                raise ImageRejectedError(f"실행당 다운로드 한도 초과 ({self.limit / 1024 / 1024:.1f}MB)")
+
+
+def limited_chunks(response: requests.Response, chunk_size: int, max_bytes: int = 0,
+                   budget: ByteBudget = None, deadline: float = 0) -> Iterator[bytes]:
+    """
+    크기 / 전체 한도 / 제한 시간을 확인하면서 응답 본문을 청크 단위로 읽기
+
+    Args:
+        response: stream=True로 받은 응답
+        chunk_size: 청크 크기 (bytes)
+        max_bytes: 이미지 1개 최대 크기 (0 이하면 제한 없음)
+        budget: 실행 전체 다운로드 한도
+        deadline: 다운로드 제한 시간 (초, 0 이하면 제한 없음)
+
+    Raises:
+        ImageRejectedError: 한도/제한 시간 초과
+    """
+    # Content-Length가 있으면 받기 전에 거름
+    content_length = int(response.headers.get('Content-Length') or 0)
+    if max_bytes > 0 and content_length > max_bytes:
+        raise ImageRejectedError(f"이미지 크기 초과 ({content_length / 1024 / 1024:.1f}MB)")
+
+    started = time.monotonic()
+    received = 0
+    for chunk in response.iter_content(chunk_size):
+        if not chunk:
+            continue
+        received += len(chunk)
+        if max_bytes > 0 and received > max_bytes:
+            raise ImageRejectedError(f"이미지 크기 초과 ({max_bytes / 1024 / 1024:.1f}MB 이상)")
+        if budget is not None:
+            budget.consume(len(chunk))
+        if deadline > 0 and time.monotonic() - started > deadline:
+            raise ImageRejectedError(f"다운로드 제한 시간 초과 ({deadline}초)")
+        yield chunk
+
+
+class PostImageJob:
+    """게시글 1개의 이미지 다운로드 작업 (게시글당 동시 다운로드 수 제한)"""
+
+    def __init__(self, post_id: str, urls: List[str]):
+        self.post_id = post_id
+        self.urls = urls
+        self.paths: List[Optional[str]] = [None] * len(urls)
+
+        self._next = 0
+        self._remaining = len(urls)
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        if not urls:
+            self._done.set()
+
+    def _take(self) -> Optional[int]:
+        """다음에 받을 이미지 순서 (없으면 None)"""
+        with self._lock:
+            if self._next >= len(self.urls):
+                return None
+            index = self._next
+            self._next += 1
+            return index
+
+    def _finish(self, count: int = 1):
+        with self._lock:
+            self._remaining -= count
+            if self._remaining <= 0:
+                self._done.set()
+
+    def done(self) -> bool:
+        """모든 이미지 처리(성공/실패/건너뜀)가 끝났는지"""
+        return self._done.is_set()
+
+    def result(self, timeout: float = None) -> List[str]:
+        """
+        다운로드가 끝날 때까지 대기 후 로컬 경로 리스트 반환 (원래 순서 유지, 실패한 이미지 제외)
+        """
+        self._done.wait(timeout)
+        return [path for path in self.paths if path]
+
+
+class ImageDownloadStage:
+    """
+    이미지 다운로드 단계
+
+    Usage:
+        stage = ImageDownloadStage(download_image)
+        job = stage.submit(post_id, image_urls)   # 즉시 반환
+        ...
+        post['image_paths'] = job.result()        # 저장 직전에 대기
+        stage.shutdown()
+    """
+
+    def __init__(self, download_fn: Callable, max_workers: int = 4, per_post: int = 2,
+                 max_image_bytes: int = 0, max_run_bytes: int = 0):
+        """
+        Args:
+            download_fn: (url, post_id, index, max_bytes=, budget=) → 로컬 경로 또는 None
+            max_workers: 전체 동시 다운로드 수
+            per_post: 게시글 1개당 동시 다운로드 수
+            max_image_bytes: 이미지 1개 최대 크기 (0 이하면 제한 없음)
+            max_run_bytes: 1회 실행 전체 다운로드 한도 (0 이하면 제한 없음)
+        """
+        self.download_fn = download_fn
+        self.max_workers = max(1, max_workers)
+        self.per_post = max(1, per_post)
+        self.max_image_bytes = max_image_bytes
+        self.budget = ByteBudget(max_run_bytes)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='image')
+        self._pending: Set[PostImageJob] = set()  # 아직 끝나지 않은 게시글 작업 (wait_all용)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # 통계
+        self.stats = {'submitted': 0, 'saved': 0, 'failed': 0, 'skipped': 0}
+
+    def _count(self, key: str, value: int = 1):
+        with self._lock:
+            self.stats[key] += value
+
+    def submit(self, post_id: str, urls: List[str]) -> PostImageJob:
+        """게시글의 이미지 다운로드 예약 (바로 반환)"""
+        job = PostImageJob(post_id, list(urls))
+        with self._lock:
+            if urls:
+                self._pending.add(job)
+            self.stats['submitted'] += len(urls)
+
+        for _ in range(min(self.per_post, len(urls))):
+            self._schedule(job)
+        return job
+
+    def _finish(self, job: PostImageJob, count: int = 1):
+        """이미지 count개 처리 완료 (게시글의 이미지가 모두 끝나면 대기 목록에서 제거)"""
+        job._finish(count)
+        if job.done():
+            with self._lock:
+                self._pending.discard(job)
+
+    def _skip_rest(self, job: PostImageJob, count: int):
+        """아직 시작하지 않은 이미지를 모두 건너뜀 처리 (count: 이미 꺼냈지만 실행되지 않은 이미지 수)"""
+        while job._take() is not None:
+            count += 1
+        self._count('skipped', count)
+        self._finish(job, count)
+
+    def _schedule(self, job: PostImageJob):
+        index = job._take()
+        if index is None:
+            return
+        try:
+            future = self._executor.submit(self._run, job, index)
+        except RuntimeError:
+            # 이미 종료된 단계 → 남은 이미지는 받지 않음
+            self._skip_rest(job, 1)
+            return
+
+        def on_done(done_future):
+            # shutdown(wait=False)로 취소되면 _run이 불리지 않음 → 건너뜀 처리해서 result()가 끝나도록
+            if done_future.cancelled():
+                self._skip_rest(job, 1)
+
+        future.add_done_callback(on_done)
+
+    def _run(self, job: PostImageJob, index: int):
+        try:
+            if self.budget.exhausted:
+                self._count('skipped')
+                return
+
+            path = self.download_fn(job.urls[index], job.post_id, index,
+                                    max_bytes=self.max_image_bytes, budget=self.budget)
+            job.paths[index] = path
+            self._count('saved' if path else 'failed')
+        except Exception as e:
+            logger.warning(f"  ⚠️ 이미지 다운로드 실패 ({job.urls[index]}): {e}")
+            self._count('failed')
+        finally:
+            self._finish(job)
+            # 같은 게시글의 다음 이미지 (게시글당 동시 다운로드 수 유지)
+            self._schedule(job)
+
+    def wait_all(self, timeout: float = None):
+        """예약된 모든 이미지 다운로드가 끝날 때까지 대기"""
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            jobs = list(self._pending)
+        for job in jobs:
+            remaining = max(0.0, deadline - time.monotonic()) if deadline else None
+            job.result(remaining)
+
+    def shutdown(self, wait: bool = True):
+        """
+        다운로드 스레드 종료 (두 번째 호출부터는 무시)
+
+        wait=False면 대기 중인 다운로드를 취소하고 건너뜀으로 처리한다 (취소된 게시글의 result()도 바로 끝남).
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        if self.stats['submitted']:
+            logger.info(f"🖼️ 이미지 다운로드: 요청 {self.stats['submitted']}개, 저장 {self.stats['saved']}개, "
+                        f"실패 {self.stats['failed']}개, 건너뜀 {self.stats['skipped']}개 "
+                        f"({self.budget.used / 1024 / 1024:.1f}MB)")
@@ -0,0 +1,306 @@
+"""
+크롤링 이미지 저장소 (내용 주소 기반, 중복 제거)
+
+같은 짤/차트가 여러 게시글이나 며칠에 걸쳐 올라와도 한 번만 저장한다.
+- 파일 경로: <IMAGE_STORE_DIR>/objects/<sha256 앞 2자리>/<sha256>.<ext>
+- URL → 해시 인덱스: 이미 받은 URL은 다시 요청하지 않음
+- 참조 인덱스: 해시 → 참조한 게시글 목록 + 마지막 참조 시각 (게시글에는 복사본 대신 경로만 저장)
+- collect_garbage: DB에 남아 있는 게시글이 참조하지 않는 파일만 삭제 (이전 날짜별 폴더도 함께 정리)
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import logging
+import tempfile
+import threading
+
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_index: Optional[Dict] = None  # {'urls': {url: sha256}, 'objects': {sha256: {...}}}
+_dirty = False
+
+
+def _store_dir() -> Path:
+    return Path(os.getenv('IMAGE_STORE_DIR', 'app/output/images'))
+
+
+def _objects_dir() -> Path:
+    return _store_dir() / 'objects'
+
+
+def _index_path() -> Path:
+    return _store_dir() / 'index.json'
+
+
+def object_path(sha256: str, ext: str) -> Path:
+    return _objects_dir() / sha256[:2] / f"{sha256}.{ext}"
+
+
+def _load_index() -> Dict:
+    """인덱스 파일 로드 (처음 한 번만, _lock 안에서 호출)"""
+    global _index
+    if _index is None:
+        try:
+            _index = json.loads(_index_path().read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            _index = {}
+        _index.setdefault('urls', {})
+        _index.setdefault('objects', {})
+    return _index
+
+
+def flush():
+    """변경된 인덱스를 디스크에 기록 (원자적 교체)"""
+    global _dirty
+    with _lock:
+        if _index is None or not _dirty:
+            return
+        path = _index_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(_index, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, path)
+        _dirty = False
+
+
+# 크롤링 도중 종료되더라도 인덱스가 남도록
+atexit.register(flush)
+
+
+def lookup_url(url: str) -> Optional[Tuple[str, Path]]:
+    """
+    이미 받은 URL이면 (해시, 파일 경로) 반환
+
+    인덱스에는 있지만 파일이 지워진 경우 None (다시 다운로드)
+    """
+    global _dirty
+    with _lock:
+        index = _load_index()
+        sha256 = index['urls'].get(url)
+        obj = index['objects'].get(sha256) if sha256 else None
+        if obj is None:
+            return None
+
+        path = object_path(sha256, obj['ext'])
+        if path.exists():
+            return sha256, path
+
+        # 파일이 사라짐 → 인덱스에서 제거
+        del index['urls'][url]
+        index['objects'].pop(sha256, None)
+        _dirty = True
+        return None
+
+
+def save_stream(url: str, chunks: Iterable[bytes], ext: str) -> Tuple[str, Path]:
+    """
+    청크 단위로 받은 이미지를 해시하면서 임시 파일에 쓰고, 내용 주소 경로로 이동
+
+    같은 내용의 파일이 이미 있으면 새 파일은 버리고 기존 파일을 사용한다.
+
+    Args:
+        url: 원본 이미지 URL (URL → 해시 인덱스에 기록)
+        chunks: 이미지 바이트 청크 (response.iter_content)
+        ext: 파일 확장자
+
+    Returns:
+        (sha256, 파일 경로)
+    """
+    global _dirty
+
+    objects_dir = _objects_dir()
+    objects_dir.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=objects_dir, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                if chunk:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+        sha256 = digest.hexdigest()
+        with _lock:
+            index = _load_index()
+            obj = index['objects'].get(sha256)
+            # 같은 내용이 다른 URL/확장자로 이미 저장돼 있으면 그 파일을 사용
+            if obj is not None and object_path(sha256, obj['ext']).exists():
+                ext = obj['ext']
+            path = object_path(sha256, ext)
+
+            if path.exists():
+                os.remove(tmp_name)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_name, path)
+
+            index['urls'][url] = sha256
+            if obj is None or obj['ext'] != ext:
+                index['objects'][sha256] = {'ext': ext, 'size': size, 'posts': [], 'last_ref': None}
+            _dirty = True
+
+        return sha256, path
+
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def add_ref(sha256: str, post_id: str):
+    """게시글이 이미지를 참조함을 기록 (마지막 참조 시각 갱신)"""
+    global _dirty
+    with _lock:
+        obj = _load_index()['objects'].get(sha256)
+        if obj is None:
+            return
+        if post_id not in obj['posts']:
+            obj['posts'].append(post_id)
+        obj['last_ref'] = datetime.now().isoformat(timespec='seconds')
+        _dirty = True
+
+
+def _is_recent(timestamp: Optional[str], cutoff: datetime) -> bool:
+    return timestamp is not None and datetime.fromisoformat(timestamp) >= cutoff
+
+
+def _delete_file(path: Path, result: Dict[str, int]):
+    try:
+        size = path.stat().st_size
+        path.unlink()
+    except FileNotFoundError:
+        return
+    result['bytes'] += size
+    result['objects'] += 1
+
+
+def _remove_legacy_files(live_post_ids: Set[str], cutoff: datetime) -> int:
+    """
+    이전 방식의 날짜별 폴더(YYYY-MM-DD/<post_id>_<순서>.<ext>) 정리
+
+    삭제된 게시글의 파일만 지우고, 비어 버린 폴더는 폴더째 삭제
+    """
+    deleted = 0
+    for folder in _store_dir().iterdir():
+        if not folder.is_dir():
+            continue
+        try:
+            # 날짜 형식이 아닌 폴더(objects 등)는 무시
+            datetime.strptime(folder.name, '%Y-%m-%d')
+        except ValueError:
+            continue
+
+        for path in folder.iterdir():
+            post_id = path.name.split('_', 1)[0]
+            if post_id in live_post_ids or datetime.fromtimestamp(path.stat().st_mtime) >= cutoff:
+                continue
+            path.unlink()
+            deleted += 1
+
+        if not any(folder.iterdir()):
+            folder.rmdir()
+            logger.info(f"🗑️ 이전 이미지 폴더 삭제: {folder.name}")
+    return deleted
+
+
+def collect_garbage(live_post_ids: Set[str], grace_days: float = 7) -> Dict[str, int]:
+    """
+    참조 기반 이미지 정리
+
+    - 참조하던 게시글이 DB에서 모두 삭제된 파일 삭제 (남은 게시글은 참조 목록에서만 제거)
+    - 유예 기간 안에 참조된 파일은 건드리지 않음 (아직 DB에 저장되기 전인 게시글이 쓰는 중일 수 있음)
+    - 인덱스에 없는 파일(중단된 다운로드 등)은 수정 시각이 유예 기간보다 오래됐으면 삭제
+    - 이전 방식의 날짜별 폴더는 삭제된 게시글의 파일만 삭제
+
+    크롤링과 동시에 실행될 수 있으므로 파일 1개씩 잠금을 잡고 지운다.
+
+    Args:
+        live_post_ids: DB에 남아 있는 게시글 ID 전체
+        grace_days: 유예 기간 (일)
+
+    Returns:
+        {'objects': 삭제한 파일 수, 'bytes': 확보한 용량, 'legacy': 삭제한 이전 방식 파일 수}
+    """
+    global _dirty
+
+    result = {'objects': 0, 'bytes': 0, 'legacy': 0}
+    if not _store_dir().exists():
+        return result
+
+    cutoff = datetime.now() - timedelta(days=grace_days)
+    result['legacy'] = _remove_legacy_files(live_post_ids, cutoff)
+
+    # 1) 참조 목록 정리 + 삭제 대상 선정
+    with _lock:
+        index = _load_index()
+        candidates = []
+        for sha256, obj in index['objects'].items():
+            if _is_recent(obj['last_ref'], cutoff):
+                continue
+            posts = [post_id for post_id in obj['posts'] if post_id in live_post_ids]
+            if posts:
+                if len(posts) != len(obj['posts']):
+                    obj['posts'] = posts
+                    _dirty = True
+            else:
+                candidates.append(sha256)
+
+    # 2) 하나씩 다시 확인하고 삭제 (그 사이 다시 참조됐으면 유지)
+    for sha256 in candidates:
+        with _lock:
+            obj = index['objects'].get(sha256)
+            if obj is None or _is_recent(obj['last_ref'], cutoff):
+                continue
+            del index['objects'][sha256]
+            _dirty = True
+            _delete_file(object_path(sha256, obj['ext']), result)
+
+    if candidates:
+        with _lock:
+            removed = set(candidates) - set(index['objects'])
+            index['urls'] = {url: sha256 for url, sha256 in index['urls'].items() if sha256 not in removed}
+
+    # 3) 인덱스에 없는 파일 (인덱스 기록 전에 종료된 경우, 남은 .part 등)
+    objects_dir = _objects_dir()
+    if objects_dir.exists():
+        for path in list(objects_dir.glob('**/*')):
+            if not path.is_file():
+                continue
+            with _lock:
+                if path.stem in index['objects']:
+                    continue
+                try:
+                    modified = datetime.fromtimestamp(path.stat().st_mtime)
+                except FileNotFoundError:
+                    continue
+                if modified < cutoff:
+                    _delete_file(path, result)
+
+    flush()
+    return result
+
+
+def get_store_stats() -> Dict[str, int]:
+    """저장된 이미지 수 / 용량 / 참조 수"""
+    with _lock:
+        objects = _load_index()['objects']
+        return {
+            'objects': len(objects),
+            'bytes': sum(obj['size'] for obj in objects.values()),
+            'refs': sum(len(obj['posts']) for obj in objects.values()),
+        }
@@ -2,12 +2,14 @@
 
 import os
 import logging
+import threading
 
+from typing import Optional
 from pymongo import MongoClient
-from dotenv import load_dotenv
+from app.config import load_config
 
 # 환경변수 로드
-load_dotenv()
+load_config()
 
 # 로깅 설정
 logging.basicConfig(
@@ -16,26 +18,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 프로세스 전역 클라이언트 (처음 사용할 때 생성, MongoClient 자체가 스레드 안전한 커넥션 풀)
+_client: Optional[MongoClient] = None
+_lock = threading.Lock()
+
 
 def get_mongo_client() -> MongoClient:
-    """MongoDB 클라이언트 생성"""
-    mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
-
-    try:
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        # 연결 테스트
-        client.admin.command('ping')
-        logger.info("=" * 60)
-        logger.info("🔌  MongoDB Connection Status")
-        logger.info(f"   URI: {mongo_uri}")
-        logger.info(f"   Status: ✅ MongoDB Connected Successfully")
-        logger.info("=" * 60)
-        return client
-    except Exception as e:
-        logger.error("=" * 60)
-        logger.error("🔌  MongoDB Connection Status")
-        logger.error(f"   URI: {mongo_uri}")
-        logger.error(f"   Status: ❌ MongoDB Connection Failed")
-        logger.error(f"   Error: {e}")
-        logger.error("=" * 60)
-        raise
\ No newline at end of file
+    """
+    MongoDB 클라이언트 반환 (프로세스 전체에서 하나를 공유)
+
+    처음 호출할 때만 클라이언트를 만들고 ping으로 연결을 확인한다.
+    풀 크기 등은 MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE / MONGO_MAX_IDLE_MS 환경변수로 조정.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _lock:
+        if _client is not None:
+            return _client
+
+        mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+        client = MongoClient(
+            mongo_uri,
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=int(os.getenv('MONGO_MAX_POOL_SIZE', 20)),
+            minPoolSize=int(os.getenv('MONGO_MIN_POOL_SIZE', 0)),
+            maxIdleTimeMS=int(os.getenv('MONGO_MAX_IDLE_MS', 60000)),
+        )
+
+        try:
+            # 연결 테스트 (최초 1회)
+            client.admin.command('ping')
+            logger.info("=" * 60)
+            logger.info("🔌  MongoDB Connection Status")
+            logger.info(f"   URI: {mongo_uri}")
+            logger.info(f"   Pool: max {client.options.pool_options.max_pool_size}, "
+                        f"min {client.options.pool_options.min_pool_size}")
+            logger.info(f"   Status: ✅ MongoDB Connected Successfully")
+            logger.info("=" * 60)
+        except Exception as e:
+            # 실패한 클라이언트는 저장하지 않음 → 다음 호출에서 다시 연결 시도
+            client.close()
+            logger.error("=" * 60)
+            logger.error("🔌  MongoDB Connection Status")
+            logger.error(f"   URI: {mongo_uri}")
+            logger.error(f"   Status: ❌ MongoDB Connection Failed")
+            logger.error(f"   Error: {e}")
+            logger.error("=" * 60)
+            raise
+
+        _client = client
+        return _client
+
+
+def close_mongo_client():
+    """공유 클라이언트 종료 (프로세스 종료 전에 호출, 생성된 적 없으면 아무것도 안 함)"""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+        logger.info("🔌 MongoDB 연결 종료")
@@ -0,0 +1,99 @@
+# 증분 크롤링 상태 관리 (이미 저장된 게시글 비교 + 하이 워터 마크)
+import os
+import logging
+
+from typing import List, Dict, Optional
+from datetime import datetime
+
+from app.modules.crawling.manager.connection_db import get_mongo_client
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 목록 단계에서 비교하는 필드
+SNAPSHOT_FIELDS = ('views', 'recommend', 'comment_count')
+
+
+def fetch_post_snapshots(post_ids: List[str], db_name: str = None) -> Dict[str, Dict]:
+    """
+    이미 저장된 게시글의 목록 지표(조회수/추천수/댓글수) 조회
+
+    Args:
+        post_ids: 조회할 게시글 ID 리스트
+        db_name: 데이터베이스 이름
+
+    Returns:
+        {post_id: {'views', 'recommend', 'comment_count'}} (조회 실패 시 빈 dict → 전부 새로 수집)
+    """
+    if not post_ids:
+        return {}
+
+    db_name = db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')
+
+    try:
+        client = get_mongo_client()
+        collection = client[db_name]['posts']
+
+        projection = {'_id': 0, 'post_id': 1, **{field: 1 for field in SNAPSHOT_FIELDS}}
+        cursor = collection.find({'post_id': {'$in': post_ids}}, projection)
+        return {doc['post_id']: doc for doc in cursor}
+
+    except Exception as e:
+        logger.warning(f"⚠️ 저장된 게시글 조회 실패 (전체 새로 수집): {e}")
+        return {}
+
+
+def load_high_water_mark(state_id: str, db_name: str = None) -> Optional[int]:
+    """
+    이전 실행에서 수집한 가장 큰 게시글 번호 조회
+
+    Args:
+        state_id: 상태 문서 ID (예: stockus:recommend)
+        db_name: 데이터베이스 이름
+
+    Returns:
+        게시글 번호 (기록이 없거나 조회 실패 시 None)
+    """
+    db_name = db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')
+
+    try:
+        client = get_mongo_client()
+        state = client[db_name]['crawl_state'].find_one({'_id': state_id})
+        return state.get('high_water_mark') if state else None
+
+    except Exception as e:
+        logger.warning(f"⚠️ 크롤링 상태 조회 실패: {e}")
+        return None
+
+
+def save_high_water_mark(state_id: str, post_no: int, db_name: str = None) -> bool:
+    """
+    이번 실행에서 본 가장 큰 게시글 번호 저장 (기존 값보다 클 때만 갱신)
+
+    Args:
+        state_id: 상태 문서 ID (예: stockus:recommend)
+        post_no: 게시글 번호
+        db_name: 데이터베이스 이름
+
+    Returns:
+        성공 여부
+    """
+    db_name = db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')
+
+    try:
+        client = get_mongo_client()
+        client[db_name]['crawl_state'].update_one(
+            {'_id': state_id},
+            {'$max': {'high_water_mark': post_no}, '$set': {'updated_at': datetime.now()}},
+            upsert=True
+        )
+        logger.info(f"📌 하이 워터 마크 저장: {state_id} → {post_no}")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 크롤링 상태 저장 실패: {e}")
+        return False
@@ -0,0 +1,229 @@
+# 컬렉션 인덱스 관리 (실행 시작 시 선언된 인덱스를 생성/갱신 + 주요 쿼리 실행 계획 점검)
+import os
+import sys
+import logging
+
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from app.modules.crawling.manager.connection_db import get_mongo_client
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 대본 미생성 게시글 조회 조건 (script_repository와 실행 계획 점검이 같은 쿼리를 쓰도록 여기서 정의)
+# script_generated_at은 대본 저장 시 script와 함께 기록되므로 "없음(null)" == 대본 미생성
+UNSCRIPTED_FILTER = {'script_generated_at': None}
+UNSCRIPTED_SORT = [('recommend', DESCENDING)]
+
+# 게시글 보관 기간 (마지막으로 수집된 뒤 이 기간이 지나면 TTL 인덱스가 삭제, 대본이 있는 게시글은 유지)
+POST_RETENTION_DAYS = float(os.getenv('POST_RETENTION_DAYS', 30))
+
+
+def _crawled_at_index() -> IndexModel:
+    """crawled_at TTL 인덱스 (POST_RETENTION_DAYS가 0이면 만료 없는 일반 인덱스)"""
+    if POST_RETENTION_DAYS <= 0:
+        return IndexModel([('crawled_at', ASCENDING)], name='crawled_at')
+    return IndexModel(
+        [('crawled_at', ASCENDING)],
+        name='crawled_at',
+        expireAfterSeconds=int(POST_RETENTION_DAYS * 86400),
+        # 대본 미생성(script_generated_at: null) 게시글만 만료 (retention.py 참고)
+        partialFilterExpression={'script_generated_at': {'$type': 'null'}},
+    )
+
+
+# 컬렉션별로 유지할 인덱스 (이름으로 관리, 정의가 바뀌면 지우고 다시 생성)
+INDEXES: Dict[str, List[IndexModel]] = {
+    'posts': [
+        # upsert / 증분 크롤링 비교($in) 조회
+        IndexModel([('post_id', ASCENDING)], name='post_id_unique', unique=True),
+        # 대본 미생성 게시글을 추천수 높은 순으로 (동등 조건 + 정렬을 인덱스로 처리)
+        IndexModel([('script_generated_at', ASCENDING), ('recommend', DESCENDING)],
+                   name='unscripted_by_recommend'),
+        # 오래된 게시글 만료 (TTL)
+        _crawled_at_index(),
+    ],
+    # crawl_state는 _id로만 조회 (기본 인덱스)
+}
+
+# 예전 게시글 만료 표시(backfill_script_marker)를 끝냈다는 기록 (crawl_state 문서 ID)
+SCRIPT_MARKER_MIGRATION = 'migration:script_marker'
+
+# 실행 계획을 점검할 주요 쿼리: (이름, 컬렉션, 조건, 정렬)
+HOT_QUERIES = [
+    ('대본 미생성 게시글', 'posts', UNSCRIPTED_FILTER, UNSCRIPTED_SORT),
+    ('증분 크롤링 비교', 'posts', {'post_id': {'$in': ['0']}}, None),
+    ('게시글 upsert', 'posts', {'post_id': '0'}, None),
+]
+
+
+def _index_spec(info: Dict) -> Dict:
+    """index_information() 항목에서 비교할 정의만 추출 (서버가 붙이는 v/ns 등 제외)"""
+    spec = {key: value for key, value in info.items() if key not in ('v', 'ns', 'background')}
+    # mongosh로 만든 인덱스는 방향이 1.0 같은 실수로 저장됨
+    spec['key'] = [(field, int(direction) if isinstance(direction, float) else direction)
+                   for field, direction in spec['key']]
+    return spec
+
+
+def _model_spec(model: IndexModel) -> Dict:
+    document = dict(model.document)
+    document.pop('name')
+    document['key'] = list(document['key'].items())
+    return document
+
+
+def ensure_collection_indexes(collection, models: List[IndexModel], counts: Dict[str, int] = None) -> Dict[str, int]:
+    """
+    컬렉션 하나에 인덱스 생성 (이미 있으면 건너뜀, 같은 이름인데 정의가 다르면 삭제 후 재생성)
+
+    같은 이름으로 옵션만 바꿔 create_index하면 IndexOptionsConflict가 나므로 (예: TTL 변경)
+    정의를 비교해서 다시 만든다. 선언되지 않은 인덱스는 건드리지 않는다.
+
+    Args:
+        collection: pymongo 컬렉션
+        models: 유지할 인덱스
+        counts: 넘기면 여기에 더해서 집계
+
+    Returns:
+        {'created', 'recreated', 'unchanged', 'failed'} 개수
+    """
+    counts = counts if counts is not None else {'created': 0, 'recreated': 0, 'unchanged': 0, 'failed': 0}
+    existing = collection.index_information()
+
+    for model in models:
+        name = model.document['name']
+        try:
+            if name in existing:
+                if _index_spec(existing[name]) == _model_spec(model):
+                    counts['unchanged'] += 1
+                    continue
+                logger.info(f"🔁 인덱스 정의 변경: {collection.name}.{name} 삭제 후 재생성")
+                collection.drop_index(name)
+                collection.create_indexes([model])
+                counts['recreated'] += 1
+            else:
+                collection.create_indexes([model])
+                logger.info(f"🗂️ 인덱스 생성: {collection.name}.{name}")
+                counts['created'] += 1
+        except PyMongoError as e:
+            # 예: 중복 post_id가 남아 있어 unique 인덱스 생성 실패 → 나머지 인덱스는 계속 진행
+            logger.error(f"❌ 인덱스 생성 실패 ({collection.name}.{name}): {e}")
+            counts['failed'] += 1
+    return counts
+
+
+def backfill_script_marker(db) -> int:
+    """
+    script_generated_at 필드가 없는 예전 게시글에 null 기록 (crawled_at TTL 인덱스의 만료 대상으로 포함)
+
+    조건에 맞는 인덱스가 없어 전체를 훑는 일회성 작업이므로, 끝나면 crawl_state에 기록하고 다음부터는 건너뜀
+    (새 게시글은 저장할 때 null로 기록됨)
+
+    Args:
+        db: pymongo 데이터베이스
+
+    Returns:
+        갱신한 게시글 수 (이미 끝났으면 0)
+    """
+    state = db['crawl_state']
+    if state.find_one({'_id': SCRIPT_MARKER_MIGRATION}) is not None:
+        return 0
+
+    result = db['posts'].update_many(
+        {'script_generated_at': {'$exists': False}},
+        {'$set': {'script_generated_at': None}}
+    )
+    state.update_one(
+        {'_id': SCRIPT_MARKER_MIGRATION},
+        {'$set': {'modified': result.modified_count, 'updated_at': datetime.now()}},
+        upsert=True
+    )
+    logger.info(f"🏷️ 만료 대상 표시: 예전 게시글 {result.modified_count}개")
+    return result.modified_count
+
+
+def ensure_indexes(db_name: str = None) -> Dict[str, int]:
+    """
+    INDEXES에 선언된 인덱스 생성 (컬렉션마다 ensure_collection_indexes) + 예전 게시글 만료 표시(처음 한 번)
+
+    Args:
+        db_name: 데이터베이스 이름
+
+    Returns:
+        {'created', 'recreated', 'unchanged', 'failed'} 개수
+    """
+    db_name = db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')
+    counts = {'created': 0, 'recreated': 0, 'unchanged': 0, 'failed': 0}
+
+    client = get_mongo_client()
+    db = client[db_name]
+
+    for collection_name, models in INDEXES.items():
+        ensure_collection_indexes(db[collection_name], models, counts)
+
+    try:
+        backfill_script_marker(db)
+    except PyMongoError as e:
+        # 기록이 남지 않았으므로 다음 실행에서 다시 시도
+        logger.error(f"❌ 예전 게시글 만료 표시 실패: {e}")
+
+    logger.info(f"🗂️ 인덱스 확인: 생성 {counts['created']}개, 재생성 {counts['recreated']}개, "
+                f"유지 {counts['unchanged']}개, 실패 {counts['failed']}개")
+    return counts
+
+
+def plan_stages(plan) -> Iterator[str]:
+    """explain() 결과에서 실행 계획의 stage 이름을 모두 꺼냄 (classic / SBE 형식 모두)"""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+
+def check_query_plans(db_name: str = None) -> Dict[str, List[str]]:
+    """
+    HOT_QUERIES의 실행 계획 확인
+
+    Returns:
+        {쿼리 이름: 선택된 실행 계획의 stage 리스트} - COLLSCAN 또는 메모리 정렬(SORT)이 있으면 인덱스를 못 쓰는 것
+    """
+    db_name = db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')
+    db = get_mongo_client()[db_name]
+
+    plans = {}
+    for name, collection_name, query, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = cursor.limit(10).explain()
+        plans[name] = list(plan_stages(explain.get('queryPlanner', {}).get('winningPlan', {})))
+    return plans
+
+
+def find_slow_plans(plans: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """전체 스캔(COLLSCAN) 또는 메모리 정렬(SORT)을 쓰는 쿼리만 추림"""
+    return {name: stages for name, stages in plans.items() if 'COLLSCAN' in stages or 'SORT' in stages}
+
+
+if __name__ == '__main__':
+    # python3 -m app.modules.crawling.manager.indexes → 인덱스 생성 후 실행 계획 점검 (문제 있으면 종료 코드 1)
+    ensure_indexes()
+    slow = find_slow_plans(check_query_plans())
+    if slow:
+        for query_name, stages in slow.items():
+            logger.error(f"❌ 인덱스를 쓰지 않는 쿼리: {query_name} → {' > '.join(stages)}")
+        sys.exit(1)
+    logger.info("✅ 주요 쿼리가 모두 인덱스를 사용합니다")
@@ -0,0 +1,79 @@
+# 보관 기간 관리 (게시글은 TTL 인덱스로 만료, 이미지는 DB에 남은 게시글 기준으로 정리)
+#
+# - 게시글: crawled_at TTL 인덱스 (indexes.py). 대본이 생성된 게시글(script_generated_at 있음)은 만료 대상이 아님
+#   → TTL 인덱스의 partialFilterExpression은 "필드 없음"을 조건으로 쓸 수 없으므로
+#     새 게시글은 script_generated_at: null로 저장하고, 예전 게시글은 indexes.backfill_script_marker로 한 번 채움
+# - 이미지: DB에 남아 있는 post_id 전체와 이미지 저장소의 참조 인덱스를 비교해서
+#   더 이상 어떤 게시글도 참조하지 않는 파일만 삭제 (DB의 image_paths가 지워진 파일을 가리키지 않도록)
+import os
+import logging
+import threading
+
+from typing import Dict, Optional, Set
+
+from app.modules.crawling import image_store
+from app.modules.crawling.manager.connection_db import get_mongo_client
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def fetch_live_post_ids(db_name: str = None) -> Set[str]:
+    """DB에 남아 있는 게시글 ID 전체"""
+    db_name = db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')
+    collection = get_mongo_client()[db_name]['posts']
+
+    # hint('post_id_unique')는 인덱스가 없으면 실패해서 이미지 정리 전체를 건너뛰게 되므로 쓰지 않음
+    cursor = collection.find({}, {'_id': 0, 'post_id': 1}).batch_size(5000)
+    with cursor:
+        return {doc['post_id'] for doc in cursor}
+
+
+def run_retention(grace_days: float = 7, db_name: str = None) -> Optional[Dict[str, int]]:
+    """
+    보관 정리 1회 실행
+
+    DB 조회에 실패하면 이미지는 지우지 않는다 (빈 목록으로 정리하면 전부 삭제되므로).
+
+    Args:
+        grace_days: 참조가 끊긴 이미지를 지우기 전 유예 기간 (일)
+        db_name: 데이터베이스 이름
+
+    Returns:
+        image_store.collect_garbage 결과, 실패 시 None
+    """
+    try:
+        live_post_ids = fetch_live_post_ids(db_name)
+    except Exception as e:
+        logger.warning(f"⚠️ 게시글 조회 실패로 이미지 정리 건너뜀: {e}")
+        return None
+
+    result = image_store.collect_garbage(live_post_ids, grace_days=grace_days)
+    if result['objects'] or result['legacy']:
+        logger.info(f"✅ 이미지 정리 완료: 파일 {result['objects']}개 ({result['bytes'] / 1024 / 1024:.1f}MB), "
+                    f"이전 방식 파일 {result['legacy']}개 (게시글 {len(live_post_ids)}개 기준)")
+    else:
+        logger.info(f"✅ 정리할 이미지 없음 (게시글 {len(live_post_ids)}개 기준, 유예 기간 {grace_days}일)")
+    return result
+
+
+def start_retention(grace_days: float = 7, db_name: str = None) -> threading.Thread:
+    """
+    보관 정리를 백그라운드 스레드에서 시작 (크롤링 시작을 막지 않음)
+
+    Returns:
+        실행 중인 스레드 (끝날 때까지 기다리려면 join)
+    """
+    def run():
+        try:
+            run_retention(grace_days, db_name)
+        except Exception as e:
+            logger.error(f"❌ 보관 정리 실패: {e}")
+
+    thread = threading.Thread(target=run, name='retention', daemon=True)
+    thread.start()
+    return thread
@@ -1,9 +1,12 @@
 # 크롤링한 게시글 저장 로직
 import os
+import time
 import logging
 
 from typing import List, Dict
 from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 
 from app.modules.crawling.manager.connection_db import get_mongo_client
 
@@ -14,16 +17,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def save_posts(posts: List[Dict], db_name: str = None) -> int:
+def _upsert_update(post: Dict) -> Dict:
+    # 새 게시글은 대본 미생성(null)으로 저장 → crawled_at TTL 인덱스의 만료 대상 (retention.py)
+    return {'$set': post, '$setOnInsert': {'script_generated_at': None}}
+
+
+def _upsert_op(post: Dict) -> UpdateOne:
+    # post_id를 기준으로 Upsert
+    return UpdateOne({'post_id': post['post_id']}, _upsert_update(post), upsert=True)
+
+
+def bulk_upsert_posts(collection, posts: List[Dict], batch_size: int = 500) -> Dict[str, int]:
+    """
+    게시글 Upsert를 unordered bulk_write로 묶어서 실행
+
+    한 배치에서 일부 문서가 실패해도 나머지는 그대로 저장되고,
+    실패한 문서만 update_one으로 한 번 더 시도한다.
+
+    Args:
+        collection: posts 컬렉션
+        posts: 저장할 게시글 리스트 (같은 post_id는 마지막 것만 저장)
+        batch_size: bulk_write 1회에 넣을 문서 수
+
+    Returns:
+        {'inserted', 'modified', 'unchanged', 'failed'}
+    """
+    counts = {'inserted': 0, 'modified': 0, 'unchanged': 0, 'failed': 0}
+
+    # 같은 배치 안에 같은 post_id가 두 번 있으면 upsert가 중복 문서를 만들 수 있으므로 미리 합침
+    unique_posts = list({post['post_id']: post for post in posts}.values())
+    batch_size = max(1, batch_size)
+
+    for start in range(0, len(unique_posts), batch_size):
+        batch = unique_posts[start:start + batch_size]
+        try:
+            result = collection.bulk_write([_upsert_op(post) for post in batch], ordered=False)
+            inserted, matched, modified = result.upserted_count, result.matched_count, result.modified_count
+            failed_indexes = []
+        except BulkWriteError as e:
+            # 실패한 문서 외에는 이미 반영됨 (unordered)
+            details = e.details
+            inserted, matched, modified = details.get('nUpserted', 0), details.get('nMatched', 0), details.get('nModified', 0)
+            failed_indexes = [error['index'] for error in details.get('writeErrors', [])]
+            logger.warning(f"⚠️ bulk_write 일부 실패: {len(failed_indexes)}/{len(batch)}개, 해당 문서만 재시도")
+
+        counts['inserted'] += inserted
+        counts['modified'] += modified
+        counts['unchanged'] += matched - modified
+
+        # 실패한 문서만 개별 재시도
+        for index in failed_indexes:
+            post = batch[index]
+            try:
+                result = collection.update_one({'post_id': post['post_id']}, _upsert_update(post), upsert=True)
+            except PyMongoError as e:
+                counts['failed'] += 1
+                logger.error(f"❌ 게시글 {post['post_id']} 저장 실패: {e}")
+                continue
+
+            if result.upserted_id is not None:
+                counts['inserted'] += 1
+            elif result.modified_count:
+                counts['modified'] += 1
+            else:
+                counts['unchanged'] += 1
+
+    return counts
+
+
+def save_posts(posts: List[Dict], db_name: str = None, verbose: bool = True, counts: Dict[str, int] = None) -> int:
     """
     크롤링한 게시글을 MongoDB 에 저장 (Upsert)
 
+    MONGO_BULK_SIZE개씩 묶어서 bulk_write로 저장한다 (게시글마다 왕복하지 않음).
+
     Args:
         posts: 저장할 게시글 리스트
         db_name: 데이터베이스 이름
+        verbose: 저장 결과 요약 로그 출력 여부 (마이크로 배치 저장 시 False)
+        counts: 넘기면 {'inserted', 'modified', 'unchanged', 'failed'}를 채워줌 (연결 실패 시 전부 failed)
 
     Returns:
-        저장된 게시글 수
+        저장된 게시글 수 (새로 추가 + 변경)
     """
     if not posts:
         return 0
@@ -35,21 +110,22 @@ def save_posts(posts: List[Dict], db_name: str = None) -> int:
         db = client[db_name]
         collection = db['posts']
 
-        saved_count = 0
+        crawled_at = datetime.now()
         for post in posts:
-            # post_id를 기준으로 Upsert
-            post['crawled_at'] = datetime.now()
-            result = collection.update_one(
-                {'post_id': post['post_id']},
-                {'$set': post},
-                upsert=True
-            )
-            if result.upserted_id or result.modified_count > 0:
-                saved_count += 1
+            post['crawled_at'] = crawled_at
+
+        result = bulk_upsert_posts(collection, posts, batch_size=int(os.getenv('MONGO_BULK_SIZE', 500)))
+        if counts is not None:
+            counts.update(result)
+        saved_count = result['inserted'] + result['modified']
+
+        if not verbose:
+            return saved_count
 
         logger.info("=" * 60)
         logger.info("💾 MongoDB Save Status")
-        logger.info(f"   Saved Count: {saved_count}")
+        logger.info(f"   Saved Count: {saved_count} (new {result['inserted']}, updated {result['modified']}, "
+                    f"unchanged {result['unchanged']}, failed {result['failed']})")
         logger.info(f"   Total Count: {len(posts)}")
         logger.info(f"   Database: {db_name}")
         logger.info(f"   Collection: posts")
@@ -58,4 +134,79 @@ def save_posts(posts: List[Dict], db_name: str = None) -> int:
 
     except Exception as e:
         logger.error(f"❌ MongoDB 저장 실패: {e}")
+        if counts is not None:
+            counts['failed'] = counts.get('failed', 0) + len(posts)
         return 0
+
+
+class PostBatchSaver:
+    """
+    크롤링 결과를 조금씩 모아서 저장하는 소비자 (마이크로 배치)
+
+    batch_size개가 모이거나 마지막 저장 후 flush_interval초가 지나면 저장한다.
+    크롤링 도중 실패해도 그 전까지 모인 게시글은 close()에서 저장된다.
+
+    Usage:
+        saver = PostBatchSaver()
+        try:
+            for post in iter_gallery(...):
+                saver.add(post)
+        finally:
+            saver.close()
+    """
+
+    def __init__(self, batch_size: int = 20, flush_interval: float = 30.0, db_name: str = None):
+        """
+        Args:
+            batch_size: 한 번에 저장할 게시글 수
+            flush_interval: 게시글이 적게 들어와도 이 시간(초)이 지나면 저장
+            db_name: 데이터베이스 이름
+        """
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.db_name = db_name
+
+        self._buffer: List[Dict] = []
+        self._last_flush = time.monotonic()
+
+        # 통계
+        self.total = 0
+        self.saved = 0
+        self.failed = 0  # 저장하지 못한 게시글 수 (변경 없는 게시글은 saved에 안 들어가므로 따로 집계)
+        self.batches = 0
+
+    def add(self, post: Dict):
+        """게시글 1개 추가 (조건을 채우면 바로 저장)"""
+        self._buffer.append(post)
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """모인 게시글 저장"""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        batch, self._buffer = self._buffer, []
+        counts = {}
+        saved = save_posts(batch, db_name=self.db_name, verbose=False, counts=counts)
+        self.total += len(batch)
+        self.saved += saved
+        self.failed += counts.get('failed', 0)
+        self.batches += 1
+        logger.info(f"💾 배치 저장: {saved}/{len(batch)}개 (누적 {self.total}개)")
+
+    def close(self):
+        """남은 게시글 저장 후 요약 출력"""
+        self.flush()
+
+        logger.info("=" * 60)
+        logger.info("💾 MongoDB Save Status")
+        logger.info(f"   Saved Count: {self.saved}")
+        logger.info(f"   Total Count: {self.total}")
+        if self.failed:
+            logger.info(f"   Failed Count: {self.failed}")
+        logger.info(f"   Batches: {self.batches}")
+        logger.info(f"   Database: {self.db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')}")
+        logger.info(f"   Collection: posts")
+        logger.info("=" * 60)
@@ -0,0 +1,96 @@
+"""
+크롤링 요청 속도 제한 (Token Bucket)
+
+동시 크롤링 시에도 서버에 보내는 요청 빈도가 늘어나지 않도록
+초당 요청 수와 동시 연결 수를 한 곳에서 제한한다.
+"""
+
+import time
+import threading
+import logging
+
+from contextlib import contextmanager
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketLimiter:
+    """
+    초당 요청 수(rate) + 동시 연결 수(max_concurrent)를 함께 제한하는 리미터
+
+    - 토큰은 초당 rate개씩 채워지고 최대 burst개까지 쌓인다
+    - 요청 1회당 토큰 1개를 소비하며, 토큰이 없으면 채워질 때까지 대기
+    - 동시에 진행 중인 요청은 max_concurrent개를 넘지 않는다
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_concurrent: int = 1, name: str = 'default'):
+        """
+        Args:
+            rate: 초당 허용 요청 수 (0 이하면 속도 제한 없음)
+            burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+            max_concurrent: 동시에 진행 가능한 요청 수
+            name: 로그용 이름 (대상 호스트 등)
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_concurrent = max(1, max_concurrent)
+        self.name = name
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrent)
+
+        # 통계
+        self.total_requests = 0
+        self.total_wait = 0.0
+
+    def acquire_token(self):
+        """토큰 1개 획득 (없으면 채워질 때까지 대기)"""
+        if self.rate <= 0:
+            with self._lock:
+                self.total_requests += 1
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.total_requests += 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+                self.total_wait += wait
+
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self):
+        """
+        동시 연결 슬롯 + 토큰을 획득한 상태로 요청 실행
+
+        Usage:
+            with limiter.slot():
+                requests.get(...)
+        """
+        # 슬롯을 먼저 잡아야 대기 중인 스레드가 토큰을 낭비하지 않음
+        self._semaphore.acquire()
+        try:
+            self.acquire_token()
+            yield
+        finally:
+            self._semaphore.release()
+
+    def log_stats(self):
+        """리미터 사용 통계 출력"""
+        logger.info(f"🚦 [{self.name}] 요청 {self.total_requests}회, 누적 대기 {self.total_wait:.1f}초 "
+                    f"(초당 {self.rate:.2f}회, 동시 {self.max_concurrent}개 제한)")
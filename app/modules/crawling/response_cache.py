@@ -0,0 +1,217 @@
+"""
+크롤링 HTTP 응답 디스크 캐시
+
+목록/본문 HTML을 gzip으로 압축해 디스크에 저장하고 재실행 시 다시 내려받지 않는다.
+- 키: URL + 정렬된 쿼리 파라미터의 SHA-256
+- TTL 이내면 네트워크 요청 없이 캐시 사용, 지나면 ETag/Last-Modified로 조건부 요청(304 재검증)
+- 전체 용량이 한도를 넘으면 가장 오래 안 쓴 항목부터 삭제 (LRU, 파일 mtime 기준)
+- HTTP_CACHE_MODE=offline이면 캐시만 사용 (없으면 CacheMissError)
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+import requests
+
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlencode
+from requests.structures import CaseInsensitiveDict
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ('off', 'on', 'offline')
+
+_lock = threading.Lock()
+_total_size: Optional[int] = None  # 처음 저장할 때 디렉토리를 한 번 스캔해서 계산
+_stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+
+class CacheMissError(requests.RequestException):
+    """오프라인 모드에서 캐시에 없는 URL을 요청했을 때"""
+
+
+def get_cache_mode() -> str:
+    """캐시 모드 (HTTP_CACHE_MODE: off / on / offline)"""
+    mode = os.getenv('HTTP_CACHE_MODE', 'on').lower()
+    return mode if mode in CACHE_MODES else 'on'
+
+
+def _cache_dir() -> Path:
+    return Path(os.getenv('HTTP_CACHE_DIR', 'app/output/cache/http'))
+
+
+def _ttl() -> float:
+    return float(os.getenv('HTTP_CACHE_TTL', 600))
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv('HTTP_CACHE_MAX_MB', 200)) * 1024 * 1024)
+
+
+def make_cache_key(url: str, params: Dict = None) -> str:
+    """URL + 쿼리 파라미터로 캐시 키 생성 (파라미터 순서 무관)"""
+    query = urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+
+def _paths(key: str):
+    base = _cache_dir() / key[:2]
+    return base / f"{key}.gz", base / f"{key}.json"
+
+
+def load_entry(key: str) -> Optional[Dict]:
+    """
+    캐시 항목 조회
+
+    Returns:
+        {'meta': {...}, 'body': bytes, 'age': 초} 또는 None
+    """
+    body_path, meta_path = _paths(key)
+    try:
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        body = gzip.decompress(body_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+    # 조회할 때마다 mtime 갱신 → LRU 순서로 사용
+    try:
+        os.utime(body_path)
+    except OSError:
+        pass
+
+    return {'meta': meta, 'body': body, 'age': time.time() - meta.get('stored_at', 0)}
+
+
+def is_fresh(entry: Dict) -> bool:
+    return entry['age'] < _ttl()
+
+
+def build_response(entry: Dict, cache_status: str) -> requests.Response:
+    """캐시 항목을 requests.Response로 변환 (호출부 코드는 그대로 .text / raise_for_status 사용)"""
+    meta = entry['meta']
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.url = meta['url']
+    response.encoding = meta.get('encoding')
+    response._content = entry['body']
+    response.headers = CaseInsensitiveDict({
+        'Content-Type': meta.get('content_type', 'text/html'),
+        'X-Cache': cache_status,
+    })
+    return response
+
+
+def conditional_headers(entry: Dict) -> Dict:
+    """재검증용 조건부 요청 헤더 (서버가 ETag/Last-Modified를 준 경우만)"""
+    headers = {}
+    if entry['meta'].get('etag'):
+        headers['If-None-Match'] = entry['meta']['etag']
+    if entry['meta'].get('last_modified'):
+        headers['If-Modified-Since'] = entry['meta']['last_modified']
+    return headers
+
+
+def touch_entry(key: str, entry: Dict):
+    """304 재검증 성공 → 저장 시각만 갱신"""
+    _, meta_path = _paths(key)
+    entry['meta']['stored_at'] = time.time()
+    _write_atomic(meta_path, json.dumps(entry['meta'], ensure_ascii=False).encode('utf-8'))
+
+
+def store_response(key: str, response: requests.Response):
+    """200 응답을 캐시에 저장 (압축 후 원자적으로 기록)"""
+    global _total_size
+
+    body_path, meta_path = _paths(key)
+    body_path.parent.mkdir(parents=True, exist_ok=True)
+
+    compressed = gzip.compress(response.content, compresslevel=6)
+    meta = {
+        'url': response.url,
+        'stored_at': time.time(),
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'content_type': response.headers.get('Content-Type', 'text/html'),
+        'encoding': response.encoding,
+    }
+
+    old_size = body_path.stat().st_size if body_path.exists() else 0
+    _write_atomic(body_path, compressed)
+    _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    with _lock:
+        _stats['stores'] += 1
+        if _total_size is None:
+            _total_size = sum(p.stat().st_size for p in _cache_dir().glob('*/*.gz'))
+        else:
+            _total_size += len(compressed) - old_size
+        over = _total_size > _max_bytes()
+
+    if over:
+        evict()
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def evict():
+    """용량 한도의 90%가 될 때까지 가장 오래 안 쓴 항목 삭제"""
+    global _total_size
+
+    with _lock:
+        entries = []
+        for body_path in _cache_dir().glob('*/*.gz'):
+            try:
+                stat = body_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, body_path))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(_max_bytes() * 0.9)
+        evicted = 0
+
+        for _, size, body_path in sorted(entries):
+            if total <= target:
+                break
+            body_path.unlink(missing_ok=True)
+            body_path.with_suffix('.json').unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        _total_size = total
+        _stats['evictions'] += evicted
+
+    if evicted:
+        logger.info(f"🧹 HTTP 캐시 정리: {evicted}개 항목 삭제 (현재 {total / 1024 / 1024:.1f}MB)")
+
+
+def record(event: str):
+    """캐시 이벤트 집계 (hits / revalidated / misses)"""
+    with _lock:
+        _stats[event] += 1
+
+
+def get_cache_stats() -> Dict[str, int]:
+    with _lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _lock:
+        for event in _stats:
+            _stats[event] = 0
@@ -0,0 +1,128 @@
+"""
+역할 : Anthropic(Claude) API 클라이언트
+포함내용
+- API KEY 검증 (ANTHROPIC_API_KEY)
+- Messages API를 GenerativeModel.generate_content와 같은 모양으로 감싼 모델 (AnthropicModel)
+  응답의 .text / .usage_metadata(prompt_token_count, cached_content_token_count, candidates_token_count)
+  고정 지시문은 system 파라미터로 매 호출 함께 보냄
+- 스트리밍 (generate_content(stream=True): 텍스트 조각을 받는 대로 반환, 다 받으면 usage_metadata)
+- anthropic 패키지는 이 제공자를 쓸 때만 import (Gemini만 쓰는 환경에서는 없어도 됨)
+"""
+
+import os
+import logging
+
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from app.config import load_config
+
+# 환경변수 로드
+load_config()
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = os.getenv('ANTHROPIC_MODEL', 'claude-sonnet-4-5')
+
+# 응답 최대 토큰 수 (Messages API 필수 파라미터, 대본 JSON은 보통 1000토큰 안쪽)
+MAX_OUTPUT_TOKENS = int(os.getenv('ANTHROPIC_MAX_TOKENS', 4096))
+
+
+def _usage_metadata(usage) -> SimpleNamespace:
+    """Anthropic usage → Gemini usage_metadata 모양 (캐시에서 읽은 입력도 입력 토큰에 포함)"""
+    cached = getattr(usage, 'cache_read_input_tokens', 0) or 0
+    return SimpleNamespace(prompt_token_count=(getattr(usage, 'input_tokens', 0) or 0) + cached,
+                           cached_content_token_count=cached,
+                           candidates_token_count=getattr(usage, 'output_tokens', 0) or 0)
+
+
+class AnthropicStreamResponse:
+    """generate_content(stream=True) 응답 (반복하면 텍스트 조각, 다 받으면 usage_metadata)"""
+
+    def __init__(self, events):
+        self._events = events
+        self.usage_metadata = None
+
+    def __iter__(self):
+        input_tokens = cached = 0
+        for event in self._events:
+            if event.type == 'message_start':
+                input_tokens = event.message.usage.input_tokens
+                cached = getattr(event.message.usage, 'cache_read_input_tokens', 0) or 0
+            elif event.type == 'content_block_delta' and getattr(event.delta, 'type', '') == 'text_delta':
+                yield SimpleNamespace(text=event.delta.text)
+            elif event.type == 'message_delta':
+                usage = SimpleNamespace(input_tokens=input_tokens, cache_read_input_tokens=cached,
+                                        output_tokens=event.usage.output_tokens)
+                self.usage_metadata = _usage_metadata(usage)
+
+
+class AnthropicModel:
+    """
+    Claude 모델 (GenerativeModel과 같은 generate_content 인터페이스)
+
+    Usage:
+        model = AnthropicModel('claude-sonnet-4-5', system_instruction=SCRIPT_INSTRUCTION)
+        response = model.generate_content(prompt)
+        script = json.loads(response.text)
+    """
+
+    # call_gemini_api가 request_options={'timeout': ...}를 넘겨도 되는 모델
+    accepts_request_options = True
+
+    def __init__(self, model_name: str = MODEL_NAME, system_instruction: str = None, api_key: str = None,
+                 max_tokens: int = MAX_OUTPUT_TOKENS):
+        import anthropic
+
+        self.client = anthropic.Anthropic(api_key=api_key)
+        self.model_name = model_name
+        self.script_instruction = system_instruction
+        self.max_tokens = max_tokens
+
+    def _params(self, prompt: str, request_options: Optional[Dict]) -> Dict:
+        params = {
+            'model': self.model_name,
+            'max_tokens': self.max_tokens,
+            'messages': [{'role': 'user', 'content': prompt}],
+        }
+        if self.script_instruction:
+            params['system'] = self.script_instruction
+        timeout = (request_options or {}).get('timeout')
+        if timeout:
+            params['timeout'] = timeout
+        return params
+
+    def generate_content(self, prompt: str, stream: bool = False, request_options: Dict = None, **kwargs):
+        params = self._params(prompt, request_options)
+        if stream:
+            return AnthropicStreamResponse(self.client.messages.create(stream=True, **params))
+
+        message = self.client.messages.create(**params)
+        text = ''.join(block.text for block in message.content if getattr(block, 'type', '') == 'text')
+        return SimpleNamespace(text=text, usage_metadata=_usage_metadata(message.usage))
+
+
+def init_anthropic_api(system_instruction: str = None, model_name: str = None) -> AnthropicModel:
+    """
+    Anthropic API 클라이언트 초기화
+
+    Args:
+        system_instruction: 모든 호출에 공통인 지시문 (system 파라미터로 보냄)
+        model_name: 사용할 모델 (없으면 ANTHROPIC_MODEL)
+
+    Returns:
+        AnthropicModel 객체
+    """
+    api_key = os.getenv('ANTHROPIC_API_KEY')
+
+    if not api_key or api_key == 'your_api_key_here':
+        raise ValueError("❌ ANTHROPIC_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+
+    model = AnthropicModel(model_name or MODEL_NAME, system_instruction=system_instruction, api_key=api_key)
+    logger.info(f"✅ Anthropic API 초기화 완료 ({model.model_name})")
+    return model
@@ -0,0 +1,172 @@
+"""
+역할: 오프라인 테스트용 가짜 Gemini 모델
+포함 내용:
+- GenerativeModel.generate_content와 같은 모양으로 대본 JSON 응답을 돌려줌
+- 응답 지연, 분당 요청 한도(초과 시 429 RESOURCE_EXHAUSTED) 흉내
+- system instruction 흉내: 같은 instruction은 첫 호출 이후 캐시된 입력으로 처리
+  (입력 처리 지연에서 빠지고 usage_metadata.cached_content_token_count로 보고)
+- 여러 게시글 묶음 프롬프트면 post_id별 대본을 scripts 배열로 응답
+- 스트리밍 흉내 (generate_content(stream=True): 응답을 조각으로 나눠 조금씩 돌려줌)
+- LLM_FAKE=true(또는 LLM_PROVIDER=fake)면 init_llm_model()이 이 모델을 반환 (API 키 없이 전체 흐름 확인/처리량 측정)
+"""
+
+import json
+import time
+import logging
+import threading
+
+from collections import deque
+from types import SimpleNamespace
+
+from app.modules.llm.prompt.prompt_builder import BATCH_POST_PATTERN
+from app.modules.llm.prompt.token_counter import count_tokens
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeRateLimitError(Exception):
+    """google.api_core.exceptions.ResourceExhausted 대신 쓰는 429 오류"""
+
+    code = 429
+
+    def __init__(self, message: str = '429 RESOURCE_EXHAUSTED: Quota exceeded (fake)'):
+        super().__init__(message)
+
+
+class FakeGenerativeModel:
+    """
+    가짜 Gemini 모델 (스레드 안전)
+
+    Usage:
+        model = FakeGenerativeModel(latency=0.5, rpm_limit=30, system_instruction=SCRIPT_INSTRUCTION)
+        response = model.generate_content(prompt)
+        script = json.loads(response.text)
+    """
+
+    model_name = 'fake-gemini'
+
+    def __init__(self, latency: float = 0.5, rpm_limit: int = 0, window: float = 60.0,
+                 system_instruction: str = None, latency_per_1k_tokens: float = 0.0,
+                 chunk_size: int = 40, chunk_delay: float = 0.0):
+        """
+        Args:
+            latency: 응답 지연 (초)
+            rpm_limit: window초 동안 허용하는 요청 수 (0 이하면 제한 없음, 넘으면 FakeRateLimitError)
+            window: 요청 수를 세는 구간 (초, 테스트에서는 짧게)
+            system_instruction: 모든 호출에 공통으로 붙는 지시문 (init_gemini_api와 같은 의미)
+            latency_per_1k_tokens: 캐시되지 않은 입력 1000토큰당 추가 지연 (첫 토큰까지 걸리는 시간 흉내)
+            chunk_size: 스트리밍 응답 조각 크기 (글자)
+            chunk_delay: 조각 사이 지연 (출력 생성 시간 흉내, 스트리밍이 아니어도 전체 지연에 포함)
+        """
+        self.latency = latency
+        self.rpm_limit = rpm_limit
+        self.window = window
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.script_instruction = system_instruction
+        self._instruction_tokens = count_tokens(system_instruction or '')
+
+        self._sent = deque()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._instruction_cached = False
+
+        # 통계
+        self.stats = {'calls': 0, 'rejected': 0, 'peak_in_flight': 0, 'input_tokens': 0, 'cached_tokens': 0}
+
+    def _admit(self, prompt: str):
+        """요청 한도 확인 + 통계 기록 (한도를 넘으면 FakeRateLimitError)"""
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= self.window:
+                self._sent.popleft()
+            if self.rpm_limit > 0 and len(self._sent) >= self.rpm_limit:
+                self.stats['rejected'] += 1
+                raise FakeRateLimitError()
+            self._sent.append(now)
+            self.stats['calls'] += 1
+            self._in_flight += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self._in_flight)
+
+            # instruction은 처음 한 번만 처리하고 이후에는 캐시된 입력으로 취급
+            cached = self._instruction_tokens if self._instruction_cached else 0
+            self._instruction_cached = bool(self._instruction_tokens)
+            input_tokens = self._instruction_tokens + count_tokens(prompt)
+            self.stats['input_tokens'] += input_tokens
+            self.stats['cached_tokens'] += cached
+        return input_tokens, cached
+
+    def _finish(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _stream(self, chunks, first_delay: float):
+        try:
+            time.sleep(first_delay)
+            for index, chunk in enumerate(chunks):
+                if index:
+                    time.sleep(self.chunk_delay)
+                yield SimpleNamespace(text=chunk)
+        finally:
+            self._finish()
+
+    @staticmethod
+    def _script(prompt: str) -> dict:
+        title = next((line.split(':', 1)[1].strip() for line in prompt.splitlines()
+                      if line.strip().startswith('- 제목:')), '')
+        return {
+            'script_segments': [
+                {'role': 'narrator', 'text': f"{title} 소식입니다. 갤러리 분위기가 심상치 않습니다.", 'duration_estimate': 6},
+                {'role': 'comment', 'text': '가즈아!!', 'emotion': 'excitement'},
+                {'role': 'narrator', 'text': '시장은 또 한 번 흔들립니다.', 'duration_estimate': 5},
+            ],
+            'full_text_for_thumbnail': title[:15],
+        }
+
+    def _script_text(self, prompt: str) -> str:
+        # 묶음 프롬프트: post_id 구분선마다 대본 하나
+        sections = BATCH_POST_PATTERN.split(prompt)
+        if len(sections) > 1:
+            scripts = [dict(post_id=post_id, **self._script(section))
+                       for post_id, section in zip(sections[1::2], sections[2::2])]
+            return json.dumps({'scripts': scripts}, ensure_ascii=False)
+        return json.dumps(self._script(prompt), ensure_ascii=False)
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs) -> SimpleNamespace:
+        """
+        stream=True면 응답을 chunk_size 글자씩 나눠서 돌려주는 iterable (조각 사이 chunk_delay)
+
+        stream=False면 모든 조각이 만들어질 때까지 기다린 뒤 한 번에 반환
+        """
+        input_tokens, cached = self._admit(prompt)
+        first_delay = self.latency + (input_tokens - cached) / 1000 * self.latency_per_1k_tokens
+
+        text = self._script_text(prompt)
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        usage = SimpleNamespace(prompt_token_count=input_tokens, cached_content_token_count=cached,
+                                candidates_token_count=count_tokens(text))
+        if stream:
+            return FakeStreamResponse(self._stream(chunks, first_delay), usage)
+
+        try:
+            time.sleep(first_delay + (len(chunks) - 1) * self.chunk_delay)
+        finally:
+            self._finish()
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class FakeStreamResponse:
+    """generate_content(stream=True) 응답 흉내 (반복하면 조각, 끝나면 usage_metadata)"""
+
+    def __init__(self, chunks, usage_metadata):
+        self._chunks = chunks
+        self.usage_metadata = usage_metadata
+
+    def __iter__(self):
+        return iter(self._chunks)
@@ -3,19 +3,42 @@
 포함내용
 - API KEY 검증
 - genai.configure(api_key=api_key)
-- 모델 생성 (GenerativeModel)
+- 모델 생성 (GenerativeModel): 고정 지시문은 system instruction으로 한 번만 설정
+  (LLM_CONTEXT_CACHE=on이고 지시문이 최소 크기 이상이면 명시적 컨텍스트 캐시, 실패하면 system instruction)
+- LLM_FAKE=true면 오프라인용 가짜 모델 (fake_client.FakeGenerativeModel)
+- API 호출: 응답 캐시(llm_cache) 확인 → 리미터 슬롯 안에서 호출 (한도 초과 시 재시도) → 캐시 저장
+- 스트리밍 호출 (stream_gemini_api): 같은 캐시/리미터/재시도, 응답 조각을 받는 대로 반환
+- 호출 마감 시간(LLM_CALL_TIMEOUT) + 느린 호출 헤지 (hedging.call_with_deadline, LLM_HEDGE_MODEL로 헤지용 모델 지정)
+- 입력/캐시된 입력/출력 토큰 사용량 집계 (응답의 usage_metadata)
+- 호출 함수는 generate_content 인터페이스만 사용 (Anthropic 모델 / 가짜 모델 / 라우터도 그대로 사용, providers.py)
+  meta를 넘기면 실제로 응답한 모델 이름을 기록 (라우터/헤지 모델/캐시 적중 포함)
+- google.generativeai는 Gemini 모델을 만들 때만 import (가짜 모델 / Anthropic만 쓰면 import 비용 없음)
 - 로깅
 """
 
+from __future__ import annotations
+
 import logging
 import os
+import time
+import threading
+
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+from datetime import timedelta
+from contextlib import nullcontext
 
-import google.generativeai as genai
+from app.config import load_config
+from app.modules.llm.client import hedging, llm_cache
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.client.rate_limiter import AdaptiveRateLimiter, estimate_tokens, is_rate_limited
+from app.modules.llm.client.router import get_model_label
+from app.modules.llm.prompt.token_counter import count_tokens
 
-from dotenv import load_dotenv
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
 # 환경변수 로드
-load_dotenv()
+load_config()
 
 # 로깅 설정
 logging.basicConfig(
@@ -24,42 +47,286 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def init_gemini_api() -> genai.GenerativeModel:
+# 한도 초과(429) 응답 시 같은 프롬프트 재시도 횟수
+MAX_RATE_LIMIT_RETRIES = 3
+
+MODEL_NAME = os.getenv('GEMINI_MODEL', 'gemini-2.5-pro')
+
+# 명시적 컨텍스트 캐시를 만들 수 있는 최소 입력 토큰 수 (모델별 하한, 작으면 system instruction만 사용)
+CONTEXT_CACHE_MIN_TOKENS = int(os.getenv('LLM_CONTEXT_CACHE_MIN_TOKENS', 4096))
+
+_usage_lock = threading.Lock()
+_usage = {'calls': 0, 'input_tokens': 0, 'cached_tokens': 0, 'output_tokens': 0}
+
+
+def _create_model(system_instruction: Optional[str], model_name: str = MODEL_NAME) -> genai.GenerativeModel:
+    """지시문을 system instruction(또는 컨텍스트 캐시)으로 넣은 모델 생성"""
+    import google.generativeai as genai
+    from google.generativeai import caching
+
+    if not system_instruction:
+        model = genai.GenerativeModel(model_name)
+        model.script_instruction = None
+        model.accepts_request_options = True
+        return model
+
+    instruction_tokens = count_tokens(system_instruction)
+    if os.getenv('LLM_CONTEXT_CACHE', 'off').lower() == 'on' and instruction_tokens >= CONTEXT_CACHE_MIN_TOKENS:
+        try:
+            cached = caching.CachedContent.create(
+                model=model_name,
+                display_name='shorts-factory-script-instruction',
+                system_instruction=system_instruction,
+                ttl=timedelta(seconds=int(os.getenv('LLM_CONTEXT_CACHE_TTL', 3600)))
+            )
+            logger.info(f"🗄️ 컨텍스트 캐시 생성: {cached.name} (지시문 약 {instruction_tokens} 토큰)")
+            model = genai.GenerativeModel.from_cached_content(cached)
+            model.script_instruction = system_instruction
+            model.accepts_request_options = True
+            return model
+        except Exception as e:
+            logger.warning(f"⚠️ 컨텍스트 캐시 생성 실패, system instruction으로 대체: {e}")
+
+    model = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+    model.script_instruction = system_instruction
+    model.accepts_request_options = True
+    return model
+
+
+def init_gemini_api(system_instruction: str = None, model_name: str = None) -> genai.GenerativeModel:
     """
     Gemini API 클라이언트 초기화
 
+    Args:
+        system_instruction: 모든 호출에 공통인 지시문 (모델에 한 번만 설정, 호출마다 프롬프트로 보내지 않음)
+        model_name: 사용할 모델 (없으면 GEMINI_MODEL)
+
     Returns:
-        Gemini GenerativeModel 객체
+        Gemini GenerativeModel 객체 (script_instruction 속성에 설정한 지시문,
+        LLM_HEDGE_MODEL을 주면 hedge_model 속성에 같은 지시문의 헤지용 모델)
     """
+    if os.getenv('LLM_FAKE', 'false').lower() == 'true':
+        logger.info("🧪 가짜 Gemini 모델 사용 (LLM_FAKE=true)")
+        return FakeGenerativeModel(latency=float(os.getenv('LLM_FAKE_LATENCY', 0.5)),
+                                   system_instruction=system_instruction)
+
     api_key = os.getenv("GEMINI_API_KEY")
 
     if not api_key or api_key == 'your_api_key_here':
         raise ValueError("❌ GEMINI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
 
+    import google.generativeai as genai
+
     genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.5-pro')
+    model = _create_model(system_instruction, model_name or MODEL_NAME)
+    hedge_model_name = os.getenv('LLM_HEDGE_MODEL')
+    if hedge_model_name:
+        model.hedge_model = _create_model(system_instruction, hedge_model_name)
 
     logger.info("✅ Gemini API 초기화 완료")
     return model
 
 
-def call_gemini_api(model: genai.GenerativeModel, prompt: str) -> str:
+def close_gemini_model(model: genai.GenerativeModel):
+    """모델(과 헤지용 모델)이 쓰던 컨텍스트 캐시 삭제 (TTL까지 남겨두면 저장 비용이 계속 나감)"""
+    hedge_model = getattr(model, 'hedge_model', None)
+    if hedge_model is not None:
+        close_gemini_model(hedge_model)
+
+    cache_name = getattr(model, '_cached_content', None)
+    if not cache_name:
+        return
+    from google.generativeai import caching
+
+    try:
+        caching.CachedContent(cache_name).delete()
+        logger.info(f"🗄️ 컨텍스트 캐시 삭제: {cache_name}")
+    except Exception as e:
+        logger.warning(f"⚠️ 컨텍스트 캐시 삭제 실패 (TTL 후 자동 만료): {e}")
+
+
+def get_cache_key(model: genai.GenerativeModel, prompt: str) -> str:
+    """모델 이름 + 생성 설정 + 지시문 + 프롬프트로 응답 캐시 키 생성"""
+    config = {
+        'generation_config': getattr(model, '_generation_config', None),
+        'system_instruction': getattr(model, 'script_instruction', None),
+    }
+    return llm_cache.make_cache_key(getattr(model, 'model_name', ''), prompt, config)
+
+
+def invalidate_cached_response(model: genai.GenerativeModel, prompt: str):
+    """쓸 수 없는 응답(JSON 파싱 실패 등)을 캐시에서 제거"""
+    llm_cache.invalidate(get_cache_key(model, prompt))
+
+
+def replace_cached_response(model: genai.GenerativeModel, prompt: str, text: str, model_name: str = None):
+    """프롬프트의 캐시 응답을 다른 텍스트(복구된 JSON 등)로 교체 (model_name: 텍스트를 만든 모델)"""
+    llm_cache.store(get_cache_key(model, prompt), model_name or get_model_label(model), text)
+
+
+def _record_usage(response):
+    usage = getattr(response, 'usage_metadata', None)
+    with _usage_lock:
+        _usage['calls'] += 1
+        if usage is not None:
+            _usage['input_tokens'] += getattr(usage, 'prompt_token_count', 0) or 0
+            _usage['cached_tokens'] += getattr(usage, 'cached_content_token_count', 0) or 0
+            _usage['output_tokens'] += getattr(usage, 'candidates_token_count', 0) or 0
+
+
+def get_usage_stats() -> Dict[str, int]:
+    with _usage_lock:
+        return dict(_usage)
+
+
+def reset_usage_stats():
+    with _usage_lock:
+        for key in _usage:
+            _usage[key] = 0
+
+
+def log_usage_stats():
+    """토큰 사용량 출력 (캐시된 입력 비율 포함, 호출한 적 없으면 생략)"""
+    usage = get_usage_stats()
+    if not usage['calls']:
+        return
+    cached_rate = usage['cached_tokens'] / usage['input_tokens'] * 100 if usage['input_tokens'] else 0
+    logger.info(f"🔢 토큰 사용량: 호출 {usage['calls']}회, 입력 {usage['input_tokens']} "
+                f"(캐시 {usage['cached_tokens']}, {cached_rate:.0f}%), 출력 {usage['output_tokens']}")
+
+
+def _request_options(model, timeout: float) -> Dict:
+    """API 클라이언트 자체 timeout도 설정 (지원하는 모델만, 가짜/테스트 모델은 추가 인자 없이 호출)"""
+    if timeout and getattr(model, 'accepts_request_options', False):
+        return {'request_options': {'timeout': timeout}}
+    return {}
+
+
+def _generate(model: genai.GenerativeModel, prompt: str,
+              limiter: Optional[AdaptiveRateLimiter] = None) -> Tuple[str, str]:
+    """(응답 텍스트, 실제로 응답한 모델 이름)"""
+    timeout = hedging.get_call_timeout()
+
+    def request(target) -> Tuple[str, str]:
+        response = target.generate_content(prompt, **_request_options(target, timeout))
+        _record_usage(response)
+        return response.text.strip(), getattr(response, 'model_name', None) or get_model_label(target)
+
+    hedge_model = getattr(model, 'hedge_model', None) or model
+    try:
+        return hedging.call_with_deadline(lambda: request(model), timeout, hedge=lambda: request(hedge_model),
+                                          limiter=limiter, tokens=estimate_tokens(prompt))
+    except Exception as e:
+        logger.error(f"❌ Gemini API 호출 실패 : {e}")
+        raise
+
+
+def call_gemini_api(model: genai.GenerativeModel, prompt: str, limiter: Optional[AdaptiveRateLimiter] = None,
+                    meta: Dict = None) -> str:
     """
     Gemini API 를 호출하여 응답 텍스트를 반환
 
+    같은 모델/설정/프롬프트로 받은 응답이 캐시에 있으면 API를 호출하지 않는다 (리미터도 사용 안 함).
+    호출은 LLM_CALL_TIMEOUT 안에 끝나야 하고, LLM_HEDGE=on이면 느린 호출에 헤지 요청을 보낸다
+    (헤지 모델의 응답도 원래 요청의 응답으로 캐시).
+
     Args:
         model: 초기화된 GenerativeModel 객체
         prompt: 전달할 프롬프트 문자열
+        limiter: 여러 스레드가 함께 쓰는 호출 속도 제한 (없으면 바로 호출)
+        meta: 주면 'model'에 실제로 응답한 모델 이름을 기록
 
     Returns:
         API 응답 텍스트 (str)
 
     Raises:
+        hedging.LLMTimeoutError: 마감 시간 초과
         Exception: API 호출 실패 시
     """
-    try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        logger.error(f"❌ Gemini API 호출 실패 : {e}")
-        raise
\ No newline at end of file
+    cache_key = get_cache_key(model, prompt)
+    cached = llm_cache.lookup(cache_key)
+    if cached is not None:
+        text, model_name = cached
+        if meta is not None:
+            meta['model'] = model_name or get_model_label(model)
+        return text
+
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        # 리미터 슬롯은 call_with_deadline이 잡고, 요청을 실행하는 스레드가 끝날 때 반납
+        # (마감 시간이 지나 버려진 요청도 끝날 때까지 슬롯을 차지)
+        try:
+            text, model_name = _generate(model, prompt, limiter)
+        except Exception as e:
+            if limiter is None or not is_rate_limited(e) or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            # 리미터가 잠시 쉬게 한 뒤 재시도
+            limiter.throttled()
+            continue
+
+        if limiter:
+            limiter.succeeded()
+        llm_cache.store(cache_key, model_name, text)
+        if meta is not None:
+            meta['model'] = model_name
+        return text
+
+
+def stream_gemini_api(model: genai.GenerativeModel, prompt: str, limiter: Optional[AdaptiveRateLimiter] = None,
+                      meta: Dict = None) -> Iterator[str]:
+    """
+    Gemini API 를 스트리밍으로 호출하여 응답 조각을 받는 대로 반환
+
+    캐시/리미터/한도 초과 재시도는 call_gemini_api와 같다. 캐시에 있으면 전체 응답을 조각 1개로 반환하고,
+    다 받은 응답은 call_gemini_api와 같은 형태(앞뒤 공백 제거)로 캐시에 저장한다.
+    한도 초과 재시도는 첫 조각을 받기 전에 실패한 경우에만 한다 (이미 내보낸 조각을 되돌릴 수 없으므로).
+    마감 시간(LLM_CALL_TIMEOUT)은 API 클라이언트 timeout + 조각을 받을 때마다 확인 (헤지는 하지 않음).
+
+    Args:
+        model: 초기화된 GenerativeModel 객체
+        prompt: 전달할 프롬프트 문자열
+        limiter: 여러 스레드가 함께 쓰는 호출 속도 제한 (없으면 바로 호출, 스트림을 다 받을 때까지 슬롯 사용)
+        meta: 주면 'model'에 실제로 응답한 모델 이름을 기록
+
+    Yields:
+        응답 텍스트 조각
+    """
+    cache_key = get_cache_key(model, prompt)
+    cached = llm_cache.lookup(cache_key)
+    if cached is not None:
+        text, model_name = cached
+        if meta is not None:
+            meta['model'] = model_name or get_model_label(model)
+        yield text
+        return
+
+    timeout = hedging.get_call_timeout()
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        chunks = []
+        with limiter.slot(estimate_tokens(prompt)) if limiter else nullcontext():
+            started = time.monotonic()
+            try:
+                response = model.generate_content(prompt, stream=True, **_request_options(model, timeout))
+                for chunk in response:
+                    if timeout and time.monotonic() - started > timeout:
+                        hedging.record('timeouts')
+                        raise hedging.LLMTimeoutError(f"LLM 스트리밍 응답 마감 시간 초과 ({timeout:g}초)")
+                    text = chunk.text
+                    chunks.append(text)
+                    yield text
+            except Exception as e:
+                if chunks or limiter is None or not is_rate_limited(e) or attempt == MAX_RATE_LIMIT_RETRIES:
+                    logger.error(f"❌ Gemini API 스트리밍 호출 실패 : {e}")
+                    raise
+                limiter.throttled()
+                continue
+
+        if limiter:
+            limiter.succeeded()
+        hedging.record('calls')
+        hedging.latency.record(time.monotonic() - started)
+        _record_usage(response)
+        model_name = getattr(response, 'model_name', None) or get_model_label(model)
+        llm_cache.store(cache_key, model_name, ''.join(chunks).strip())
+        if meta is not None:
+            meta['model'] = model_name
+        return
@@ -0,0 +1,219 @@
+"""
+역할: LLM 호출 마감 시간(deadline) + 헤지 요청 + 지연 통계
+포함 내용:
+- 호출을 데몬 스레드에서 실행하고 마감 시간까지만 기다림 (멈춘 호출이 배치/프로세스를 붙잡지 않도록)
+- 헤지: 응답 없이 헤지 지연(고정값 또는 최근 p95)이 지나면 두 번째 요청을 보내고 먼저 끝난 쪽 사용
+  (늦은 쪽 결과는 버림, 헤지 요청 비율 상한 / 리미터에 여유가 없으면 헤지 안 함)
+- 리미터 슬롯은 요청을 실행하는 스레드가 끝날 때 반납 (마감 시간이 지나거나 헤지가 이겨서 버려진 요청도
+  실제로 끝날 때까지는 진행 중으로 계산 → 동시 호출 수 / 분당 한도를 넘지 않음)
+- 최근 호출 지연 p50/p95/p99, 타임아웃/헤지/헤지 승리 횟수 집계
+"""
+
+import os
+import time
+import logging
+import threading
+
+from collections import deque
+from typing import Callable, Dict, List, Optional, TypeVar
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from app.modules.llm.client.rate_limiter import AdaptiveRateLimiter
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_lock = threading.Lock()
+_stats = {'calls': 0, 'timeouts': 0, 'hedged': 0, 'hedge_wins': 0}
+
+
+class LLMTimeoutError(TimeoutError):
+    """마감 시간 안에 LLM 응답을 받지 못함"""
+
+
+class LatencyTracker:
+    """최근 size개 호출의 지연 시간 (스레드 안전)"""
+
+    def __init__(self, size: int = 500):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, ratio: float) -> Optional[float]:
+        """ratio(0~1) 분위 지연, 기록이 없으면 None"""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {'count': len(self), 'p50': self.percentile(0.5), 'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99)}
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+latency = LatencyTracker()
+
+
+def get_call_timeout() -> float:
+    """호출 1회 마감 시간 (LLM_CALL_TIMEOUT 초, 0이면 제한 없음)"""
+    return float(os.getenv('LLM_CALL_TIMEOUT', 120))
+
+
+def get_hedge_delay() -> Optional[float]:
+    """
+    헤지 요청을 보내기 전 기다릴 시간 (LLM_HEDGE=on일 때만)
+
+    LLM_HEDGE_DELAY를 주면 그 값, 아니면 최근 지연의 p95 (기록이 LLM_HEDGE_MIN_SAMPLES개 미만이면 헤지 안 함).
+    헤지 요청이 전체 호출의 LLM_HEDGE_MAX_RATIO를 넘으면 헤지 안 함 (장애 때 요청이 두 배가 되지 않도록).
+    """
+    if os.getenv('LLM_HEDGE', 'off').lower() != 'on':
+        return None
+
+    with _lock:
+        calls, hedged = _stats['calls'], _stats['hedged']
+    if calls and hedged / calls >= float(os.getenv('LLM_HEDGE_MAX_RATIO', 0.1)):
+        return None
+
+    fixed = float(os.getenv('LLM_HEDGE_DELAY', 0))
+    if fixed > 0:
+        return fixed
+    if len(latency) < int(os.getenv('LLM_HEDGE_MIN_SAMPLES', 20)):
+        return None
+    return latency.percentile(0.95)
+
+
+def _start(func: Callable[[], T], release: Callable[[], None] = None) -> Future:
+    """데몬 스레드에서 func 실행 (마감 시간이 지나 버려져도 프로세스 종료를 막지 않음)"""
+    future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run():
+        started = time.monotonic()
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            # 버려진 호출도 끝나면 기록 (늦은 응답이 빠지면 p95가 낮게 잡힘)
+            latency.record(time.monotonic() - started)
+            future.set_result(result)
+        finally:
+            if release:
+                release()
+
+    threading.Thread(target=run, name='llm-call', daemon=True).start()
+    return future
+
+
+def _first_success(futures: List[Future], deadline: Optional[float]) -> Optional[Future]:
+    """
+    성공한 첫 번째 Future (모두 실패하면 첫 번째)
+
+    Returns:
+        Future, 마감 시각(monotonic)까지 아무것도 성공하지 못하고 끝나지도 않았으면 None
+    """
+    pending = set(futures)
+    while pending:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        if not done:
+            return None
+        for future in futures:
+            if future in done and future.exception() is None:
+                return future
+    return futures[0]
+
+
+def call_with_deadline(primary: Callable[[], T], timeout: float = None, hedge: Callable[[], T] = None,
+                       limiter: Optional[AdaptiveRateLimiter] = None, tokens: int = 1) -> T:
+    """
+    마감 시간 안에서 호출 (헤지 설정 시 느리면 두 번째 요청)
+
+    Args:
+        primary: 원래 요청
+        timeout: 마감 시간 (초, 없으면 get_call_timeout(), 0이면 제한 없음)
+        hedge: 헤지 요청 (없으면 primary를 한 번 더)
+        limiter: 원래 요청의 슬롯을 기다려서 잡고, 헤지 요청은 바로 잡을 수 있을 때만 보냄
+            (두 슬롯 모두 요청이 실제로 끝날 때 반납, 호출하는 쪽에서 slot()으로 감싸지 않음)
+        tokens: 요청 1회의 토큰 수 (리미터용)
+
+    Returns:
+        먼저 성공한 요청의 결과
+
+    Raises:
+        LLMTimeoutError: 마감 시간 초과
+        Exception: 모든 요청이 실패하면 원래 요청의 오류
+    """
+    timeout = get_call_timeout() if timeout is None else timeout
+    record('calls')
+    if limiter:
+        limiter.acquire(tokens)
+    started = time.monotonic()
+    futures = [_start(primary, release=limiter.release if limiter else None)]
+
+    hedge_delay = get_hedge_delay()
+    if hedge_delay is not None and (not timeout or hedge_delay < timeout):
+        done, _ = wait(futures, timeout=hedge_delay)
+        if not done and (limiter is None or limiter.try_acquire(tokens)):
+            record('hedged')
+            logger.info(f"🪝 {hedge_delay:.1f}초 동안 응답 없음 → 헤지 요청")
+            futures.append(_start(hedge or primary, release=limiter.release if limiter else None))
+
+    winner = _first_success(futures, started + timeout if timeout else None)
+    if winner is None:
+        record('timeouts')
+        raise LLMTimeoutError(f"LLM 응답 없음 ({timeout:g}초 초과)")
+
+    if len(futures) > 1 and winner is futures[1]:
+        record('hedge_wins')
+    return winner.result()
+
+
+def record(event: str):
+    with _lock:
+        _stats[event] += 1
+
+
+def get_latency_stats() -> Dict:
+    with _lock:
+        stats = dict(_stats)
+    stats.update(latency.snapshot())
+    return stats
+
+
+def reset_latency_stats():
+    with _lock:
+        for event in _stats:
+            _stats[event] = 0
+    latency.clear()
+
+
+def log_latency_stats():
+    """지연 분포 + 타임아웃/헤지 통계 출력 (호출한 적 없으면 생략)"""
+    stats = get_latency_stats()
+    if not stats['calls']:
+        return
+    if stats['count']:
+        logger.info(f"⏱️ LLM 지연: p50 {stats['p50']:.2f}초, p95 {stats['p95']:.2f}초, p99 {stats['p99']:.2f}초 "
+                    f"(최근 {stats['count']}회)")
+    win_rate = stats['hedge_wins'] / stats['hedged'] * 100 if stats['hedged'] else 0
+    logger.info(f"⏱️ 호출 {stats['calls']}회, 타임아웃 {stats['timeouts']}회, "
+                f"헤지 {stats['hedged']}회 (헤지 승 {stats['hedge_wins']}회, {win_rate:.0f}%)")
@@ -0,0 +1,327 @@
+"""
+역할: LLM 응답 캐시 (같은 모델 + 같은 프롬프트 + 같은 생성 설정이면 API를 다시 호출하지 않음)
+포함 내용:
+- 키: (모델 이름, 프롬프트, 생성 설정)의 SHA-256
+- 저장소: 로컬 SQLite 파일(기본) 또는 MongoDB 컬렉션 (LLM_CACHE_BACKEND)
+- TTL이 지난 항목은 사용하지 않고 정리, 전체 용량이 한도를 넘으면 가장 오래 안 쓴 항목부터 삭제
+- LLM_CACHE_MODE: on(기본) / off(캐시 사용 안 함) / refresh(읽지 않고 새로 호출한 결과로 덮어씀)
+- 응답과 함께 실제로 응답을 만든 모델 이름 저장 (캐시 적중 시에도 대본에 기록)
+- 적중/미스 횟수 집계
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, IndexModel
+
+from app.modules.crawling.manager.connection_db import get_mongo_client
+from app.modules.crawling.manager.indexes import ensure_collection_indexes
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ('off', 'on', 'refresh')
+
+_lock = threading.Lock()
+_store = None
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0}
+
+# 저장소의 전체 크기를 다시 세는 주기 (초) - 그 사이에는 저장/삭제한 크기로 추정
+# (TTL로 지워진 항목 / 다른 프로세스가 저장한 항목은 다시 셀 때 반영)
+SIZE_RECOUNT_SECONDS = 300
+
+
+def get_cache_mode() -> str:
+    """캐시 모드 (LLM_CACHE_MODE: off / on / refresh)"""
+    mode = os.getenv('LLM_CACHE_MODE', 'on').lower()
+    return mode if mode in CACHE_MODES else 'on'
+
+
+def _ttl() -> float:
+    return float(os.getenv('LLM_CACHE_TTL', 7 * 86400))
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv('LLM_CACHE_MAX_MB', 50)) * 1024 * 1024)
+
+
+def make_cache_key(model_name: str, prompt: str, config: Dict = None) -> str:
+    """모델 이름 + 프롬프트 + 생성 설정으로 캐시 키 생성 (설정의 키 순서 무관)"""
+    payload = json.dumps({'model': model_name, 'prompt': prompt, 'config': config or {}},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SQLiteCacheStore:
+    """
+    로컬 SQLite 파일 저장소 (프로세스 내 스레드끼리 연결 1개를 잠금으로 공유)
+
+    전체 크기는 저장/삭제할 때마다 추정하고, 만료 항목 삭제 + 전체 집계는 다시 셀 때만 한다 (MongoCacheStore와 같음)
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS llm_cache ('
+            ' key TEXT PRIMARY KEY, model TEXT, response TEXT, size INTEGER,'
+            ' created_at REAL, accessed_at REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)')
+        self._lock = threading.Lock()
+        self._size = None  # 전체 응답 크기 추정치 (bytes, None이면 아직 안 셈)
+        self._counted_at = 0.0
+
+    def _add_size(self, delta: int):
+        # self._lock 안에서 호출
+        if self._size is not None:
+            self._size += delta
+
+    def _delete_row(self, key: str):
+        # self._lock 안에서 호출
+        row = self._conn.execute('SELECT size FROM llm_cache WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            self._conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+            self._add_size(-row[0])
+
+    def get(self, key: str, ttl: float) -> Optional[Tuple[str, str]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT response, model, created_at FROM llm_cache WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[2] >= ttl:
+                self._delete_row(key)
+                return None
+            self._conn.execute('UPDATE llm_cache SET accessed_at = ? WHERE key = ?', (now, key))
+            return row[0], row[1]
+
+    def put(self, key: str, model_name: str, response: str):
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            previous = self._conn.execute('SELECT size FROM llm_cache WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)',
+                (key, model_name, response, size, now, now)
+            )
+            self._add_size(size - (previous[0] if previous else 0))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._delete_row(key)
+
+    def evict(self, ttl: float, max_bytes: int) -> int:
+        """
+        용량 한도를 넘으면 가장 오래 안 쓴 항목부터 삭제
+
+        저장할 때마다 전체를 집계하지 않고 추정치로 판단한다. 추정치가 한도를 넘었거나
+        SIZE_RECOUNT_SECONDS가 지났을 때만 만료 항목을 지우고 다시 센다 (만료 항목은 조회 시에도 쓰지 않음).
+        """
+        with self._lock:
+            deleted = 0
+            if (self._size is None or self._size > max_bytes
+                    or time.monotonic() - self._counted_at >= SIZE_RECOUNT_SECONDS):
+                deleted = self._conn.execute('DELETE FROM llm_cache WHERE created_at <= ?',
+                                             (time.time() - ttl,)).rowcount
+                self._size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+                self._counted_at = time.monotonic()
+            if self._size <= max_bytes:
+                return deleted
+
+            victims = []
+            for key, size in self._conn.execute('SELECT key, size FROM llm_cache ORDER BY accessed_at'):
+                if self._size <= max_bytes:
+                    break
+                victims.append((key,))
+                self._size -= size
+            self._conn.executemany('DELETE FROM llm_cache WHERE key = ?', victims)
+            return deleted + len(victims)
+
+
+def cache_indexes(ttl: float) -> List[IndexModel]:
+    """MongoDB 캐시 컬렉션 인덱스 (created_at TTL은 LLM_CACHE_TTL에 따라 바뀜)"""
+    return [
+        IndexModel([('created_at', ASCENDING)], name='created_at_ttl', expireAfterSeconds=int(ttl)),
+        IndexModel([('accessed_at', ASCENDING)], name='accessed_at'),
+    ]
+
+
+class MongoCacheStore:
+    """MongoDB 컬렉션 저장소 (만료는 created_at TTL 인덱스가 처리, 전체 크기는 저장/삭제할 때마다 추정)"""
+
+    def __init__(self, db_name: str, ttl: float):
+        self.collection = get_mongo_client()[db_name]['llm_cache']
+        # LLM_CACHE_TTL이 바뀌면 TTL 인덱스를 다시 만듦 (같은 이름으로 create_index하면 IndexOptionsConflict)
+        ensure_collection_indexes(self.collection, cache_indexes(ttl))
+
+        self._lock = threading.Lock()
+        self._size = None  # 전체 응답 크기 추정치 (bytes, None이면 아직 안 셈)
+        self._counted_at = 0.0
+
+    def get(self, key: str, ttl: float) -> Optional[Tuple[str, str]]:
+        # TTL 인덱스는 1분 주기로 지우므로 조회 시에도 만료 확인
+        now = datetime.now()
+        doc = self.collection.find_one_and_update(
+            {'_id': key, 'created_at': {'$gt': now - timedelta(seconds=ttl)}},
+            {'$set': {'accessed_at': now}},
+            projection={'response': 1, 'model': 1}
+        )
+        return (doc['response'], doc.get('model', '')) if doc else None
+
+    def _add_size(self, delta: int):
+        with self._lock:
+            if self._size is not None:
+                self._size += delta
+
+    def put(self, key: str, model_name: str, response: str):
+        now = datetime.now()
+        size = len(response.encode('utf-8'))
+        previous = self.collection.find_one_and_replace({'_id': key}, {
+            'model': model_name, 'response': response, 'size': size,
+            'created_at': now, 'accessed_at': now,
+        }, projection={'size': 1}, upsert=True)
+        self._add_size(size - (previous or {}).get('size', 0))
+
+    def delete(self, key: str):
+        previous = self.collection.find_one_and_delete({'_id': key}, projection={'size': 1})
+        if previous:
+            self._add_size(-previous.get('size', 0))
+
+    def _count_size(self) -> int:
+        """컬렉션 전체 크기를 다시 세서 추정치 갱신"""
+        totals = list(self.collection.aggregate([{'$group': {'_id': None, 'size': {'$sum': '$size'}}}]))
+        total = totals[0]['size'] if totals else 0
+        with self._lock:
+            self._size = total
+            self._counted_at = time.monotonic()
+        return total
+
+    def evict(self, ttl: float, max_bytes: int) -> int:
+        """
+        용량 한도를 넘으면 가장 오래 안 쓴 항목부터 삭제
+
+        저장할 때마다 전체를 집계하지 않고 추정치로 판단한다. 추정치가 한도를 넘었거나
+        SIZE_RECOUNT_SECONDS가 지났을 때만 다시 센다.
+        """
+        with self._lock:
+            size = self._size
+            stale = size is None or time.monotonic() - self._counted_at >= SIZE_RECOUNT_SECONDS
+        if stale or size > max_bytes:
+            size = self._count_size()
+        if size <= max_bytes:
+            return 0
+
+        total = size
+        victims = []
+        for doc in self.collection.find({}, {'size': 1}).sort('accessed_at', ASCENDING):
+            if total <= max_bytes:
+                break
+            victims.append(doc['_id'])
+            total -= doc['size']
+        deleted = self.collection.delete_many({'_id': {'$in': victims}}).deleted_count
+        self._add_size(total - size)
+        return deleted
+
+
+def get_store():
+    """설정된 저장소 (LLM_CACHE_BACKEND: sqlite / mongo, 처음 호출할 때 생성)"""
+    global _store
+    with _lock:
+        if _store is None:
+            if os.getenv('LLM_CACHE_BACKEND', 'sqlite').lower() == 'mongo':
+                _store = MongoCacheStore(os.getenv('MONGO_DB_NAME', 'shorts_factory'), _ttl())
+            else:
+                _store = SQLiteCacheStore(os.getenv('LLM_CACHE_PATH', 'app/output/cache/llm_cache.sqlite3'))
+        return _store
+
+
+def lookup(key: str) -> Optional[Tuple[str, str]]:
+    """
+    캐시된 응답 조회 (off/refresh 모드에서는 항상 None)
+
+    저장소 오류는 미스로 처리 (캐시 때문에 대본 생성이 멈추지 않도록)
+
+    Returns:
+        (응답, 응답을 만든 모델 이름) 또는 None
+    """
+    if get_cache_mode() != 'on':
+        return None
+    try:
+        entry = get_store().get(key, _ttl())
+    except Exception as e:
+        logger.warning(f"⚠️ LLM 캐시 조회 실패: {e}")
+        entry = None
+
+    record('hits' if entry is not None else 'misses')
+    if entry is not None:
+        logger.info(f"💾 LLM 캐시 적중 ({key[:12]})")
+    return entry
+
+
+def store(key: str, model_name: str, response: str):
+    """응답 저장 후 만료/용량 초과 항목 정리 (off 모드에서는 저장 안 함)"""
+    if get_cache_mode() == 'off':
+        return
+    try:
+        backend = get_store()
+        backend.put(key, model_name, response)
+        record('stores')
+        evicted = backend.evict(_ttl(), _max_bytes())
+        if evicted:
+            record('evictions', evicted)
+    except Exception as e:
+        logger.warning(f"⚠️ LLM 캐시 저장 실패: {e}")
+
+
+def invalidate(key: str):
+    """잘못된 응답(파싱 실패 등)을 캐시에서 제거 → 다음 시도는 새로 호출"""
+    if get_cache_mode() == 'off':
+        return
+    try:
+        get_store().delete(key)
+        record('invalidations')
+    except Exception as e:
+        logger.warning(f"⚠️ LLM 캐시 삭제 실패: {e}")
+
+
+def record(event: str, count: int = 1):
+    with _lock:
+        _stats[event] += count
+
+
+def get_cache_stats() -> Dict[str, int]:
+    with _lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _lock:
+        for event in _stats:
+            _stats[event] = 0
+
+
+def log_cache_stats():
+    """캐시 사용 통계 출력 (사용한 적 없으면 생략)"""
+    stats = get_cache_stats()
+    if not any(stats.values()):
+        return
+    lookups = stats['hits'] + stats['misses']
+    hit_rate = stats['hits'] / lookups * 100 if lookups else 0
+    logger.info(f"💾 LLM 캐시: 적중 {stats['hits']}회, 미스 {stats['misses']}회 ({hit_rate:.0f}%), "
+                f"저장 {stats['stores']}회, 삭제 {stats['evictions']}개, 무효화 {stats['invalidations']}회")
@@ -0,0 +1,110 @@
+"""
+역할: LLM 제공자(Gemini / Anthropic / 가짜) 모델 생성
+포함 내용:
+- 모델 인터페이스(LLMModel): generate_content(prompt, stream=False) → 응답의 .text / .usage_metadata
+  (Gemini 응답 모양), model_name, script_instruction - call_gemini_api / 스트리밍 / 헤지가 이 인터페이스만 사용
+- LLM_ROUTES(제공자:모델 목록)로 모델 생성, 2개 이상이면 라우터(ModelRouter)로 묶음
+  (없으면 LLM_PROVIDER 하나, LLM_FAKE=true면 가짜 모델)
+- 모델 정리 (Gemini 컨텍스트 캐시 삭제), 라우터 통계 출력
+"""
+
+import os
+import logging
+
+from typing import Optional, Protocol
+
+from app.modules.llm.client.anthropic_client import init_anthropic_api
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.client.gemini_client import close_gemini_model, init_gemini_api
+from app.modules.llm.client.router import ModelRouter, Route, parse_routes
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ('gemini', 'anthropic', 'fake')
+
+
+class LLMModel(Protocol):
+    """대본 생성에 쓰는 모델 인터페이스 (genai.GenerativeModel / AnthropicModel / FakeGenerativeModel / ModelRouter)"""
+
+    model_name: str
+    script_instruction: Optional[str]
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        ...
+
+
+def create_model(provider: str, model_name: str = None, system_instruction: str = None) -> LLMModel:
+    """
+    제공자 이름으로 모델 생성
+
+    Args:
+        provider: gemini / anthropic / fake
+        model_name: 모델 이름 (없으면 제공자 기본값: GEMINI_MODEL / ANTHROPIC_MODEL)
+        system_instruction: 모든 호출에 공통인 지시문
+
+    Raises:
+        ValueError: 지원하지 않는 제공자, API 키 없음
+    """
+    if provider == 'gemini':
+        return init_gemini_api(system_instruction=system_instruction, model_name=model_name)
+    if provider == 'anthropic':
+        return init_anthropic_api(system_instruction=system_instruction, model_name=model_name)
+    if provider == 'fake':
+        model = FakeGenerativeModel(latency=float(os.getenv('LLM_FAKE_LATENCY', 0.5)),
+                                    system_instruction=system_instruction)
+        if model_name:
+            model.model_name = model_name
+        return model
+    raise ValueError(f"❌ 지원하지 않는 LLM 제공자: {provider} ({'/'.join(PROVIDERS)} 중 하나)")
+
+
+def init_llm_model(system_instruction: str = None) -> LLMModel:
+    """
+    환경변수로 대본 생성 모델 초기화
+
+    LLM_ROUTES에 모델이 2개 이상이면 라우터로 묶는다. 초기화에 실패한 모델(API 키 없음 등)은 빼고,
+    하나도 남지 않으면 오류.
+
+    Args:
+        system_instruction: 모든 호출에 공통인 지시문
+
+    Returns:
+        모델 또는 ModelRouter
+    """
+    if os.getenv('LLM_FAKE', 'false').lower() == 'true':
+        logger.info("🧪 가짜 LLM 모델 사용 (LLM_FAKE=true)")
+        return create_model('fake', system_instruction=system_instruction)
+
+    specs = parse_routes(os.getenv('LLM_ROUTES') or os.getenv('LLM_PROVIDER', 'gemini'))
+    if len(specs) == 1:
+        provider, model_name, _ = specs[0]
+        return create_model(provider, model_name, system_instruction)
+
+    routes = []
+    for provider, model_name, price in specs:
+        try:
+            routes.append(Route(provider, create_model(provider, model_name, system_instruction), price))
+        except Exception as e:
+            logger.warning(f"⚠️ {provider}:{model_name or '기본 모델'} 초기화 실패, 라우터에서 제외: {e}")
+
+    router = ModelRouter(routes)
+    logger.info(f"🔀 LLM 라우터 사용: {', '.join(route.name for route in routes)}")
+    return router
+
+
+def close_llm_model(model: LLMModel):
+    """모델(라우터면 모든 모델)이 쓰던 자원 정리"""
+    for route in getattr(model, 'routes', None) or []:
+        close_gemini_model(route.model)
+    close_gemini_model(model)
+
+
+def log_model_stats(model: LLMModel):
+    """라우터면 모델별 호출 통계 출력"""
+    if isinstance(model, ModelRouter):
+        model.log_stats()
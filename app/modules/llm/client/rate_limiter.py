@@ -0,0 +1,181 @@
+"""
+역할: LLM API 호출 속도 제한 (분당 요청 수 / 분당 토큰 수 + 적응형 동시 호출 수)
+포함 내용:
+- 최근 60초 동안 보낸 요청 수(RPM)와 토큰 수(TPM)를 기록해서 한도를 넘지 않게 대기
+- 동시 호출 수는 AIMD로 조절: 성공하면 조금씩 늘리고, 429/RESOURCE_EXHAUSTED면 절반으로 줄이고 잠시 쉼
+- 한도 초과 오류 판별 (is_rate_limited)
+"""
+
+import time
+import logging
+import threading
+
+from typing import Optional
+from collections import deque
+from contextlib import contextmanager
+
+from app.modules.llm.prompt.token_counter import count_tokens
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """TPM 계산용 토큰 수 (token_counter.count_tokens 추정치, 최소 1)"""
+    return max(1, count_tokens(text))
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """429 / RESOURCE_EXHAUSTED 같은 한도 초과 오류인지"""
+    if getattr(error, 'code', None) == 429:
+        return True
+    name = type(error).__name__
+    if name in ('ResourceExhausted', 'TooManyRequests'):
+        return True
+    message = str(error)
+    return '429' in message or 'RESOURCE_EXHAUSTED' in message
+
+
+class AdaptiveRateLimiter:
+    """
+    분당 요청/토큰 한도 + 적응형 동시 호출 수 리미터
+
+    Usage:
+        limiter = AdaptiveRateLimiter(rpm=60, tpm=1_000_000, max_concurrent=8)
+        with limiter.slot(estimate_tokens(prompt)):
+            try:
+                response = call_api(prompt)
+            except Exception as e:
+                if is_rate_limited(e):
+                    limiter.throttled()
+                raise
+            limiter.succeeded()
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, max_concurrent: int = 4, initial_concurrent: int = None,
+                 backoff: float = 5.0, max_backoff: float = 60.0, window: float = 60.0, name: str = 'llm'):
+        """
+        Args:
+            rpm: 분당 최대 요청 수 (0 이하면 제한 없음)
+            tpm: 분당 최대 토큰 수 (0 이하면 제한 없음)
+            max_concurrent: 동시 호출 수 상한
+            initial_concurrent: 시작 동시 호출 수 (기본: 상한의 절반)
+            backoff: 한도 초과 시 첫 대기 시간 (초, 연속으로 초과하면 2배씩 증가)
+            max_backoff: 최대 대기 시간 (초)
+            window: 요청/토큰 수를 세는 구간 (초, 분당 한도면 60)
+            name: 로그용 이름
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrent = max(1, max_concurrent)
+        self.concurrency = float(initial_concurrent or max(1, self.max_concurrent // 2))
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+        self.window = window
+        self.name = name
+
+        self._sent = deque()  # (보낸 시각, 토큰 수)
+        self._sent_tokens = 0
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._backoff = backoff
+        self._cond = threading.Condition()
+
+        # 통계
+        self.stats = {'requests': 0, 'tokens': 0, 'throttled': 0, 'wait': 0.0, 'peak_concurrency': 0}
+
+    def _trim(self, now: float):
+        while self._sent and now - self._sent[0][0] >= self.window:
+            _, tokens = self._sent.popleft()
+            self._sent_tokens -= tokens
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        """지금 보낼 수 없으면 기다릴 시간 (초), 보낼 수 있으면 0 (_cond 안에서 호출)"""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self.concurrency):
+            return self.window  # 슬롯이 비면 notify로 깨어남
+
+        self._trim(now)
+        if self.rpm > 0 and len(self._sent) >= self.rpm:
+            return self._sent[0][0] + self.window - now
+        if self.tpm > 0 and self._sent and self._sent_tokens + tokens > self.tpm:
+            # 오래된 요청이 빠질 때까지 (요청 1개가 한도보다 크면 창이 빌 때 보냄)
+            return self._sent[0][0] + self.window - now
+        return 0.0
+
+    def _take(self, tokens: int, now: float, started: float):
+        """슬롯 사용 기록 (_cond 안에서 호출)"""
+        self._sent.append((now, tokens))
+        self._sent_tokens += tokens
+        self._in_flight += 1
+        self.stats['requests'] += 1
+        self.stats['tokens'] += tokens
+        self.stats['wait'] += now - started
+        self.stats['peak_concurrency'] = max(self.stats['peak_concurrency'], self._in_flight)
+
+    def acquire(self, tokens: int = 1):
+        """호출 슬롯 획득 (한도에 여유가 생길 때까지 대기)"""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(tokens, now)
+                if wait <= 0:
+                    break
+                self._cond.wait(wait)
+            self._take(tokens, now, started)
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """지금 바로 보낼 수 있을 때만 슬롯 획득 (기다리지 않음, 헤지 요청용)"""
+        with self._cond:
+            now = time.monotonic()
+            if self._wait_time(tokens, now) > 0:
+                return False
+            self._take(tokens, now, now)
+            return True
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, tokens: int = 1):
+        """슬롯을 잡은 상태로 호출 (끝나면 반납)"""
+        self.acquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def succeeded(self):
+        """호출 성공 → 동시 호출 수를 조금 늘림 (현재 동시 수만큼 성공하면 +1)"""
+        with self._cond:
+            self.concurrency = min(self.max_concurrent, self.concurrency + 1 / self.concurrency)
+            self._backoff = self.base_backoff
+            self._cond.notify_all()
+
+    def throttled(self, retry_after: Optional[float] = None):
+        """한도 초과 응답 → 동시 호출 수 절반 + 잠시 전체 호출 중단"""
+        with self._cond:
+            self.stats['throttled'] += 1
+            now = time.monotonic()
+            if now < self._paused_until:
+                # 같은 시점에 보낸 호출들이 함께 실패한 경우 → 한 번만 줄임
+                return
+            self.concurrency = max(1.0, self.concurrency / 2)
+            pause = retry_after if retry_after is not None else self._backoff
+            self._paused_until = now + pause
+            self._backoff = min(self.max_backoff, self._backoff * 2)
+            logger.warning(f"⏳ [{self.name}] 한도 초과 응답, {pause:.1f}초 대기 후 동시 {int(self.concurrency)}개로 재시도")
+
+    def log_stats(self):
+        """리미터 사용 통계 출력"""
+        logger.info(f"🚦 [{self.name}] 요청 {self.stats['requests']}회, 토큰 약 {self.stats['tokens']}개, "
+                    f"한도 초과 {self.stats['throttled']}회, 누적 대기 {self.stats['wait']:.1f}초, "
+                    f"최대 동시 {self.stats['peak_concurrency']}개 (분당 요청 {self.rpm or '∞'}, 분당 토큰 {self.tpm or '∞'})")
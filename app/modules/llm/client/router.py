@@ -0,0 +1,271 @@
+"""
+역할: 여러 LLM 모델(제공자) 중에서 요청마다 하나를 고르는 라우터
+포함 내용:
+- 모델마다 최근 지연(지수 이동 평균), 오류율, 평균 출력 토큰 수, 누적 비용 기록
+- 점수 = (예상 비용 + 지연 1초의 가치 × 예상 지연) / 성공 확률 → 점수가 낮은 모델부터 시도
+  (가끔 다른 모델도 시도해서 지연 기록을 최신으로 유지, LLM_ROUTER_EXPLORE)
+- 호출이 실패하면 다음 모델로 바로 전환, 연속으로 실패한 모델은 잠시 제외 (LLM_ROUTER_COOLDOWN 후 다시 시도)
+- 라우터도 generate_content(prompt, stream=False) 인터페이스라서 call_gemini_api / 스트리밍 / 헤지에 그대로 사용
+  (응답의 model_name에 실제로 응답한 모델 이름)
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+
+from typing import Dict, List, Optional, Tuple
+
+from app.modules.llm.prompt.token_counter import count_tokens
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 모델별 가격 (USD / 입력·출력 100만 토큰, 공개 가격표 기준, LLM_ROUTES에서 모델@입력/출력으로 덮어씀)
+MODEL_PRICES = {
+    'gemini-2.5-pro': (1.25, 10.0),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'claude-sonnet-4-5': (3.0, 15.0),
+    'claude-haiku-4-5': (1.0, 5.0),
+    'fake-gemini': (0.0, 0.0),
+}
+
+# 기록이 없는 모델의 예상 지연 (초) / 예상 출력 토큰 수
+DEFAULT_LATENCY = 20.0
+DEFAULT_OUTPUT_TOKENS = 800
+# 지수 이동 평균에서 새 기록의 비중
+EWMA_WEIGHT = 0.2
+# 연속으로 이만큼 실패하면 잠시 제외
+FAILURE_THRESHOLD = 3
+
+
+def get_model_label(model) -> str:
+    """모델 이름 ('models/gemini-2.5-pro' → 'gemini-2.5-pro')"""
+    name = getattr(model, 'model_name', '') or ''
+    return name.split('/', 1)[1] if name.startswith('models/') else name
+
+
+def get_model_price(model_name: str) -> Tuple[float, float]:
+    """가격표에서 모델 가격 찾기 (버전 접미사가 붙은 이름은 앞부분으로, 없으면 0)"""
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model_name.startswith(name):
+            return MODEL_PRICES[name]
+    logger.warning(f"⚠️ {model_name} 가격 정보 없음 (비용 0으로 계산)")
+    return 0.0, 0.0
+
+
+class Route:
+    """라우터가 고를 수 있는 모델 1개 + 관측 통계"""
+
+    def __init__(self, provider: str, model, price: Tuple[float, float] = None):
+        self.provider = provider
+        self.model = model
+        self.model_name = get_model_label(model)
+        self.name = f"{provider}:{self.model_name}"
+        self.input_price, self.output_price = price or get_model_price(self.model_name)
+
+        self.latency = None  # 지연 지수 이동 평균 (초)
+        self.error_rate = 0.0  # 오류율 지수 이동 평균
+        self.output_tokens = DEFAULT_OUTPUT_TOKENS
+        self.failures = 0  # 연속 실패 횟수
+        self.open_until = 0.0  # 이 시각(monotonic)까지 제외
+
+        # 통계
+        self.stats = {'calls': 0, 'errors': 0, 'input_tokens': 0, 'output_tokens': 0, 'cost': 0.0}
+
+    def expected_cost(self, input_tokens: int) -> float:
+        return (input_tokens * self.input_price + self.output_tokens * self.output_price) / 1_000_000
+
+
+class RoutedResponse:
+    """고른 모델의 응답 + 실제로 응답한 모델 이름 (스트리밍이면 반복하면 조각)"""
+
+    def __init__(self, response, model_name: str, chunks=None):
+        self._response = response
+        self._chunks = chunks
+        self.model_name = model_name
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    @property
+    def usage_metadata(self):
+        return getattr(self._response, 'usage_metadata', None)
+
+    def __iter__(self):
+        return iter(self._chunks if self._chunks is not None else [self._response])
+
+
+class ModelRouter:
+    """
+    지연 / 오류율 / 비용을 보고 요청마다 모델을 고르는 라우터 (스레드 안전)
+
+    Usage:
+        router = ModelRouter([Route('gemini', gemini_model), Route('anthropic', claude_model)])
+        response = router.generate_content(prompt)
+        print(response.model_name, response.text)
+    """
+
+    # call_gemini_api가 request_options={'timeout': ...}를 넘겨도 되는 모델 (지원하는 모델에만 전달)
+    accepts_request_options = True
+
+    def __init__(self, routes: List[Route], latency_value: float = None, explore: float = None,
+                 cooldown: float = None):
+        """
+        Args:
+            routes: 고를 수 있는 모델 (같은 지시문으로 생성)
+            latency_value: 호출 1회의 지연 1초를 줄이는 데 낼 수 있는 비용 (USD, 없으면 LLM_ROUTER_LATENCY_VALUE)
+            explore: 점수와 관계없이 다른 모델을 먼저 시도하는 비율 (없으면 LLM_ROUTER_EXPLORE)
+            cooldown: 연속으로 실패한 모델을 제외하는 시간 (초, 없으면 LLM_ROUTER_COOLDOWN)
+        """
+        if not routes:
+            raise ValueError("❌ 라우터에 사용할 모델이 없습니다.")
+        self.routes = routes
+        self.latency_value = float(os.getenv('LLM_ROUTER_LATENCY_VALUE', 0.001)) \
+            if latency_value is None else latency_value
+        self.explore = float(os.getenv('LLM_ROUTER_EXPLORE', 0.05)) if explore is None else explore
+        self.cooldown = float(os.getenv('LLM_ROUTER_COOLDOWN', 60)) if cooldown is None else cooldown
+
+        # 응답 캐시 키 / 지시문 확인용 (어느 모델이 응답해도 같은 요청으로 취급)
+        self.model_name = 'router:' + ','.join(sorted(route.name for route in routes))
+        self.script_instruction = getattr(routes[0].model, 'script_instruction', None)
+        self._instruction_tokens = count_tokens(self.script_instruction or '')
+        self._lock = threading.Lock()
+
+    def score(self, route: Route, input_tokens: int) -> float:
+        """예상 비용 + 지연의 가치를 성공 확률로 나눈 값 (낮을수록 먼저 시도)"""
+        latency = DEFAULT_LATENCY if route.latency is None else route.latency
+        success = max(0.05, 1.0 - route.error_rate)
+        return (route.expected_cost(input_tokens) + self.latency_value * latency) / success
+
+    def order(self, input_tokens: int) -> List[Route]:
+        """시도할 순서 (제외 중인 모델은 다른 모델이 모두 실패했을 때만 마지막으로)"""
+        now = time.monotonic()
+        with self._lock:
+            available = sorted((route for route in self.routes if route.open_until <= now),
+                               key=lambda route: self.score(route, input_tokens))
+            excluded = sorted((route for route in self.routes if route.open_until > now),
+                              key=lambda route: route.open_until)
+        if len(available) > 1 and random.random() < self.explore:
+            available.insert(0, available.pop(random.randrange(1, len(available))))
+        return available + excluded
+
+    def _succeeded(self, route: Route, seconds: float, usage):
+        input_tokens = getattr(usage, 'prompt_token_count', 0) or 0
+        output_tokens = getattr(usage, 'candidates_token_count', 0) or 0
+        with self._lock:
+            route.latency = seconds if route.latency is None else \
+                route.latency + EWMA_WEIGHT * (seconds - route.latency)
+            route.error_rate -= EWMA_WEIGHT * route.error_rate
+            route.failures = 0
+            route.open_until = 0.0
+            if output_tokens:
+                route.output_tokens += EWMA_WEIGHT * (output_tokens - route.output_tokens)
+            route.stats['calls'] += 1
+            route.stats['input_tokens'] += input_tokens
+            route.stats['output_tokens'] += output_tokens
+            route.stats['cost'] += (input_tokens * route.input_price + output_tokens * route.output_price) / 1_000_000
+
+    def _failed(self, route: Route, error: Exception):
+        with self._lock:
+            route.error_rate += EWMA_WEIGHT * (1.0 - route.error_rate)
+            route.failures += 1
+            route.stats['calls'] += 1
+            route.stats['errors'] += 1
+            if route.failures >= FAILURE_THRESHOLD:
+                route.open_until = time.monotonic() + self.cooldown
+        if route.failures >= FAILURE_THRESHOLD:
+            logger.warning(f"🚧 {route.name} 연속 {route.failures}회 실패 → {self.cooldown:g}초 동안 제외")
+
+    def _stream(self, route: Route, response, started: float):
+        """첫 조각은 이미 받은 상태에서 나머지 조각 반환 (다 받으면 성공 기록, 중간에 끊기면 실패 기록)"""
+        chunks = iter(response)
+        first = next(chunks, None)
+
+        def generate():
+            try:
+                if first is not None:
+                    yield first
+                yield from chunks
+            except Exception as e:
+                self._failed(route, e)
+                raise
+            self._succeeded(route, time.monotonic() - started, getattr(response, 'usage_metadata', None))
+
+        return generate()
+
+    def generate_content(self, prompt: str, stream: bool = False, request_options: Dict = None, **kwargs):
+        """
+        점수가 낮은 모델부터 호출 (실패하면 다음 모델)
+
+        스트리밍은 첫 조각을 받기 전에 실패한 경우에만 다음 모델로 전환한다.
+
+        Returns:
+            RoutedResponse (model_name: 실제로 응답한 모델)
+
+        Raises:
+            Exception: 모든 모델이 실패하면 마지막 오류
+        """
+        input_tokens = self._instruction_tokens + count_tokens(prompt)
+        error = None
+        for route in self.order(input_tokens):
+            options = {'request_options': request_options} \
+                if request_options and getattr(route.model, 'accepts_request_options', False) else {}
+            started = time.monotonic()
+            try:
+                if stream:
+                    response = route.model.generate_content(prompt, stream=True, **options)
+                    return RoutedResponse(response, route.model_name, self._stream(route, response, started))
+                response = route.model.generate_content(prompt, **options)
+            except Exception as e:
+                self._failed(route, e)
+                error = e
+                logger.warning(f"🔀 {route.name} 호출 실패, 다음 모델로 전환: {e}")
+                continue
+
+            self._succeeded(route, time.monotonic() - started, getattr(response, 'usage_metadata', None))
+            return RoutedResponse(response, route.model_name)
+        raise error
+
+    def get_stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {route.name: dict(route.stats, latency=route.latency, error_rate=route.error_rate)
+                    for route in self.routes}
+
+    def log_stats(self):
+        """모델별 호출 수 / 오류 / 평균 지연 / 비용 출력"""
+        for name, stats in self.get_stats().items():
+            latency = f"{stats['latency']:.1f}초" if stats['latency'] is not None else '-'
+            logger.info(f"🔀 {name}: 호출 {stats['calls']}회 (오류 {stats['errors']}회), 지연 {latency}, "
+                        f"비용 ${stats['cost']:.4f}")
+
+
+def parse_routes(spec: str) -> List[Tuple[str, Optional[str], Optional[Tuple[float, float]]]]:
+    """
+    LLM_ROUTES 문자열 해석
+
+    형식: '제공자[:모델][@입력가격/출력가격]'을 쉼표로 나열 (가격은 USD / 100만 토큰)
+    예: 'gemini:gemini-2.5-pro, anthropic:claude-sonnet-4-5, gemini:gemini-2.5-flash@0.3/2.5'
+
+    Returns:
+        (제공자, 모델 이름 또는 None, 가격 또는 None) 리스트
+    """
+    routes = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        price = None
+        if '@' in item:
+            item, price_text = item.split('@', 1)
+            input_price, output_price = price_text.split('/', 1)
+            price = (float(input_price), float(output_price))
+        provider, _, model_name = item.partition(':')
+        routes.append((provider.strip().lower(), model_name.strip() or None, price))
+    return routes
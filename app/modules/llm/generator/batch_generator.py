@@ -0,0 +1,163 @@
+"""
+역할: 여러 게시글을 한 번의 요청으로 대본 생성 (LLM_POSTS_PER_REQUEST > 1일 때)
+포함 내용:
+- 묶음 토큰 예산(PROMPT_BATCH_TOKEN_BUDGET) / 요청당 최대 게시글 수 안에서 게시글 묶기
+  (고정 지시문은 묶음당 한 번이므로 게시글이 짧을수록 한 요청에 많이 들어감)
+- 응답의 scripts 배열을 post_id별로 나눠서 각각 검증 (response_parser.parse_batch_response)
+- 응답에 없거나 형식이 잘못된 게시글만 한 건씩 다시 요청 (generate_script_with_gemini)
+- 묶음 요청 수 / 묶음으로 처리한 게시글 수 / 한 건씩 재요청한 게시글 수 집계
+"""
+
+from __future__ import annotations
+
+import os
+import logging
+import threading
+
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.modules.llm.prompt.prompt_builder import (BATCH_FIXED_TOKENS, SCRIPT_INSTRUCTION, batch_part_tokens,
+                                                   build_batch_prompt, build_script_prompt, get_batch_token_budget)
+from app.modules.llm.client.gemini_client import call_gemini_api, invalidate_cached_response
+from app.modules.llm.client.rate_limiter import AdaptiveRateLimiter
+from app.modules.llm.client.router import get_model_label
+from app.modules.llm.generator import response_parser
+from app.modules.llm.generator.response_parser import ScriptParseError
+from app.modules.llm.generator.script_generator import add_script_metadata, generate_script_with_gemini
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 묶음에 넣는 게시글 1개: (게시글, 게시글 부분 프롬프트, 토큰 리포트)
+PostPrompt = Tuple[Dict, str, Dict]
+
+_lock = threading.Lock()
+_stats = {'requests': 0, 'posts': 0, 'retried': 0}
+
+
+def get_posts_per_request() -> int:
+    """요청 1회에 넣는 최대 게시글 수 (LLM_POSTS_PER_REQUEST, 1이면 묶지 않음)"""
+    return max(1, int(os.getenv('LLM_POSTS_PER_REQUEST', 1)))
+
+
+def iter_post_batches(posts: Iterable[Dict], max_posts: int = None, budget: int = None) -> Iterator[List[PostPrompt]]:
+    """
+    게시글을 읽으면서 토큰 예산 안에 들어가는 만큼씩 묶기
+
+    게시글마다 build_script_prompt로 한 건씩 요청할 때와 같은 예산으로 줄인 뒤, 묶음 전체가
+    budget을 넘기 전까지 (최대 max_posts개) 채운다. 혼자서 예산을 넘는 게시글은 1개짜리 묶음.
+
+    Args:
+        posts: 게시글 (커서 그대로 가능)
+        max_posts: 묶음당 최대 게시글 수 (없으면 LLM_POSTS_PER_REQUEST)
+        budget: 묶음 전체 토큰 예산 (없으면 PROMPT_BATCH_TOKEN_BUDGET, 0이면 제한 없음)
+
+    Yields:
+        (게시글, 게시글 부분 프롬프트, 토큰 리포트) 리스트
+    """
+    max_posts = get_posts_per_request() if max_posts is None else max_posts
+    budget = get_batch_token_budget() if budget is None else budget
+
+    batch = []
+    used = BATCH_FIXED_TOKENS
+    for post in posts:
+        part, report = build_script_prompt(post, include_instruction=False)
+        tokens = batch_part_tokens(post, report)
+        if batch and (len(batch) >= max_posts or (budget and used + tokens > budget)):
+            yield batch
+            batch = []
+            used = BATCH_FIXED_TOKENS
+        batch.append((post, part, report))
+        used += tokens
+    if batch:
+        yield batch
+
+
+def generate_batch_with_gemini(model: genai.GenerativeModel, batch: List[PostPrompt],
+                               limiter: AdaptiveRateLimiter = None) -> List[Tuple[Dict, Optional[Dict]]]:
+    """
+    게시글 묶음을 한 번의 요청으로 대본 생성 (실패한 게시글만 한 건씩 재요청)
+
+    Args:
+        model: Gemini GenerativeModel 객체
+        batch: iter_post_batches()가 만든 묶음
+        limiter: 여러 스레드가 함께 쓰는 호출 속도 제한 (없으면 바로 호출)
+
+    Returns:
+        (게시글, 대본 또는 None) 리스트 (묶음 순서대로)
+    """
+    if len(batch) == 1:
+        post = batch[0][0]
+        return [(post, generate_script_with_gemini(model, post, limiter=limiter))]
+
+    # 모델이 지시문을 이미 갖고 있으면 게시글 부분만 보냄 (없으면 지시문을 앞에 붙임)
+    has_instruction = getattr(model, 'script_instruction', None) == SCRIPT_INSTRUCTION
+    prompt = build_batch_prompt([(post, part) for post, part, _ in batch], include_instruction=not has_instruction)
+    post_ids = [str(post.get('post_id')) for post, _, _ in batch]
+    batch_tokens = BATCH_FIXED_TOKENS + sum(batch_part_tokens(post, report) for post, _, report in batch)
+
+    logger.info(f"📦 게시글 {len(batch)}개 묶음 대본 생성 시작 ({batch_tokens} 토큰)")
+    scripts, errors, salvaged = {}, {}, False
+    meta = {}
+    try:
+        script_text = call_gemini_api(model, prompt, limiter=limiter, meta=meta)
+        scripts, errors, salvaged = response_parser.parse_batch_response(script_text, post_ids)
+    except ScriptParseError as e:
+        errors = {post_id: e.errors for post_id in post_ids}
+    except Exception as e:
+        errors = {post_id: [str(e)] for post_id in post_ids}
+
+    if errors:
+        # 일부라도 잘못된 응답은 캐시에서 다시 나오지 않도록
+        invalidate_cached_response(model, prompt)
+    record('requests')
+    record('posts', len(scripts))
+
+    results = []
+    for (post, _, report), post_id in zip(batch, post_ids):
+        script_data = scripts.get(post_id)
+        if script_data is None:
+            logger.warning(f"⚠️ [{post_id}] 묶음 응답 사용 불가 ({', '.join(errors[post_id][:3])}) → 한 건씩 재요청")
+            record('retried')
+            results.append((post, generate_script_with_gemini(model, post, limiter=limiter)))
+            continue
+
+        response_parser.record('salvaged' if salvaged else 'parsed')
+        report = dict(report, batch_size=len(batch), batch_total=batch_tokens)
+        results.append((post, add_script_metadata(script_data, post, report,
+                                                  meta.get('model') or get_model_label(model))))
+
+    logger.info(f"✅ 묶음 대본 생성 완료: {len(scripts)}/{len(batch)}개")
+    return results
+
+
+def record(event: str, count: int = 1):
+    with _lock:
+        _stats[event] += count
+
+
+def get_batch_stats() -> Dict[str, int]:
+    with _lock:
+        return dict(_stats)
+
+
+def reset_batch_stats():
+    with _lock:
+        for event in _stats:
+            _stats[event] = 0
+
+
+def log_batch_stats():
+    """묶음 요청 통계 출력 (묶음 요청을 한 적 없으면 생략)"""
+    stats = get_batch_stats()
+    if not stats['requests']:
+        return
+    logger.info(f"📦 묶음 요청 {stats['requests']}회로 게시글 {stats['posts']}개 생성 "
+                f"(요청당 {stats['posts'] / stats['requests']:.1f}개, 한 건씩 재요청 {stats['retried']}개)")
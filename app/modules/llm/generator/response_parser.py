@@ -0,0 +1,445 @@
+"""
+역할: 모델 응답에서 대본 JSON 추출 / 복구 / 스키마 검증
+포함 내용:
+- 앞뒤 설명문, 코드블럭이 섞여 있어도 JSON 객체만 추출 (설명문 속 '{...}'는 건너뛰고 스키마에 맞는 객체를 찾음)
+- 흔한 형식 오류 복구: 끝에 붙은 쉼표, 스마트 따옴표, 중간에 끊긴 배열/객체
+- SCRIPT_SCHEMA 기준 검증 (script_segments / full_text_for_thumbnail)
+- 로컬 복구로도 안 되면 모델에 다시 요청할 짧은 복구 프롬프트 생성
+- 여러 게시글 묶음 응답({"scripts": [...]})을 post_id별로 나눠서 각각 검증
+- 스트리밍 응답에서 script_segments 항목이 닫히는 즉시 하나씩 꺼내기 (SegmentStreamParser)
+- 바로 파싱 / 로컬 복구 / 재요청 복구 / 실패 횟수 집계
+"""
+
+import re
+import json
+import logging
+import threading
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 대본 JSON 스키마 (필드: (타입, 필수 여부))
+SCRIPT_SCHEMA = {
+    'script_segments': (list, True),
+    'full_text_for_thumbnail': (str, True),
+}
+SEGMENT_SCHEMA = {
+    'role': (str, True),
+    'text': (str, True),
+    'duration_estimate': ((int, float), False),
+    'emotion': (str, False),
+}
+SEGMENT_ROLES = ('narrator', 'comment')
+
+# 복구 프롬프트에 넣는 원래 응답 최대 길이
+REPAIR_EXCERPT_CHARS = 4000
+
+SMART_QUOTES = str.maketrans({'“': '"', '”': '"', '„': '"', '‘': "'", '’': "'"})
+TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+SEGMENTS_START = re.compile(r'"script_segments"\s*:\s*\[')
+
+_lock = threading.Lock()
+_stats = {'parsed': 0, 'salvaged': 0, 'repaired': 0, 'failed': 0}
+
+
+class ScriptParseError(ValueError):
+    """응답에서 스키마에 맞는 대본 JSON을 얻지 못함"""
+
+    def __init__(self, message: str, errors: List[str] = None):
+        super().__init__(message)
+        self.errors = errors or [message]
+
+
+def _scan(text: str, start: int) -> Tuple[Optional[int], List[str], int]:
+    """
+    start 위치의 '{'부터 괄호 짝을 맞추며 읽기 (문자열 안의 괄호는 무시)
+
+    Returns:
+        (완결된 객체의 끝 위치 또는 None, 끝까지 닫히지 않은 괄호 스택, 마지막으로 완결된 하위 값의 끝 위치)
+    """
+    stack = []
+    in_string = False
+    escaped = False
+    last_complete = start
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]':
+            if not stack or stack[-1] != char:
+                return None, stack, last_complete
+            stack.pop()
+            if not stack:
+                return i + 1, [], i + 1
+            last_complete = i + 1
+
+    return None, stack, last_complete
+
+
+def extract_json_object(text: str, start: int = 0) -> Tuple[Optional[str], int]:
+    """
+    응답 텍스트의 start 위치 이후 첫 번째 JSON 객체 추출
+
+    끝까지 닫히지 않은 객체(출력이 중간에 끊긴 경우)는 마지막으로 완결된 값까지 자르고 괄호를 닫아서 반환.
+
+    Returns:
+        (JSON 문자열, 다음 후보를 찾기 시작할 위치) - '{'가 없으면 (None, len(text))
+    """
+    start = text.find('{', start)
+    if start < 0:
+        return None, len(text)
+
+    end, _, last_complete = _scan(text, start)
+    if end is not None:
+        # 완결된 객체 안쪽의 '{'는 다시 볼 필요 없음
+        return text[start:end], end
+
+    # 끊긴 출력: 마지막으로 완결된 하위 값까지만 남기고, 그 시점에 열려 있던 괄호를 닫음
+    head = text[start:last_complete].rstrip().rstrip(',')
+    _, open_stack, _ = _scan(head, 0)
+    return head + ''.join(reversed(open_stack)), start + 1
+
+
+def strip_code_fence(text: str) -> str:
+    """```json ... ``` 코드블럭 제거"""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text[3:]
+        if text.startswith('json'):
+            text = text[4:]
+    if text.endswith('```'):
+        text = text[:-3]
+    return text.strip()
+
+
+def repair_candidates(candidate: str) -> List[str]:
+    """
+    파싱에 실패한 JSON의 복구 후보 (순서대로 시도)
+
+    스마트 따옴표는 본문 안에 정상적으로 들어갈 수도 있으므로 쉼표 복구로 안 될 때만 바꿈
+    """
+    without_commas = TRAILING_COMMA.sub(r'\1', candidate)
+    return [without_commas, TRAILING_COMMA.sub(r'\1', candidate.translate(SMART_QUOTES))]
+
+
+def validate_segment(segment, index: int = 0) -> List[str]:
+    """
+    script_segments 항목 1개를 SEGMENT_SCHEMA 기준으로 검증
+
+    Returns:
+        오류 메시지 리스트 (비어 있으면 통과)
+    """
+    if not isinstance(segment, dict):
+        return [f"script_segments[{index}]가 객체가 아님"]
+
+    errors = []
+    for field, (field_type, required) in SEGMENT_SCHEMA.items():
+        if field not in segment:
+            if required:
+                errors.append(f"script_segments[{index}].{field} 없음")
+        elif not isinstance(segment[field], field_type) or isinstance(segment[field], bool):
+            errors.append(f"script_segments[{index}].{field} 타입 오류")
+    if segment.get('role') not in SEGMENT_ROLES:
+        errors.append(f"script_segments[{index}].role은 {'/'.join(SEGMENT_ROLES)} 중 하나여야 함")
+    elif not str(segment.get('text', '')).strip():
+        errors.append(f"script_segments[{index}].text가 비어 있음")
+    return errors
+
+
+def validate_script(data) -> List[str]:
+    """
+    SCRIPT_SCHEMA 기준 검증
+
+    Returns:
+        오류 메시지 리스트 (비어 있으면 통과)
+    """
+    if not isinstance(data, dict):
+        return ['최상위 값이 객체가 아님']
+
+    errors = []
+    for field, (field_type, required) in SCRIPT_SCHEMA.items():
+        if field not in data:
+            if required:
+                errors.append(f"{field} 없음")
+        elif not isinstance(data[field], field_type):
+            errors.append(f"{field} 타입 오류")
+
+    segments = data.get('script_segments')
+    if isinstance(segments, list):
+        if not segments:
+            errors.append('script_segments가 비어 있음')
+        for index, segment in enumerate(segments):
+            errors.extend(validate_segment(segment, index))
+
+    if isinstance(data.get('full_text_for_thumbnail'), str) and not data['full_text_for_thumbnail'].strip():
+        errors.append('full_text_for_thumbnail이 비어 있음')
+    return errors
+
+
+def _parse_candidate(candidate: str) -> Tuple[object, bool]:
+    """
+    JSON 후보 파싱 (안 되면 복구 후보 순서대로)
+
+    Returns:
+        (파싱 결과, 복구 후보 사용 여부)
+
+    Raises:
+        json.JSONDecodeError: 복구 후보로도 파싱 실패 (원래 후보의 오류)
+    """
+    try:
+        return json.loads(candidate), False
+    except json.JSONDecodeError as e:
+        for repaired in repair_candidates(candidate):
+            try:
+                return json.loads(repaired), True
+            except json.JSONDecodeError:
+                continue
+        raise e
+
+
+def _load_candidate(text: str, accept: Callable[[object], bool]) -> Tuple[object, bool]:
+    """
+    코드블럭 제거 → JSON 객체 추출 → 파싱 (안 되면 복구 후보 순서대로)
+
+    설명문에 '{예시}' 같은 괄호가 먼저 나올 수 있으므로, 파싱되고 accept를 통과하는 후보가 나올 때까지
+    뒤쪽 '{'부터 다시 추출한다. 통과하는 후보가 없으면 처음 파싱된 후보를 돌려줘서 호출한 쪽이 그 오류를 보고.
+
+    Returns:
+        (파싱 결과, 로컬 복구 사용 여부)
+
+    Raises:
+        ScriptParseError: JSON을 찾지 못했거나 복구 실패
+    """
+    text = strip_code_fence(text or '')
+    first = None
+    first_error = None
+    pos = 0
+    while True:
+        candidate, pos = extract_json_object(text, pos)
+        if candidate is None:
+            break
+        try:
+            data, repaired = _parse_candidate(candidate)
+        except json.JSONDecodeError as e:
+            first_error = first_error or e
+            continue
+
+        # 코드블럭을 뗀 원문이 그대로 JSON이면 복구 없이 파싱된 것
+        result = (data, repaired or candidate != text)
+        if accept(data):
+            return result
+        first = first or result
+
+    if first is not None:
+        return first
+    if first_error is not None:
+        raise ScriptParseError(f"JSON 복구 실패: {first_error}")
+    raise ScriptParseError('응답에 JSON 객체가 없음')
+
+
+def parse_script_response(text: str) -> Tuple[Dict, bool]:
+    """
+    모델 응답을 대본 딕셔너리로 변환
+
+    Returns:
+        (대본, 로컬 복구 사용 여부) - 그대로 json.loads가 되면 False
+
+    Raises:
+        ScriptParseError: JSON을 찾지 못했거나 복구 후에도 스키마 검증 실패
+    """
+    data, salvaged = _load_candidate(text, lambda candidate: not validate_script(candidate))
+    errors = validate_script(data)
+    if errors:
+        raise ScriptParseError(f"스키마 검증 실패: {', '.join(errors[:5])}", errors)
+    return data, salvaged
+
+
+def parse_batch_response(text: str, post_ids: List[str]) -> Tuple[Dict[str, Dict], Dict[str, List[str]], bool]:
+    """
+    여러 게시글 묶음 응답({"scripts": [{"post_id": ..., 대본}, ...]})을 post_id별 대본으로 나누기
+
+    대본마다 따로 검증하므로 일부가 잘못되어도 나머지는 사용할 수 있다 (출력이 중간에 끊겨도 완결된 대본까지는 사용).
+
+    Args:
+        text: 모델 응답
+        post_ids: 묶음에 넣은 게시글 post_id (문자열)
+
+    Returns:
+        (post_id별 대본, post_id별 오류 메시지, 로컬 복구 사용 여부) - 응답에 없는 게시글도 오류에 포함
+
+    Raises:
+        ScriptParseError: JSON이나 scripts 배열을 찾지 못함
+    """
+    data, salvaged = _load_candidate(
+        text, lambda candidate: isinstance(candidate, dict) and isinstance(candidate.get('scripts'), list))
+    items = data.get('scripts') if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise ScriptParseError('scripts 배열 없음')
+
+    scripts = {}
+    errors = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        post_id = str(item.pop('post_id', ''))
+        if post_id not in post_ids or post_id in scripts:
+            continue
+        item_errors = validate_script(item)
+        if item_errors:
+            errors[post_id] = item_errors
+        else:
+            scripts[post_id] = item
+            errors.pop(post_id, None)
+
+    for post_id in post_ids:
+        if post_id not in scripts and post_id not in errors:
+            errors[post_id] = ['응답에 없음']
+    return scripts, errors, salvaged
+
+
+class SegmentStreamParser:
+    """
+    스트리밍 응답 조각을 받으면서 script_segments 배열의 항목을 닫히는 즉시 꺼냄
+
+    앞에서 읽은 위치와 괄호/문자열 상태를 기억하므로 조각마다 새로 들어온 부분만 읽는다.
+    여기서 꺼낸 항목은 미리보기용이고, 최종 대본은 전체 텍스트를 parse_script_response로 파싱한 결과.
+
+    Usage:
+        parser = SegmentStreamParser()
+        for chunk in chunks:
+            for segment in parser.feed(chunk):
+                start_tts(segment)
+        script, _ = parse_script_response(parser.text)
+    """
+
+    def __init__(self):
+        self.text = ''  # 지금까지 받은 전체 텍스트
+        self._pos = None  # script_segments 배열 안에서 다음에 읽을 위치 (배열을 찾기 전에는 None)
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._start = None
+        self.done = False
+        self.segments = []
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        응답 조각 추가
+
+        Returns:
+            이번 조각으로 새로 완성된 항목 리스트 (JSON으로 읽을 수 없는 항목은 건너뜀)
+        """
+        self.text += chunk
+        if self.done:
+            return []
+
+        text = self.text
+        if self._pos is None:
+            match = SEGMENTS_START.search(text)
+            if not match:
+                return []
+            self._pos = match.end()
+
+        completed = []
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif char in '}]':
+                if self._depth == 0:
+                    # 배열이 닫힘
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    segment = self._load(text[self._start:i + 1])
+                    if segment is not None:
+                        self.segments.append(segment)
+                        completed.append(segment)
+        self._pos = len(text)
+        return completed
+
+    @staticmethod
+    def _load(candidate: str) -> Optional[Dict]:
+        for attempt in [candidate] + repair_candidates(candidate):
+            try:
+                segment = json.loads(attempt)
+            except json.JSONDecodeError:
+                continue
+            return segment if isinstance(segment, dict) else None
+        return None
+
+
+def build_repair_prompt(text: str, errors: List[str]) -> str:
+    """
+    로컬 복구로도 안 될 때 모델에 보낼 짧은 복구 프롬프트 (원래 게시글/규칙은 다시 보내지 않음)
+    """
+    excerpt = (text or '')[:REPAIR_EXCERPT_CHARS]
+    return f"""아래 출력은 요구한 JSON 형식이 아닙니다.
+문제: {'; '.join(errors[:10])}
+
+내용은 최대한 유지하고, 다른 설명 없이 아래 형식의 JSON 하나만 다시 출력하세요.
+{{"script_segments": [{{"role": "narrator" 또는 "comment", "text": "...", "duration_estimate": 초(narrator만), "emotion": "...(comment만)"}}], "full_text_for_thumbnail": "..."}}
+
+# 원래 출력
+{excerpt}
+"""
+
+
+def record(event: str):
+    with _lock:
+        _stats[event] += 1
+
+
+def get_parse_stats() -> Dict[str, int]:
+    with _lock:
+        return dict(_stats)
+
+
+def reset_parse_stats():
+    with _lock:
+        for event in _stats:
+            _stats[event] = 0
+
+
+def log_parse_stats():
+    """응답 처리 통계 출력 (로컬 복구 + 재요청 복구로 살린 비율)"""
+    stats = get_parse_stats()
+    total = sum(stats.values())
+    if not total:
+        return
+    saved = stats['salvaged'] + stats['repaired']
+    logger.info(f"🧩 응답 파싱: 바로 성공 {stats['parsed']}개, 로컬 복구 {stats['salvaged']}개, "
+                f"재요청 복구 {stats['repaired']}개, 실패 {stats['failed']}개 "
+                f"(복구율 {saved / total * 100:.0f}%, 대본 재생성 호출 {stats['salvaged']}회 절약)")
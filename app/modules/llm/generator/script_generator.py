@@ -1,23 +1,33 @@
 """
 역할: 전체 대본 생성 프로세스
 포함 내용:
-- 프롬프트 생성 (prompt_builder.create_script_prompt()) 호출
-- API 호출 (gemini_client.call_gemini_api()) 호출
-- JSON 파싱 (코드블럭 제거 + 파싱)
-- 메타데이터 추가 (generated_at, model, post_id)
+- 프롬프트 생성 (prompt_builder.build_script_prompt()) 호출 (토큰 예산 안으로,
+  모델에 고정 지시문이 system instruction으로 들어 있으면 게시글 부분만)
+- API 호출 (gemini_client.call_gemini_api()) 호출 (응답 캐시 / 리미터 / 한도 초과 재시도는 클라이언트에서 처리)
+  on_segment를 주면 스트리밍 호출 (stream_gemini_api()) 후 script_segments 항목이 닫히는 대로 콜백
+  (최종 대본은 스트리밍이 아닐 때와 같은 방식으로 전체 텍스트를 파싱)
+- JSON 파싱 (response_parser: 추출 + 로컬 복구 + 스키마 검증, 안 되면 짧은 복구 프롬프트로 1회 재요청)
+- 메타데이터 추가 (generated_at, model: 실제로 응답한 모델, post_id, prompt_tokens)
 """
 
+from __future__ import annotations
+
 import logging
 import json
 
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Optional
 from datetime import datetime
 
-import google.generativeai as genai
-
-from app.modules.llm.prompt.prompt_builder import create_script_prompt
-from app.modules.llm.client.gemini_client import call_gemini_api
+from app.modules.llm.prompt.prompt_builder import SCRIPT_INSTRUCTION, build_script_prompt
+from app.modules.llm.client.gemini_client import (call_gemini_api, invalidate_cached_response, replace_cached_response,
+                                                  stream_gemini_api)
+from app.modules.llm.client.rate_limiter import AdaptiveRateLimiter
+from app.modules.llm.client.router import get_model_label
+from app.modules.llm.generator import response_parser
+from app.modules.llm.generator.response_parser import ScriptParseError, SegmentStreamParser
 
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
 # 로깅 설정
 logging.basicConfig(
@@ -27,50 +37,115 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def generate_script_with_gemini(model: genai.GenerativeModel, post: Dict) -> Optional[Dict]:
+def _parse_or_repair(model: genai.GenerativeModel, prompt: str, script_text: str,
+                     limiter: Optional[AdaptiveRateLimiter], meta: Dict = None) -> Dict:
+    """
+    응답을 대본으로 변환 (로컬 복구 → 안 되면 복구 프롬프트로 1회 재요청)
+
+    재요청하면 meta['model']은 복구 응답을 만든 모델로 바뀜
+
+    Raises:
+        ScriptParseError: 재요청 응답도 쓸 수 없을 때
+    """
+    try:
+        script_data, salvaged = response_parser.parse_script_response(script_text)
+        response_parser.record('salvaged' if salvaged else 'parsed')
+        if salvaged:
+            logger.info("🧩 응답 형식 로컬 복구 성공")
+        return script_data
+    except ScriptParseError as e:
+        errors = e.errors
+        logger.warning(f"⚠️ 응답 형식 오류, 복구 요청: {', '.join(errors[:3])}")
+
+    # 같은 응답이 캐시에서 다시 나오지 않도록
+    invalidate_cached_response(model, prompt)
+
+    repair_prompt = response_parser.build_repair_prompt(script_text, errors)
+    repaired_text = call_gemini_api(model, repair_prompt, limiter=limiter, meta=meta)
+    try:
+        script_data, _ = response_parser.parse_script_response(repaired_text)
+    except ScriptParseError:
+        invalidate_cached_response(model, repair_prompt)
+        response_parser.record('failed')
+        raise
+
+    response_parser.record('repaired')
+    # 다음에 같은 게시글을 다시 처리하면 복구된 결과를 바로 사용
+    replace_cached_response(model, prompt, json.dumps(script_data, ensure_ascii=False),
+                            (meta or {}).get('model'))
+    return script_data
+
+
+def _stream_segments(model: genai.GenerativeModel, prompt: str, limiter: Optional[AdaptiveRateLimiter],
+                     on_segment: Callable[[int, Dict], None], meta: Dict = None) -> str:
+    """스트리밍으로 응답을 받으면서 완성된 script_segments 항목마다 on_segment(순번, 항목) 호출"""
+    parser = SegmentStreamParser()
+    for chunk in stream_gemini_api(model, prompt, limiter=limiter, meta=meta):
+        emitted = len(parser.segments)
+        for index, segment in enumerate(parser.feed(chunk), start=emitted):
+            try:
+                on_segment(index, segment)
+            except Exception as e:
+                # 후속 처리 실패가 대본 생성을 멈추지 않도록
+                logger.warning(f"⚠️ 대본 항목 {index} 처리 실패: {e}")
+    return parser.text.strip()
+
+
+def add_script_metadata(script_data: Dict, post: Dict, prompt_report: Dict, model_name: str) -> Dict:
+    """대본에 메타데이터 추가 (generated_at, model, post_id, prompt_tokens)"""
+    script_data['generated_at'] = datetime.now()
+    # 실제로 대본을 만든 모델 (라우터/헤지 모델이면 그 모델, 캐시 적중이면 캐시된 응답을 만든 모델)
+    script_data['model'] = model_name
+    script_data['post_id'] = post.get('post_id')
+    # 프롬프트 토큰 사용량 (예산 대비)
+    script_data['prompt_tokens'] = prompt_report
+    return script_data
+
+
+def generate_script_with_gemini(model: genai.GenerativeModel, post: Dict,
+                                limiter: AdaptiveRateLimiter = None,
+                                on_segment: Callable[[int, Dict], None] = None) -> Optional[Dict]:
     """
     Gemini API 를 사용하여 영상 대본 생성
 
     Args:
         model: Gemini GenerativeModel 객체
         post: 게시글 데이터
+        limiter: 여러 스레드가 함께 쓰는 호출 속도 제한 (없으면 바로 호출)
+        on_segment: 주면 스트리밍으로 호출하고 script_segments 항목이 완성될 때마다 (순번, 항목)으로 호출
+                    (미리보기용, 응답을 복구해야 했으면 최종 대본의 항목과 다를 수 있음)
 
     Returns:
         생성된 대본 딕셔너리 또는 None
     """
     script_text = None  # 초기화 (에러 처리에서 참조 가능하도록)
+    prompt = None
+    meta = {}
     
     try:
-        prompt = create_script_prompt(post)
+        # 모델이 지시문을 이미 갖고 있으면 게시글 부분만 보냄 (없으면 지시문을 앞에 붙임)
+        has_instruction = getattr(model, 'script_instruction', None) == SCRIPT_INSTRUCTION
+        prompt, prompt_report = build_script_prompt(post, include_instruction=not has_instruction)
 
         logger.info(f"📝 대본 생성 시작: {post.get('title', '')[:30]}...")
 
         # Gemini API 호출
-        script_text = call_gemini_api(model, prompt)
-
-        # JSON 파싱 (Gemini 가 코드블록드로 감쌀 수 있으므로 처리)
-        if script_text.startswith('```json'):
-            script_text = script_text[7:]
-        if script_text.startswith('```'):
-            script_text = script_text[3:]
-        if script_text.endswith('```'):
-            script_text = script_text[:-3]
-
-        script_text = script_text.strip()
+        if on_segment is None:
+            script_text = call_gemini_api(model, prompt, limiter=limiter, meta=meta)
+        else:
+            script_text = _stream_segments(model, prompt, limiter, on_segment, meta)
 
-        # JSON 파싱
-        script_data = json.loads(script_text)
+        # JSON 추출/복구/검증 (안 되면 복구 프롬프트로 재요청)
+        script_data = _parse_or_repair(model, prompt, script_text, limiter, meta)
 
         # 메타데이터 추가
-        script_data['generated_at'] = datetime.now()
-        script_data['model'] = 'gemini-2.5-pro'
-        script_data['post_id'] = post.get('post_id')
+        add_script_metadata(script_data, post, prompt_report, meta.get('model') or get_model_label(model))
 
         logger.info(f"✅ 대본 생성 완료: {post.get('title', '')[:30]}...")
 
         return script_data
 
-    except json.JSONDecodeError as e:
+    except ScriptParseError as e:
         logger.error(f"❌ JSON 파싱 실패: {e}")
         logger.error(f"   응답 내용: {script_text[:200] if script_text else 'N/A'}...")
         return None
@@ -1,11 +1,21 @@
 # Gemini API를 사용한 영상 대본 생성 모듈 (Orchestrator)
 
-import logging
+import os
 import time
+import logging
 
-from app.modules.llm.client.gemini_client import init_gemini_api
+from functools import partial
+from typing import Callable, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from app.modules.llm.client import hedging, llm_cache
+from app.modules.llm.client.gemini_client import log_usage_stats
+from app.modules.llm.client.providers import close_llm_model, init_llm_model, log_model_stats
+from app.modules.llm.client.rate_limiter import AdaptiveRateLimiter
+from app.modules.llm.generator import batch_generator, response_parser
 from app.modules.llm.generator.script_generator import generate_script_with_gemini
-from app.modules.llm.repository.script_repository import fetch_posts_without_script, save_script_to_db
+from app.modules.llm.prompt.prompt_builder import SCRIPT_INSTRUCTION
+from app.modules.llm.repository.script_repository import iter_posts_without_script, save_script_to_db
 
 # 로깅 설정
 logging.basicConfig(
@@ -15,62 +25,143 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def generate_scripts_batch(limit: int = 5) -> int:
+def create_llm_limiter() -> AdaptiveRateLimiter:
+    """환경변수(LLM_RPM / LLM_TPM / LLM_CONCURRENCY)로 LLM 호출 리미터 생성"""
+    return AdaptiveRateLimiter(
+        rpm=int(os.getenv('LLM_RPM', 5)),
+        tpm=int(os.getenv('LLM_TPM', 250000)),
+        max_concurrent=int(os.getenv('LLM_CONCURRENCY', 4)),
+        name='gemini'
+    )
+
+
+def check_segment(post: Dict, index: int, segment: Dict):
+    """스트리밍 기본 후속 처리: 도착한 대본 항목을 바로 검증 (LLM_STREAM=true이고 on_segment가 없을 때)"""
+    errors = response_parser.validate_segment(segment, index)
+    if errors:
+        logger.warning(f"⚠️ [{post.get('post_id')}] 대본 항목 {index} 형식 오류: {', '.join(errors)}")
+    else:
+        logger.info(f"🎙️ [{post.get('post_id')}] 대본 항목 {index} 도착 ({segment['role']})")
+
+
+def _generate_and_save(model, post: Dict, limiter: AdaptiveRateLimiter,
+                       on_segment: Optional[Callable[[Dict, int, Dict], None]] = None) -> bool:
+    """게시글 1개 대본 생성 + 저장 (작업 스레드에서 실행)"""
+    script_data = generate_script_with_gemini(model, post, limiter=limiter,
+                                              on_segment=partial(on_segment, post) if on_segment else None)
+    # MongoDB에 저장
+    return bool(script_data) and save_script_to_db(post['post_id'], script_data)
+
+
+def _generate_batch_and_save(model, batch, limiter: AdaptiveRateLimiter) -> int:
+    """게시글 묶음 1개 대본 생성 + 저장 (작업 스레드에서 실행)"""
+    results = batch_generator.generate_batch_with_gemini(model, batch, limiter=limiter)
+    return sum(bool(script_data) and save_script_to_db(post['post_id'], script_data) for post, script_data in results)
+
+
+def generate_scripts_batch(limit: int = 5, model=None, limiter: AdaptiveRateLimiter = None,
+                           on_segment: Callable[[Dict, int, Dict], None] = None, deadline: float = None) -> int:
     """
-    여러 게시글에 대해 대본을 일괄 생성
-    
+    여러 게시글에 대해 대본을 일괄 생성 (여러 개를 동시에 호출)
+
+    동시에 진행하는 호출 수는 리미터가 분당 요청/토큰 한도와 한도 초과 응답에 맞춰 조절한다.
+    on_segment를 주거나 LLM_STREAM=true면 스트리밍으로 호출해서 대본 항목이 완성되는 대로 넘긴다
+    (저장되는 대본은 스트리밍이 아닐 때와 같음).
+    LLM_POSTS_PER_REQUEST > 1이면 토큰 예산 안에서 게시글 여러 개를 한 요청으로 묶는다 (스트리밍과 함께 쓰지 않음).
+
     Args:
         limit: 생성할 대본 수
-        
+        model: 사용할 모델 (없으면 대본 지시문을 system instruction으로 넣어 init_llm_model(),
+               LLM_ROUTES에 여러 모델을 주면 요청마다 고르는 라우터)
+        limiter: 호출 리미터 (없으면 create_llm_limiter())
+        on_segment: 대본 항목 후속 처리 (게시글, 순번, 항목) - TTS/렌더링 등 (없으면 LLM_STREAM=true일 때 check_segment)
+        deadline: 배치 전체 마감 시간 (초, 없으면 LLM_BATCH_DEADLINE, 0이면 제한 없음)
+
     Returns:
         성공적으로 생성된 대본 수
     """
     logger.info("=" * 60)
     logger.info("🤖 Gemini 대본 생성 시작")
     logger.info("=" * 60)
-    
+
+    owns_model = model is None
     try:
-        # Gemini API 초기화
-        model = init_gemini_api()
-        
-        # 대본 미생성 게시글 가져오기
-        posts = fetch_posts_without_script(limit=limit)
-        
-        if not posts:
+        # LLM 모델 초기화 (고정 지시문은 모델에 한 번만 설정)
+        model = model or init_llm_model(system_instruction=SCRIPT_INSTRUCTION)
+        limiter = limiter or create_llm_limiter()
+        if on_segment is None and os.getenv('LLM_STREAM', 'false').lower() == 'true':
+            on_segment = check_segment
+        started = time.monotonic()
+
+        success_count = 0
+        processed = 0
+
+        # 배치 전체 마감 시간 (지나면 새 게시글을 제출하지 않고, 남은 작업을 기다리지 않음)
+        batch_deadline = float(os.getenv('LLM_BATCH_DEADLINE', 0)) if deadline is None else deadline
+        deadline_at = started + batch_deadline if batch_deadline > 0 else None
+
+        def remaining() -> Optional[float]:
+            return None if deadline_at is None else max(0.0, deadline_at - time.monotonic())
+
+        # 대본 미생성 게시글을 커서로 하나씩 읽어서 제출 (대기 중인 작업은 동시 호출 수 상한의 2배까지만)
+        executor = ThreadPoolExecutor(max_workers=limiter.max_concurrent, thread_name_prefix='script')
+        running = set()
+        try:
+            posts = iter_posts_without_script(limit=limit)
+            if on_segment is None and batch_generator.get_posts_per_request() > 1:
+                jobs = ((len(batch), batch[0][0], partial(_generate_batch_and_save, model, batch, limiter))
+                        for batch in batch_generator.iter_post_batches(posts))
+            else:
+                jobs = ((1, post, partial(_generate_and_save, model, post, limiter, on_segment)) for post in posts)
+
+            for count, post, job in jobs:
+                if len(running) >= limiter.max_concurrent * 2:
+                    done, running = wait(running, timeout=remaining(), return_when=FIRST_COMPLETED)
+                    success_count += sum(future.result() for future in done)
+                if remaining() == 0:
+                    break
+
+                processed += count
+                more = f" 외 {count - 1}개" if count > 1 else ''
+                logger.info(f"[{processed}/{limit}] 대본 생성 요청: {post.get('title', '')[:30]}{more}")
+                running.add(executor.submit(job))
+
+            done, running = wait(running, timeout=remaining())
+            success_count += sum(future.result() for future in done)
+        finally:
+            # 마감 시간을 넘긴 작업: 시작 전이면 취소, 진행 중인 호출은 LLM_CALL_TIMEOUT 안에 끝남
+            executor.shutdown(wait=not running, cancel_futures=True)
+
+        if running:
+            logger.warning(f"⏰ 배치 마감 시간({batch_deadline:g}초) 초과: 끝나지 않은 {len(running)}개는 기다리지 않음")
+
+        if not processed:
             logger.info("📭 대본을 생성할 게시글이 없습니다.")
             return 0
-        
-        success_count = 0
-        
-        for idx, post in enumerate(posts, 1):
-            logger.info(f"\n[{idx}/{len(posts)}] 처리 중...")
-            
-            # 대본 생성
-            script_data = generate_script_with_gemini(model, post)
-            
-            if script_data:
-                # MongoDB에 저장
-                if save_script_to_db(post['post_id'], script_data):
-                    success_count += 1
-            
-            # API 호출 제한 방지 (간단한 딜레이)
-            if idx < len(posts):
-                time.sleep(2)
-        
+
         logger.info("=" * 60)
         logger.info("🎬 대본 생성 완료")
-        logger.info(f"   성공: {success_count}/{len(posts)}")
+        logger.info(f"   성공: {success_count}/{processed} ({time.monotonic() - started:.1f}초)")
         logger.info("=" * 60)
-        
+        limiter.log_stats()
+        hedging.log_latency_stats()
+        log_model_stats(model)
+        batch_generator.log_batch_stats()
+        log_usage_stats()
+        llm_cache.log_cache_stats()
+        response_parser.log_parse_stats()
+
         return success_count
-        
+
     except Exception as e:
         logger.error(f"❌ 대본 생성 중 오류 발생: {e}")
         return 0
+    finally:
+        if owns_model and model is not None:
+            close_llm_model(model)
 
 
 if __name__ == '__main__':
     # 테스트 실행
     generate_scripts_batch(limit=5)
 
-
@@ -1,12 +1,21 @@
 """
 역할: 게시글 데이터를 프롬프트 문자열로 변환
 포함 내용:
-- 게시글 정보 (제목, 본문, 댓글) + 대본 작성 규칙 템플릿
+- 대본 작성 규칙(SCRIPT_INSTRUCTION, 모든 게시글 공통) + 게시글 정보(POST_TEMPLATE: 제목, 본문, 댓글)
+  모델에 규칙을 system instruction으로 넣었으면 게시글 부분만, 아니면 규칙을 앞에 붙여서 반환
+- 토큰 예산(PROMPT_TOKEN_BUDGET) 안에 맞추기: 본문 정리(링크/중복 줄 제거) 후 넘치면 앞/뒤 문장만 남기고 중략,
+  댓글은 중복/내용 없는 댓글을 거르고 예산 안에서 PROMPT_COMMENT_LIMIT개까지 선택
+- 사용한 토큰 수 리포트 (대본과 함께 저장)
+- 여러 게시글을 한 프롬프트로 묶기 (build_batch_prompt: 게시글마다 post_id 구분선, 응답은 post_id별 scripts 배열)
 """
 
+import os
+import re
 import logging
 
-from typing import Dict
+from typing import Dict, List, Tuple
+
+from app.modules.llm.prompt.token_counter import count_tokens, truncate_to_tokens
 
 # 로깅 설정
 logging.basicConfig(
@@ -15,45 +24,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 프롬프트에 넣는 댓글 수
+PROMPT_COMMENT_LIMIT = 5
 
-def create_script_prompt(post: Dict) -> str:
-    """
-    게시글 정보를 기반으로 Gemini 에게 전달할 프롬프트 생성
-
-    Args:
-        post: MongoDB 에서 가져온 게시글 데이터
-
-    Returns:
-        프롬프트 문자열
-    """
-    title = post.get('title', '')
-    content = post.get('content', '')
-    recommend_count = post.get('recommend_count', 0)
-    comment_count = post.get('comment_count', 0)
-
-    # 댓글이 있을경우 일부 포함
-    comments_text = ""
-    if post.get('comments'):
-        top_comments = post['comments'][:5]  # 상위 5개 댓글만
-        # 댓글은 문자열 리스트이므로 직접 사용
-        comments_text = "\n".join([f"- {c}" if isinstance(c, str) else f"- {c.get('content', '')}" for c in top_comments])
-
-    prompt = f"""
-당신은 '미국 주식 시장 소식을 전하는 건조하고 시니컬한 뉴스 앵커'입니다.
-DC인사이드 미국 주식 갤러리(미주갤)의 다음 게시글을 기반으로 50초 분량의 쇼츠 영상 대본을 작성하세요.
+# 댓글 선택 후보 수 (조회 시 앞에서부터 이만큼만 가져옴)
+PROMPT_COMMENT_CANDIDATES = 20
 
-# 게시글 정보
-- 제목: {title}
-- 추천수: {recommend_count}
-- 댓글수: {comment_count}
+# 프롬프트 생성에 필요한 게시글 필드 (조회 시 이 필드만 가져옴, comments는 앞 PROMPT_COMMENT_CANDIDATES개만)
+PROMPT_FIELDS = ('post_id', 'title', 'content', 'recommend', 'comment_count', 'comments')
 
-## 본문
-{content}
+# 항목별 토큰 상한
+TITLE_MAX_TOKENS = 80
+COMMENT_MAX_TOKENS = 100
+# 본문에 쓰고 남은 예산 중 댓글에 쓸 수 있는 최대 비율
+COMMENT_BUDGET_SHARE = 0.3
+# 본문을 줄일 때 앞부분에 쓰는 비율 (나머지는 마지막 부분)
+CONTENT_HEAD_SHARE = 0.75
+CONTENT_OMITTED = '\n(...중략...)\n'
 
-## 주요 댓글
-{comments_text if comments_text else "(댓글 없음)"}
+URL_PATTERN = re.compile(r'https?://\S+')
+SENTENCE_END = re.compile(r'(?<=[.!?。])\s+|\n+')
 
----
+# 모든 게시글에 공통인 고정 부분 (페르소나/규칙/톤/출력 형식)
+# 모델의 system instruction(또는 컨텍스트 캐시)으로 한 번만 보내고, 지원하지 않으면 프롬프트 앞에 붙임
+SCRIPT_INSTRUCTION = """당신은 '미국 주식 시장 소식을 전하는 건조하고 시니컬한 뉴스 앵커'입니다.
+DC인사이드 미국 주식 갤러리(미주갤)의 게시글이 주어지면 그 게시글을 기반으로 50초 분량의 쇼츠 영상 대본을 작성하세요.
 
 # 대본 작성 규칙
 
@@ -88,31 +83,254 @@ DC인사이드 미국 주식 갤러리(미주갤)의 다음 게시글을 기반
 # 출력 형식 (JSON)
 반드시 아래 JSON 형식으로만 출력하세요. 다른 설명 없이 JSON만 출력하세요.
 
-{{
+{
   "script_segments": [
-    {{
+    {
       "role": "narrator",
       "text": "오늘 프리장에서 엔비디아가 3% 넘게 빠지고 있습니다. 젠슨 황의 주식 매도 소식 때문일까요? 갤러리 분위기가 심상치 않습니다.",
       "duration_estimate": 6
-    }},
-    {{
+    },
+    {
       "role": "comment",
       "text": "아니 젠슨황 이 형은 고점에서 맨날 던지네;; 내 롱 포지션 어떡하냐 ㅠㅠ",
       "emotion": "despair"
-    }},
-    {{
+    },
+    {
       "role": "comment",
       "text": "ㅋㅋㅋㅋ 숏충이들은 개추 눌러라. 오늘밤안에 나스닥 -2% 본다.",
       "emotion": "mocking"
-    }},
-    {{
+    },
+    {
       "role": "comment",
       "text": "쫄지마라 SOXL 풀매수 기회다. 공포에 사라고 했다!! 가즈아!!",
       "emotion": "excitement"
-    }}
+    }
   ],
   "full_text_for_thumbnail": "엔비디아 떡락 이유"
-}}
+}
 """
-    
-    return prompt
\ No newline at end of file
+
+# 게시글마다 바뀌는 부분
+POST_TEMPLATE = """
+# 게시글 정보
+- 제목: {title}
+- 추천수: {recommend_count}
+- 댓글수: {comment_count}
+
+## 본문
+{content}
+
+## 주요 댓글
+{comments_text}
+"""
+
+# 고정 부분의 토큰 수 (게시글마다 다시 세지 않도록 한 번만 계산)
+INSTRUCTION_TOKENS = count_tokens(SCRIPT_INSTRUCTION)
+POST_TEMPLATE_TOKENS = count_tokens(POST_TEMPLATE.format(title='', recommend_count='', comment_count='',
+                                                         content='', comments_text=''))
+NO_COMMENTS = "(댓글 없음)"
+# 고정 부분을 프롬프트 앞에 붙일 때 구분선
+INSTRUCTION_SEPARATOR = '\n---\n'
+
+# 여러 게시글을 한 프롬프트로 묶을 때 게시글 구분선 / 출력 형식
+BATCH_POST_HEADER = "\n=== post_id: {post_id} ===\n"
+BATCH_POST_PATTERN = re.compile(r'^=== post_id: (.+?) ===$', re.MULTILINE)
+BATCH_OUTPUT_RULES = """
+# 여러 게시글 처리
+위 게시글 각각에 대해 대본을 따로 작성하세요. 게시글끼리 내용을 섞지 마세요.
+출력은 위 출력 형식의 대본에 게시글의 post_id를 붙여서 scripts 배열에 담은 JSON 하나만 출력하세요.
+{"scripts": [{"post_id": "구분선의 post_id", "script_segments": [...], "full_text_for_thumbnail": "..."}]}
+"""
+# 묶음마다 한 번씩 들어가는 부분의 토큰 수 (고정 지시문 + 구분선 + 묶음 출력 형식)
+BATCH_FIXED_TOKENS = INSTRUCTION_TOKENS + count_tokens(INSTRUCTION_SEPARATOR) + count_tokens(BATCH_OUTPUT_RULES)
+
+
+def get_token_budget() -> int:
+    """프롬프트 전체 토큰 예산 (PROMPT_TOKEN_BUDGET, 0이면 제한 없음)"""
+    return int(os.getenv('PROMPT_TOKEN_BUDGET', 3000))
+
+
+def get_batch_token_budget() -> int:
+    """게시글 여러 개를 묶은 프롬프트의 토큰 예산 (PROMPT_BATCH_TOKEN_BUDGET, 0이면 제한 없음)"""
+    return int(os.getenv('PROMPT_BATCH_TOKEN_BUDGET', 12000))
+
+
+def clean_content(content: str) -> str:
+    """본문 정리: 링크 제거, 줄 앞뒤 공백/연속 빈 줄/같은 줄 반복 제거 (붙여넣은 기사에 흔함)"""
+    lines = []
+    seen = set()
+    for line in URL_PATTERN.sub('', content or '').splitlines():
+        line = ' '.join(line.split())
+        if not line:
+            if lines and lines[-1]:
+                lines.append('')
+            continue
+        if line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return '\n'.join(lines).strip()
+
+
+def _take_sentences(sentences: List[str], max_tokens: int) -> List[str]:
+    taken = []
+    used = 0
+    for sentence in sentences:
+        tokens = count_tokens(sentence) + 1
+        if used + tokens > max_tokens:
+            break
+        taken.append(sentence)
+        used += tokens
+    return taken
+
+
+def condense_content(content: str, max_tokens: int) -> str:
+    """
+    본문을 max_tokens 안으로 줄이기 (같은 문장 반복 제거 후 앞부분 문장 위주 + 마지막 몇 문장, 사이는 중략 표시)
+
+    문장 하나가 예산보다 길면 글자 단위로 자름
+    """
+    if count_tokens(content) <= max_tokens:
+        return content
+
+    sentences = list(dict.fromkeys(s.strip() for s in SENTENCE_END.split(content) if s.strip()))
+    if count_tokens(' '.join(sentences)) <= max_tokens:
+        return ' '.join(sentences)
+
+    budget = max_tokens - count_tokens(CONTENT_OMITTED)
+    head = _take_sentences(sentences, int(budget * CONTENT_HEAD_SHARE))
+    if not head:
+        return truncate_to_tokens(content, max_tokens)
+
+    rest = sentences[len(head):]
+    used = count_tokens(' '.join(head))
+    tail = list(reversed(_take_sentences(list(reversed(rest)), budget - used)))
+    return ' '.join(head) + CONTENT_OMITTED + ' '.join(tail)
+
+
+def _comment_text(comment) -> str:
+    # 댓글은 문자열 리스트 (예전 데이터는 {'content': ...})
+    text = comment if isinstance(comment, str) else comment.get('content', '')
+    return ' '.join(URL_PATTERN.sub('', text or '').split())
+
+
+def select_comments(comments: List, max_tokens: int) -> Tuple[List[str], int]:
+    """
+    예산 안에서 댓글 선택 (앞에서부터, 중복/기호뿐인 댓글 제외, 긴 댓글은 COMMENT_MAX_TOKENS로 자름)
+
+    Returns:
+        (선택된 댓글 리스트, 사용한 토큰 수)
+    """
+    selected = []
+    seen = set()
+    used = 0
+    for comment in comments[:PROMPT_COMMENT_CANDIDATES]:
+        text = _comment_text(comment)
+        if not any(char.isalnum() for char in text) or text in seen:
+            continue
+        seen.add(text)
+        line = f"- {truncate_to_tokens(text, COMMENT_MAX_TOKENS)}"
+        tokens = count_tokens(line)
+        if used + tokens > max_tokens:
+            break
+        selected.append(line)
+        used += tokens
+        if len(selected) >= PROMPT_COMMENT_LIMIT:
+            break
+    return selected, used
+
+
+def build_script_prompt(post: Dict, budget: int = None, include_instruction: bool = True) -> Tuple[str, Dict]:
+    """
+    게시글 정보를 기반으로 Gemini 에게 전달할 프롬프트 생성 (토큰 예산 안으로)
+
+    고정 부분(SCRIPT_INSTRUCTION)은 따로 보내더라도 입력 토큰이므로 예산에 포함해서 계산한다.
+
+    Args:
+        post: MongoDB 에서 가져온 게시글 데이터
+        budget: 입력 전체 토큰 예산 (없으면 PROMPT_TOKEN_BUDGET, 0이면 제한 없음)
+        include_instruction: False면 게시글 부분만 반환 (모델에 system instruction으로 고정 부분을 넣은 경우)
+
+    Returns:
+        (프롬프트 문자열, 토큰 사용 리포트)
+    """
+    budget = get_token_budget() if budget is None else budget
+    limit = budget or float('inf')
+
+    title = truncate_to_tokens(' '.join(str(post.get('title', '')).split()), TITLE_MAX_TOKENS)
+    fields = {'recommend_count': post.get('recommend', 0), 'comment_count': post.get('comment_count', 0)}
+    header = POST_TEMPLATE_TOKENS + count_tokens(title) + count_tokens(' '.join(str(v) for v in fields.values()))
+    instruction = INSTRUCTION_TOKENS + (count_tokens(INSTRUCTION_SEPARATOR) if include_instruction else 0)
+    fixed = instruction + header
+    available = max(0, limit - fixed)
+
+    original = post.get('content', '') or ''
+    content = clean_content(original)
+    content_tokens = count_tokens(content)
+
+    # 댓글은 본문이 쓰고 남은 만큼 (단, 최소 COMMENT_BUDGET_SHARE 만큼은 댓글 몫으로 보장)
+    comment_budget = max(available - content_tokens, available * COMMENT_BUDGET_SHARE)
+    comments, comment_tokens = select_comments(post.get('comments') or [], comment_budget)
+    condensed = condense_content(content, int(min(available - comment_tokens, content_tokens)))
+
+    comments_text = '\n'.join(comments) if comments else NO_COMMENTS
+    prompt = POST_TEMPLATE.format(title=title, content=condensed, comments_text=comments_text, **fields)
+    if include_instruction:
+        prompt = SCRIPT_INSTRUCTION + INSTRUCTION_SEPARATOR + prompt
+    content_used = count_tokens(condensed)
+    total = fixed + content_used + (comment_tokens if comments else count_tokens(NO_COMMENTS))
+    report = {
+        'budget': budget,
+        'total': total,
+        # 호출마다 프롬프트로 보내는 토큰 수 (고정 부분을 따로 보내면 total보다 작음)
+        'prompt': total if include_instruction else total - instruction,
+        'instruction': INSTRUCTION_TOKENS,
+        'instruction_separate': not include_instruction,
+        'template': fixed,
+        'content': content_used,
+        'content_original': count_tokens(original),
+        'comments': comment_tokens,
+        'comments_used': len(comments),
+        'trimmed': condensed != content,
+    }
+    if report['trimmed']:
+        logger.info(f"✂️ 본문 축약: {report['content_original']} → {report['content']} 토큰 "
+                    f"(프롬프트 {report['total']}/{budget})")
+    return prompt, report
+
+
+def batch_part_tokens(post: Dict, report: Dict) -> int:
+    """묶음 프롬프트에서 게시글 1개가 차지하는 토큰 수 (build_script_prompt(include_instruction=False) 리포트 기준)"""
+    header = BATCH_POST_HEADER.format(post_id=post.get('post_id'))
+    return count_tokens(header) + report['prompt']
+
+
+def build_batch_prompt(parts: List[Tuple[Dict, str]], include_instruction: bool = True) -> str:
+    """
+    게시글별 프롬프트(build_script_prompt(include_instruction=False))를 한 프롬프트로 묶기
+
+    Args:
+        parts: (게시글, 게시글 부분 프롬프트) 리스트
+        include_instruction: False면 고정 지시문 없이 (모델에 system instruction으로 넣은 경우)
+
+    Returns:
+        프롬프트 문자열
+    """
+    sections = [BATCH_POST_HEADER.format(post_id=post.get('post_id')) + part for post, part in parts]
+    prompt = ''.join(sections) + BATCH_OUTPUT_RULES
+    if include_instruction:
+        prompt = SCRIPT_INSTRUCTION + INSTRUCTION_SEPARATOR + prompt
+    return prompt
+
+
+def create_script_prompt(post: Dict) -> str:
+    """
+    게시글 정보를 기반으로 Gemini 에게 전달할 프롬프트 생성
+
+    Args:
+        post: MongoDB 에서 가져온 게시글 데이터
+
+    Returns:
+        프롬프트 문자열
+    """
+    return build_script_prompt(post)[0]
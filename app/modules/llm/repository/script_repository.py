@@ -1,17 +1,20 @@
 """
 역할: 대본 미생성 게시글 조회 및 생성된 대본을 MongoDB 에 저장
 포함 내용:
-- MongoDB에서 script 필드가 없는 게시글 조회
+- MongoDB에서 대본이 없는 게시글 조회 (indexes.UNSCRIPTED_FILTER, 인덱스로 정렬)
+  프롬프트에 필요한 필드만 가져오고 (댓글은 $slice), 많이 처리할 때는 커서로 하나씩 읽음
 - posts 컬렉션의 해당 게시글에 script 필드 업데이트
 """
 
 import logging
 import os
 
-from typing import List, Dict
+from typing import List, Dict, Iterator
 from datetime import datetime
 
 from app.modules.crawling.manager.connection_db import get_mongo_client
+from app.modules.crawling.manager.indexes import UNSCRIPTED_FILTER, UNSCRIPTED_SORT
+from app.modules.llm.prompt.prompt_builder import PROMPT_FIELDS, PROMPT_COMMENT_CANDIDATES
 
 # 로깅 설정
 logging.basicConfig(
@@ -20,42 +23,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 대본 생성용 조회 필드 (이미지 경로/수집 시각 등은 제외, 댓글은 프롬프트 댓글 선택 후보 개수만)
+SCRIPT_PROJECTION = {
+    '_id': 0,
+    **{field: 1 for field in PROMPT_FIELDS},
+    'comments': {'$slice': PROMPT_COMMENT_CANDIDATES},
+}
 
-def fetch_posts_without_script(db_name: str = None, limit: int = 10) -> List[Dict]:
+
+def iter_posts_without_script(db_name: str = None, limit: int = 0, batch_size: int = 50) -> Iterator[Dict]:
     """
-    아직 대본이 생성되지 않은 게시글을 MongoDB에서 가져오기
+    아직 대본이 생성되지 않은 게시글을 커서로 하나씩 가져오기 (전체 리스트를 만들지 않음)
 
     Args:
         db_name: 데이터베이스 이름
-        limit: 가져올 최대 게시글 수
+        limit: 가져올 최대 게시글 수 (0이면 전체)
+        batch_size: 서버에서 한 번에 받아 오는 문서 수
 
-    Returns:
-        게시글 리스트
+    Yields:
+        게시글 (SCRIPT_PROJECTION 필드만, 추천수 높은 순)
     """
     db_name = db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')
 
     try:
         client = get_mongo_client()
-        db = client[db_name]
-        collection = db['posts']
-
-        # script 필드가 없는 게시글만 가져오기 (추천수 높은 순)
-        posts = list(collection.find(
-            {'script': {'$exists': False}},
-            limit=limit
-        ).sort('recommend_count', -1))
-
-        logger.info("=" * 60)
-        logger.info("📚 대본 미생성 게시글 조회")
-        logger.info(f"   조회된 게시글 수: {len(posts)}")
-        logger.info(f"   Database: {db_name}")
-        logger.info("=" * 60)
+        collection = client[db_name]['posts']
 
-        return posts
+        # 대본이 없는 게시글만 가져오기 (추천수 높은 순, unscripted_by_recommend 인덱스 사용)
+        cursor = (collection.find(UNSCRIPTED_FILTER, SCRIPT_PROJECTION)
+                  .sort(UNSCRIPTED_SORT)
+                  .limit(limit)
+                  .batch_size(batch_size))
+        with cursor:
+            yield from cursor
 
     except Exception as e:
         logger.error(f"❌ 게시글 조회 실패: {e}")
-        return []
+
+
+def fetch_posts_without_script(db_name: str = None, limit: int = 10) -> List[Dict]:
+    """
+    아직 대본이 생성되지 않은 게시글을 MongoDB에서 가져오기
+
+    Args:
+        db_name: 데이터베이스 이름
+        limit: 가져올 최대 게시글 수
+
+    Returns:
+        게시글 리스트 (조회 실패 시 빈 리스트)
+    """
+    db_name = db_name or os.getenv('MONGO_DB_NAME', 'shorts_factory')
+    posts = list(iter_posts_without_script(db_name, limit=limit, batch_size=max(limit, 1)))
+
+    logger.info("=" * 60)
+    logger.info("📚 대본 미생성 게시글 조회")
+    logger.info(f"   조회된 게시글 수: {len(posts)}")
+    logger.info(f"   Database: {db_name}")
+    logger.info("=" * 60)
+
+    return posts
 
 
 def save_script_to_db(post_id: str, script_data: Dict, db_name: str = None) -> bool:
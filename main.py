@@ -2,7 +2,12 @@
 Shorts Factory - 실행 진입점
 
 Usage:
-    python3 main.py
+    python3 main.py                      # 전체 (크롤링 → 대본 작성 → 영상 생성)
+    python3 main.py crawl [--pages N] [--max-posts N]
+    python3 main.py write [--limit N]
+    python3 main.py render
+
+단계별 의존성은 그 단계를 실행할 때만 import (app/core.py)
 """
 
 import sys
@@ -16,5 +21,4 @@ sys.path.insert(0, str(app_dir))
 from app.core import main
 
 if __name__ == '__main__':
-    main()
-
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+동시 크롤링 벤치마크 (로컬 가짜 서버)
+
+DC인사이드 대신 로컬 HTTP 서버에 fixture 페이지를 띄워 놓고
+crawl_gallery의 동시성(concurrency)별 처리량(posts/sec)을 비교한다.
+실제 서버에는 요청을 보내지 않는다.
+
+Usage:
+    python3 tests/crawling/bench_concurrent_crawl.py
+    python3 tests/crawling/bench_concurrent_crawl.py --latency 0.3 --delay 0.05 --pages 3
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import threading
+
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling import crawler_main
+from app.modules.crawling import image_store
+from app.modules.crawling.dcinside import list_scraper, detail_scraper, comment_api
+
+FIXTURE_DIR = project_root / 'tests' / 'fixtures' / 'dcinside'
+
+# 1x1 투명 PNG
+PNG_BYTES = bytes.fromhex(
+    '89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c4'
+    '890000000d49444154789c6360000002000105f2e0b0000000000049454e44ae426082'
+)
+
+
+def make_handler(latency: float):
+    """응답 지연(latency)을 흉내내는 요청 핸들러 생성"""
+    list_html = (FIXTURE_DIR / 'list_page.html').read_bytes()
+    view_html = (FIXTURE_DIR / 'view_page.html').read_text(encoding='utf-8')
+    comment_pages = [(FIXTURE_DIR / f'comments_page{n}.json').read_bytes() for n in (1, 2)]
+
+    class FakeDCInsideHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive 지원 (커넥션 재사용 측정용)
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency)
+
+            if self.path.startswith('/lists'):
+                body, content_type = list_html, 'text/html; charset=UTF-8'
+            elif self.path.startswith('/view'):
+                # 이미지 주소를 로컬 서버로 바꿔서 응답
+                host = f"http://{self.headers['Host']}/img"
+                body = re.sub(r'https://dcimg\d\.dcinside\.co\.kr', host, view_html).encode('utf-8')
+                content_type = 'text/html; charset=UTF-8'
+            elif self.path.startswith('/img'):
+                body, content_type = PNG_BYTES, 'image/png'
+            else:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            # 댓글 API: comment_page 값에 맞는 fixture 응답
+            time.sleep(latency)
+            form = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+            page = 2 if 'comment_page=2' in form else 1
+            body = comment_pages[page - 1]
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # 요청 로그 출력 안 함
+
+    return FakeDCInsideHandler
+
+
+def run_benchmark(pages: int, delay: float, latency: float, concurrency_list, comment_backend: str = 'http'):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # 스크래퍼가 로컬 서버를 보도록 URL 교체, Selenium 댓글 수집은 생략 (브라우저 없음)
+    list_scraper.BASE_URL = f"{base}/lists"
+    detail_scraper.VIEW_URL = f"{base}/view"
+    comment_api.COMMENT_URL = f"{base}/comment"
+    crawler_main.GALLERY_HOST = '127.0.0.1'  # 요청 속도 제한도 로컬 서버 요청에 적용
+    detail_scraper.get_comments_with_selenium = lambda post_id: []
+    os.environ['COMMENT_BACKEND'] = comment_backend
+    os.environ['HTTP_CACHE_MODE'] = 'off'  # 동시성 단계별 비교가 캐시 적중으로 왜곡되지 않도록
+
+    # 이미지 저장 경로(app/output/images)가 프로젝트를 더럽히지 않도록 임시 폴더에서 실행
+    os.chdir(tempfile.mkdtemp(prefix='bench_crawl_'))
+
+    print("=" * 60)
+    print(f"🏁 동시 크롤링 벤치마크 (pages={pages}, delay={delay}s, latency={latency}s, comments={comment_backend})")
+    print("=" * 60)
+
+    results = []
+    for concurrency in concurrency_list:
+        # 이미지 저장소도 단계마다 비움 (이전 단계에서 받은 이미지 재사용 방지)
+        os.environ['IMAGE_STORE_DIR'] = tempfile.mkdtemp(prefix='bench_images_')
+        image_store._index = None
+
+        started = time.perf_counter()
+        posts = crawler_main.crawl_gallery(
+            pages=pages,
+            delay=delay,
+            save_to_db=False,
+            cleanup_days=0,
+            concurrency=concurrency
+        )
+        elapsed = time.perf_counter() - started
+        results.append((concurrency, len(posts), elapsed))
+
+    server.shutdown()
+
+    print("\n" + "=" * 60)
+    print(f"{'concurrency':>12} {'posts':>6} {'seconds':>9} {'posts/sec':>10}")
+    for concurrency, count, elapsed in results:
+        print(f"{concurrency:>12} {count:>6} {elapsed:>9.2f} {count / elapsed:>10.2f}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='crawl_gallery 동시성 벤치마크')
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--delay', type=float, default=0.05, help='요청 간 최소 간격 (초)')
+    parser.add_argument('--latency', type=float, default=0.3, help='가짜 서버 응답 지연 (초)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--comment-backend', choices=['http', 'selenium'], default='http',
+                        help='selenium은 브라우저 없이 빈 댓글로 대체')
+    args = parser.parse_args()
+
+    run_benchmark(args.pages, args.delay, args.latency, args.concurrency, args.comment_backend)
@@ -0,0 +1,75 @@
+"""
+목록/본문 페이지 파서 벤치마크 (오프라인)
+
+저장해 둔 페이지(tests/fixtures/dcinside)를 반복 파싱해서
+기존 BeautifulSoup 파서와 lxml XPath 빠른 파서의 페이지당 처리 시간을 비교한다.
+
+Usage:
+    python3 tests/crawling/bench_parsers.py
+    python3 tests/crawling/bench_parsers.py --iterations 500 --repeat-rows 5
+"""
+
+import re
+import sys
+import time
+import argparse
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling.dcinside import list_scraper, detail_scraper
+from app.modules.crawling.dcinside.fast_parser import parse_post_list_fast, parse_post_detail_fast
+
+FIXTURE_DIR = project_root / 'tests' / 'fixtures' / 'dcinside'
+
+
+def enlarge_list_page(html: str, times: int) -> str:
+    """목록 행(tr.ub-content)을 times배로 늘린 페이지 (실제 목록은 50행 이상)"""
+    if times <= 1:
+        return html
+    rows = re.findall(r'<tr class="ub-content.*?</tr>', html, flags=re.S)
+    return html.replace(rows[-1], rows[-1] + ''.join(rows) * (times - 1), 1)
+
+
+def measure(func, html: str, iterations: int) -> float:
+    """페이지 1개 파싱 평균 시간 (ms)"""
+    func(html)  # 워밍업
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(html)
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def run_benchmark(iterations: int, repeat_rows: int):
+    list_html = enlarge_list_page((FIXTURE_DIR / 'list_page.html').read_text(encoding='utf-8'), repeat_rows)
+    view_html = (FIXTURE_DIR / 'view_page.html').read_text(encoding='utf-8')
+
+    cases = [
+        ('list', list_html, list_scraper.parse_post_list, parse_post_list_fast),
+        ('view', view_html, detail_scraper.parse_post_detail, parse_post_detail_fast),
+    ]
+
+    print("=" * 60)
+    print(f"🏁 파서 벤치마크 (iterations={iterations}, 목록 {len(list_scraper.parse_post_list(list_html))}행)")
+    print("=" * 60)
+    print(f"{'page':>6} {'soup ms':>10} {'fast ms':>10} {'speedup':>9} {'same':>6}")
+
+    for name, html, soup_parser, fast_parser in cases:
+        same = soup_parser(html) == fast_parser(html)
+        soup_ms = measure(soup_parser, html, iterations)
+        fast_ms = measure(fast_parser, html, iterations)
+        print(f"{name:>6} {soup_ms:>10.3f} {fast_ms:>10.3f} {soup_ms / fast_ms:>8.1f}x {str(same):>6}")
+
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='BeautifulSoup / lxml XPath 파서 비교')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--repeat-rows', type=int, default=1, help='목록 행을 몇 배로 늘려서 측정할지')
+    args = parser.parse_args()
+
+    run_benchmark(args.iterations, args.repeat_rows)
@@ -0,0 +1,172 @@
+"""
+브라우저(WebDriver) 풀 테스트 (오프라인, Chromium 없음)
+
+create_driver를 가짜 드라이버로 바꿔서
+- 헬스 체크에 실패한 드라이버는 폐기하고 새로 만드는지
+- max_pages만큼 쓴 드라이버는 종료하고 다시 만드는지
+- 여러 스레드가 동시에 빌려도 대여 중인 드라이버가 size개를 넘지 않는지
+- shutdown_browser_pool()이 놀고 있는 드라이버와 대여 중이던 드라이버를 모두 종료하는지
+확인한다.
+
+Usage:
+    python3 tests/crawling/test_browser_pool.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling import browser_pool
+from app.modules.crawling.browser_pool import BrowserPool
+
+
+class FakeDriver:
+    """헬스 체크 / 상태 초기화 / 종료만 흉내 내는 드라이버"""
+
+    created = []
+
+    def __init__(self):
+        self.broken = False
+        self.quit_called = False
+        self.visited = []
+        FakeDriver.created.append(self)
+
+    def execute_script(self, script):
+        if self.broken:
+            raise RuntimeError('browser crashed')
+        return 1
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def with_fake_driver():
+    """browser_pool.create_driver를 가짜로 교체 (restore 함수 반환)"""
+    original = browser_pool.create_driver
+    FakeDriver.created = []
+    browser_pool.create_driver = FakeDriver
+
+    def restore():
+        browser_pool.shutdown_browser_pool()
+        browser_pool.create_driver = original
+
+    return restore
+
+
+def test_broken_driver_is_replaced():
+    restore = with_fake_driver()
+    try:
+        pool = BrowserPool(size=1, max_pages=10)
+        with pool.lease() as first:
+            pass
+        first.broken = True
+        with pool.lease() as second:
+            pass
+        pool.shutdown()
+    finally:
+        restore()
+
+    assert second is not first
+    assert first.quit_called
+    assert pool.created == 2 and pool.leases == 2
+
+
+def test_recycle_after_max_pages():
+    restore = with_fake_driver()
+    try:
+        pool = BrowserPool(size=1, max_pages=3)
+        drivers = []
+        for _ in range(4):
+            with pool.lease() as driver:
+                drivers.append(driver)
+        pool.shutdown()
+    finally:
+        restore()
+
+    # 3페이지까지는 같은 드라이버, 4번째는 새 드라이버
+    assert drivers[0] is drivers[1] is drivers[2]
+    assert drivers[3] is not drivers[0]
+    assert drivers[0].quit_called and pool.recycled == 1
+    # 반납할 때마다 about:blank로 초기화 (재생성하는 반납은 초기화 없이 종료)
+    assert drivers[0].visited == ['about:blank', 'about:blank']
+
+
+def test_leases_bounded_under_threads():
+    restore = with_fake_driver()
+    try:
+        pool = BrowserPool(size=2, max_pages=100)
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def work():
+            with pool.lease():
+                with lock:
+                    state['active'] += 1
+                    state['peak'] = max(state['peak'], state['active'])
+                time.sleep(0.02)
+                with lock:
+                    state['active'] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pool.shutdown()
+    finally:
+        restore()
+
+    assert state['peak'] == 2
+    assert pool.created == 2 and pool.leases == 8
+
+
+def test_shutdown_quits_every_driver():
+    restore = with_fake_driver()
+    os.environ['BROWSER_POOL_SIZE'] = '2'
+    try:
+        pool = browser_pool.get_browser_pool()
+        assert browser_pool.get_browser_pool() is pool
+
+        with pool.lease():
+            pass
+        with pool.lease() as leased:
+            # 대여 중에 종료하면 놀고 있던 드라이버는 바로, 대여 중인 드라이버는 반납할 때 종료
+            with pool.lease():
+                pass
+            browser_pool.shutdown_browser_pool()
+            assert not leased.quit_called
+        assert browser_pool._pool is None
+
+        try:
+            with pool.lease():
+                pass
+            raise AssertionError("종료된 풀에서 대여됨")
+        except RuntimeError:
+            pass
+    finally:
+        os.environ.pop('BROWSER_POOL_SIZE')
+        restore()
+
+    assert len(FakeDriver.created) == 2
+    assert all(driver.quit_called for driver in FakeDriver.created)
+
+
+if __name__ == '__main__':
+    for test in (test_broken_driver_is_replaced, test_recycle_after_max_pages, test_leases_bounded_under_threads,
+                 test_shutdown_quits_every_driver):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
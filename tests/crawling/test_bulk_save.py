@@ -0,0 +1,126 @@
+"""
+게시글 bulk upsert 테스트 (오프라인, MongoDB 없음)
+
+bulk_write / update_one만 흉내 내는 메모리 컬렉션으로
+- 새로 추가 / 변경 / 변화 없음 개수를 정확히 세는지
+- 배치 크기대로 나눠서 bulk_write를 호출하는지
+- 일부 문서가 실패하면 그 문서만 다시 저장하는지
+확인한다. (실제 MongoDB 처리량 비교는 tests/integration/bench_save_posts.py)
+
+Usage:
+    python3 tests/crawling/test_bulk_save.py
+"""
+
+import sys
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from pymongo.errors import BulkWriteError, OperationFailure
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling.manager.save_db import bulk_upsert_posts
+
+
+class MemoryCollection:
+    """
+    post_id 기준 upsert만 지원하는 메모리 컬렉션
+
+    fail_bulk에 있는 post_id는 bulk_write에서 실패, fail_always에 있는 post_id는 update_one에서도 실패
+    """
+
+    def __init__(self, fail_bulk=(), fail_always=()):
+        self.docs = {}
+        self.fail_bulk = set(fail_bulk)
+        self.fail_always = set(fail_always)
+        self.bulk_calls = []
+        self.single_calls = []
+
+    def _apply(self, post_id, fields):
+        """(upserted, matched, modified)"""
+        if post_id not in self.docs:
+            self.docs[post_id] = dict(fields)
+            return 1, 0, 0
+        changed = any(self.docs[post_id].get(key) != value for key, value in fields.items())
+        self.docs[post_id].update(fields)
+        return 0, 1, int(changed)
+
+    def bulk_write(self, operations, ordered=True):
+        assert ordered is False
+        self.bulk_calls.append(len(operations))
+        totals = [0, 0, 0]
+        errors = []
+        for index, op in enumerate(operations):
+            post_id = op._filter['post_id']
+            # 새 게시글은 TTL 만료 대상(대본 미생성)으로 저장
+            assert op._doc['$setOnInsert'] == {'script_generated_at': None}
+            if post_id in self.fail_bulk or post_id in self.fail_always:
+                errors.append({'index': index, 'code': 1, 'errmsg': 'failed'})
+                continue
+            for i, value in enumerate(self._apply(post_id, op._doc['$set'])):
+                totals[i] += value
+
+        if errors:
+            raise BulkWriteError({'writeErrors': errors, 'nUpserted': totals[0], 'nMatched': totals[1],
+                                  'nModified': totals[2]})
+        return SimpleNamespace(upserted_count=totals[0], matched_count=totals[1], modified_count=totals[2])
+
+    def update_one(self, filter, update, upsert=False):
+        post_id = filter['post_id']
+        self.single_calls.append(post_id)
+        if post_id in self.fail_always:
+            raise OperationFailure('still failing')
+        upserted, _, modified = self._apply(post_id, update['$set'])
+        return SimpleNamespace(upserted_id=post_id if upserted else None, modified_count=modified)
+
+
+def make_posts(count: int, views: int = 0):
+    return [{'post_id': str(i), 'title': f"글 {i}", 'views': views} for i in range(count)]
+
+
+def test_counts_and_batches():
+    collection = MemoryCollection()
+
+    counts = bulk_upsert_posts(collection, make_posts(7), batch_size=3)
+    assert counts == {'inserted': 7, 'modified': 0, 'unchanged': 0, 'failed': 0}
+    assert collection.bulk_calls == [3, 3, 1]
+
+    # 2개만 조회수 변경 + 새 글 1개
+    posts = make_posts(7)
+    posts[0]['views'] = posts[5]['views'] = 100
+    posts.append({'post_id': '7', 'title': '새 글', 'views': 0})
+    counts = bulk_upsert_posts(collection, posts, batch_size=500)
+    assert counts == {'inserted': 1, 'modified': 2, 'unchanged': 5, 'failed': 0}
+
+
+def test_duplicate_post_ids_in_batch():
+    """같은 post_id가 두 번 있으면 마지막 값 1개만 저장"""
+    collection = MemoryCollection()
+    posts = make_posts(3) + [{'post_id': '1', 'title': '수정된 글', 'views': 5}]
+
+    counts = bulk_upsert_posts(collection, posts, batch_size=10)
+
+    assert counts['inserted'] == 3
+    assert collection.bulk_calls == [3]
+    assert collection.docs['1']['title'] == '수정된 글'
+
+
+def test_retry_only_failed_documents():
+    """bulk_write에서 실패한 문서만 update_one으로 재시도, 그래도 실패하면 failed로 집계"""
+    collection = MemoryCollection(fail_bulk={'2', '4'}, fail_always={'5'})
+
+    counts = bulk_upsert_posts(collection, make_posts(6), batch_size=10)
+
+    assert collection.single_calls == ['2', '4', '5']
+    assert counts == {'inserted': 5, 'modified': 0, 'unchanged': 0, 'failed': 1}
+    assert set(collection.docs) == {'0', '1', '2', '3', '4'}
+
+
+if __name__ == '__main__':
+    for test in (test_counts_and_batches, test_duplicate_post_ids_in_batch, test_retry_only_failed_documents):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
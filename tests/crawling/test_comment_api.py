@@ -0,0 +1,170 @@
+"""
+HTTP 댓글 수집 테스트 (오프라인)
+
+저장해 둔 댓글 API 응답(tests/fixtures/dcinside/comments_page*.json)을 로컬 서버로 띄워서
+- Selenium 파서와 같은 형식(대댓글 "└ ", 댓글돌이/광고 제외)으로 나오는지
+- 페이지네이션이 끝까지 도는지
+- API 실패 시 Selenium으로 폴백하는지
+- 댓글 페이지 요청마다 호스트 리미터 토큰을 쓰는지 (Selenium 폴백도 같은 리미터)
+확인한다.
+
+Usage:
+    python3 tests/crawling/test_comment_api.py
+"""
+
+import sys
+import json
+import threading
+
+from pathlib import Path
+from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling import http_client
+from app.modules.crawling.dcinside import comment_api, detail_scraper
+from app.modules.crawling.rate_limiter import TokenBucketLimiter
+
+FIXTURE_DIR = project_root / 'tests' / 'fixtures' / 'dcinside'
+POST_ID = "13267271"
+
+EXPECTED_COMMENTS = [
+    "아니 젠슨황 이 형은 고점에서 맨날 던지네;; 내 롱 포지션 어떡하냐 ㅠㅠ",
+    "└ ㅋㅋㅋㅋ 숏충이들은 개추 눌러라",
+    "쫄지마라 SOXL 풀매수 기회다.공포에 사라고 했다!! 가즈아!! >_<",
+    "200일선 깨지면 손절이다",
+    "└ 손절은 무슨 기도매매 간다",
+]
+
+
+def load_page(page: int) -> dict:
+    return json.loads((FIXTURE_DIR / f'comments_page{page}.json').read_text(encoding='utf-8'))
+
+
+def start_comment_server(json_response: bool = True, pages: int = None):
+    """댓글 API 흉내 서버 (comment_page 값에 맞는 fixture 응답, pages를 주면 페이지마다 댓글 1개씩 pages페이지)"""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            form = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+            requests_seen.append(form)
+
+            if pages:
+                page = int(form['comment_page'][0])
+                row = {'no': str(page), 'memo': f"댓글 {page}", 'depth': 0}
+                body = json.dumps({'total_cnt': pages, 'comments': [row]}).encode('utf-8')
+                content_type = 'application/json'
+            elif json_response:
+                page = int(form['comment_page'][0])
+                body = json.dumps(load_page(page) if page <= 2 else {'total_cnt': 7, 'comments': []}).encode('utf-8')
+                content_type = 'application/json'
+            else:
+                # 토큰 만료 등으로 HTML이 돌아오는 경우
+                body, content_type = '<html>잘못된 접근입니다</html>'.encode('utf-8'), 'text/html; charset=UTF-8'
+
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/board/comment/", requests_seen
+
+
+def test_parse_comment_response():
+    """fixture 1페이지 파싱: 댓글돌이/삭제/디시콘 제외, 대댓글 접두어"""
+    comments, total, row_count = comment_api.parse_comment_response(load_page(1))
+
+    assert total == 7
+    assert row_count == 5  # 댓글돌이 제외한 원본 행 수
+    assert comments == EXPECTED_COMMENTS[:3]
+
+
+def test_same_format_as_selenium_parser():
+    """HTTP 결과와 렌더링된 페이지(Selenium) 파싱 결과가 같아야 함"""
+    html = (FIXTURE_DIR / 'comments_rendered.html').read_text(encoding='utf-8')
+    selenium_comments = detail_scraper.parse_comment_html(html)
+
+    http_comments = []
+    for page in (1, 2):
+        http_comments.extend(comment_api.parse_comment_response(load_page(page))[0])
+
+    assert selenium_comments == EXPECTED_COMMENTS
+    assert http_comments == selenium_comments
+
+
+def test_pagination():
+    """전체 댓글 수(total_cnt)만큼 읽을 때까지 페이지를 넘김"""
+    server, url, requests_seen = start_comment_server()
+    original_url = comment_api.COMMENT_URL
+    comment_api.COMMENT_URL = url
+    try:
+        comments = comment_api.get_comments_with_http(POST_ID, 'fixture_token')
+    finally:
+        comment_api.COMMENT_URL = original_url
+        server.shutdown()
+
+    assert comments == EXPECTED_COMMENTS
+    assert [r['comment_page'][0] for r in requests_seen] == ['1', '2']
+    assert requests_seen[0]['e_s_n_o'][0] == 'fixture_token'
+
+
+def test_fallback_to_selenium():
+    """JSON이 아닌 응답 / 토큰 없음 → Selenium으로 폴백"""
+    server, url, _ = start_comment_server(json_response=False)
+    original_url = comment_api.COMMENT_URL
+    original_selenium = detail_scraper.get_comments_with_selenium
+    comment_api.COMMENT_URL = url
+    detail_scraper.get_comments_with_selenium = lambda post_id: ['selenium']
+    try:
+        assert detail_scraper.get_comments(POST_ID, 'fixture_token') == ['selenium']
+        assert detail_scraper.get_comments(POST_ID, None) == ['selenium']
+    finally:
+        comment_api.COMMENT_URL = original_url
+        detail_scraper.get_comments_with_selenium = original_selenium
+        server.shutdown()
+
+
+def test_comment_pages_use_host_limiter():
+    """댓글 페이지마다 토큰 1개 (본문 요청 1번에 묶이지 않음), Selenium 폴백도 같은 리미터"""
+    server, url, requests_seen = start_comment_server(pages=4)
+    limiter = TokenBucketLimiter(rate=50, burst=1, max_concurrent=1, name='127.0.0.1')
+    original_url = comment_api.COMMENT_URL
+    comment_api.COMMENT_URL = url
+    http_client.set_host_limiter('127.0.0.1', limiter)
+    try:
+        comments = comment_api.get_comments_with_http(POST_ID, 'fixture_token')
+        assert comments == [f"댓글 {page}" for page in range(1, 5)]
+        assert len(requests_seen) == 4 and limiter.total_requests == 4
+        # 버스트 1개 이후에는 초당 50개 간격 (3개 × 20ms)
+        assert limiter.total_wait >= 0.05
+
+        with http_client.host_slot(f"{url}?selenium"):
+            pass
+        assert limiter.total_requests == 5
+    finally:
+        http_client.set_host_limiter('127.0.0.1', None)
+        comment_api.COMMENT_URL = original_url
+        server.shutdown()
+
+    # 등록 해제 후에는 제한 없음
+    with http_client.host_slot(url):
+        pass
+    assert limiter.total_requests == 5
+
+
+if __name__ == '__main__':
+    for test in (test_parse_comment_response, test_same_format_as_selenium_parser, test_pagination, test_fallback_to_selenium,
+                 test_comment_pages_use_host_limiter):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,89 @@
+"""
+빠른 파서(lxml XPath) 결과 비교 테스트 (오프라인)
+
+저장해 둔 목록/본문 페이지(tests/fixtures/dcinside)와 경계 사례 HTML로
+fast_parser 결과가 기존 BeautifulSoup 파서와 똑같은지 확인한다.
+
+Usage:
+    python3 tests/crawling/test_fast_parser.py
+"""
+
+import sys
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling.dcinside import list_scraper, detail_scraper
+from app.modules.crawling.dcinside.fast_parser import parse_post_list_fast, parse_post_detail_fast
+
+FIXTURE_DIR = project_root / 'tests' / 'fixtures' / 'dcinside'
+
+# 주석, 아이콘, 공지/AD 행, 숫자가 아닌 조회수, 클래스 여러 개 등 경계 사례
+EDGE_LIST_HTML = '''
+<table><tbody>
+<tr class="ub-content us-post" data-no="123">
+  <td class="gall_num">123</td>
+  <td class="gall_subject"><b>일반</b></td>
+  <td class="gall_tit ub-word"><a href="#"><em class="icon_img icon_pic"></em>제목<!-- 숨김 --> 이다 &amp; 끝</a>
+    <a class="reply_numbox"><span class="reply_num">[7]</span></a></td>
+  <td class="gall_writer ub-writer" data-nick="작성자"></td>
+  <td class="gall_date" title="2026-01-01 00:00:00">01.01</td>
+  <td class="gall_count">-</td>
+  <td class="gall_recommend">5</td>
+</tr>
+<tr class="ub-content"><td class="gall_num">공지</td><td class="gall_tit"><a>공지글</a></td></tr>
+<tr class="ub-content"><td class="gall_num">5</td><td class="gall_subject"> A<b>D</b> </td><td class="gall_tit"><a>광고</a></td></tr>
+<tr class="ub-content"><td class="gall_num">6</td><td class="gall_tit">링크 없음</td></tr>
+<tr class="ub-content"><td class="gall_num"> 7 </td><td class="gall_tit"><a> 작성자 없음 </a></td></tr>
+</tbody></table>
+'''
+
+EDGE_VIEW_HTML = '''
+<html><body>
+<span class="title_subject"> 제목 <!-- c --> &amp; 끝 </span>
+<div class="gall_writer ub-writer" data-nick="닉"></div>
+<div class="write_div">
+  <script>var a = 1;</script><style>p {}</style>
+  <p>가<br>나</p>텍스트<img src="http://x/1.jpg">꼬리<img src="/local.gif"><img>
+  <!-- 주석 --><p>&nbsp;</p><p><img src="https://x/2.png"></p>
+</div>
+<div class="write_div">두 번째 본문 영역은 무시</div>
+<input type="hidden" id="e_s_n_o" value="token">
+</body></html>
+'''
+
+
+def test_list_fixture_parity():
+    html = (FIXTURE_DIR / 'list_page.html').read_text(encoding='utf-8')
+    expected = list_scraper.parse_post_list(html)
+
+    assert expected  # fixture가 비어 있으면 비교 의미 없음
+    assert parse_post_list_fast(html) == expected
+
+
+def test_view_fixture_parity():
+    html = (FIXTURE_DIR / 'view_page.html').read_text(encoding='utf-8')
+    expected = detail_scraper.parse_post_detail(html)
+
+    assert expected['content'] and expected['images'] and expected['e_s_n_o']
+    assert parse_post_detail_fast(html) == expected
+
+
+def test_edge_case_parity():
+    assert parse_post_list_fast(EDGE_LIST_HTML) == list_scraper.parse_post_list(EDGE_LIST_HTML)
+    assert parse_post_detail_fast(EDGE_VIEW_HTML) == detail_scraper.parse_post_detail(EDGE_VIEW_HTML)
+
+    # 빈 페이지 / 구조가 다른 페이지
+    for html in ('', '<html><body><p>점검 중</p></body></html>'):
+        assert parse_post_list_fast(html) == list_scraper.parse_post_list(html)
+        assert parse_post_detail_fast(html) == detail_scraper.parse_post_detail(html)
+
+
+if __name__ == '__main__':
+    for test in (test_list_fixture_parity, test_view_fixture_parity, test_edge_case_parity):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
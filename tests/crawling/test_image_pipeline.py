@@ -0,0 +1,200 @@
+"""
+이미지 다운로드 단계 테스트 (오프라인)
+
+지연이 있는 로컬 이미지 서버로
+- 게시글당 / 전체 동시 다운로드 수 제한이 지켜지는지
+- 결과가 원래 이미지 순서대로 나오는지
+- 크기 초과, 실행당 한도 초과, 이미지가 아닌 응답(HTML)은 저장하지 않는지
+- 확장자를 URL이 아니라 파일 내용으로 판별하는지
+- shutdown(wait=False)로 취소된 게시글도 result()가 끝나고, 끝난 작업은 단계가 붙잡고 있지 않는지
+확인한다.
+
+Usage:
+    python3 tests/crawling/test_image_pipeline.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling import image_store
+from app.modules.crawling.image_pipeline import ImageDownloadStage, sniff_extension
+from app.modules.crawling.dcinside import detail_scraper
+
+PNG = b'\x89PNG\r\n\x1a\n'
+JPEG = b'\xff\xd8\xff\xe0'
+WEBP = b'RIFF\x00\x00\x00\x00WEBPVP8 '
+
+
+def start_image_server(latency: float = 0.1):
+    """
+    /img/<n>  → 서로 다른 PNG (약 7~10KB), 확장자 없는 dcimg 스타일 URL
+    /big      → 약 3MB
+    /error    → HTML 오류 페이지 (Content-Type은 image/png)
+    """
+    state = {'active': 0, 'max_active': 0, 'active_by_post': {}, 'max_by_post': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            post_id = self.headers.get('Referer', '').rsplit('=', 1)[-1]
+            with lock:
+                state['active'] += 1
+                state['max_active'] = max(state['max_active'], state['active'])
+                by_post = state['active_by_post']
+                by_post[post_id] = by_post.get(post_id, 0) + 1
+                state['max_by_post'] = max(state['max_by_post'], by_post[post_id])
+            try:
+                time.sleep(latency)
+                if self.path.startswith('/big'):
+                    body = PNG + b'\x00' * (3 * 1024 * 1024)
+                elif self.path.startswith('/error'):
+                    body = '<html>잘못된 접근입니다</html>'.encode('utf-8')
+                else:
+                    body = PNG + self.path.encode('utf-8') * 1000
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # 크기 초과로 클라이언트가 먼저 끊은 경우
+            finally:
+                with lock:
+                    state['active'] -= 1
+                    state['active_by_post'][post_id] -= 1
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", state
+
+
+def with_temp_store(test):
+    """임시 이미지 저장소 폴더로 테스트 실행 후 원복"""
+    def wrapper():
+        original = os.environ.get('IMAGE_STORE_DIR')
+        os.environ['IMAGE_STORE_DIR'] = tempfile.mkdtemp(prefix='image_pipeline_')
+        image_store._index = None
+        try:
+            test()
+        finally:
+            if original is None:
+                os.environ.pop('IMAGE_STORE_DIR', None)
+            else:
+                os.environ['IMAGE_STORE_DIR'] = original
+            image_store._index = None
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+def test_sniff_extension():
+    """매직 바이트 우선, 판별 못 하면 Content-Type, HTML은 거부"""
+    assert sniff_extension(PNG + b'data', 'image/jpeg') == 'png'
+    assert sniff_extension(JPEG + b'data') == 'jpg'
+    assert sniff_extension(b'GIF89a...') == 'gif'
+    assert sniff_extension(WEBP) == 'webp'
+    assert sniff_extension(b'\x00\x01unknown', 'image/webp; charset=binary') == 'webp'
+    assert sniff_extension(b'<html>error</html>', 'image/png') is None
+    assert sniff_extension(b'\x00\x01unknown', 'text/plain') is None
+
+
+@with_temp_store
+def test_concurrency_limits_and_order():
+    """게시글당 2개 / 전체 4개 제한, 결과는 원래 순서"""
+    server, base, state = start_image_server(latency=0.1)
+    stage = ImageDownloadStage(detail_scraper.download_image, max_workers=4, per_post=2)
+    try:
+        started = time.perf_counter()
+        jobs = {
+            post_id: stage.submit(post_id, [f"{base}/img/{post_id}_{i}" for i in range(6)])
+            for post_id in ('1', '2', '3')
+        }
+        submit_elapsed = time.perf_counter() - started
+
+        results = {post_id: job.result(timeout=30) for post_id, job in jobs.items()}
+        elapsed = time.perf_counter() - started
+    finally:
+        stage.shutdown()
+        server.shutdown()
+
+    assert submit_elapsed < 0.05  # 예약은 바로 반환
+    assert state['max_by_post'] <= 2
+    assert state['max_active'] <= 4
+    assert elapsed < 18 * 0.1  # 순차(1.8초)보다 빨라야 함
+    for post_id, paths in results.items():
+        assert len(paths) == 6
+        # 원래 순서 유지: 각 파일 내용에 요청 경로가 들어 있음
+        for i, path in enumerate(paths):
+            assert f"/img/{post_id}_{i}".encode('utf-8') in Path(path).read_bytes()[:100]
+            assert path.endswith('.png')  # URL에 확장자가 없어도 내용으로 판별
+    assert stage.stats['saved'] == 18
+    assert not stage._pending  # 끝난 게시글 작업은 놓아줌
+
+
+@with_temp_store
+def test_size_caps_and_rejection():
+    """이미지 크기 초과 / HTML 응답은 저장 안 함, 실행당 한도를 넘으면 남은 이미지 건너뜀"""
+    server, base, _ = start_image_server(latency=0)
+    try:
+        stage = ImageDownloadStage(detail_scraper.download_image, max_workers=1, per_post=1,
+                                   max_image_bytes=1024 * 1024)
+        paths = stage.submit('1', [f"{base}/img/a", f"{base}/big", f"{base}/error", f"{base}/img/b"]).result(timeout=30)
+        stage.shutdown()
+
+        assert len(paths) == 2
+        assert stage.stats['failed'] == 2
+        assert not list(Path(os.environ['IMAGE_STORE_DIR']).glob('objects/*.part'))
+
+        # 실행당 한도 10KB: 첫 이미지(약 7KB) 저장, 두 번째에서 한도 초과 → 나머지 건너뜀
+        budget_stage = ImageDownloadStage(detail_scraper.download_image, max_workers=1, per_post=1,
+                                          max_run_bytes=10 * 1024)
+        paths = budget_stage.submit('2', [f"{base}/img/c{i}" for i in range(5)]).result(timeout=30)
+        budget_stage.shutdown()
+
+        assert len(paths) == 1
+        assert budget_stage.stats['failed'] == 1
+        assert budget_stage.stats['skipped'] == 3
+    finally:
+        server.shutdown()
+
+
+def test_shutdown_without_wait_finishes_jobs():
+    """대기 중인 다운로드를 취소해도 result()가 끝나야 함 (취소된 이미지는 건너뜀)"""
+    release = threading.Event()
+
+    def download(url, post_id, index, max_bytes=0, budget=None):
+        release.wait(5)
+        return f"{url}.png"
+
+    stage = ImageDownloadStage(download, max_workers=1, per_post=2)
+    first = stage.submit('1', ['a0', 'a1', 'a2'])   # a0 다운로드 중, a1 대기
+    second = stage.submit('2', ['b0', 'b1'])        # 둘 다 대기
+    stage.shutdown(wait=False)
+
+    assert second.done() and second.result(timeout=1) == []
+    assert not first.done()  # 이미 시작한 a0는 끝날 때까지 기다림
+    release.set()
+    assert first.result(timeout=5) == ['a0.png']
+    assert stage.stats['saved'] == 1 and stage.stats['skipped'] == 4
+    assert not stage._pending
+
+
+if __name__ == '__main__':
+    for test in (test_sniff_extension, test_concurrency_limits_and_order, test_size_caps_and_rejection,
+                 test_shutdown_without_wait_finishes_jobs):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
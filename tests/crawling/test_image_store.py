@@ -0,0 +1,175 @@
+"""
+내용 주소 기반 이미지 저장소 테스트 (오프라인)
+
+로컬 이미지 서버로
+- 같은 URL은 다시 요청하지 않고, 다른 URL이라도 같은 내용이면 파일 1개만 저장
+- 게시글별 참조가 기록되는지
+- 정리(GC) 시 DB에 남은 게시글이 참조하는 이미지는 남고, 삭제된 게시글만 참조하던 이미지/이전 날짜 폴더 파일은 삭제되는지
+- DB 조회에 실패하면 정리를 건너뛰는지
+확인한다.
+
+Usage:
+    python3 tests/crawling/test_image_store.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+from pathlib import Path
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling import image_store
+from app.modules.crawling.dcinside import detail_scraper
+from app.modules.crawling.manager import retention
+
+MEME = b'\x89PNG\r\n\x1a\n' + b'meme' * 50000  # 약 200KB
+CHART = b'\xff\xd8\xff' + b'chart' * 1000
+
+
+def start_image_server():
+    """/meme*.png → 같은 내용, /chart.jpg → 다른 내용"""
+    paths_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            paths_seen.append(self.path)
+            body = MEME if self.path.startswith('/meme') else CHART
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", paths_seen
+
+
+def with_temp_store(test):
+    """임시 저장소 폴더로 테스트 실행 후 원복"""
+    def wrapper():
+        original = os.environ.get('IMAGE_STORE_DIR')
+        os.environ['IMAGE_STORE_DIR'] = tempfile.mkdtemp(prefix='image_store_')
+        image_store._index = None
+        try:
+            test()
+        finally:
+            if original is None:
+                os.environ.pop('IMAGE_STORE_DIR', None)
+            else:
+                os.environ['IMAGE_STORE_DIR'] = original
+            image_store._index = None
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@with_temp_store
+def test_dedupe_and_url_index():
+    """같은 URL은 재요청 없음, 같은 내용은 파일 1개 공유"""
+    server, base, paths_seen = start_image_server()
+    try:
+        first = detail_scraper.download_image(f"{base}/meme.png", '100', 0)
+        again = detail_scraper.download_image(f"{base}/meme.png", '101', 0)
+        mirror = detail_scraper.download_image(f"{base}/meme_mirror.png", '102', 0)
+        chart = detail_scraper.download_image(f"{base}/chart.jpg", '102', 1)
+    finally:
+        server.shutdown()
+
+    assert paths_seen == ['/meme.png', '/meme_mirror.png', '/chart.jpg']
+    assert first == again == mirror
+    assert chart != first
+    assert Path(first).read_bytes() == MEME
+    assert Path(first).parent.parent.name == 'objects'
+
+    stats = image_store.get_store_stats()
+    assert stats['objects'] == 2
+    assert stats['refs'] == 4  # meme: 100, 101, 102 / chart: 102
+
+    # 인덱스가 디스크에 남아 다음 실행에서도 재사용
+    image_store.flush()
+    image_store._index = None
+    assert image_store.lookup_url(f"{base}/meme.png")[1] == Path(first)
+
+
+@with_temp_store
+def test_garbage_collection():
+    """
+    DB에서 삭제된 게시글(1)만 참조하던 이미지는 삭제, 남은 게시글(3)이 참조하거나
+    최근에 참조된(아직 DB 저장 전일 수 있는) 이미지는 유지
+    """
+    store_dir = Path(os.environ['IMAGE_STORE_DIR'])
+    old_sha, old_path = image_store.save_stream('http://x/old.png', [CHART], 'png')
+    shared_sha, shared_path = image_store.save_stream('http://x/shared.png', [MEME], 'png')
+    fresh_sha, fresh_path = image_store.save_stream('http://x/fresh.gif', [b'GIF89a' + b'new' * 100], 'gif')
+
+    old_ref = (datetime.now() - timedelta(days=30)).isoformat(timespec='seconds')
+    image_store.add_ref(old_sha, '1')
+    image_store.add_ref(shared_sha, '1')
+    image_store.add_ref(shared_sha, '3')
+    image_store.add_ref(fresh_sha, '9')  # 방금 수집, 아직 DB에 없음
+    image_store._index['objects'][old_sha]['last_ref'] = old_ref
+    image_store._index['objects'][shared_sha]['last_ref'] = old_ref
+
+    # 이전 방식 날짜 폴더 (1번 게시글 파일만 있는 폴더 / 3번 게시글 파일이 남는 폴더)
+    old_mtime = time.time() - 30 * 86400
+    legacy_dead = store_dir / '2026-01-01'
+    legacy_live = store_dir / '2026-01-02'
+    for folder, name in ((legacy_dead, '1_00.jpg'), (legacy_live, '1_01.jpg'), (legacy_live, '3_00.jpg')):
+        folder.mkdir(exist_ok=True)
+        (folder / name).write_bytes(CHART)
+        os.utime(folder / name, (old_mtime, old_mtime))
+    # 인덱스 기록 전에 중단된 임시 파일
+    orphan = store_dir / 'objects' / 'tmpabc.part'
+    orphan.write_bytes(b'partial')
+    os.utime(orphan, (old_mtime, old_mtime))
+
+    result = image_store.collect_garbage(live_post_ids={'3'}, grace_days=7)
+
+    assert result['objects'] == 2  # 삭제된 게시글의 이미지 + 임시 파일
+    assert result['legacy'] == 2
+    assert not old_path.exists() and not orphan.exists() and not legacy_dead.exists()
+    assert shared_path.exists() and fresh_path.exists()
+    assert [path.name for path in legacy_live.iterdir()] == ['3_00.jpg']
+    assert image_store.lookup_url('http://x/old.png') is None
+    assert image_store.lookup_url('http://x/shared.png')[0] == shared_sha
+    # 남은 게시글만 참조 목록에 유지
+    assert image_store._index['objects'][shared_sha]['posts'] == ['3']
+
+
+@with_temp_store
+def test_retention_keeps_images_without_db():
+    """DB 조회에 실패하면 (게시글 목록을 모르므로) 이미지를 지우지 않음"""
+    sha256, path = image_store.save_stream('http://x/old.png', [CHART], 'png')
+    image_store._index['objects'][sha256]['last_ref'] = (datetime.now() - timedelta(days=30)).isoformat()
+
+    def unavailable():
+        raise ConnectionError('MongoDB 없음')
+
+    original = retention.get_mongo_client
+    retention.get_mongo_client = unavailable
+    try:
+        result = retention.start_retention(grace_days=7)
+        result.join(timeout=5)
+        assert retention.run_retention(grace_days=7) is None
+    finally:
+        retention.get_mongo_client = original
+
+    assert path.exists()
+
+
+if __name__ == '__main__':
+    for test in (test_dedupe_and_url_index, test_garbage_collection, test_retention_keeps_images_without_db):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,138 @@
+"""
+인덱스 관리 테스트 (오프라인, MongoDB 없음)
+
+index_information / create_indexes / drop_index만 흉내 내는 메모리 DB로
+- 없는 인덱스는 만들고, 같은 정의는 건너뛰는지
+- 같은 이름인데 정의가 다르면 지우고 다시 만드는지
+- 예전 게시글 만료 표시(script_generated_at: null)는 처음 한 번만 하는지
+- explain() 결과에서 COLLSCAN / 메모리 정렬(SORT)을 찾아내는지
+확인한다. (실제 실행 계획 점검은 python3 -m app.modules.crawling.manager.indexes)
+
+Usage:
+    python3 tests/crawling/test_indexes.py
+"""
+
+import sys
+
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling.manager import indexes
+
+
+class MemoryIndexCollection:
+    def __init__(self, existing=None, name='posts'):
+        self.name = name
+        self.info = {'_id_': {'v': 2, 'key': [('_id', 1)]}}
+        self.info.update(existing or {})
+        self.created = []
+        self.dropped = []
+        self.docs = {}  # _id로 조회/저장하는 문서 (crawl_state)
+        self.update_many_calls = 0
+
+    def index_information(self):
+        return dict(self.info)
+
+    def create_indexes(self, models):
+        for model in models:
+            document = dict(model.document)
+            name = document.pop('name')
+            document['key'] = list(document['key'].items())
+            self.info[name] = {'v': 2, **document}
+            self.created.append(name)
+
+    def drop_index(self, name):
+        del self.info[name]
+        self.dropped.append(name)
+
+    def find_one(self, query):
+        return self.docs.get(query['_id'])
+
+    def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query['_id'], {'_id': query['_id']}).update(update['$set'])
+
+    def update_many(self, query, update):
+        self.update_many_calls += 1
+        return SimpleNamespace(modified_count=3)
+
+
+class MemoryDB(dict):
+    def __missing__(self, name):
+        self[name] = MemoryIndexCollection(name=name)
+        return self[name]
+
+
+def with_fake_db(db: MemoryDB):
+    original = indexes.get_mongo_client
+    indexes.get_mongo_client = lambda: {'test': db}
+
+    def restore():
+        indexes.get_mongo_client = original
+
+    return restore
+
+
+def test_create_then_unchanged():
+    db = MemoryDB()
+    restore = with_fake_db(db)
+    try:
+        first = indexes.ensure_indexes('test')
+        second = indexes.ensure_indexes('test')
+    finally:
+        restore()
+
+    assert first['created'] == len(indexes.INDEXES['posts'])
+    assert second == {'created': 0, 'recreated': 0, 'unchanged': first['created'], 'failed': 0}
+    assert db['posts'].info['post_id_unique']['unique'] is True
+
+    # 예전 게시글 만료 표시는 처음 한 번만 (완료 기록이 남으면 전체 update_many를 다시 하지 않음)
+    assert db['posts'].update_many_calls == 1
+    assert db['crawl_state'].docs[indexes.SCRIPT_MARKER_MIGRATION]['modified'] == 3
+
+
+def test_recreate_changed_definition():
+    """예전에 unique 없이 만든 post_id 인덱스 / TTL이 없던 crawled_at 인덱스 + mongosh로 만든 실수 방향 인덱스"""
+    db = MemoryDB()
+    db['posts'] = MemoryIndexCollection({
+        'post_id_unique': {'v': 2, 'key': [('post_id', 1)]},
+        'crawled_at': {'v': 2, 'key': [('crawled_at', -1)]},
+        'unscripted_by_recommend': {'v': 2, 'key': [('script_generated_at', 1.0), ('recommend', -1.0)]},
+        'manual_index': {'v': 2, 'key': [('title', 1)]},
+    })
+    restore = with_fake_db(db)
+    try:
+        counts = indexes.ensure_indexes('test')
+    finally:
+        restore()
+
+    assert db['posts'].dropped == ['post_id_unique', 'crawled_at']
+    assert counts == {'created': 0, 'recreated': 2, 'unchanged': 1, 'failed': 0}
+    assert db['posts'].info['crawled_at']['expireAfterSeconds'] == int(indexes.POST_RETENTION_DAYS * 86400)
+    # 선언되지 않은 인덱스는 그대로
+    assert 'manual_index' in db['posts'].info
+
+
+def test_find_slow_plans():
+    index_plan = {'queryPlanner': {'winningPlan': {
+        'stage': 'LIMIT', 'inputStage': {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN'}}}}}
+    scan_plan = {'queryPlanner': {'winningPlan': {'queryPlan': {
+        'stage': 'SORT', 'inputStage': {'stage': 'COLLSCAN'}}}}}
+
+    plans = {
+        'indexed': list(indexes.plan_stages(index_plan['queryPlanner']['winningPlan'])),
+        'scan': list(indexes.plan_stages(scan_plan['queryPlanner']['winningPlan'])),
+    }
+
+    assert plans['indexed'] == ['LIMIT', 'FETCH', 'IXSCAN']
+    assert indexes.find_slow_plans(plans) == {'scan': ['SORT', 'COLLSCAN']}
+
+
+if __name__ == '__main__':
+    for test in (test_create_then_unchanged, test_recreate_changed_definition, test_find_slow_plans):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,130 @@
+"""
+공유 MongoDB 클라이언트 테스트 (오프라인, MongoDB 없음)
+
+MongoClient를 가짜로 바꿔서
+- 여러 스레드가 동시에 get_mongo_client()를 불러도 클라이언트 1개 / ping 1번인지
+- ping에 실패한 클라이언트는 저장하지 않고 다음 호출에서 다시 만드는지
+- close_mongo_client() 후에는 새 클라이언트를 만드는지
+확인한다.
+
+Usage:
+    python3 tests/crawling/test_mongo_client.py
+"""
+
+import sys
+import time
+import threading
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from pymongo.errors import ServerSelectionTimeoutError
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling.manager import connection_db
+
+
+class FakeMongoClient:
+    """ping / close만 흉내 내는 클라이언트"""
+
+    created = []
+    fail_ping = False
+
+    def __init__(self, uri, **kwargs):
+        self.kwargs = kwargs
+        self.pings = 0
+        self.closed = False
+        self.options = SimpleNamespace(pool_options=SimpleNamespace(
+            max_pool_size=kwargs.get('maxPoolSize'), min_pool_size=kwargs.get('minPoolSize')))
+        self.admin = SimpleNamespace(command=self._command)
+        FakeMongoClient.created.append(self)
+
+    def _command(self, name):
+        # 동시에 들어온 스레드가 생성 구간에 겹치도록 잠깐 대기
+        time.sleep(0.05)
+        self.pings += 1
+        if FakeMongoClient.fail_ping:
+            raise ServerSelectionTimeoutError('no server')
+        return {'ok': 1}
+
+    def close(self):
+        self.closed = True
+
+
+def with_fake_client(fail_ping: bool = False):
+    """connection_db.MongoClient를 가짜로 교체 (restore 함수 반환)"""
+    original = connection_db.MongoClient
+    connection_db.close_mongo_client()
+    FakeMongoClient.created = []
+    FakeMongoClient.fail_ping = fail_ping
+    connection_db.MongoClient = FakeMongoClient
+
+    def restore():
+        connection_db._client = None
+        connection_db.MongoClient = original
+
+    return restore
+
+
+def test_one_client_across_threads():
+    restore = with_fake_client()
+    try:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(connection_db.get_mongo_client()))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        restore()
+
+    assert len(FakeMongoClient.created) == 1
+    assert FakeMongoClient.created[0].pings == 1
+    assert all(client is FakeMongoClient.created[0] for client in results)
+    assert FakeMongoClient.created[0].kwargs['maxPoolSize'] == 20
+
+
+def test_failed_ping_is_not_cached():
+    restore = with_fake_client(fail_ping=True)
+    try:
+        try:
+            connection_db.get_mongo_client()
+            raise AssertionError("ServerSelectionTimeoutError가 발생해야 함")
+        except ServerSelectionTimeoutError:
+            pass
+        assert connection_db._client is None
+        assert FakeMongoClient.created[0].closed
+
+        # 서버가 살아나면 다음 호출에서 새로 연결
+        FakeMongoClient.fail_ping = False
+        client = connection_db.get_mongo_client()
+    finally:
+        restore()
+
+    assert len(FakeMongoClient.created) == 2
+    assert client is FakeMongoClient.created[1]
+
+
+def test_close_then_reconnect():
+    restore = with_fake_client()
+    try:
+        first = connection_db.get_mongo_client()
+        connection_db.close_mongo_client()
+        connection_db.close_mongo_client()  # 두 번 불러도 문제 없음
+        second = connection_db.get_mongo_client()
+    finally:
+        restore()
+
+    assert first.closed
+    assert second is not first and not second.closed
+
+
+if __name__ == '__main__':
+    for test in (test_one_client_across_threads, test_failed_ping_is_not_cached, test_close_then_reconnect):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
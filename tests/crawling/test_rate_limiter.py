@@ -0,0 +1,84 @@
+"""
+요청 속도 제한(TokenBucketLimiter) 테스트 (오프라인)
+
+- burst개까지는 바로 통과하고, N개를 받는 데 약 (N - burst) / rate초가 걸리는지
+- 여러 스레드가 동시에 slot()을 잡아도 진행 중인 요청이 max_concurrent개를 넘지 않는지
+- rate가 0 이하면 기다리지 않는지 (동시 연결 수 제한만 적용)
+확인한다.
+
+Usage:
+    python3 tests/crawling/test_rate_limiter.py
+"""
+
+import sys
+import time
+import threading
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling.rate_limiter import TokenBucketLimiter
+
+
+def test_rate_cap():
+    limiter = TokenBucketLimiter(rate=50, burst=3, name='test')
+
+    # burst개는 바로 통과
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire_token()
+    assert time.monotonic() - started < 0.02
+
+    # 나머지는 초당 rate개씩: 10개 → (10 - 3) / 50 = 0.14초
+    for _ in range(7):
+        limiter.acquire_token()
+    elapsed = time.monotonic() - started
+    assert 0.13 <= elapsed < 0.4, f"{elapsed:.3f}초"
+    assert limiter.total_requests == 10
+    assert limiter.total_wait >= 0.13
+
+
+def test_max_concurrent_under_threads():
+    limiter = TokenBucketLimiter(rate=1000, burst=20, max_concurrent=3, name='test')
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+
+    def work():
+        with limiter.slot():
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert state['peak'] == 3
+    assert limiter.total_requests == 12
+
+
+def test_non_positive_rate_is_unlimited():
+    for rate in (0, -1):
+        limiter = TokenBucketLimiter(rate=rate, burst=1, name='test')
+        started = time.monotonic()
+        for _ in range(1000):
+            with limiter.slot():
+                pass
+        assert time.monotonic() - started < 0.5
+        assert limiter.total_requests == 1000
+        assert limiter.total_wait == 0
+
+
+if __name__ == '__main__':
+    for test in (test_rate_cap, test_max_concurrent_under_threads, test_non_positive_rate_is_unlimited):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
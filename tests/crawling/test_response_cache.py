@@ -0,0 +1,165 @@
+"""
+HTTP 응답 디스크 캐시 테스트 (오프라인)
+
+ETag를 주는 로컬 서버로
+- TTL 이내 재요청은 네트워크 없이 캐시 적중
+- TTL이 지나면 조건부 요청(If-None-Match) → 304면 캐시 본문 재사용
+- offline 모드에서 캐시에 없는 URL은 CacheMissError
+- 용량 한도를 넘으면 오래된 항목 삭제
+확인한다.
+
+Usage:
+    python3 tests/crawling/test_response_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling import http_client, response_cache
+
+FIXTURE_DIR = project_root / 'tests' / 'fixtures' / 'dcinside'
+ETAG = '"fixture-v1"'
+
+
+def start_list_server():
+    """목록 페이지 흉내 서버 (ETag 일치 시 304)"""
+    conditional_seen = []
+    body = (FIXTURE_DIR / 'list_page.html').read_bytes()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            conditional_seen.append(self.headers.get('If-None-Match'))
+
+            if self.headers.get('If-None-Match') == ETAG:
+                self.send_response(304)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=UTF-8')
+            self.send_header('ETag', ETAG)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/lists", conditional_seen
+
+
+def with_cache_env(**env):
+    """임시 캐시 폴더 + 환경변수로 테스트 실행 후 원복"""
+    def decorator(test):
+        def wrapper():
+            values = {'HTTP_CACHE_DIR': tempfile.mkdtemp(prefix='http_cache_'), 'HTTP_CACHE_MODE': 'on', **env}
+            original = {key: os.environ.get(key) for key in values}
+            os.environ.update(values)
+            response_cache.reset_cache_stats()
+            response_cache._total_size = None
+            try:
+                test()
+            finally:
+                for key, value in original.items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
+        wrapper.__name__ = test.__name__
+        return wrapper
+    return decorator
+
+
+@with_cache_env(HTTP_CACHE_TTL='600')
+def test_fresh_hit():
+    """TTL 이내면 두 번째 요청은 서버로 가지 않음 (파라미터 순서 무관)"""
+    server, url, conditional_seen = start_list_server()
+    try:
+        first = http_client.http_get(url, params={'id': 'stockus', 'page': 1}, use_cache=True)
+        second = http_client.http_get(url, params={'page': 1, 'id': 'stockus'}, use_cache=True)
+    finally:
+        server.shutdown()
+
+    assert conditional_seen == [None]
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.text == first.text
+    assert response_cache.get_cache_stats()['hits'] == 1
+
+
+@with_cache_env(HTTP_CACHE_TTL='0')
+def test_revalidate_304():
+    """TTL이 지나면 If-None-Match로 재검증하고, 304면 캐시 본문 사용"""
+    server, url, conditional_seen = start_list_server()
+    try:
+        first = http_client.http_get(url, params={'page': 1}, use_cache=True)
+        second = http_client.http_get(url, params={'page': 1}, use_cache=True)
+    finally:
+        server.shutdown()
+
+    assert conditional_seen == [None, ETAG]
+    assert second.status_code == 200
+    assert second.headers['X-Cache'] == 'REVALIDATED'
+    assert second.text == first.text
+
+
+@with_cache_env()
+def test_offline_mode():
+    """offline 모드: 캐시에 있으면 TTL과 무관하게 사용, 없으면 CacheMissError"""
+    server, url, conditional_seen = start_list_server()
+    try:
+        http_client.http_get(url, params={'page': 1}, use_cache=True)
+
+        os.environ['HTTP_CACHE_MODE'] = 'offline'
+        os.environ['HTTP_CACHE_TTL'] = '0'
+        cached = http_client.http_get(url, params={'page': 1}, use_cache=True)
+
+        try:
+            http_client.http_get(url, params={'page': 2}, use_cache=True)
+            raise AssertionError("CacheMissError가 발생해야 함")
+        except response_cache.CacheMissError:
+            pass
+    finally:
+        server.shutdown()
+
+    assert conditional_seen == [None]
+    assert cached.headers['X-Cache'] == 'HIT'
+
+
+@with_cache_env(HTTP_CACHE_MAX_MB='0.01')
+def test_eviction():
+    """용량 한도(약 10KB)를 넘으면 오래 안 쓴 항목부터 삭제"""
+    server, url, _ = start_list_server()
+    try:
+        for page in range(1, 6):
+            http_client.http_get(url, params={'page': page}, use_cache=True)
+    finally:
+        server.shutdown()
+
+    cache_dir = Path(os.environ['HTTP_CACHE_DIR'])
+    total = sum(p.stat().st_size for p in cache_dir.glob('*/*.gz'))
+
+    assert response_cache.get_cache_stats()['evictions'] > 0
+    assert total <= 0.01 * 1024 * 1024
+    # 가장 최근 항목은 남아 있어야 함
+    assert response_cache.load_entry(response_cache.make_cache_key(url, {'page': 5})) is not None
+
+
+if __name__ == '__main__':
+    for test in (test_fresh_hit, test_revalidate_304, test_offline_mode, test_eviction):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
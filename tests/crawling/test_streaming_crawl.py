@@ -0,0 +1,176 @@
+"""
+스트리밍 크롤링 + 마이크로 배치 저장 테스트 (오프라인, MongoDB 없음)
+
+목록/본문 수집과 저장 함수를 가짜로 바꿔서
+- iter_gallery가 전체를 다 모으기 전에 게시글을 하나씩 내보내는지
+- PostBatchSaver가 개수 기준으로 나눠서 저장하는지
+- 중간 페이지에서 실패해도 그 전까지의 게시글은 저장되고, 하이 워터 마크는 저장되지 않는지
+- max_posts로 끊기거나 본문 수집/저장에 실패한 실행은 하이 워터 마크를 저장하지 않고,
+  새 글/갱신 수는 실제로 수집한 게시글만 세는지
+- crawl_gallery가 예전처럼 전체 리스트를 반환하는지
+확인한다.
+
+Usage:
+    python3 tests/crawling/test_streaming_crawl.py
+"""
+
+import os
+import sys
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling import crawler_main
+from app.modules.crawling.manager import save_db
+
+POSTS_PER_PAGE = 4
+
+
+def with_fake_crawl(fail_on_page: int = None, fail_details=(), fail_saves: bool = False):
+    """
+    목록/본문/저장을 가짜로 교체 (fail_details: 본문 수집에 실패할 post_id, fail_saves: 저장 전부 실패)
+
+    Returns:
+        (calls, restore) - calls에 목록 요청 페이지, 저장 배치, 하이 워터 마크 저장 기록
+    """
+    calls = {'pages': [], 'batches': [], 'high_water_mark': []}
+    originals = {
+        'get_post_list': crawler_main.get_post_list,
+        'get_post_detail': crawler_main.get_post_detail,
+        'fetch_post_snapshots': crawler_main.fetch_post_snapshots,
+        'load_high_water_mark': crawler_main.load_high_water_mark,
+        'save_high_water_mark': crawler_main.save_high_water_mark,
+    }
+    original_save_posts = save_db.save_posts
+
+    def get_post_list(page: int, recommend_only: bool = True):
+        calls['pages'].append(page)
+        if page == fail_on_page:
+            raise RuntimeError(f"{page}페이지 요청 실패")
+        start = 1000 - (page - 1) * POSTS_PER_PAGE
+        return [{'post_id': str(start - i), 'title': f"글 {start - i}", 'views': 0, 'recommend': 0,
+                 'comment_count': 0} for i in range(POSTS_PER_PAGE)]
+
+    def get_post_detail(post_id: str, download_images: bool = True):
+        if post_id in fail_details:
+            return None
+        return {'post_id': post_id, 'content': '본문', 'images': [], 'image_paths': [], 'comments': []}
+
+    def save_posts(posts, db_name=None, verbose=True, counts=None):
+        calls['batches'].append([post['post_id'] for post in posts])
+        if fail_saves:
+            counts['failed'] = len(posts)
+            return 0
+        return len(posts)
+
+    crawler_main.get_post_list = get_post_list
+    crawler_main.get_post_detail = get_post_detail
+    crawler_main.fetch_post_snapshots = lambda post_ids: {}
+    crawler_main.load_high_water_mark = lambda state_id: None
+    crawler_main.save_high_water_mark = lambda state_id, post_no: calls['high_water_mark'].append(post_no)
+    save_db.save_posts = save_posts
+
+    def restore():
+        for name, func in originals.items():
+            setattr(crawler_main, name, func)
+        save_db.save_posts = original_save_posts
+
+    return calls, restore
+
+
+def test_iter_gallery_is_lazy():
+    """첫 게시글은 1페이지만 읽은 상태에서 나와야 함"""
+    calls, restore = with_fake_crawl()
+    try:
+        stream = crawler_main.iter_gallery(pages=3, delay=0, cleanup_days=0)
+        first = next(stream)
+        pages_at_first = list(calls['pages'])
+        rest = list(stream)
+    finally:
+        restore()
+
+    assert first['post_id'] == '1000'
+    assert pages_at_first == [1]
+    assert [post['post_id'] for post in [first] + rest] == [str(1000 - i) for i in range(12)]
+
+
+def test_micro_batches_and_high_water_mark():
+    """batch_size개씩 저장, 정상 종료 시 하이 워터 마크 저장"""
+    calls, restore = with_fake_crawl()
+    os.environ['SAVE_BATCH_SIZE'] = '5'
+    try:
+        posts = crawler_main.crawl_gallery(pages=3, delay=0, cleanup_days=0, concurrency=2, incremental=True)
+    finally:
+        os.environ.pop('SAVE_BATCH_SIZE')
+        restore()
+
+    assert len(posts) == 12
+    assert [len(batch) for batch in calls['batches']] == [5, 5, 2]
+    assert calls['high_water_mark'] == [1000]
+
+
+def test_failure_keeps_saved_pages():
+    """3페이지에서 실패해도 1~2페이지 게시글은 저장, 하이 워터 마크는 저장 안 함"""
+    calls, restore = with_fake_crawl(fail_on_page=3)
+    os.environ['SAVE_BATCH_SIZE'] = '100'
+    try:
+        crawler_main.save_gallery(pages=5, delay=0, cleanup_days=0, incremental=True)
+        raise AssertionError("RuntimeError가 발생해야 함")
+    except RuntimeError:
+        pass
+    finally:
+        os.environ.pop('SAVE_BATCH_SIZE')
+        restore()
+
+    saved = [post_id for batch in calls['batches'] for post_id in batch]
+    assert saved == [str(1000 - i) for i in range(8)]
+    assert calls['high_water_mark'] == []
+
+
+def test_max_posts_keeps_high_water_mark():
+    """max_posts로 끊긴 실행은 하이 워터 마크 저장 안 함, 새 글 수는 수집한 만큼만"""
+    calls, restore = with_fake_crawl()
+    state = {}
+    try:
+        stream = crawler_main.iter_gallery(pages=3, delay=0, max_posts=5, cleanup_days=0, incremental=True,
+                                           state=state)
+        crawler_main._consume(stream, save_to_db=True, incremental=True, state=state)
+    finally:
+        restore()
+
+    assert [post_id for batch in calls['batches'] for post_id in batch] == [str(1000 - i) for i in range(5)]
+    assert state['new'] == 5 and state['total'] == 5
+    assert state['high_water_mark'] == 1000 and not state['complete']
+    assert calls['high_water_mark'] == []
+
+
+def test_incomplete_runs_keep_high_water_mark():
+    """본문 수집 실패 / 저장 실패가 있으면 하이 워터 마크 저장 안 함"""
+    calls, restore = with_fake_crawl(fail_details=('999',))
+    state = {}
+    try:
+        stream = crawler_main.iter_gallery(pages=2, delay=0, cleanup_days=0, incremental=True, state=state)
+        crawler_main._consume(stream, save_to_db=True, incremental=True, state=state)
+    finally:
+        restore()
+    assert state['failed'] == 1 and state['new'] == 7
+    assert calls['high_water_mark'] == []
+
+    calls, restore = with_fake_crawl(fail_saves=True)
+    try:
+        crawler_main.save_gallery(pages=2, delay=0, cleanup_days=0, incremental=True)
+    finally:
+        restore()
+    assert len(calls['batches']) == 1
+    assert calls['high_water_mark'] == []
+
+
+if __name__ == '__main__':
+    for test in (test_iter_gallery_is_lazy, test_micro_batches_and_high_water_mark, test_failure_keeps_saved_pages,
+                 test_max_posts_keeps_high_water_mark, test_incomplete_runs_keep_high_water_mark):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,107 @@
+"""
+게시글 저장 벤치마크 (로컬 MongoDB 필요)
+
+같은 게시글 N개를
+- 기존 방식: 게시글마다 update_one(upsert=True) 왕복
+- bulk 방식: unordered bulk_write (MONGO_BULK_SIZE개씩)
+으로 저장해서 docs/sec를 비교한다. 새로 추가(insert)와 재저장(update) 두 경우를 모두 측정한다.
+
+벤치마크 전용 DB(shorts_factory_bench)를 만들었다가 끝나면 삭제한다.
+
+Usage:
+    docker-compose up -d mongodb
+    MONGO_URI=mongodb://localhost:27017/ python3 tests/integration/bench_save_posts.py --docs 2000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from pathlib import Path
+from datetime import datetime
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling.manager.save_db import bulk_upsert_posts
+
+load_dotenv()
+
+BENCH_DB = 'shorts_factory_bench'
+
+
+def make_posts(count: int, revision: int):
+    """실제 크롤링 결과와 비슷한 크기의 게시글 (본문 약 1KB, 댓글 20개)"""
+    return [{
+        'post_id': str(13000000 + i),
+        'title': f"벤치마크 게시글 {i}",
+        'author': '익명',
+        'date': '2026-01-01 00:00:00',
+        'views': 100 + revision,
+        'recommend': 10,
+        'comment_count': 20,
+        'content': '본문 ' * 250,
+        'images': [],
+        'image_paths': [],
+        'comments': [f"댓글 {j}" for j in range(20)],
+        'crawled_at': datetime.now(),
+    } for i in range(count)]
+
+
+def save_one_by_one(collection, posts):
+    """기존 save_posts 방식 (게시글마다 왕복)"""
+    for post in posts:
+        collection.update_one({'post_id': post['post_id']}, {'$set': post}, upsert=True)
+
+
+def measure(label: str, func, collection, posts) -> float:
+    started = time.perf_counter()
+    func(collection, posts)
+    elapsed = time.perf_counter() - started
+    rate = len(posts) / elapsed
+    print(f"{label:>22} {len(posts):>7} {elapsed:>9.2f} {rate:>10.0f}")
+    return rate
+
+
+def run_benchmark(docs: int, batch_size: int):
+    client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/'), serverSelectionTimeoutMS=5000)
+    client.admin.command('ping')
+    db = client[BENCH_DB]
+
+    def bulk(collection, posts):
+        bulk_upsert_posts(collection, posts, batch_size=batch_size)
+
+    print("=" * 60)
+    print(f"🏁 게시글 저장 벤치마크 (docs={docs}, bulk_size={batch_size})")
+    print("=" * 60)
+    print(f"{'case':>22} {'docs':>7} {'seconds':>9} {'docs/sec':>10}")
+
+    try:
+        results = {}
+        for name, func in (('update_one', save_one_by_one), ('bulk_write', bulk)):
+            db.drop_collection('posts')
+            collection = db['posts']
+            collection.create_index('post_id', unique=True)
+
+            results[f"{name} insert"] = measure(f"{name} insert", func, collection, make_posts(docs, 0))
+            results[f"{name} update"] = measure(f"{name} update", func, collection, make_posts(docs, 1))
+
+        print("=" * 60)
+        for case in ('insert', 'update'):
+            print(f"{case}: bulk_write {results[f'bulk_write {case}'] / results[f'update_one {case}']:.1f}x")
+    finally:
+        client.drop_database(BENCH_DB)
+        client.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='save_posts 저장 방식 비교')
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=int(os.getenv('MONGO_BULK_SIZE', 500)))
+    args = parser.parse_args()
+
+    run_benchmark(args.docs, args.batch_size)
@@ -0,0 +1,119 @@
+"""
+시작 시간(import 비용) 회귀 테스트 (python -X importtime, MongoDB / API 없음)
+
+새 프로세스에서 -X importtime으로 실행해서
+- main.py / app.core를 불러오는 것만으로는 단계별 무거운 의존성(Selenium, bs4, lxml, requests,
+  google.generativeai, anthropic, pymongo)을 import하지 않는지
+- render는 크롤러 / LLM / MongoDB 없이 실행되는지
+- 대본 작성 단계는 크롤러를, 크롤링 단계는 LLM 라이브러리를 import하지 않는지
+- app.core import 시간이 예산(IMPORT_TIME_BUDGET_MS, 기본 100ms) 안인지
+확인한다. 직접 실행하면 단계별 import 시간과 가장 느린 모듈도 출력.
+
+Usage:
+    python3 tests/integration/test_import_time.py
+"""
+
+import os
+import re
+import sys
+import subprocess
+
+from pathlib import Path
+from typing import Dict, List
+
+# 프로젝트 루트
+project_root = Path(__file__).parent.parent.parent
+
+# -X importtime 출력 한 줄: "import time: self [us] | cumulative | imported package"
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+CRAWLER_MODULES = ('selenium', 'bs4', 'lxml', 'requests')
+LLM_MODULES = ('google.generativeai', 'anthropic')
+DB_MODULES = ('pymongo',)
+
+# 단계별로 import하는 모듈 (단계 함수가 안에서 import하는 것과 같음)
+PHASES = {
+    'core': 'import app.core',
+    'write': 'import app.modules.llm.llm_writer',
+    'crawl': 'import app.modules.crawling.crawler_main',
+}
+
+
+def import_profile(args: List[str], env: Dict[str, str] = None) -> Dict[str, int]:
+    """
+    새 파이썬 프로세스를 -X importtime으로 실행해서 모듈별 누적 import 시간(us) 수집
+
+    Args:
+        args: python 뒤에 붙일 인자 (예: ['-c', 'import app.core'], ['main.py', 'render'])
+        env: 덧붙일 환경변수
+
+    Returns:
+        {모듈 이름: 누적 import 시간(us)}
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=project_root,
+                            env=dict(os.environ, **(env or {})), capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            profile[match.group(4)] = int(match.group(2))
+    return profile
+
+
+def imported(profile: Dict[str, int], packages) -> List[str]:
+    """profile에서 packages(하위 모듈 포함) 중 import된 것"""
+    return sorted(name for name in profile
+                  if any(name == package or name.startswith(package + '.') for package in packages))
+
+
+def test_core_skips_phase_dependencies():
+    profile = import_profile(['-c', PHASES['core']])
+    assert 'app.core' in profile
+    assert imported(profile, CRAWLER_MODULES + LLM_MODULES + DB_MODULES) == []
+
+
+def test_render_runs_without_crawler_or_llm():
+    profile = import_profile(['main.py', 'render'])
+    assert imported(profile, CRAWLER_MODULES + LLM_MODULES + DB_MODULES) == []
+
+
+def test_write_skips_crawler():
+    # 가짜 모델 / Anthropic으로 쓰면 google.generativeai도 필요 없음 (Gemini 모델을 만들 때 import)
+    profile = import_profile(['-c', PHASES['write']])
+    assert 'app.modules.llm.llm_writer' in profile
+    assert imported(profile, ('selenium', 'bs4', 'lxml') + LLM_MODULES) == []
+
+
+def test_crawl_skips_llm():
+    profile = import_profile(['-c', PHASES['crawl']])
+    assert 'app.modules.crawling.crawler_main' in profile
+    assert imported(profile, LLM_MODULES) == []
+
+
+def test_core_import_budget():
+    budget_ms = float(os.getenv('IMPORT_TIME_BUDGET_MS', 100))
+    # 첫 실행은 .pyc 생성 비용이 섞이므로 두 번 재고 빠른 쪽
+    elapsed_ms = min(import_profile(['-c', PHASES['core']])['app.core'] for _ in range(2)) / 1000
+    assert elapsed_ms < budget_ms, f"app.core import {elapsed_ms:.1f}ms > 예산 {budget_ms:g}ms"
+
+
+def print_report(top: int = 5):
+    """단계별 import 시간 + 가장 느린 최상위 모듈"""
+    for phase, code in PHASES.items():
+        profile = import_profile(['-c', code])
+        module = code.split()[-1]
+        slowest = sorted(((us, name) for name, us in profile.items()
+                          if name != module and '.' not in name), reverse=True)[:top]
+        print(f"⏱️ {phase:<6} {profile[module] / 1000:8.1f}ms  "
+              + ', '.join(f"{name} {us / 1000:.1f}ms" for us, name in slowest))
+
+
+if __name__ == '__main__':
+    for test in (test_core_skips_phase_dependencies, test_render_runs_without_crawler_or_llm, test_write_skips_crawler,
+                 test_crawl_skips_llm, test_core_import_budget):
+        test()
+        print(f"✅ {test.__name__}")
+    print_report()
+    print("🎉 모든 테스트 통과!")
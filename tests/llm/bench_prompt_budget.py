@@ -0,0 +1,108 @@
+"""
+프롬프트 토큰 예산 벤치마크 (MongoDB에 저장된 게시글 필요)
+
+저장된 게시글로 프롬프트를 만들어서
+- 토큰 추정기 속도 (게시글당 시간, 초당 글자 수)
+- 예산 없이(0) 만들었을 때와 예산별로 만들었을 때의 프롬프트 토큰 분포 (p50/p95/max)
+- 본문이 축약된 게시글 수와 줄어든 토큰 합계
+를 출력한다. --calibrate N을 주면 Gemini count_tokens API로 N개를 실제로 세서 추정치와의 비율을 보여준다.
+
+Usage:
+    MONGO_URI=mongodb://localhost:27017/ python3 tests/llm/bench_prompt_budget.py --limit 500 --budgets 2000 3000 4000
+    python3 tests/llm/bench_prompt_budget.py --limit 200 --calibrate 20   # GEMINI_API_KEY 필요
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+
+from pathlib import Path
+from dotenv import load_dotenv
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.crawling.manager.connection_db import get_mongo_client
+from app.modules.llm.prompt.prompt_builder import build_script_prompt
+from app.modules.llm.prompt.token_counter import count_tokens
+from app.modules.llm.repository.script_repository import SCRIPT_PROJECTION
+
+load_dotenv()
+
+
+def load_posts(limit: int):
+    collection = get_mongo_client()[os.getenv('MONGO_DB_NAME', 'shorts_factory')]['posts']
+    return list(collection.find({}, SCRIPT_PROJECTION).limit(limit))
+
+
+def percentile(values, ratio: float) -> int:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def bench_estimator(posts, repeat: int = 5):
+    texts = [post.get('content') or '' for post in posts]
+    chars = sum(len(text) for text in texts)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            count_tokens(text)
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"🔢 추정기: 게시글당 {elapsed / len(texts) * 1e6:.0f}µs, 초당 {chars / elapsed / 1e6:.1f}M 글자")
+
+
+def bench_budgets(posts, budgets):
+    print(f"{'budget':>8} {'p50':>7} {'p95':>7} {'max':>7} {'trimmed':>8} {'saved':>9} {'ms/post':>8}")
+    baseline = [build_script_prompt(post, budget=0)[1]['total'] for post in posts]
+    for budget in budgets:
+        started = time.perf_counter()
+        reports = [build_script_prompt(post, budget=budget)[1] for post in posts]
+        elapsed = time.perf_counter() - started
+        totals = [report['total'] for report in reports]
+        trimmed = sum(report['trimmed'] for report in reports)
+        saved = sum(baseline) - sum(totals)
+        label = budget or '없음'
+        print(f"{label:>8} {statistics.median(totals):>7.0f} {percentile(totals, 0.95):>7} {max(totals):>7} "
+              f"{trimmed:>8} {saved:>9} {elapsed / len(posts) * 1000:>8.2f}")
+
+
+def calibrate(posts, count: int):
+    """Gemini count_tokens(실제 토크나이저) 대비 추정치 비율"""
+    from app.modules.llm.client.gemini_client import init_gemini_api
+
+    model = init_gemini_api()
+    ratios = []
+    for post in posts[:count]:
+        prompt, report = build_script_prompt(post)
+        actual = model.count_tokens(prompt).total_tokens
+        ratios.append(report['total'] / actual)
+    print(f"📏 추정치/실제: 평균 {statistics.mean(ratios):.2f}, 최소 {min(ratios):.2f}, 최대 {max(ratios):.2f} "
+          f"({len(ratios)}개, 1 이상이면 보수적으로 추정)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='프롬프트 토큰 예산 벤치마크')
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--budgets', type=int, nargs='+', default=[0, 2000, 3000, 4000])
+    parser.add_argument('--calibrate', type=int, default=0, help='Gemini count_tokens로 비교할 게시글 수')
+    args = parser.parse_args()
+
+    # 게시글마다 찍히는 축약 로그 숨김
+    logging.getLogger('app.modules.llm.prompt.prompt_builder').setLevel(logging.WARNING)
+
+    posts = load_posts(args.limit)
+    if not posts:
+        print("📭 저장된 게시글이 없습니다.")
+        sys.exit(0)
+
+    print("=" * 60)
+    print(f"🏁 프롬프트 토큰 예산 벤치마크 (게시글 {len(posts)}개)")
+    print("=" * 60)
+    bench_estimator(posts)
+    bench_budgets(posts, args.budgets)
+    if args.calibrate:
+        calibrate(posts, args.calibrate)
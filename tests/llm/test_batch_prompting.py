@@ -0,0 +1,162 @@
+"""
+여러 게시글 묶음 요청 테스트 (오프라인, Gemini API / MongoDB 없음)
+
+가짜 모델로
+- 게시글이 짧으면 요청당 최대 개수까지, 길면 토큰 예산 안에 들어가는 만큼만 묶는지
+- 묶음 응답을 post_id별로 나눠서 게시글마다 자기 대본이 저장되는지
+- 응답에서 빠졌거나 형식이 잘못된 게시글만 한 건씩 다시 요청하는지
+- 같은 게시글을 처리할 때 한 건씩 요청하는 것보다 요청 수 / 입력 토큰이 줄어드는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_batch_prompting.py
+"""
+
+import os
+import sys
+import json
+import threading
+
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm import llm_writer
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.client.rate_limiter import AdaptiveRateLimiter
+from app.modules.llm.generator import batch_generator, response_parser
+from app.modules.llm.prompt.prompt_builder import BATCH_POST_PATTERN
+
+
+def make_posts(count: int, content: str = '본문입니다.'):
+    return [{'post_id': str(i), 'title': f"글 {i}", 'content': content, 'recommend': 10, 'comment_count': 1,
+             'comments': ['가즈아']} for i in range(count)]
+
+
+def with_clean_state(test):
+    """캐시 끄고 통계 초기화 후 실행, 끝나면 환경변수 원복"""
+    def wrapper():
+        os.environ['LLM_CACHE_MODE'] = 'off'
+        batch_generator.reset_batch_stats()
+        response_parser.reset_parse_stats()
+        try:
+            test()
+        finally:
+            for name in ('LLM_CACHE_MODE', 'LLM_POSTS_PER_REQUEST', 'PROMPT_BATCH_TOKEN_BUDGET'):
+                os.environ.pop(name, None)
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@with_clean_state
+def test_batch_size_follows_budget():
+    short = make_posts(7)
+    assert [len(batch) for batch in batch_generator.iter_post_batches(short, max_posts=3, budget=8000)] == [3, 3, 1]
+
+    # 본문이 길면 (게시글당 예산까지 줄여도) 묶음 예산 안에 2개씩만 들어감
+    content = ' '.join(f"{i}번째 줄, 엔비디아 실적 발표 앞두고 프리장 분위기 정리." for i in range(300))
+    long_posts = make_posts(4, content=content)
+    batches = list(batch_generator.iter_post_batches(long_posts, max_posts=5, budget=6000))
+    assert [len(batch) for batch in batches] == [2, 2]
+
+    # 혼자서 예산을 넘는 게시글도 빠지지 않음
+    assert [len(batch) for batch in batch_generator.iter_post_batches(long_posts, max_posts=5, budget=1000)] \
+        == [1, 1, 1, 1]
+
+
+@with_clean_state
+def test_results_split_by_post_id():
+    model = FakeGenerativeModel(latency=0)
+    batch = next(batch_generator.iter_post_batches(make_posts(4), max_posts=4))
+    results = batch_generator.generate_batch_with_gemini(model, batch)
+
+    assert model.stats['calls'] == 1
+    for post, script_data in results:
+        assert script_data['post_id'] == post['post_id']
+        assert script_data['full_text_for_thumbnail'] == post['title']
+        assert script_data['prompt_tokens']['batch_size'] == 4
+    assert batch_generator.get_batch_stats() == {'requests': 1, 'posts': 4, 'retried': 0}
+
+
+class PartlyBrokenModel(FakeGenerativeModel):
+    """묶음 응답에서 post_id '1'은 빼고 '2'는 썸네일 문구 없이 돌려주는 가짜 모델"""
+
+    def __init__(self):
+        super().__init__(latency=0)
+        self.batch_calls = 0
+        self.single_calls = []
+        self._calls_lock = threading.Lock()
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        response = super().generate_content(prompt, **kwargs)
+        if not BATCH_POST_PATTERN.search(prompt):
+            with self._calls_lock:
+                self.single_calls.append(response.text)
+            return response
+
+        self.batch_calls += 1
+        data = json.loads(response.text)
+        scripts = [script for script in data['scripts'] if script['post_id'] != '1']
+        for script in scripts:
+            if script['post_id'] == '2':
+                del script['full_text_for_thumbnail']
+        return SimpleNamespace(text=json.dumps({'scripts': scripts}, ensure_ascii=False),
+                               usage_metadata=response.usage_metadata)
+
+
+@with_clean_state
+def test_only_failed_posts_are_retried():
+    model = PartlyBrokenModel()
+    batch = next(batch_generator.iter_post_batches(make_posts(4), max_posts=4))
+    results = batch_generator.generate_batch_with_gemini(model, batch)
+
+    assert model.batch_calls == 1 and len(model.single_calls) == 2
+    assert all(script_data is not None for _, script_data in results)
+    # 재요청한 게시글은 한 건씩 요청한 대본 (묶음 메타데이터 없음)
+    retried = {post['post_id'] for post, script_data in results if 'batch_size' not in script_data['prompt_tokens']}
+    assert retried == {'1', '2'}
+    assert batch_generator.get_batch_stats() == {'requests': 1, 'posts': 2, 'retried': 2}
+
+
+@with_clean_state
+def test_fewer_requests_than_single_posts():
+    posts = make_posts(7)
+    saved = {}
+    lock = threading.Lock()
+    originals = (llm_writer.iter_posts_without_script, llm_writer.save_script_to_db)
+
+    def save_script_to_db(post_id, script_data):
+        with lock:
+            saved[post_id] = script_data
+        return True
+
+    llm_writer.iter_posts_without_script = lambda limit=0: iter(posts[:limit])
+    llm_writer.save_script_to_db = save_script_to_db
+    try:
+        single = FakeGenerativeModel(latency=0)
+        limiter = AdaptiveRateLimiter(max_concurrent=2, initial_concurrent=2)
+        assert llm_writer.generate_scripts_batch(limit=7, model=single, limiter=limiter) == 7
+
+        saved.clear()
+        os.environ['LLM_POSTS_PER_REQUEST'] = '3'
+        batched = FakeGenerativeModel(latency=0)
+        assert llm_writer.generate_scripts_batch(limit=7, model=batched, limiter=limiter) == 7
+    finally:
+        llm_writer.iter_posts_without_script, llm_writer.save_script_to_db = originals
+
+    assert sorted(saved, key=int) == [post['post_id'] for post in posts]
+    assert all(saved[post['post_id']]['full_text_for_thumbnail'] == post['title'] for post in posts)
+    # 3개 + 3개 + 1개 → 요청 3회, 고정 지시문도 3번만
+    assert single.stats['calls'] == 7 and batched.stats['calls'] == 3
+    assert batched.stats['input_tokens'] < single.stats['input_tokens'] * 0.6
+
+
+if __name__ == '__main__':
+    for test in (test_batch_size_follows_budget, test_results_split_by_post_id, test_only_failed_posts_are_retried,
+                 test_fewer_requests_than_single_posts):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
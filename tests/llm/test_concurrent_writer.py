@@ -0,0 +1,114 @@
+"""
+동시 대본 생성 + 적응형 리미터 테스트 (오프라인, Gemini API / MongoDB 없음)
+
+가짜 모델(FakeGenerativeModel)과 메모리 저장소로
+- 여러 게시글을 동시에 호출해서 순차 처리보다 빨리 끝나는지
+- 가짜 모델이 429를 돌려주면 동시 호출 수를 줄이고 재시도해서 결국 모두 저장하는지
+- 분당 요청 한도(RPM)를 넘지 않도록 대기하는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_concurrent_writer.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm import llm_writer
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.client.rate_limiter import AdaptiveRateLimiter
+
+
+def with_fake_repository(post_count: int):
+    """
+    게시글 조회/대본 저장을 메모리로 교체
+
+    Returns:
+        (saved, restore) - saved: {post_id: script}
+    """
+    saved = {}
+    lock = threading.Lock()
+    originals = (llm_writer.iter_posts_without_script, llm_writer.save_script_to_db)
+
+    def iter_posts_without_script(limit: int = 0):
+        for i in range(min(limit, post_count) if limit else post_count):
+            yield {'post_id': str(i), 'title': f"글 {i}", 'content': '본문', 'recommend': 10, 'comment_count': 0,
+                   'comments': []}
+
+    def save_script_to_db(post_id, script_data):
+        with lock:
+            assert post_id not in saved, f"{post_id} 중복 저장"
+            saved[post_id] = script_data
+        return True
+
+    llm_writer.iter_posts_without_script = iter_posts_without_script
+    llm_writer.save_script_to_db = save_script_to_db
+    # 매번 실제로 (가짜) 모델을 호출하도록 응답 캐시 끔
+    os.environ['LLM_CACHE_MODE'] = 'off'
+
+    def restore():
+        llm_writer.iter_posts_without_script, llm_writer.save_script_to_db = originals
+        os.environ.pop('LLM_CACHE_MODE')
+
+    return saved, restore
+
+
+def test_concurrent_is_faster_than_sequential():
+    saved, restore = with_fake_repository(post_count=20)
+    model = FakeGenerativeModel(latency=0.2)
+    limiter = AdaptiveRateLimiter(max_concurrent=4, initial_concurrent=4)
+    try:
+        started = time.monotonic()
+        count = llm_writer.generate_scripts_batch(limit=8, model=model, limiter=limiter)
+        elapsed = time.monotonic() - started
+    finally:
+        restore()
+
+    # SCRIPT_LIMIT 의미 유지: limit개만 처리
+    assert count == 8 and sorted(saved, key=int) == [str(i) for i in range(8)]
+    assert model.stats['peak_in_flight'] == 4
+    assert elapsed < 8 * 0.2 / 2, f"순차 처리와 비슷함 ({elapsed:.2f}초)"
+
+
+def test_backs_off_on_rate_limit():
+    """가짜 모델은 1초에 3번까지만 허용 → 429를 받으면 동시 호출 수를 줄이고 재시도"""
+    saved, restore = with_fake_repository(post_count=6)
+    model = FakeGenerativeModel(latency=0.05, rpm_limit=3, window=1.0)
+    limiter = AdaptiveRateLimiter(max_concurrent=6, initial_concurrent=6, backoff=0.5, max_backoff=1.0)
+    try:
+        count = llm_writer.generate_scripts_batch(limit=6, model=model, limiter=limiter)
+    finally:
+        restore()
+
+    assert count == 6 and len(saved) == 6
+    assert model.stats['rejected'] > 0
+    assert limiter.stats['throttled'] > 0
+    assert limiter.concurrency < 6
+
+
+def test_rpm_window():
+    """구간당 요청 수 한도를 넘으면 가장 오래된 요청이 구간에서 빠질 때까지 대기"""
+    limiter = AdaptiveRateLimiter(rpm=2, max_concurrent=4, initial_concurrent=4, window=0.5)
+    started = time.monotonic()
+    for _ in range(3):
+        with limiter.slot():
+            pass
+    elapsed = time.monotonic() - started
+
+    assert 0.45 <= elapsed < 1.0, f"{elapsed:.2f}초"
+    assert limiter.stats['requests'] == 3
+
+
+if __name__ == '__main__':
+    for test in (test_concurrent_is_faster_than_sequential, test_backs_off_on_rate_limit, test_rpm_window):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,193 @@
+"""
+LLM 호출 마감 시간 + 헤지 요청 테스트 (오프라인, Gemini API / MongoDB 없음)
+
+가짜 모델로
+- 응답이 멈춘 호출이 LLM_CALL_TIMEOUT 안에 LLMTimeoutError로 끝나는지
+- 원래 요청이 느리면 헤지 요청의 응답을 쓰고, 헤지 승리로 집계하는지
+- 리미터에 여유가 없거나 헤지 비율 상한을 넘으면 헤지하지 않는지
+- 마감 시간이 지나거나 헤지에 져서 버려진 요청도 실제로 끝날 때까지 리미터 슬롯을 차지하는지
+- LLM_BATCH_DEADLINE이 지나면 배치가 남은 작업을 기다리지 않고 끝나는지
+- 지연 p50/p95/p99가 집계되는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_deadlines.py
+"""
+
+import os
+import sys
+import time
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm import llm_writer
+from app.modules.llm.client import hedging
+from app.modules.llm.client.gemini_client import call_gemini_api
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.client.rate_limiter import AdaptiveRateLimiter
+
+ENV_NAMES = ('LLM_CACHE_MODE', 'LLM_CALL_TIMEOUT', 'LLM_BATCH_DEADLINE', 'LLM_HEDGE', 'LLM_HEDGE_DELAY',
+             'LLM_HEDGE_MIN_SAMPLES', 'LLM_HEDGE_MAX_RATIO')
+
+
+def with_clean_stats(test):
+    """캐시 끄고 지연 통계 초기화 후 실행, 끝나면 환경변수 원복"""
+    def wrapper():
+        os.environ['LLM_CACHE_MODE'] = 'off'
+        hedging.reset_latency_stats()
+        try:
+            test()
+        finally:
+            for name in ENV_NAMES:
+                os.environ.pop(name, None)
+            hedging.reset_latency_stats()
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@with_clean_stats
+def test_stuck_call_times_out():
+    os.environ['LLM_CALL_TIMEOUT'] = '0.3'
+    model = FakeGenerativeModel(latency=5)
+
+    started = time.monotonic()
+    try:
+        call_gemini_api(model, 'prompt')
+    except hedging.LLMTimeoutError:
+        pass
+    else:
+        raise AssertionError('LLMTimeoutError가 발생해야 함')
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0, f"{elapsed:.2f}초"
+    assert hedging.get_latency_stats()['timeouts'] == 1
+
+
+@with_clean_stats
+def test_hedge_wins_over_slow_primary():
+    os.environ['LLM_HEDGE'] = 'on'
+    os.environ['LLM_HEDGE_DELAY'] = '0.1'
+    os.environ['LLM_HEDGE_MAX_RATIO'] = '1'
+    model = FakeGenerativeModel(latency=2)
+    model.hedge_model = FakeGenerativeModel(latency=0.05)
+    limiter = AdaptiveRateLimiter(max_concurrent=2, initial_concurrent=2)
+
+    started = time.monotonic()
+    text = call_gemini_api(model, '- 제목: 엔비디아', limiter=limiter)
+    elapsed = time.monotonic() - started
+
+    assert 'script_segments' in text
+    assert elapsed < 1.0, f"{elapsed:.2f}초"
+    stats = hedging.get_latency_stats()
+    assert stats['hedged'] == 1 and stats['hedge_wins'] == 1
+    # 진 원래 요청은 아직 실행 중 → 끝날 때까지 슬롯 차지, 헤지 요청이 잡은 슬롯은 반납
+    assert limiter._in_flight == 1
+    time.sleep(2.2 - elapsed)
+    assert limiter._in_flight == 0
+
+
+@with_clean_stats
+def test_abandoned_call_keeps_slot():
+    os.environ['LLM_CALL_TIMEOUT'] = '0.2'
+    model = FakeGenerativeModel(latency=0.6)
+    limiter = AdaptiveRateLimiter(max_concurrent=1, initial_concurrent=1)
+
+    started = time.monotonic()
+    try:
+        call_gemini_api(model, 'prompt', limiter=limiter)
+    except hedging.LLMTimeoutError:
+        pass
+    else:
+        raise AssertionError('LLMTimeoutError가 발생해야 함')
+
+    # 마감 시간이 지나도 요청은 계속 실행 중 → 다음 호출은 그 요청이 끝날 때까지 슬롯을 기다림
+    assert limiter._in_flight == 1
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.55
+    limiter.release()
+
+
+@with_clean_stats
+def test_no_hedge_without_capacity():
+    os.environ['LLM_HEDGE'] = 'on'
+    os.environ['LLM_HEDGE_DELAY'] = '0.05'
+    os.environ['LLM_HEDGE_MAX_RATIO'] = '1'
+    model = FakeGenerativeModel(latency=0.3)
+    model.hedge_model = FakeGenerativeModel(latency=0)
+
+    # 동시 호출 1개 → 원래 요청이 슬롯을 잡고 있어서 헤지 요청은 보낼 수 없음
+    limiter = AdaptiveRateLimiter(max_concurrent=1, initial_concurrent=1)
+    call_gemini_api(model, 'prompt', limiter=limiter)
+    assert hedging.get_latency_stats()['hedged'] == 0
+    assert model.hedge_model.stats['calls'] == 0
+
+    # 헤지 비율 상한: 첫 호출에서 헤지한 뒤로는 헤지하지 않음
+    os.environ['LLM_HEDGE_MAX_RATIO'] = '0.5'
+    for _ in range(3):
+        call_gemini_api(model, 'prompt')
+    assert hedging.get_latency_stats()['hedged'] == 2
+    assert model.hedge_model.stats['calls'] == 2
+
+
+@with_clean_stats
+def test_hedge_delay_uses_p95():
+    os.environ['LLM_HEDGE'] = 'on'
+    os.environ['LLM_HEDGE_MIN_SAMPLES'] = '10'
+    for i in range(9):
+        hedging.latency.record(1.0 + i / 10)
+    # 기록이 부족하면 헤지 안 함
+    assert hedging.get_hedge_delay() is None
+
+    for _ in range(11):
+        hedging.latency.record(1.0)
+    hedging.latency.record(9.0)
+    assert abs(hedging.get_hedge_delay() - 1.8) < 1e-9
+
+    stats = hedging.get_latency_stats()
+    assert stats['count'] == 21 and stats['p50'] == 1.0 and stats['p99'] == 9.0
+
+
+@with_clean_stats
+def test_batch_deadline_returns_early():
+    os.environ['LLM_CALL_TIMEOUT'] = '5'
+    saved = {}
+    originals = (llm_writer.iter_posts_without_script, llm_writer.save_script_to_db)
+
+    def iter_posts_without_script(limit: int = 0):
+        for i in range(limit):
+            yield {'post_id': str(i), 'title': f"글 {i}", 'content': '본문', 'comments': []}
+
+    def save_script_to_db(post_id, script_data):
+        saved[post_id] = script_data
+        return True
+
+    llm_writer.iter_posts_without_script = iter_posts_without_script
+    llm_writer.save_script_to_db = save_script_to_db
+    model = FakeGenerativeModel(latency=1.0)
+    limiter = AdaptiveRateLimiter(max_concurrent=2, initial_concurrent=2)
+    try:
+        started = time.monotonic()
+        count = llm_writer.generate_scripts_batch(limit=8, model=model, limiter=limiter, deadline=0.3)
+        elapsed = time.monotonic() - started
+    finally:
+        # 기다리지 않은 호출이 끝날 때까지 저장 함수를 원복하지 않음
+        time.sleep(model.latency)
+        llm_writer.iter_posts_without_script, llm_writer.save_script_to_db = originals
+
+    assert elapsed < 0.8, f"{elapsed:.2f}초"
+    assert count == 0
+    # 실행 중이던 호출 외에는 모델에 보내지 않음
+    assert model.stats['calls'] <= 2
+
+
+if __name__ == '__main__':
+    for test in (test_stuck_call_times_out, test_hedge_wins_over_slow_primary, test_abandoned_call_keeps_slot,
+                 test_no_hedge_without_capacity,
+                 test_hedge_delay_uses_p95, test_batch_deadline_returns_early):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -53,7 +53,7 @@ def test_fetch_posts():
             print(f"✅ {len(posts)}개 게시글 조회 성공")
             for idx, post in enumerate(posts, 1):
                 print(f"\n[{idx}] {post.get('title', '')[:50]}...")
-                print(f"    - 추천수: {post.get('recommend_count', 0)}")
+                print(f"    - 추천수: {post.get('recommend', 0)}")
                 print(f"    - 댓글수: {post.get('comment_count', 0)}")
         else:
             print("⚠️ 대본 미생성 게시글이 없습니다.")
@@ -0,0 +1,136 @@
+"""
+고정 지시문 분리 테스트 (오프라인, Gemini API / MongoDB 없음)
+
+가짜 모델(FakeGenerativeModel)로
+- 지시문을 system instruction으로 가진 모델에는 게시글 부분만 보내고, 아닌 모델에는 지시문을 앞에 붙이는지
+- 토큰 예산은 두 경우 모두 지시문을 포함해서 계산하는지
+- 지시문이 두 번째 호출부터 캐시된 입력으로 처리되어 입력 처리 시간이 줄어드는지
+- LLM_FAKE=true로 일괄 생성하면 모델에 지시문이 한 번만 설정되고 토큰 사용량이 집계되는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_instruction_split.py
+"""
+
+import os
+import sys
+import time
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm import llm_writer
+from app.modules.llm.client import gemini_client
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.generator.script_generator import generate_script_with_gemini
+from app.modules.llm.prompt.prompt_builder import (INSTRUCTION_SEPARATOR, INSTRUCTION_TOKENS, SCRIPT_INSTRUCTION,
+                                                  build_script_prompt)
+from app.modules.llm.prompt.token_counter import count_tokens
+
+POSTS = [{'post_id': str(i), 'title': f"엔비디아 {i}", 'content': '실적 발표 후 시간외 급등', 'recommend': 10,
+          'comment_count': 1, 'comments': ['가즈아']} for i in range(4)]
+
+
+class RecordingModel(FakeGenerativeModel):
+    """받은 프롬프트를 기록하는 가짜 모델"""
+
+    def __init__(self, **kwargs):
+        super().__init__(latency=0, **kwargs)
+        self.prompts = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return super().generate_content(prompt, **kwargs)
+
+
+def without_response_cache(test):
+    def wrapper():
+        os.environ['LLM_CACHE_MODE'] = 'off'
+        try:
+            test()
+        finally:
+            os.environ.pop('LLM_CACHE_MODE')
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+def test_prompt_split():
+    full, full_report = build_script_prompt(POSTS[0], budget=3000)
+    suffix, split_report = build_script_prompt(POSTS[0], budget=3000, include_instruction=False)
+
+    assert full.startswith(SCRIPT_INSTRUCTION) and SCRIPT_INSTRUCTION not in suffix
+    assert full.endswith(suffix) and '- 제목: 엔비디아 0' in suffix
+    assert split_report['instruction_separate'] and not full_report['instruction_separate']
+    assert split_report['prompt'] == count_tokens(suffix) == split_report['total'] - INSTRUCTION_TOKENS
+    assert full_report['prompt'] == full_report['total'] == count_tokens(full)
+    # 고정 부분이 프롬프트 대부분
+    assert INSTRUCTION_TOKENS > 4 * split_report['prompt']
+
+
+@without_response_cache
+def test_generator_uses_model_instruction():
+    split_model = RecordingModel(system_instruction=SCRIPT_INSTRUCTION)
+    plain_model = RecordingModel()
+
+    split_script = generate_script_with_gemini(split_model, POSTS[0])
+    plain_script = generate_script_with_gemini(plain_model, POSTS[0])
+
+    assert SCRIPT_INSTRUCTION not in split_model.prompts[0]
+    assert plain_model.prompts[0].startswith(SCRIPT_INSTRUCTION)
+    assert split_script['prompt_tokens']['instruction_separate']
+    assert not plain_script['prompt_tokens']['instruction_separate']
+    # 예산 기준(total)은 지시문을 포함해서 계산 (구분선만큼만 차이)
+    difference = plain_script['prompt_tokens']['total'] - split_script['prompt_tokens']['total']
+    assert difference == count_tokens(INSTRUCTION_SEPARATOR)
+
+
+@without_response_cache
+def test_instruction_reused_across_calls():
+    """입력 1000토큰당 0.1초 → 지시문은 첫 호출에서만 처리"""
+    def run(model):
+        started = time.monotonic()
+        for post in POSTS:
+            generate_script_with_gemini(model, post)
+        return time.monotonic() - started
+
+    split_model = FakeGenerativeModel(latency=0, latency_per_1k_tokens=0.1, system_instruction=SCRIPT_INSTRUCTION)
+    plain_model = FakeGenerativeModel(latency=0, latency_per_1k_tokens=0.1)
+    split_elapsed = run(split_model)
+    plain_elapsed = run(plain_model)
+
+    assert split_model.stats['cached_tokens'] == INSTRUCTION_TOKENS * (len(POSTS) - 1)
+    assert plain_model.stats['cached_tokens'] == 0
+    assert split_elapsed < plain_elapsed * 0.6, f"{split_elapsed:.2f}초 vs {plain_elapsed:.2f}초"
+
+
+@without_response_cache
+def test_batch_sets_instruction_once():
+    saved = {}
+    originals = (llm_writer.iter_posts_without_script, llm_writer.save_script_to_db)
+    llm_writer.iter_posts_without_script = lambda limit=0: iter(POSTS[:limit])
+    llm_writer.save_script_to_db = lambda post_id, script: saved.setdefault(post_id, script) is script
+    os.environ['LLM_FAKE'] = 'true'
+    os.environ['LLM_FAKE_LATENCY'] = '0'
+    gemini_client.reset_usage_stats()
+    try:
+        count = llm_writer.generate_scripts_batch(limit=3)
+    finally:
+        llm_writer.iter_posts_without_script, llm_writer.save_script_to_db = originals
+        os.environ.pop('LLM_FAKE')
+        os.environ.pop('LLM_FAKE_LATENCY')
+
+    usage = gemini_client.get_usage_stats()
+    assert count == 3 and all(script['prompt_tokens']['instruction_separate'] for script in saved.values())
+    assert usage['calls'] == 3 and usage['cached_tokens'] == INSTRUCTION_TOKENS * 2
+    assert usage['input_tokens'] > usage['cached_tokens'] > 0 and usage['output_tokens'] > 0
+
+
+if __name__ == '__main__':
+    for test in (test_prompt_split, test_generator_uses_model_instruction, test_instruction_reused_across_calls,
+                 test_batch_sets_instruction_once):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
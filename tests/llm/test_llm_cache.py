@@ -0,0 +1,234 @@
+"""
+LLM 응답 캐시 테스트 (오프라인, Gemini API 없음)
+
+가짜 모델 + 임시 SQLite 파일로
+- 같은 모델/프롬프트는 두 번째부터 API를 호출하지 않고, 모델이 바뀌면 다시 호출하는지
+- LLM_CACHE_MODE=off / refresh가 캐시를 우회하는지
+- TTL이 지난 항목은 쓰지 않고, 용량을 넘으면 가장 오래 안 쓴 항목부터 지우는지 (저장할 때마다 전체를 집계하지 않음)
+- 형식이 잘못된 응답은 캐시에서 지워지고, 복구된 대본으로 교체되는지
+- MongoDB 저장소: LLM_CACHE_TTL을 바꾸면 TTL 인덱스를 다시 만들고, 저장할 때마다 전체 크기를 집계하지 않는지
+  (메모리 컬렉션으로 흉내)
+확인한다.
+
+Usage:
+    python3 tests/llm/test_llm_cache.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm.client import llm_cache
+from app.modules.llm.client.gemini_client import call_gemini_api
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.generator.script_generator import generate_script_with_gemini
+
+
+def with_temp_cache(test):
+    """임시 SQLite 캐시로 테스트 실행 후 원복"""
+    def wrapper():
+        os.environ['LLM_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='llm_cache_'), 'cache.sqlite3')
+        llm_cache._store = None
+        llm_cache.reset_cache_stats()
+        try:
+            test()
+        finally:
+            for name in ('LLM_CACHE_PATH', 'LLM_CACHE_MODE', 'LLM_CACHE_TTL', 'LLM_CACHE_MAX_MB'):
+                os.environ.pop(name, None)
+            llm_cache._store = None
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@with_temp_cache
+def test_hit_and_model_key():
+    model = FakeGenerativeModel(latency=0)
+    first = call_gemini_api(model, '- 제목: 엔비디아')
+    second = call_gemini_api(model, '- 제목: 엔비디아')
+
+    other = FakeGenerativeModel(latency=0)
+    other.model_name = 'fake-gemini-flash'
+    call_gemini_api(other, '- 제목: 엔비디아')
+
+    assert first == second
+    assert model.stats['calls'] == 1 and other.stats['calls'] == 1
+    assert llm_cache.get_cache_stats()['hits'] == 1
+    assert llm_cache.get_cache_stats()['misses'] == 2
+
+
+@with_temp_cache
+def test_bypass_modes():
+    model = FakeGenerativeModel(latency=0)
+
+    os.environ['LLM_CACHE_MODE'] = 'off'
+    call_gemini_api(model, 'prompt')
+    call_gemini_api(model, 'prompt')
+    assert model.stats['calls'] == 2
+    assert llm_cache.get_cache_stats()['stores'] == 0
+
+    # refresh: 읽지 않고 새로 호출한 결과로 덮어씀 → 이후 on 모드에서 적중
+    os.environ['LLM_CACHE_MODE'] = 'refresh'
+    call_gemini_api(model, 'prompt')
+    os.environ['LLM_CACHE_MODE'] = 'on'
+    call_gemini_api(model, 'prompt')
+    assert model.stats['calls'] == 3
+    assert llm_cache.get_cache_stats()['hits'] == 1
+
+
+@with_temp_cache
+def test_ttl_and_size_eviction():
+    store = llm_cache.get_store()
+    store.put('old', 'm', 'x' * 100)
+    store.put('a', 'm', 'x' * 400)
+    time.sleep(0.01)
+    store.put('b', 'm', 'x' * 400)
+    time.sleep(0.01)
+    assert store.get('a', ttl=60) is not None  # a를 최근에 사용
+
+    # old는 만료
+    store._conn.execute("UPDATE llm_cache SET created_at = created_at - 3600 WHERE key = 'old'")
+    assert store.get('old', ttl=60) is None
+
+    store.put('c', 'm', 'x' * 400)
+    evicted = store.evict(ttl=60, max_bytes=900)
+
+    assert evicted == 1
+    assert store.get('b', ttl=60) is None  # 가장 오래 안 쓴 항목
+    assert store.get('a', ttl=60) is not None and store.get('c', ttl=60) is not None
+    assert store._size == 800
+
+    # 한도 안에서는 저장할 때마다 전체를 집계하지 않고 추정치로 판단
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+    store.put('c', 'm', 'x' * 300)  # 덮어쓰면 이전 크기를 빼고 계산
+    store.put('d', 'm', 'x' * 100)
+    assert store.evict(ttl=60, max_bytes=900) == 0
+    store.delete('a')
+    store._conn.set_trace_callback(None)
+    assert not any('SUM' in statement or 'created_at <=' in statement for statement in statements)
+    assert store._size == 400
+
+
+class MemoryCacheCollection:
+    """MongoCacheStore가 쓰는 메서드만 흉내 내는 메모리 컬렉션 (aggregate 호출 횟수 기록)"""
+
+    name = 'llm_cache'
+
+    def __init__(self):
+        self.docs = {}
+        self.info = {'_id_': {'v': 2, 'key': [('_id', 1)]}}
+        self.aggregations = 0
+
+    def index_information(self):
+        return dict(self.info)
+
+    def create_indexes(self, models):
+        for model in models:
+            document = dict(model.document)
+            name = document.pop('name')
+            document['key'] = list(document['key'].items())
+            self.info[name] = {'v': 2, **document}
+
+    def drop_index(self, name):
+        del self.info[name]
+
+    def find_one_and_replace(self, query, document, projection=None, upsert=False):
+        previous = self.docs.pop(query['_id'], None)
+        self.docs[query['_id']] = {'_id': query['_id'], **document}
+        return previous
+
+    def find_one_and_delete(self, query, projection=None):
+        return self.docs.pop(query['_id'], None)
+
+    def aggregate(self, pipeline):
+        self.aggregations += 1
+        return [{'_id': None, 'size': sum(doc['size'] for doc in self.docs.values())}] if self.docs else []
+
+    def find(self, query, projection=None):
+        docs = list(self.docs.values())
+        return SimpleNamespace(sort=lambda field, direction: sorted(docs, key=lambda doc: doc[field]))
+
+    def delete_many(self, query):
+        ids = query['_id']['$in']
+        for key in ids:
+            del self.docs[key]
+        return SimpleNamespace(deleted_count=len(ids))
+
+
+def test_mongo_store_ttl_change_and_size_tracking():
+    collection = MemoryCacheCollection()
+    original = llm_cache.get_mongo_client
+    llm_cache.get_mongo_client = lambda: {'test': {'llm_cache': collection}}
+    try:
+        llm_cache.MongoCacheStore('test', ttl=60)
+        # TTL만 바뀌어도 같은 이름 인덱스를 지우고 다시 만듦 (IndexOptionsConflict 없이)
+        store = llm_cache.MongoCacheStore('test', ttl=120)
+    finally:
+        llm_cache.get_mongo_client = original
+    assert collection.info['created_at_ttl']['expireAfterSeconds'] == 120
+
+    store.put('a', 'm', 'x' * 400)
+    store.put('b', 'm', 'x' * 400)
+    assert store.evict(ttl=60, max_bytes=900) == 0
+    assert collection.aggregations == 1  # 처음 한 번만 집계
+
+    store.put('b', 'm', 'x' * 300)  # 덮어쓰면 이전 크기를 빼고 계산
+    store.put('c', 'm', 'x' * 100)
+    assert store.evict(ttl=60, max_bytes=900) == 0
+    assert collection.aggregations == 1
+
+    # 추정치가 한도를 넘으면 다시 세서 확인 후 가장 오래 안 쓴 항목부터 삭제
+    store.put('d', 'm', 'x' * 200)
+    assert store.evict(ttl=60, max_bytes=900) == 1
+    assert collection.aggregations == 2
+    assert 'a' not in collection.docs and store._size == 600
+
+    store.delete('c')
+    assert store._size == 500
+
+
+class BrokenJsonModel:
+    """첫 번째는 JSON이 아닌 응답, 두 번째(복구 요청)부터 정상 JSON을 돌려주는 모델"""
+
+    model_name = 'broken-json'
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.calls == 1:
+            text = '죄송합니다, 대본을 만들 수 없습니다.'
+        else:
+            text = '{"script_segments": [{"role": "narrator", "text": "요약"}], "full_text_for_thumbnail": "ok"}'
+        return SimpleNamespace(text=text)
+
+
+@with_temp_cache
+def test_invalid_response_is_not_reused():
+    model = BrokenJsonModel()
+    post = {'post_id': '1', 'title': '제목', 'content': '본문'}
+
+    # 잘못된 응답은 무효화 후 복구 요청, 복구된 대본이 원래 프롬프트 캐시를 대체
+    assert generate_script_with_gemini(model, post) is not None
+    assert model.calls == 2
+    assert llm_cache.get_cache_stats()['invalidations'] == 1
+
+    assert generate_script_with_gemini(model, post)['full_text_for_thumbnail'] == 'ok'
+    assert model.calls == 2
+
+
+if __name__ == '__main__':
+    for test in (test_hit_and_model_key, test_bypass_modes, test_ttl_and_size_eviction,
+                 test_invalid_response_is_not_reused, test_mongo_store_ttl_change_and_size_tracking):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
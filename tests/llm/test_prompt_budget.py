@@ -0,0 +1,105 @@
+"""
+프롬프트 토큰 예산 테스트 (오프라인, Gemini API / MongoDB 없음)
+
+- 토큰 추정기가 문자 종류별로 세고, 추정치 기준으로 자르는지
+- 짧은 게시글은 예산과 상관없이 그대로 들어가는지
+- 긴 본문(붙여넣은 기사 등)은 링크/중복을 지우고 앞/뒤 문장만 남겨 예산 안에 들어가는지
+- 댓글은 중복/내용 없는 댓글을 거르고 예산 안에서 고르는지
+- 생성된 대본에 토큰 사용 리포트가 저장되는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_prompt_budget.py
+"""
+
+import os
+import sys
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.generator.script_generator import generate_script_with_gemini
+from app.modules.llm.prompt.prompt_builder import PROMPT_COMMENT_LIMIT, build_script_prompt, create_script_prompt
+from app.modules.llm.prompt.token_counter import count_tokens, truncate_to_tokens
+
+ARTICLE = ' '.join(f"엔비디아 {i}분기 매출이 전년 대비 크게 늘었다는 기사 문장입니다." for i in range(400))
+
+
+def test_count_and_truncate():
+    assert count_tokens('') == 0
+    assert count_tokens('떡락 ㅋㅋ!') == 5
+    assert count_tokens('NVIDIA') == 2 and count_tokens('2026') == 2
+    assert count_tokens('엔비디아 NVDA 3%') == 4 + 1 + 1 + 1
+
+    text = 'SOXL 풀매수 가즈아'
+    assert truncate_to_tokens(text, 100) == text
+    assert truncate_to_tokens(text, 3) == 'SOXL 풀매'
+    assert truncate_to_tokens(text, 1) == 'SOXL' and truncate_to_tokens(text, 0) == ''
+    assert count_tokens(truncate_to_tokens(ARTICLE, 500)) <= 500
+
+
+def test_short_post_unchanged():
+    post = {'title': '엔비디아 실적', 'content': '오늘 실적 발표\n\n가즈아', 'recommend': 12, 'comment_count': 2,
+            'comments': ['풀매수 간다', '숏충이 울겠네']}
+    prompt, report = build_script_prompt(post, budget=3000)
+
+    assert '오늘 실적 발표\n\n가즈아' in prompt
+    assert '- 풀매수 간다\n- 숏충이 울겠네' in prompt
+    assert not report['trimmed'] and report['comments_used'] == 2
+    assert report['total'] == count_tokens(prompt) <= 3000
+    assert prompt == create_script_prompt(post)
+
+
+def test_long_post_fits_budget():
+    content = f"{ARTICLE}\nhttps://news.example.com/a/1234567890\n{ARTICLE}\n마지막 결론 문장입니다."
+    post = {'title': '기사 붙여넣기', 'content': content, 'comments': [f"댓글 {i}" for i in range(50)]}
+    prompt, report = build_script_prompt(post, budget=2000)
+
+    assert report['trimmed'] and report['total'] <= 2000
+    assert report['total'] == count_tokens(prompt)
+    assert report['content_original'] > report['content']
+    assert 'https://' not in prompt
+    assert '(...중략...)' in prompt
+    # 앞부분과 마지막 문장은 남김
+    assert '엔비디아 0분기' in prompt and '마지막 결론 문장입니다.' in prompt
+    assert report['comments_used'] == PROMPT_COMMENT_LIMIT
+
+    # 예산 0이면 제한 없음 (링크/중복 줄 정리만)
+    _, unlimited = build_script_prompt(post, budget=0)
+    assert not unlimited['trimmed'] and unlimited['total'] > 10000
+
+
+def test_comment_selection():
+    comments = ['ㅋㅋㅋ 가즈아', 'ㅋㅋㅋ 가즈아', '!!!', 'https://dcinside.com/x', '긴 댓글 ' * 200, '숏충이 울겠네']
+    prompt, report = build_script_prompt({'title': '제목', 'content': '본문', 'comments': comments}, budget=3000)
+
+    section = prompt[prompt.index('## 주요 댓글'):]
+    assert section.count('ㅋㅋㅋ 가즈아') == 1
+    assert '!!!' not in section and 'https://' not in section
+    assert '숏충이 울겠네' in section
+    assert report['comments_used'] == 3 and report['comments'] < 150
+
+
+def test_report_saved_with_script():
+    os.environ['LLM_CACHE_MODE'] = 'off'
+    try:
+        script = generate_script_with_gemini(FakeGenerativeModel(latency=0),
+                                             {'post_id': '1', 'title': '제목', 'content': ARTICLE})
+    finally:
+        os.environ.pop('LLM_CACHE_MODE')
+
+    report = script['prompt_tokens']
+    assert report['budget'] == int(os.getenv('PROMPT_TOKEN_BUDGET', 3000))
+    assert report['trimmed'] and report['total'] <= report['budget']
+
+
+if __name__ == '__main__':
+    for test in (test_count_and_truncate, test_short_post_unchanged, test_long_post_fits_budget,
+                 test_comment_selection, test_report_saved_with_script):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,155 @@
+"""
+모델 응답 JSON 추출/복구/검증 테스트 (오프라인, Gemini API 없음)
+
+- 코드블럭, 앞뒤 설명문, 끝에 붙은 쉼표, 스마트 따옴표, 중간에 끊긴 출력을 로컬에서 복구하는지
+- 설명문에 JSON보다 먼저 나온 '{...}'는 건너뛰고 대본 JSON을 찾는지
+- 본문 안의 스마트 따옴표는 그대로 두는지
+- 스키마에 맞지 않는 응답은 오류 목록과 함께 실패하는지
+- 로컬 복구가 안 되면 짧은 복구 프롬프트로 한 번만 다시 요청하는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_response_parser.py
+"""
+
+import os
+import sys
+import json
+
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm.generator import response_parser
+from app.modules.llm.generator.response_parser import ScriptParseError, parse_script_response
+from app.modules.llm.generator.script_generator import generate_script_with_gemini
+
+SCRIPT = {
+    'script_segments': [
+        {'role': 'narrator', 'text': '오늘 엔비디아가 “역대급” 실적을 냈습니다.', 'duration_estimate': 3.5},
+        {'role': 'comment', 'text': '와 이건 못 참지', 'emotion': '흥분'},
+    ],
+    'full_text_for_thumbnail': '엔비디아 역대급 실적',
+}
+
+
+def test_clean_and_fenced():
+    text = json.dumps(SCRIPT, ensure_ascii=False)
+    assert parse_script_response(text) == (SCRIPT, False)
+    assert parse_script_response(f"```json\n{text}\n```") == (SCRIPT, False)
+
+
+def test_salvage():
+    text = json.dumps(SCRIPT, ensure_ascii=False, indent=2)
+
+    # 앞뒤 설명문
+    data, salvaged = parse_script_response(f"네, 대본입니다.\n{text}\n도움이 되셨길 바랍니다!")
+    assert data == SCRIPT and salvaged
+
+    # 끝에 붙은 쉼표
+    data, salvaged = parse_script_response(text.replace('\n    }', ',\n    }').replace('\n  ]', ',\n  ]'))
+    assert salvaged and len(data['script_segments']) == 2
+
+    # 스마트 따옴표로 감싼 키/값 (본문 안의 스마트 따옴표는 유지)
+    smart = '{“script_segments”: [{“role”: “narrator”, “text”: “요약”}], “full_text_for_thumbnail”: “제목”}'
+    data, salvaged = parse_script_response(smart)
+    assert salvaged and data['full_text_for_thumbnail'] == '제목'
+    assert '“역대급”' in parse_script_response(text)[0]['script_segments'][0]['text']
+
+
+def test_braces_in_prose():
+    text = json.dumps(SCRIPT, ensure_ascii=False)
+
+    # 설명문 속 괄호(파싱 안 됨 / 파싱되지만 대본이 아님)는 건너뛰고 뒤의 대본 JSON을 찾음
+    data, salvaged = parse_script_response(f"설명 {{예시}} 형식 {{\"title\": \"제목\"}} 결과: {text}")
+    assert data == SCRIPT and salvaged
+
+    # 대본 JSON이 없으면 처음 파싱된 객체의 스키마 오류를 보고
+    try:
+        parse_script_response('설명 {예시} 결과: {"title": "제목"}')
+        assert False, "대본 없이 통과"
+    except ScriptParseError as e:
+        assert e.errors == ['script_segments 없음', 'full_text_for_thumbnail 없음']
+
+
+def test_truncated_output():
+    text = json.dumps(SCRIPT, ensure_ascii=False)
+
+    # 썸네일 문구 이후에서 끊기면 마지막으로 완결된 값까지 살림
+    reordered = json.dumps({'full_text_for_thumbnail': '제목', 'script_segments': SCRIPT['script_segments']},
+                           ensure_ascii=False)
+    data, salvaged = parse_script_response(reordered[:reordered.index('와 이건')])
+    assert salvaged and len(data['script_segments']) == 1
+
+    # 필수 필드까지 잘리면 실패
+    try:
+        parse_script_response(text[:text.index('"full_text_for_thumbnail"')])
+        assert False, "필수 필드 없이 통과"
+    except ScriptParseError as e:
+        assert e.errors == ['full_text_for_thumbnail 없음']
+
+
+def test_schema_errors():
+    bad = {'script_segments': [{'role': 'host', 'text': ''}, 'x'], 'full_text_for_thumbnail': 1}
+    try:
+        parse_script_response(json.dumps(bad))
+        assert False, "스키마 오류 통과"
+    except ScriptParseError as e:
+        assert 'full_text_for_thumbnail 타입 오류' in e.errors
+        assert 'script_segments[1]가 객체가 아님' in e.errors
+        assert any(error.startswith('script_segments[0].role') for error in e.errors)
+
+    try:
+        parse_script_response('대본을 만들 수 없습니다.')
+        assert False, "JSON 없이 통과"
+    except ScriptParseError:
+        pass
+
+
+class ScriptedModel:
+    """미리 정한 응답을 차례대로 돌려주고 받은 프롬프트를 기록하는 모델"""
+
+    model_name = 'scripted'
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(text=self.responses.pop(0))
+
+
+def test_repair_request():
+    os.environ['LLM_CACHE_MODE'] = 'off'
+    response_parser.reset_parse_stats()
+    post = {'post_id': '1', 'title': '제목', 'content': '본문 ' * 500}
+    try:
+        model = ScriptedModel(['{"script_segments": "없음"}', json.dumps(SCRIPT, ensure_ascii=False)])
+        script = generate_script_with_gemini(model, post)
+
+        # 복구 프롬프트는 게시글 본문 없이 원래 출력과 오류만 포함
+        assert script['full_text_for_thumbnail'] == SCRIPT['full_text_for_thumbnail']
+        assert len(model.prompts) == 2
+        assert '본문 본문' not in model.prompts[1] and 'script_segments 타입 오류' in model.prompts[1]
+        assert len(model.prompts[1]) < len(model.prompts[0])
+
+        # 복구 요청도 실패하면 한 번만 재요청하고 포기
+        model = ScriptedModel(['엉뚱한 답', '여전히 엉뚱한 답'])
+        assert generate_script_with_gemini(model, post) is None
+        assert len(model.prompts) == 2
+    finally:
+        os.environ.pop('LLM_CACHE_MODE')
+
+    assert response_parser.get_parse_stats() == {'parsed': 0, 'salvaged': 0, 'repaired': 1, 'failed': 1}
+
+
+if __name__ == '__main__':
+    for test in (test_clean_and_fenced, test_salvage, test_braces_in_prose, test_truncated_output,
+                 test_schema_errors, test_repair_request):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,194 @@
+"""
+LLM 제공자 / 라우터 테스트 (오프라인, Gemini / Anthropic API 없음)
+
+가짜 모델로
+- 비용이 같으면 빠른 모델, 지연이 같으면 싼 모델을 고르는지
+- 호출이 실패하면 다음 모델로 넘어가고, 연속으로 실패한 모델은 잠시 제외했다가 다시 시도하는지
+- 스트리밍도 첫 조각 전에 실패하면 다음 모델로 넘어가는지
+- 대본에 상수 대신 실제로 응답한 모델 이름이 기록되는지 (캐시 적중 포함)
+- LLM_ROUTES / LLM_PROVIDER로 모델/라우터를 만드는지, Anthropic 응답을 Gemini 응답 모양으로 바꾸는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_router.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm.client import llm_cache
+from app.modules.llm.client.anthropic_client import AnthropicModel
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.client.gemini_client import call_gemini_api, stream_gemini_api
+from app.modules.llm.client.providers import init_llm_model
+from app.modules.llm.client.router import ModelRouter, Route, parse_routes
+from app.modules.llm.generator.script_generator import generate_script_with_gemini
+
+
+class FlakyModel(FakeGenerativeModel):
+    """fail=True인 동안 503 오류를 내는 가짜 모델"""
+
+    def __init__(self, name: str, latency: float = 0, fail: bool = False):
+        super().__init__(latency=latency)
+        self.model_name = name
+        self.fail = fail
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        if self.fail:
+            self.stats['rejected'] += 1
+            raise RuntimeError('503 UNAVAILABLE (fake)')
+        return super().generate_content(prompt, stream=stream, **kwargs)
+
+
+def make_router(*models, **kwargs) -> ModelRouter:
+    """가격 0인 가짜 모델 라우터 (앞에 준 모델이 먼저 시도되도록 지연 기록을 넣어 둠)"""
+    kwargs.setdefault('explore', 0)
+    router = ModelRouter([Route('fake', model, (0.0, 0.0)) for model in models], **kwargs)
+    for index, route in enumerate(router.routes):
+        route.latency = 1.0 + index * 10
+    return router
+
+
+def with_clean_env(test):
+    """캐시 끄고 실행, 끝나면 환경변수 원복"""
+    def wrapper():
+        os.environ['LLM_CACHE_MODE'] = 'off'
+        try:
+            test()
+        finally:
+            for name in ('LLM_CACHE_MODE', 'LLM_CACHE_PATH', 'LLM_ROUTES', 'LLM_PROVIDER', 'LLM_FAKE_LATENCY'):
+                os.environ.pop(name, None)
+            llm_cache._store = None
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@with_clean_env
+def test_prefers_fast_then_cheap():
+    slow, fast = FlakyModel('fake-slow', latency=0.1), FlakyModel('fake-fast', latency=0)
+    router = make_router(slow, fast, latency_value=1.0)
+    for route in router.routes:
+        route.latency = None
+        router._succeeded(route, route.model.latency, None)
+
+    for _ in range(5):
+        assert router.generate_content('prompt').model_name == 'fake-fast'
+    assert slow.stats['calls'] == 0
+
+    # 지연이 같으면 예상 비용이 싼 모델
+    cheap, pricey = FlakyModel('fake-cheap'), FlakyModel('fake-pricey')
+    router = ModelRouter([Route('fake', pricey, (3.0, 15.0)), Route('fake', cheap, (0.3, 2.5))], explore=0)
+    assert router.generate_content('prompt').model_name == 'fake-cheap'
+
+
+@with_clean_env
+def test_failover_and_cooldown():
+    primary, backup = FlakyModel('fake-primary', fail=True), FlakyModel('fake-backup')
+    router = make_router(primary, backup, cooldown=0.2)
+
+    for _ in range(3):
+        assert router.generate_content('prompt').model_name == 'fake-backup'
+    assert primary.stats['rejected'] == 3
+
+    # 연속 3회 실패 → 제외 중에는 시도하지 않음
+    router.generate_content('prompt')
+    assert primary.stats['rejected'] == 3
+
+    # 제외 시간이 지나고 회복하면 다시 primary
+    time.sleep(0.25)
+    primary.fail = False
+    assert router.generate_content('prompt').model_name == 'fake-primary'
+    stats = router.get_stats()
+    assert stats['fake:fake-primary']['errors'] == 3 and stats['fake:fake-backup']['calls'] == 4
+
+    # 모두 실패하면 마지막 오류
+    primary.fail = backup.fail = True
+    try:
+        router.generate_content('prompt')
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError('RuntimeError가 발생해야 함')
+
+
+@with_clean_env
+def test_stream_failover_before_first_chunk():
+    router = make_router(FlakyModel('fake-down', fail=True), FlakyModel('fake-up'))
+
+    meta = {}
+    text = ''.join(stream_gemini_api(router, '- 제목: 엔비디아', meta=meta))
+    assert '엔비디아' in text
+    assert meta['model'] == 'fake-up'
+
+
+@with_clean_env
+def test_script_records_actual_model():
+    os.environ['LLM_CACHE_MODE'] = 'on'
+    os.environ['LLM_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='llm_cache_'), 'cache.sqlite3')
+    llm_cache._store = None
+
+    down, up = FlakyModel('fake-down', fail=True), FlakyModel('fake-up')
+    router = make_router(down, up)
+    post = {'post_id': '1', 'title': '엔비디아', 'content': '본문'}
+
+    assert generate_script_with_gemini(router, post)['model'] == 'fake-up'
+    # 캐시 적중이어도 캐시된 응답을 만든 모델
+    meta = {}
+    call_gemini_api(router, 'prompt', meta=meta)
+    call_gemini_api(router, 'prompt', meta=meta)
+    assert meta['model'] == 'fake-up' and up.stats['calls'] == 2
+
+    single = FlakyModel('fake-single')
+    assert generate_script_with_gemini(single, post)['model'] == 'fake-single'
+
+
+@with_clean_env
+def test_routes_from_env():
+    assert parse_routes('gemini:gemini-2.5-pro, anthropic , fake:fake-b@0.5/1') == [
+        ('gemini', 'gemini-2.5-pro', None), ('anthropic', None, None), ('fake', 'fake-b', (0.5, 1.0))]
+
+    os.environ['LLM_PROVIDER'] = 'fake'
+    assert isinstance(init_llm_model(), FakeGenerativeModel)
+
+    os.environ['LLM_ROUTES'] = 'fake:fake-a, fake:fake-b@0.5/1'
+    router = init_llm_model(system_instruction='지시문')
+    assert isinstance(router, ModelRouter)
+    assert [route.name for route in router.routes] == ['fake:fake-a', 'fake:fake-b']
+    assert router.script_instruction == '지시문'
+    assert router.routes[1].input_price == 0.5 and router.routes[0].input_price == 0.0
+
+
+def test_anthropic_adapter():
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        return SimpleNamespace(content=[SimpleNamespace(type='text', text='{"ok": true}')],
+                               usage=SimpleNamespace(input_tokens=120, output_tokens=30))
+
+    model = AnthropicModel('claude-sonnet-4-5', system_instruction='지시문', api_key='test')
+    model.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    response = model.generate_content('prompt', request_options={'timeout': 30})
+
+    assert response.text == '{"ok": true}'
+    assert response.usage_metadata.prompt_token_count == 120
+    assert response.usage_metadata.candidates_token_count == 30
+    assert calls[0]['system'] == '지시문' and calls[0]['timeout'] == 30
+    assert calls[0]['messages'] == [{'role': 'user', 'content': 'prompt'}]
+
+
+if __name__ == '__main__':
+    for test in (test_prefers_fast_then_cheap, test_failover_and_cooldown, test_stream_failover_before_first_chunk,
+                 test_script_records_actual_model, test_routes_from_env, test_anthropic_adapter):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,148 @@
+"""
+대본 미생성 게시글 조회 테스트 (오프라인, MongoDB 없음)
+
+find / sort / limit / batch_size만 흉내 내는 메모리 컬렉션으로
+- 프롬프트에 필요한 필드만 가져오고 댓글은 선택 후보(앞 20개)만 가져오는지 ($slice)
+- 줄인 문서로 만든 프롬프트가 전체 문서로 만든 프롬프트와 같은지
+- iter_posts_without_script가 추천수 순으로 하나씩 내보내는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_script_repository.py
+"""
+
+import sys
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm.repository import script_repository
+from app.modules.llm.prompt.prompt_builder import create_script_prompt, PROMPT_COMMENT_CANDIDATES
+
+
+class MemoryCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.consumed = 0
+        self.batch = None
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.docs.sort(key=lambda doc: doc.get(field, 0), reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        if count:
+            self.docs = self.docs[:count]
+        return self
+
+    def batch_size(self, size):
+        self.batch = size
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        for doc in self.docs:
+            self.consumed += 1
+            yield doc
+
+
+class MemoryPosts:
+    """{'script_generated_at': None} 조건 + include 프로젝션($slice 포함)만 지원"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.cursors = []
+        self.projections = []
+
+    def find(self, query, projection):
+        self.projections.append(projection)
+        matched = [doc for doc in self.docs
+                   if all(doc.get(field) == value for field, value in query.items())]
+
+        projected = []
+        for doc in matched:
+            out = {}
+            for field, rule in projection.items():
+                if field not in doc or rule == 0:
+                    continue
+                out[field] = doc[field][:rule['$slice']] if isinstance(rule, dict) else doc[field]
+            projected.append(out)
+
+        cursor = MemoryCursor(projected)
+        self.cursors.append(cursor)
+        return cursor
+
+
+def make_post(post_id: int, recommend: int, scripted: bool = False):
+    return {
+        '_id': f"oid-{post_id}",
+        'post_id': str(post_id),
+        'title': f"글 {post_id}",
+        'author': '익명',
+        'content': '본문 ' * 20,
+        'views': 100,
+        'recommend': recommend,
+        'comment_count': 300,
+        'images': [f"https://example.com/{post_id}/{i}.jpg" for i in range(5)],
+        'image_paths': [f"/images/{post_id}/{i}.jpg" for i in range(5)],
+        'comments': [f"댓글 {i}" for i in range(300)],
+        'script_generated_at': 'yesterday' if scripted else None,
+    }
+
+
+def with_fake_posts(posts: MemoryPosts):
+    original = script_repository.get_mongo_client
+    script_repository.get_mongo_client = lambda: {'test': {'posts': posts}}
+
+    def restore():
+        script_repository.get_mongo_client = original
+
+    return restore
+
+
+def test_projection_keeps_prompt_identical():
+    full = make_post(1, recommend=10)
+    posts = MemoryPosts([full])
+    restore = with_fake_posts(posts)
+    try:
+        fetched = script_repository.fetch_posts_without_script('test', limit=5)
+    finally:
+        restore()
+
+    assert len(fetched) == 1
+    doc = fetched[0]
+    assert set(doc) == {'post_id', 'title', 'content', 'recommend', 'comment_count', 'comments'}
+    assert len(doc['comments']) == PROMPT_COMMENT_CANDIDATES
+    assert create_script_prompt(doc) == create_script_prompt(full)
+
+
+def test_iter_streams_unscripted_by_recommend():
+    posts = MemoryPosts([make_post(1, 5), make_post(2, 50, scripted=True), make_post(3, 30), make_post(4, 10)])
+    restore = with_fake_posts(posts)
+    try:
+        stream = script_repository.iter_posts_without_script('test', limit=0, batch_size=2)
+        first = next(stream)
+        consumed_at_first = posts.cursors[0].consumed
+        rest = list(stream)
+    finally:
+        restore()
+
+    assert consumed_at_first == 1
+    assert posts.cursors[0].batch == 2
+    assert [doc['post_id'] for doc in [first] + rest] == ['3', '4', '1']
+
+
+if __name__ == '__main__':
+    for test in (test_projection_keeps_prompt_identical, test_iter_streams_unscripted_by_recommend):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")
@@ -0,0 +1,136 @@
+"""
+스트리밍 대본 생성 테스트 (오프라인, Gemini API / MongoDB 없음)
+
+가짜 모델(FakeGenerativeModel)의 스트리밍 응답으로
+- 응답을 어떤 크기로 잘라 받아도 script_segments 항목을 닫히는 즉시 하나씩 꺼내는지
+- 첫 항목이 전체 응답이 끝나기 전에 전달되는지
+- 스트리밍으로 저장한 대본이 스트리밍이 아닐 때 저장한 대본과 같은지 (생성 시각 제외)
+- 스트리밍 응답도 캐시에 저장되고, 후속 처리 실패가 대본 생성을 멈추지 않는지
+확인한다.
+
+Usage:
+    python3 tests/llm/test_streaming.py
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.modules.llm import llm_writer
+from app.modules.llm.client import llm_cache
+from app.modules.llm.client.fake_client import FakeGenerativeModel
+from app.modules.llm.client.gemini_client import stream_gemini_api
+from app.modules.llm.generator.response_parser import SegmentStreamParser, parse_script_response
+from app.modules.llm.generator.script_generator import generate_script_with_gemini
+
+POSTS = [{'post_id': str(i), 'title': f"테슬라 {i}", 'content': '본문', 'recommend': 1, 'comment_count': 0,
+          'comments': []} for i in range(3)]
+
+
+def with_cache_mode(mode: str):
+    def decorator(test):
+        def wrapper():
+            os.environ['LLM_CACHE_MODE'] = mode
+            try:
+                test()
+            finally:
+                os.environ.pop('LLM_CACHE_MODE')
+        wrapper.__name__ = test.__name__
+        return wrapper
+    return decorator
+
+
+def test_parser_any_chunking():
+    script = {
+        'script_segments': [
+            {'role': 'narrator', 'text': '괄호 {가} [섞인] "따옴표" \\ 문장', 'duration_estimate': 5},
+            {'role': 'comment', 'text': '가즈아', 'emotion': 'excitement'},
+            {'role': 'comment', 'text': '가즈아', 'emotion': 'excitement'},
+        ],
+        'full_text_for_thumbnail': '썸네일',
+    }
+    text = f"```json\n{json.dumps(script, ensure_ascii=False, indent=2)}\n```"
+
+    for size in (1, 2, 5, 13, len(text)):
+        parser = SegmentStreamParser()
+        emitted = []
+        for i in range(0, len(text), size):
+            emitted.extend(parser.feed(text[i:i + size]))
+        assert emitted == script['script_segments'], size
+        assert parser.done and parser.text == text
+        assert parse_script_response(parser.text)[0] == script
+
+
+@with_cache_mode('off')
+def test_first_segment_arrives_early():
+    model = FakeGenerativeModel(latency=0, chunk_size=10, chunk_delay=0.01)
+    arrivals = []
+    started = time.monotonic()
+    script = generate_script_with_gemini(model, POSTS[0],
+                                         on_segment=lambda index, segment: arrivals.append((index, time.monotonic())))
+    finished = time.monotonic()
+
+    assert [index for index, _ in arrivals] == [0, 1, 2]
+    assert len(script['script_segments']) == 3
+    # 첫 항목은 응답이 절반도 오기 전에 도착
+    assert arrivals[0][1] - started < (finished - started) / 2
+
+
+@with_cache_mode('off')
+def test_streamed_script_matches_non_streaming():
+    def run(on_segment):
+        saved = {}
+        originals = (llm_writer.iter_posts_without_script, llm_writer.save_script_to_db)
+        llm_writer.iter_posts_without_script = lambda limit=0: iter(POSTS[:limit])
+        llm_writer.save_script_to_db = lambda post_id, script: saved.setdefault(post_id, script) is script
+        try:
+            llm_writer.generate_scripts_batch(limit=3, model=FakeGenerativeModel(latency=0, chunk_size=7),
+                                              on_segment=on_segment)
+        finally:
+            llm_writer.iter_posts_without_script, llm_writer.save_script_to_db = originals
+        for script in saved.values():
+            script.pop('generated_at')
+        return saved
+
+    segments = []
+    streamed = run(lambda post, index, segment: segments.append((post['post_id'], index)))
+    plain = run(None)
+
+    assert streamed == plain and len(plain) == 3
+    assert sorted(segments) == [(str(i), j) for i in range(3) for j in range(3)]
+
+
+@with_cache_mode('on')
+def test_stream_cached_and_callback_errors():
+    os.environ['LLM_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='llm_stream_'), 'cache.sqlite3')
+    llm_cache._store = None
+    try:
+        model = FakeGenerativeModel(latency=0, chunk_size=5)
+        chunks = list(stream_gemini_api(model, '- 제목: 캐시'))
+        again = list(stream_gemini_api(model, '- 제목: 캐시'))
+        assert len(chunks) > 1 and again == [''.join(chunks).strip()]
+        assert model.stats['calls'] == 1
+
+        def broken(index, segment):
+            raise RuntimeError('TTS 실패')
+
+        assert generate_script_with_gemini(model, POSTS[1], on_segment=broken) is not None
+    finally:
+        os.environ.pop('LLM_CACHE_PATH')
+        llm_cache._store = None
+
+
+if __name__ == '__main__':
+    for test in (test_parser_any_chunking, test_first_segment_arrives_early, test_streamed_script_matches_non_streaming,
+                 test_stream_cached_and_callback_errors):
+        test()
+        print(f"✅ {test.__name__}")
+    print("🎉 모든 테스트 통과!")